@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EntityAnalysisResult.add_operations マイクロベンチマーク
+
+20 Entity に対して 10万件の CRUD 操作（重複を含む）をマージし、所要時間を計測する。
+1 Entity・1種別あたり約700件の操作が溜まる形で、重複判定のコストが操作数に比例するかを見る。
+比較用に旧実装（種別ごとのリストを any(...) でメソッド名のみ線形走査）も同じ入力で計測し、
+重複除去後の件数・順序が新実装と一致することを確認する。
+
+使用例:
+  python benchmarks/bench_add_operations.py
+  python benchmarks/bench_add_operations.py --operations 200000 --entities 10
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import CodeLocation, CRUDOperation, EntityAnalysisResult  # noqa: E402
+
+CRUD_TYPES = ["CREATE", "READ", "UPDATE", "DELETE"]
+
+
+class LegacyEntityAnalysisResult:
+    """旧実装（比較用）: 種別ごとのリストを保持し、同じメソッド名の操作を any(...) の線形走査で判定"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.create_operations = []
+        self.read_operations = []
+        self.update_operations = []
+        self.delete_operations = []
+
+    def add_operations(self, operations: list):
+        """CRUD操作を追加（Entity レベルで重複除去）"""
+        for op in operations:
+            # 同じメソッド名の操作が既に存在するかチェック
+            existing_ops = self._get_operations_by_type(op.operation_type)
+            is_duplicate = any(existing_op.method_name == op.method_name for existing_op in existing_ops)
+
+            if not is_duplicate:
+                if op.operation_type == "CREATE":
+                    self.create_operations.append(op)
+                elif op.operation_type == "READ":
+                    self.read_operations.append(op)
+                elif op.operation_type == "UPDATE":
+                    self.update_operations.append(op)
+                elif op.operation_type == "DELETE":
+                    self.delete_operations.append(op)
+
+    def _get_operations_by_type(self, operation_type: str) -> list:
+        """指定タイプの操作リストを取得"""
+        if operation_type == "CREATE":
+            return self.create_operations
+        elif operation_type == "READ":
+            return self.read_operations
+        elif operation_type == "UPDATE":
+            return self.update_operations
+        elif operation_type == "DELETE":
+            return self.delete_operations
+        return []
+
+    def get_total_operations(self) -> int:
+        """総CRUD操作数"""
+        return (len(self.create_operations) + len(self.read_operations) +
+                len(self.update_operations) + len(self.delete_operations))
+
+
+def generate_operations(operation_count: int, entity_count: int, seed: int) -> list:
+    """(Entity番号, CRUD操作) のリストを生成（重複を含む、メソッド名ごとにソース位置は1つ）"""
+    rng = random.Random(seed)
+    unique_per_entity = max(1, int(operation_count * 0.7) // entity_count)
+    operations = []
+    for _ in range(operation_count):
+        entity_no = rng.randrange(entity_count)
+        method_no = rng.randrange(unique_per_entity)
+        operations.append((entity_no, CRUDOperation(
+            operation_type=CRUD_TYPES[method_no % 4],
+            method_name=f"Entity{entity_no}ORMapper.method{method_no}",
+            confidence=0.9,
+            source_location=CodeLocation(f"/src/Entity{entity_no}ORMapper.java", method_no * 10 + 1, "")
+        )))
+    return operations
+
+
+def run_merge(operations: list, entity_count: int, result_class, batch_size: int) -> tuple:
+    """操作をEntityごとのバッチで追加し、(所要時間, Entity解析結果) を返す"""
+    results = [result_class(name=f"Entity{i}") for i in range(entity_count)]
+    batches = {}
+    start = time.perf_counter()
+    for entity_no, op in operations:
+        batch = batches.setdefault(entity_no, [])
+        batch.append(op)
+        if len(batch) >= batch_size:
+            results[entity_no].add_operations(batch)
+            batches[entity_no] = []
+    for entity_no, batch in batches.items():
+        if batch:
+            results[entity_no].add_operations(batch)
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EntityAnalysisResult.add_operations マイクロベンチマーク")
+    parser.add_argument('--operations', type=int, default=100_000, help='追加する操作数（デフォルト: 10万）')
+    parser.add_argument('--entities', type=int, default=20, help='Entity数（デフォルト: 20）')
+    parser.add_argument('--batch-size', type=int, default=8, help='1回の add_operations に渡す件数（デフォルト: 8）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    args = parser.parse_args()
+
+    operations = generate_operations(args.operations, args.entities, args.seed)
+
+    elapsed, results = run_merge(operations, args.entities, EntityAnalysisResult, args.batch_size)
+    total = sum(result.get_total_operations() for result in results)
+    print(f"⏱️  新実装: {args.operations:,}件 → {total:,}件 {elapsed:.3f}秒 "
+          f"({elapsed / args.operations * 1e6:.2f}µs/件)")
+
+    legacy_elapsed, legacy_results = run_merge(operations, args.entities, LegacyEntityAnalysisResult, args.batch_size)
+    legacy_total = sum(result.get_total_operations() for result in legacy_results)
+    print(f"⏱️  旧実装: {args.operations:,}件 → {legacy_total:,}件 {legacy_elapsed:.3f}秒 "
+          f"({legacy_elapsed / args.operations * 1e6:.2f}µs/件)")
+
+    # 重複除去の結果（件数・挿入順）が一致することを確認
+    for result, legacy_result in zip(results, legacy_results):
+        for crud_type in CRUD_TYPES:
+            actual = [op.method_name for op in result._get_operations_by_type(crud_type)]
+            expected = [op.method_name for op in legacy_result._get_operations_by_type(crud_type)]
+            assert actual == expected, f"{result.name} {crud_type}: 結果が一致しません"
+    print("✅ 正当性確認: 重複除去後の件数・挿入順が旧実装と一致")
+    print(f"🚀 高速化: {legacy_elapsed / elapsed:.1f}倍")
+
+
+if __name__ == "__main__":
+    main()
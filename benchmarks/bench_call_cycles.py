@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+循環呼び出し検出（call_cycles）のベンチマーク
+
+乱数シードから決定的に生成した呼び出しグラフ（深さ方向の呼び出しに、自己再帰・相互再帰の循環を埋め込んだもの）で
+- 規模を倍々にしたときの強連結成分の検出・縮約の時間（ノード数 + 辺数に線形であること）
+- 非常に長い呼び出し連鎖（再帰上限を大きく超える深さ）でも検出できること
+を計測し、Kosaraju のアルゴリズムによる参照実装と成分が一致すること、縮約したグラフに循環が残らないことを確認する。
+また、自己再帰（fact(n - 1) / this.walk()）と相互再帰（ping ↔ pong）を含む Java ソースから、
+全コードベースの呼び出しグラフと起点ファイルからの探索の両方で3つの循環が報告されることを確認する。
+
+使用例:
+  python benchmarks/bench_call_cycles.py
+  python benchmarks/bench_call_cycles.py --nodes 200000 --steps 3 --chain 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main as analyzer_main  # noqa: E402
+from call_cycles import collapse_cycles, find_call_cycles, strongly_connected_components  # noqa: E402
+from call_graph import build_call_graph  # noqa: E402
+from class_indexer import MultiSourceClassIndexer  # noqa: E402
+from graph_export import TracedGraph  # noqa: E402
+from utils import load_settings_and_resolve_paths  # noqa: E402
+
+
+# 自己再帰（修飾なし・this.）と相互再帰を含むクラス
+RECURSION_SOURCE = """package com.example.service;
+
+public class RecursionService {
+    public int fact(int n) {
+        return n <= 1 ? 1 : n * fact(n - 1);
+    }
+
+    public void walk() {
+        this.walk();
+    }
+
+    public void ping() {
+        pong();
+    }
+
+    public void pong() {
+        ping();
+    }
+}
+"""
+
+
+def generate_graph(nodes: int, degree: int, cycles: int, seed: int) -> TracedGraph:
+    """深い側への呼び出し（平均 degree 本）に、2〜6メソッドの循環と自己再帰を cycles 個埋め込んだグラフ"""
+    rng = random.Random(seed)
+    graph = TracedGraph()
+    node_ids = [f"Service{number // 8}.method{number % 8}" for number in range(nodes)]
+    for node_id in node_ids:
+        class_name, method_name = node_id.split('.')
+        graph.nodes[node_id] = {'class_name': class_name, 'method_name': method_name, 'kind': 'method'}
+
+    for number, caller_id in enumerate(node_ids[:-1]):
+        for _ in range(rng.randint(0, degree * 2)):
+            graph.edges.setdefault(caller_id, {})[node_ids[rng.randrange(number + 1, nodes)]] = None
+
+    for _ in range(cycles):
+        start = rng.randrange(nodes)
+        size = rng.randint(1, 6)
+        members = [node_ids[min(start + offset, nodes - 1)] for offset in range(size)]
+        for caller_id, callee_id in zip(members, members[1:] + members[:1]):
+            graph.edges.setdefault(caller_id, {})[callee_id] = None
+    return graph
+
+
+def generate_chain(length: int) -> TracedGraph:
+    """length メソッドが一列に呼び出し、末尾が先頭を呼び出す1つの大きな循環"""
+    graph = TracedGraph()
+    for number in range(length):
+        graph.nodes[f"Chain.method{number}"] = {'class_name': 'Chain', 'method_name': f"method{number}"}
+        graph.edges[f"Chain.method{number}"] = {f"Chain.method{(number + 1) % length}": None}
+    return graph
+
+
+def kosaraju_components(graph) -> set:
+    """参照実装: Kosaraju のアルゴリズム（反復版）による強連結成分（frozenset の集合）"""
+    order = []
+    visited = set()
+    for root in graph.nodes:
+        if root in visited:
+            continue
+        visited.add(root)
+        work = [(root, iter(graph.edges.get(root, ())))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    work.append((child, iter(graph.edges.get(child, ()))))
+                    break
+            else:
+                work.pop()
+                order.append(node)
+
+    reverse_edges = {}
+    for caller_id, callee_ids in graph.edges.items():
+        for callee_id in callee_ids:
+            reverse_edges.setdefault(callee_id, []).append(caller_id)
+
+    components = set()
+    assigned = set()
+    for root in reversed(order):
+        if root in assigned:
+            continue
+        assigned.add(root)
+        component = [root]
+        stack = [root]
+        while stack:
+            for caller_id in reverse_edges.get(stack.pop(), ()):
+                if caller_id not in assigned:
+                    assigned.add(caller_id)
+                    component.append(caller_id)
+                    stack.append(caller_id)
+        components.add(frozenset(component))
+    return components
+
+
+def check_recursion_source(work_dir: str):
+    """Java ソースの自己再帰・相互再帰が、呼び出しグラフ（cycles）と起点ファイルからの探索の両方で循環として報告されること"""
+    package_dir = os.path.join(work_dir, 'src', 'com', 'example', 'service')
+    os.makedirs(package_dir, exist_ok=True)
+    with open(os.path.join(package_dir, 'RecursionService.java'), 'w', encoding='utf-8') as f:
+        f.write(RECURSION_SOURCE)
+    settings_file = os.path.join(work_dir, 'settings.json')
+    with open(settings_file, 'w', encoding='utf-8') as f:
+        f.write('{"java.project.sourcePaths": ["src"]}')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        source_paths, _ = load_settings_and_resolve_paths(settings_file)
+        indexer = MultiSourceClassIndexer(cache_enabled=False)
+        indexer.class_index = indexer.build_class_index(source_paths)
+        call_graph = build_call_graph(indexer, workers=1)
+        specialized_index = analyzer_main.build_specialized_index(indexer, 'RecursionService', 5)
+    traced_graph = TracedGraph.from_specialized_index(specialized_index)
+
+    for graph, label in ((call_graph, '呼び出しグラフ'), (traced_graph, '起点ファイルからの探索')):
+        members = sorted(sorted(graph.nodes[node_id]['method_name'] for node_id in cycle.members)
+                         for cycle in find_call_cycles(graph))
+        assert members == [['fact'], ['ping', 'pong'], ['walk']], f"{label}: 循環が一致しません: {members}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="循環呼び出し検出のベンチマーク")
+    parser.add_argument('--nodes', type=int, default=100000, help='最小規模のノード数（デフォルト: 100000）')
+    parser.add_argument('--degree', type=int, default=3, help='1ノードあたりの平均呼び出し数（デフォルト: 3）')
+    parser.add_argument('--steps', type=int, default=3, help='規模を倍にして計測する回数（デフォルト: 3）')
+    parser.add_argument('--chain', type=int, default=500000, help='長い呼び出し連鎖のメソッド数（デフォルト: 500000）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    args = parser.parse_args()
+
+    for step in range(args.steps):
+        nodes = args.nodes * 2 ** step
+        graph = generate_graph(nodes, args.degree, nodes // 100, args.seed)
+
+        start = time.perf_counter()
+        cycles = find_call_cycles(graph)
+        detect_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        condensed = collapse_cycles(graph, cycles)
+        collapse_elapsed = time.perf_counter() - start
+
+        size = len(graph.nodes) + graph.edge_count
+        print(f"⏱️  {len(graph.nodes):,}ノード, {graph.edge_count:,}辺: 検出 {detect_elapsed:.2f}秒"
+              f" ({detect_elapsed / size * 1e6:.2f}µs/要素), 縮約 {collapse_elapsed:.2f}秒, 循環 {len(cycles):,}個")
+
+        expected = kosaraju_components(graph)
+        assert {frozenset(component) for component in strongly_connected_components(graph)} == expected, \
+            "強連結成分が参照実装と一致しません"
+        for cycle in cycles:
+            assert cycle.path[0] == cycle.path[-1] and all(
+                callee_id in graph.edges.get(caller_id, ()) for caller_id, callee_id in zip(cycle.path, cycle.path[1:])), \
+                "循環の経路がグラフの辺になっていません"
+        assert not find_call_cycles(condensed), "縮約したグラフに循環が残っています"
+
+    graph = generate_chain(args.chain)
+    start = time.perf_counter()
+    cycles = find_call_cycles(graph)
+    elapsed = time.perf_counter() - start
+    assert len(cycles) == 1 and len(cycles[0].members) == args.chain, "長い呼び出し連鎖の循環を検出できません"
+    print(f"⏱️  長い呼び出し連鎖 {args.chain:,}メソッド: 検出 {elapsed:.2f}秒（再帰上限 {sys.getrecursionlimit()}）")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        check_recursion_source(work_dir)
+
+    print("✅ 正当性確認: 強連結成分が参照実装と一致、循環の経路が辺に沿う、縮約後に循環なし、"
+          "Java ソースの自己再帰・相互再帰を検出")
+
+
+if __name__ == "__main__":
+    main()
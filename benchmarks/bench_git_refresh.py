@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+git による変更ファイル検出（インデックスの差分更新）のベンチマーク
+
+合成コードベースを git リポジトリとして生成・コミットしてインデックスを構築した後、
+- キャッシュ有効性の確認時間（全 .java ファイルの stat 走査 と git への問い合わせ）を比較し、
+- コミット済み・未コミットの変更、追加、削除、リネーム、.gitignore で無視されたファイルの変更を加えて
+  差分更新した結果が、キャッシュなしの全件構築と一致することを確認する。
+
+使用例:
+  python benchmarks/bench_git_refresh.py
+  python benchmarks/bench_git_refresh.py --classes 10000 --changes 20
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from class_indexer import MultiSourceClassIndexer  # noqa: E402
+from generate_codebase import CodebaseGenerator  # noqa: E402
+from git_changes import detect_changed_files, find_git_roots  # noqa: E402
+from utils import find_java_files, load_settings_and_resolve_paths  # noqa: E402
+
+
+def git(work_dir: str, *args: str):
+    subprocess.run(['git', *args], cwd=work_dir, check=True, capture_output=True)
+
+
+def build(source_paths: list, settings_file: str, cache_enabled: bool = True) -> tuple:
+    """インデックスを構築し、(所要時間, インデックス, インデクサ, 出力) を返す"""
+    indexer = MultiSourceClassIndexer(cache_enabled=cache_enabled)
+    indexer.set_settings_file(settings_file)
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        all_classes = indexer.build_class_index(source_paths)
+    return time.perf_counter() - start, all_classes, indexer, output.getvalue()
+
+
+def snapshot(indexer: MultiSourceClassIndexer, all_classes: dict) -> tuple:
+    """比較用のインデックス内容（キー → クラス情報）とテーブルインデックス"""
+    return ({key: indexer._serialize_class_info(class_info) for key, class_info in all_classes.items()},
+            indexer.table_index)
+
+
+def add_method(java_file: str, method_name: str):
+    """クラス末尾にメソッドを追加（エンコーディングを保つためバイト列で編集）"""
+    data = Path(java_file).read_bytes()
+    end = data.rindex(b'}')
+    Path(java_file).write_bytes(data[:end] + f"    public void {method_name}() {{ }}\n".encode('ascii') + data[end:])
+
+
+def write_ignored_source(work_dir: str, source_dir: str) -> str:
+    """.gitignore で無視するディレクトリに .java ファイル（生成ソースを想定）を書き出し、そのパスを返す"""
+    with open(os.path.join(work_dir, '.gitignore'), 'w', encoding='utf-8') as f:
+        f.write('generated/\n')
+    package_dir = os.path.join(work_dir, source_dir, 'generated')
+    os.makedirs(package_dir, exist_ok=True)
+    java_file = os.path.join(package_dir, 'BenchGenerated.java')
+    with open(java_file, 'w', encoding='utf-8') as f:
+        f.write("package generated;\n\npublic class BenchGenerated {\n    public void generated() { }\n}\n")
+    return java_file
+
+
+def apply_changes(work_dir: str, java_files: list, count: int, rng: random.Random):
+    """コミット済み・未コミットの変更、追加、削除、リネームを加える"""
+    targets = rng.sample(java_files, count + 3)
+    committed, uncommitted = targets[:count // 2], targets[count // 2:count]
+    deleted, renamed, template = targets[count:]
+
+    for number, java_file in enumerate(committed):
+        add_method(java_file, f"benchCommitted{number}")
+    git(work_dir, 'rm', '-q', deleted)
+    git(work_dir, 'commit', '-qam', 'committed changes')
+
+    for number, java_file in enumerate(uncommitted):
+        add_method(java_file, f"benchUncommitted{number}")
+    renamed_path = Path(renamed)
+    git(work_dir, 'mv', renamed, str(renamed_path.with_name('Renamed' + renamed_path.name)))
+    added = Path(template).with_name('BenchAdded.java')
+    added.write_text(f"package {Path(template).parent.name};\n\npublic class BenchAdded {{\n"
+                     f"    public void added() {{ }}\n}}\n", encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="git による変更ファイル検出のベンチマーク")
+    parser.add_argument('--classes', type=int, default=5000, help='生成するクラス数（デフォルト: 5000）')
+    parser.add_argument('--changes', type=int, default=10, help='変更するファイル数（デフォルト: 10）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.environ['CLASS_INDEX_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+        source_dir = os.path.join(work_dir, 'repo')
+        generated = CodebaseGenerator(classes=args.classes, seed=args.seed).generate(source_dir)
+        ignored_file = write_ignored_source(source_dir, 'module00/src')
+        git(source_dir, 'init', '-q')
+        git(source_dir, '-c', 'user.name=bench', '-c', 'user.email=bench@example.com', 'add', '-A')
+        git(source_dir, '-c', 'user.name=bench', '-c', 'user.email=bench@example.com', 'commit', '-qm', 'initial')
+        os.environ.update(GIT_AUTHOR_NAME='bench', GIT_AUTHOR_EMAIL='bench@example.com',
+                          GIT_COMMITTER_NAME='bench', GIT_COMMITTER_EMAIL='bench@example.com')
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            source_paths, _ = load_settings_and_resolve_paths(generated['settings_file'])
+        settings_file = generated['settings_file']
+        elapsed, _, indexer, _ = build(source_paths, settings_file)
+        print(f"📁 {generated['files']:,}ファイル, 全件構築 {elapsed:.2f}秒")
+
+        # キャッシュ有効性の確認: stat 走査 と git への問い合わせ
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            indexer._is_cache_valid(source_paths)
+            stat_elapsed = time.perf_counter() - start
+        recorded_state = indexer._git_state
+        start = time.perf_counter()
+        changes = detect_changed_files(find_git_roots(source_paths), recorded_state)
+        git_elapsed = time.perf_counter() - start
+        assert changes is not None and not changes[0], "変更なしのはずが変更を検出しました"
+        print(f"⏱️  変更確認: stat 走査 {stat_elapsed * 1000:.1f}ms, git {git_elapsed * 1000:.1f}ms")
+
+        java_files = [java_file for source_path in source_paths for java_file in find_java_files(source_path)]
+        apply_changes(source_dir, [java_file for java_file in java_files if java_file != ignored_file],
+                      args.changes, random.Random(args.seed))
+        # git status に現れない無視されたファイルの変更も、記録した更新時刻・サイズとの比較で検出する
+        add_method(ignored_file, 'benchIgnored')
+
+        elapsed, refreshed, indexer, output = build(source_paths, settings_file)
+        assert '変更分を再解析します' in output, "差分更新されていません"
+        _, expected, full_indexer, _ = build(source_paths, settings_file, cache_enabled=False)
+        summary = next(line.strip() for line in output.splitlines() if '更新完了' in line)
+        print(f"⏱️  差分更新: {elapsed:.2f}秒 ({summary})")
+        assert snapshot(indexer, refreshed) == snapshot(full_indexer, expected), "差分更新の結果が全件構築と一致しません"
+
+        # 差分更新後のキャッシュは最新（未コミットのままのファイルも更新時刻・サイズが同じなら再解析しない）
+        elapsed, reloaded, indexer, output = build(source_paths, settings_file)
+        assert 'キャッシュが最新です' in output, "変更のない再実行で再解析されました"
+        assert snapshot(indexer, reloaded) == snapshot(full_indexer, expected), "再読み込みの結果が全件構築と一致しません"
+        print(f"⏱️  再実行: {elapsed:.2f}秒")
+        print("✅ 正当性確認: 差分更新の結果が全件構築と一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+呼び出しグラフ出力（graph_export）のベンチマーク
+
+乱数シードから決定的に生成したメソッド単位の呼び出しグラフを DOT / GraphML / CSR で出力し、
+形式ごとの出力時間・ファイルサイズ・出力中の追加メモリ（tracemalloc のピーク）を計測する。
+追加メモリがファイルサイズより十分小さいこと（出力全体を文字列として組み立てていないこと）と、
+各形式を読み戻したノード・辺が元のグラフと一致することも確認する。
+
+使用例:
+  python benchmarks/bench_graph_export.py
+  python benchmarks/bench_graph_export.py --nodes 500000 --degree 6
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ElementTree
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from graph_export import GRAPH_FORMATS, TracedGraph, export_graph  # noqa: E402
+
+_GRAPHML_NAMESPACE = '{http://graphml.graphdrawing.org/xmlns}'
+_DOT_EDGE = re.compile(r'^  "((?:[^"\\]|\\.)*)" -> "((?:[^"\\]|\\.)*)";$')
+
+
+def generate_graph(nodes: int, degree: int, seed: int) -> TracedGraph:
+    """起点クラスから深度順に呼び出しが続く合成グラフ（平均 degree 本の呼び出し、合流・循環を含む）"""
+    rng = random.Random(seed)
+    graph = TracedGraph()
+    graph.nodes['EntryController'] = {'class_name': 'EntryController', 'package_name': 'com.example.controller',
+                                      'depth': 0, 'kind': 'entry'}
+    for number in range(1, nodes):
+        class_name = f"Service{number // 8}"
+        graph.nodes[f"{class_name}.method{number % 8}"] = {
+            'class_name': class_name,
+            'package_name': f"com.example.service{number % 50}",
+            'file_path': f"/src/com/example/service{number % 50}/{class_name}.java",
+            'depth': 1 + number * 6 // nodes,
+            'kind': 'method',
+            'method_name': f"method{number % 8}",
+        }
+    node_ids = list(graph.nodes)
+    for number, caller_id in enumerate(node_ids):
+        for _ in range(rng.randint(0, degree * 2)):
+            # 大半は深い側へ、一部は浅い側（循環・合流）へ
+            callee = rng.randrange(number + 1, nodes) if number + 1 < nodes and rng.random() < 0.9 else rng.randrange(nodes)
+            graph.edges.setdefault(caller_id, {})[node_ids[callee]] = None
+    return graph
+
+
+def read_back(graph_format: str, path: str) -> tuple:
+    """出力ファイルを読み戻し、(ノードID一覧, 辺の集合) を返す"""
+    if graph_format == 'csr':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        node_ids = [node['id'] for node in data['nodes']]
+        offsets, targets = data['offsets'], data['targets']
+        edges = {(node_ids[i], node_ids[target])
+                 for i in range(len(node_ids)) for target in targets[offsets[i]:offsets[i + 1]]}
+        return node_ids, edges
+
+    if graph_format == 'graphml':
+        node_ids, edges = [], set()
+        for _, element in ElementTree.iterparse(path):
+            if element.tag == _GRAPHML_NAMESPACE + 'node':
+                node_ids.append(element.get('id'))
+            elif element.tag == _GRAPHML_NAMESPACE + 'edge':
+                edges.add((element.get('source'), element.get('target')))
+            element.clear()
+        return node_ids, edges
+
+    node_ids, edges = [], set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = _DOT_EDGE.match(line.rstrip('\n'))
+            if match:
+                edges.add(match.groups())
+            elif line.startswith('  "'):
+                node_ids.append(line[3:line.index('" [')])
+    return node_ids, edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description="呼び出しグラフ出力のベンチマーク")
+    parser.add_argument('--nodes', type=int, default=200000, help='ノード数（デフォルト: 200000）')
+    parser.add_argument('--degree', type=int, default=4, help='1ノードあたりの平均呼び出し数（デフォルト: 4）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    args = parser.parse_args()
+
+    graph = generate_graph(args.nodes, args.degree, args.seed)
+    expected_edges = {(caller_id, callee_id) for caller_id, callee_ids in graph.edges.items() for callee_id in callee_ids}
+    print(f"📊 {len(graph.nodes):,}ノード, {graph.edge_count:,}辺")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for graph_format, extensions in GRAPH_FORMATS.items():
+            path = os.path.join(work_dir, f"graph{extensions[0]}")
+            start = time.perf_counter()
+            export_graph(graph, path, graph_format)
+            elapsed = time.perf_counter() - start
+
+            # メモリは tracemalloc の負荷で時間が変わるため別に出力して計測
+            tracemalloc.start()
+            export_graph(graph, path, graph_format)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            size = os.path.getsize(path)
+            print(f"⏱️  {graph_format:8s} {elapsed:.2f}秒, {size / 2**20:.1f}MB, 出力中の追加メモリ {peak / 2**20:.1f}MB")
+            if graph_format != 'csr':
+                # CSR はノード番号の対応表（ノード数に比例）を持つため対象外
+                assert peak < size / 10, f"{graph_format}: 出力中のメモリがファイルサイズに比例しています"
+
+            node_ids, edges = read_back(graph_format, path)
+            assert node_ids == list(graph.nodes), f"{graph_format}: ノードが一致しません"
+            assert edges == expected_edges, f"{graph_format}: 辺が一致しません"
+
+    print("✅ 正当性確認: 全形式の読み戻し結果が元のグラフと一致")
+
+
+if __name__ == "__main__":
+    main()
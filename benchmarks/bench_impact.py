@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+変更影響解析（impact_analyzer）のベンチマーク
+
+合成コードベースで ORMapper の1メソッドを変更したときの影響解析（呼び出しグラフ構築・逆探索）の時間を計測し、
+自クラスの補助メソッド（method() / this.method()）を経由する呼び出し連鎖でも起点クラスに到達することを確認する。
+
+使用例:
+  python benchmarks/bench_impact.py
+  python benchmarks/bench_impact.py --classes 20000 --depth 4 --workers 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from class_indexer import MultiSourceClassIndexer  # noqa: E402
+from generate_codebase import CodebaseGenerator  # noqa: E402
+from impact_analyzer import ImpactAnalyzer  # noqa: E402
+from utils import load_settings_and_resolve_paths  # noqa: E402
+
+
+# 補助メソッド経由の呼び出し連鎖: OrderController.list → OrderService.listAll → load() / this.reload() → OrderEntityManager
+HELPER_CHAIN_SOURCES = {
+    'OrderController': """package com.example.controller;
+
+import com.example.service.OrderService;
+
+public class OrderController {
+    private OrderService orderService;
+
+    public void list() {
+        orderService.listAll();
+    }
+}
+""",
+    'OrderService': """package com.example.service;
+
+import com.example.manager.OrderEntityManager;
+
+public class OrderService {
+    private OrderEntityManager orderEntityManager;
+
+    public void listAll() {
+        load();
+        this.reload(1);
+    }
+
+    private void load() {
+        orderEntityManager.select();
+    }
+
+    private void reload(int id) {
+        this.orderEntityManager.find(id);
+    }
+}
+""",
+    'OrderEntityManager': """package com.example.manager;
+
+public class OrderEntityManager {
+    public void select() {
+        int count = 0;
+    }
+
+    public void find(int id) {
+        int found = id;
+    }
+}
+""",
+}
+
+
+def build_indexer(settings_file: str) -> MultiSourceClassIndexer:
+    """キャッシュを使わずにクラスインデックスを構築"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        source_paths, _ = load_settings_and_resolve_paths(settings_file)
+        indexer = MultiSourceClassIndexer(cache_enabled=False)
+        indexer.class_index = indexer.build_class_index(source_paths)
+    return indexer
+
+
+def analyze(indexer: MultiSourceClassIndexer, changes: dict, workers=None):
+    """影響解析を実行し、(所要時間, 解析結果) を返す"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = ImpactAnalyzer(indexer, workers=workers).analyze(changes)
+    return time.perf_counter() - start, result
+
+
+def write_helper_chain(work_dir: str) -> tuple:
+    """補助メソッド経由の呼び出し連鎖を書き出し、(settings.json のパス, OrderEntityManager.java のパス) を返す"""
+    layers = {'OrderController': 'controller', 'OrderService': 'service', 'OrderEntityManager': 'manager'}
+    for class_name, content in HELPER_CHAIN_SOURCES.items():
+        package_dir = os.path.join(work_dir, 'src', 'com', 'example', layers[class_name])
+        os.makedirs(package_dir, exist_ok=True)
+        with open(os.path.join(package_dir, f"{class_name}.java"), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    settings_file = os.path.join(work_dir, 'settings.json')
+    with open(settings_file, 'w', encoding='utf-8') as f:
+        f.write('{"java.project.sourcePaths": ["src"]}')
+    return settings_file, os.path.join(work_dir, 'src', 'com', 'example', 'manager', 'OrderEntityManager.java')
+
+
+def check_helper_chain(work_dir: str):
+    """method() / this.method() の補助メソッドを経由しても、変更した EntityManager のメソッドから起点クラスに到達すること"""
+    settings_file, manager_file = write_helper_chain(work_dir)
+    indexer = build_indexer(settings_file)
+    for line, helper in ((4, 'load'), (8, 'reload')):
+        _, result = analyze(indexer, {manager_file: [(line, line)]}, workers=1)
+        assert list(result.affected) == ['OrderController'], \
+            f"OrderService.{helper}() 経由の影響が検出されません: {list(result.affected)}"
+        path = next(iter(result.affected['OrderController'].values()))
+        assert any(f"#{helper}/" in step for step in path), f"経路に OrderService.{helper}() がありません: {path}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="変更影響解析のベンチマーク")
+    parser.add_argument('--classes', type=int, default=5000, help='生成するクラス数（デフォルト: 5000）')
+    parser.add_argument('--depth', type=int, default=3, help='Service層の数（デフォルト: 3）')
+    parser.add_argument('--fanout', type=int, default=3, help='1クラスあたりの呼び出し先クラス数（デフォルト: 3）')
+    parser.add_argument('--workers', type=int, default=None, help='呼び出しグラフ構築の並列プロセス数（デフォルト: CPU数）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        generated = CodebaseGenerator(classes=args.classes, depth=args.depth, fanout=args.fanout,
+                                      seed=args.seed).generate(os.path.join(work_dir, 'bench'))
+        indexer = build_indexer(generated['settings_file'])
+        ormapper_file = next(class_info.file_path for class_info in indexer.class_index.values()
+                             if class_info.class_name.endswith('ORMapper'))
+        ormapper_class = indexer.get_class_info(Path(ormapper_file).stem)
+        select_info = ormapper_class.find_method('select')
+
+        elapsed, result = analyze(indexer, {ormapper_file: [(select_info.start_line, select_info.start_line)]},
+                                  args.workers)
+        print(f"⏱️  {generated['files']:,}ファイル: {ormapper_class.class_name}.select の変更 → "
+              f"起点クラス {len(result.affected)}個, 到達メソッド {result.reached_methods}個, {elapsed:.2f}秒")
+        assert result.affected, "ORMapper の変更から起点クラスに到達しません"
+
+        check_helper_chain(os.path.join(work_dir, 'helper_chain'))
+
+    print("✅ 正当性確認: ORMapper の変更から起点クラスに到達、補助メソッド（method() / this.method()）経由の影響を検出")
+
+
+if __name__ == "__main__":
+    main()
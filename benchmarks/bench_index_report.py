@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+集計レポート（index_report）のベンチマーク
+
+乱数シードから決定的に生成したクラスインデックス相当のレコード（複数ソースパス、ソースパス間の同名クラス・import）と
+呼び出しグラフの辺から、1回の走査でパッケージ・ソースパス単位の集計を求める時間と処理件数あたりの時間を計測する。
+節ごとに全レコードを走査し直す素朴な参照実装と集計結果が一致することも確認する。
+
+使用例:
+  python benchmarks/bench_index_report.py
+  python benchmarks/bench_index_report.py --classes 500000 --sources 6
+"""
+
+import argparse
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from index_report import REPORT_SECTIONS, IndexReport, write_report_csv, write_report_json  # noqa: E402
+
+
+def generate_records(classes: int, sources: int, seed: int) -> list:
+    """classes 個のクラスのレコード（5% は別ソースパスに同じ完全クラス名の複製）"""
+    rng = random.Random(seed)
+    source_ids = [f"module{number:02d}:src" for number in range(sources)]
+    records = []
+    for number in range(classes):
+        package = f"com.bench.p{number % (classes // 20 + 1):05d}"
+        class_name = f"C{number:07d}" if rng.random() > 0.05 else f"C{rng.randrange(max(1, number)):07d}"
+        imports = [f"com.bench.p{target % (classes // 20 + 1):05d}.C{target:07d}"
+                   for target in (rng.randrange(classes) for _ in range(rng.randint(0, 6)))]
+        imports += ['java.util.List'] if rng.random() < 0.5 else []
+        records.append({
+            'class_name': class_name,
+            'full_class_name': f"{package}.{class_name}",
+            'source_path': source_ids[number * sources // classes],
+            'package_name': package,
+            'is_interface': rng.random() < 0.1,
+            'method_count': rng.randint(1, 12),
+            'imports': imports,
+        })
+    return records
+
+
+def generate_edges(records: list, edges: int, seed: int) -> list:
+    """呼び出しグラフの辺（ノードIDは 完全クラス名@ソース識別子#メソッド名/引数の数）"""
+    rng = random.Random(seed + 1)
+
+    def node(record):
+        return f"{record['full_class_name']}@{record['source_path']}#method{rng.randrange(8)}/{rng.randrange(3)}"
+
+    return [(node(rng.choice(records)), node(rng.choice(records))) for _ in range(edges)]
+
+
+def reference_sections(records: list, edges: list) -> dict:
+    """参照実装: 節ごとに全レコードを走査し直して集計"""
+    source_ids = list(dict.fromkeys(record['source_path'] for record in records))
+
+    sources = []
+    for source in source_ids:
+        selected = [record for record in records if record['source_path'] == source]
+        sources.append({'source_path': source,
+                        'packages': len({record['package_name'] for record in selected}),
+                        'classes': len(selected),
+                        'interfaces': sum(1 for record in selected if record['is_interface']),
+                        'methods': sum(record['method_count'] for record in selected)})
+
+    grouped = {}
+    for record in records:
+        grouped.setdefault((record['source_path'], record['package_name']), []).append(record)
+    packages = []
+    for source in source_ids:
+        for package in sorted(package for package_source, package in grouped if package_source == source):
+            selected = grouped[(source, package)]
+            packages.append({'source_path': source, 'package_name': package, 'classes': len(selected),
+                             'interfaces': sum(1 for record in selected if record['is_interface']),
+                             'methods': sum(record['method_count'] for record in selected)})
+
+    by_name = {}
+    for record in records:
+        by_name.setdefault(record['class_name'], []).append(record)
+    duplicates = []
+    for class_name in sorted(by_name):
+        defined = by_name[class_name]
+        source_paths = list(dict.fromkeys(record['source_path'] for record in defined))
+        if len(source_paths) > 1:
+            duplicates.append({'class_name': class_name, 'source_count': len(source_paths), 'class_count': len(defined),
+                               'source_paths': source_paths,
+                               'full_class_names': list(dict.fromkeys(record['full_class_name'] for record in defined))})
+
+    defined_in = {}
+    for record in records:
+        defined_in.setdefault(record['full_class_name'], []).append(record['source_path'])
+    counts = {}
+    for record in records:
+        for import_name in record['imports']:
+            defined = defined_in.get(import_name)
+            if defined:
+                target = record['source_path'] if record['source_path'] in defined else defined[0]
+                if target != record['source_path']:
+                    counts.setdefault((record['source_path'], target), [0, 0])[0] += 1
+    for caller, callee in edges:
+        caller_source = caller.split('@')[1].split('#')[0]
+        callee_source = callee.split('@')[1].split('#')[0]
+        if caller_source != callee_source:
+            counts.setdefault((caller_source, callee_source), [0, 0])[1] += 1
+    dependencies = [{'from_source': source, 'to_source': target, 'imports': totals[0], 'calls': totals[1]}
+                    for (source, target), totals in sorted(
+                        counts.items(), key=lambda item: (source_ids.index(item[0][0]), source_ids.index(item[0][1])))]
+
+    return {'sources': sources, 'packages': packages, 'duplicates': duplicates, 'dependencies': dependencies}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="集計レポートのベンチマーク")
+    parser.add_argument('--classes', type=int, default=200000, help='クラス数（デフォルト: 200000）')
+    parser.add_argument('--sources', type=int, default=4, help='ソースパス数（デフォルト: 4）')
+    parser.add_argument('--edges', type=int, default=500000, help='呼び出しグラフの辺の数（デフォルト: 500000）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    args = parser.parse_args()
+
+    records = generate_records(args.classes, args.sources, args.seed)
+    edges = generate_edges(records, args.edges, args.seed)
+    imports = sum(len(record['imports']) for record in records)
+    print(f"📊 {len(records):,}クラス, {imports:,}import, {len(edges):,}辺, ソースパス {args.sources}個")
+
+    start = time.perf_counter()
+    report = IndexReport()
+    for record in records:
+        report.add_class(record)
+    for caller, callee in edges:
+        report.add_call_edge(caller, callee)
+    sections = report.sections()
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  集計 {elapsed:.2f}秒 ({elapsed / (len(records) + len(edges)) * 1e6:.2f}µs/件)")
+
+    start = time.perf_counter()
+    write_report_json(report, io.StringIO())
+    for section in REPORT_SECTIONS:
+        write_report_csv(sections[section], io.StringIO(), section)
+    print(f"⏱️  JSON・CSV出力 {time.perf_counter() - start:.2f}秒")
+    print("   " + ", ".join(f"{section} {len(sections[section]):,}行" for section in REPORT_SECTIONS))
+
+    start = time.perf_counter()
+    expected = reference_sections(records, edges)
+    print(f"⏱️  参照実装（節ごとに再走査） {time.perf_counter() - start:.2f}秒")
+    for section in REPORT_SECTIONS:
+        assert sections[section] == expected[section], f"{section}: 集計結果が参照実装と一致しません"
+
+    print("✅ 正当性確認: 全節の集計結果が参照実装と一致")
+
+
+if __name__ == "__main__":
+    main()
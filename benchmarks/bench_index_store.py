@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+クラスインデックスの保存形式（JSON キャッシュ / SQLite ストア）のベンチマーク
+
+合成コードベースのインデックスを両方の形式で構築した後、
+- 起点Controllerからの再帰探索を複数プロセスで同時に実行し、1プロセスあたりの経過時間・最大RSSを比較する
+  （SQLite ストアは読み取り専用で共有され、各プロセスは参照したクラスだけを読み込む）
+- 探索結果が両形式で一致すること、クラス名の点検索の結果が一致することを確認する
+
+使用例:
+  python benchmarks/bench_index_store.py
+  python benchmarks/bench_index_store.py --classes 20000 --processes 8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from class_indexer import MultiSourceClassIndexer  # noqa: E402
+from generate_codebase import CodebaseGenerator  # noqa: E402
+from utils import load_settings_and_resolve_paths  # noqa: E402
+
+MAIN_SCRIPT = str(Path(__file__).resolve().parent.parent / 'main.py')
+
+STORE_KINDS = ('json', 'sqlite')
+
+
+def build(store_kind: str, source_paths: list, settings_file: str) -> tuple:
+    """指定形式でインデックスを構築（キャッシュに保存）し、(所要時間, インデクサ) を返す"""
+    os.environ['CLASS_INDEX_STORE'] = store_kind
+    indexer = MultiSourceClassIndexer()
+    indexer.set_settings_file(settings_file)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        indexer.class_index = indexer.build_class_index(source_paths)
+    return time.perf_counter() - start, indexer
+
+
+def run_traces(store_kind: str, generated: dict, processes: int, work_dir: str) -> list:
+    """起点ファイルの再帰探索を processes 個同時に実行し、[(経過時間, 最大RSS, 出力)] を返す"""
+    env = dict(os.environ, CLASS_INDEX_STORE=store_kind, PYTHONHASHSEED='0', PYTHONIOENCODING='utf-8')
+    running = []
+    for number in range(processes):
+        stats_file = os.path.join(work_dir, f"{store_kind}_{number}.json")
+        command = [sys.executable, MAIN_SCRIPT, generated['entry_file'], '--settings', generated['settings_file'],
+                   '--max-depth', str(generated['config']['depth'] + 4), '--stats-json', stats_file]
+        running.append((subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env),
+                        stats_file))
+
+    results = []
+    for process, stats_file in running:
+        output = process.communicate()[0].decode('utf-8', errors='replace')
+        if process.returncode != 0:
+            raise RuntimeError(f"探索プロセスが失敗しました ({store_kind})\n{output[-2000:]}")
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+        results.append((stats['total']['wall_seconds'], stats['peak_rss_bytes'], output))
+    return results
+
+
+def trace_result(output: str) -> list:
+    """比較用の探索結果（時刻・所要時間・キャッシュ関連の行を除く）"""
+    skipped = ('キャッシュ', '作成日時', '秒', 'ストア', '💾', '計測結果を出力')
+    return [line for line in output.splitlines() if not any(word in line for word in skipped)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="クラスインデックスの保存形式のベンチマーク")
+    parser.add_argument('--classes', type=int, default=10000, help='生成するクラス数（デフォルト: 10000）')
+    parser.add_argument('--processes', type=int, default=4, help='同時に実行する探索プロセス数（デフォルト: 4）')
+    parser.add_argument('--lookups', type=int, default=2000, help='点検索の回数（デフォルト: 2000）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.environ['CLASS_INDEX_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+        generated = CodebaseGenerator(classes=args.classes, seed=args.seed).generate(os.path.join(work_dir, 'src'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            source_paths, _ = load_settings_and_resolve_paths(generated['settings_file'])
+        print(f"📁 {generated['files']:,}ファイル")
+
+        indexers = {}
+        for store_kind in STORE_KINDS:
+            elapsed, indexers[store_kind] = build(store_kind, source_paths, generated['settings_file'])
+            cache_size = os.path.getsize(indexers[store_kind].cache_file) / 2**20
+            print(f"⏱️  {store_kind:6s} 全件構築 {elapsed:.2f}秒 (キャッシュ {cache_size:.1f}MB)")
+
+        # 点検索: 同じキーで同じクラス情報が得られること
+        keys = random.Random(args.seed).sample([key for key in indexers['json'].class_index.keys()], args.lookups)
+        results = {}
+        for store_kind in STORE_KINDS:
+            indexer = indexers[store_kind]
+            start = time.perf_counter()
+            found = [indexer.get_class_info(key) for key in keys]
+            elapsed = time.perf_counter() - start
+            results[store_kind] = [indexer._serialize_class_info(class_info) for class_info in found]
+            print(f"⏱️  {store_kind:6s} 点検索 {args.lookups}回 {elapsed * 1000:.1f}ms")
+        assert results['json'] == results['sqlite'], "点検索の結果が一致しません"
+
+        # 同時に実行した探索プロセスの経過時間・最大RSS
+        outputs = {}
+        for store_kind in STORE_KINDS:
+            traces = run_traces(store_kind, generated, args.processes, work_dir)
+            outputs[store_kind] = [trace_result(output) for _, _, output in traces]
+            wall = max(result[0] for result in traces)
+            rss = max(result[1] for result in traces) / 2**20
+            print(f"⏱️  {store_kind:6s} 探索 {args.processes}プロセス同時: 最大経過 {wall:.2f}秒, 最大RSS {rss:.1f}MB/プロセス")
+
+        assert all(output == outputs['json'][0] for kind in STORE_KINDS for output in outputs[kind]), \
+            "探索結果が保存形式・プロセス間で一致しません"
+        print("✅ 正当性確認: 点検索・探索結果が JSON キャッシュと一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JARライブラリ索引（jar_indexer）のベンチマーク
+
+手組みの class ファイル（定数プール・インターフェース表・メソッドテーブルのみ）を詰めたJARを作成し、
+- class ファイルから親クラス・親インターフェース・公開メソッドを読み取れること
+- 親インターフェースから継承したメソッド（Spring Data の save 等）を has_method で見つけられること
+を確認した上で、JARの索引化とメソッド存在確認にかかる時間を計測する。
+
+使用例:
+  python benchmarks/bench_jar_indexer.py
+  python benchmarks/bench_jar_indexer.py --classes 50000
+"""
+
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from jar_indexer import ACC_INTERFACE, ACC_PUBLIC, ACC_VARARGS, LibraryIndex, index_jar, parse_class_file  # noqa: E402
+
+
+ACC_ABSTRACT = 0x0400
+
+
+def assemble_class(name: str, super_name: str = 'java/lang/Object', interfaces=(), methods=(),
+                   is_interface: bool = False) -> bytes:
+    """
+    class ファイルを手組みする（フィールド・属性なし）
+
+    methods: [(メソッド名, ディスクリプタ, アクセスフラグ), ...]
+    """
+    constants = []  # 定数プールのエントリ（バイト列、インデックスは1始まり）
+    utf8_indexes = {}
+
+    def utf8(text: str) -> int:
+        if text not in utf8_indexes:
+            encoded = text.encode('utf-8')
+            constants.append(struct.pack('>BH', 1, len(encoded)) + encoded)
+            utf8_indexes[text] = len(constants)
+        return utf8_indexes[text]
+
+    def class_ref(internal_name: str) -> int:
+        name_index = utf8(internal_name)
+        constants.append(struct.pack('>BH', 7, name_index))
+        return len(constants)
+
+    this_class = class_ref(name)
+    super_class = class_ref(super_name)
+    interface_indexes = [class_ref(interface) for interface in interfaces]
+    method_entries = [(flags, utf8(method_name), utf8(descriptor)) for method_name, descriptor, flags in methods]
+
+    access_flags = ACC_PUBLIC | (ACC_INTERFACE | ACC_ABSTRACT if is_interface else 0)
+    data = bytearray(b'\xca\xfe\xba\xbe' + struct.pack('>HHH', 0, 52, len(constants) + 1))
+    for constant in constants:
+        data += constant
+    data += struct.pack('>HHHH', access_flags, this_class, super_class, len(interface_indexes))
+    data += struct.pack(f'>{len(interface_indexes)}H', *interface_indexes)
+    data += struct.pack('>H', 0)  # fields_count
+    data += struct.pack('>H', len(method_entries))
+    for flags, name_index, descriptor_index in method_entries:
+        data += struct.pack('>HHHH', flags, name_index, descriptor_index, 0)
+    data += struct.pack('>H', 0)  # attributes_count
+    return bytes(data)
+
+
+PUBLIC_ABSTRACT = ACC_PUBLIC | ACC_ABSTRACT
+
+# Spring Data 風のリポジトリ階層（UserRepository → JpaRepository → CrudRepository / QueryByExampleExecutor）
+REPOSITORY_CLASSES = {
+    'org/springframework/data/repository/Repository': dict(is_interface=True),
+    'org/springframework/data/repository/CrudRepository': dict(
+        is_interface=True, interfaces=['org/springframework/data/repository/Repository'],
+        methods=[('save', '(Ljava/lang/Object;)Ljava/lang/Object;', PUBLIC_ABSTRACT),
+                 ('findById', '(Ljava/lang/Object;)Ljava/util/Optional;', PUBLIC_ABSTRACT),
+                 ('deleteAll', '()V', PUBLIC_ABSTRACT)]),
+    'org/springframework/data/repository/query/QueryByExampleExecutor': dict(
+        is_interface=True,
+        methods=[('findAll', '(Lorg/springframework/data/domain/Example;)Ljava/lang/Iterable;', PUBLIC_ABSTRACT)]),
+    'org/springframework/data/jpa/repository/JpaRepository': dict(
+        is_interface=True,
+        interfaces=['org/springframework/data/repository/CrudRepository',
+                    'org/springframework/data/repository/query/QueryByExampleExecutor'],
+        methods=[('flush', '()V', PUBLIC_ABSTRACT),
+                 ('saveAllAndFlush', '([Ljava/lang/Object;)Ljava/util/List;', PUBLIC_ABSTRACT | ACC_VARARGS)]),
+    'com/example/repository/UserRepository': dict(
+        is_interface=True, interfaces=['org/springframework/data/jpa/repository/JpaRepository']),
+    # 実装クラス: 親クラスのメソッドと、親クラスが実装するインターフェースのメソッド
+    'com/example/support/BaseRepository': dict(
+        interfaces=['com/example/repository/UserRepository'],
+        methods=[('<init>', '()V', ACC_PUBLIC)]),
+    'com/example/support/UserRepositoryImpl': dict(
+        super_name='com/example/support/BaseRepository',
+        methods=[('<init>', '()V', ACC_PUBLIC), ('findByName', '(Ljava/lang/String;)Ljava/util/List;', ACC_PUBLIC)]),
+    # 互いに継承するインターフェース（不正な階層でも停止すること）
+    'com/example/cycle/A': dict(is_interface=True, interfaces=['com/example/cycle/B']),
+    'com/example/cycle/B': dict(is_interface=True, interfaces=['com/example/cycle/A']),
+}
+
+
+def write_jar(jar_path: str, filler_classes: int):
+    """リポジトリ階層と、索引化時間の計測用のクラスを詰めたJARを作成"""
+    with zipfile.ZipFile(jar_path, 'w', zipfile.ZIP_DEFLATED) as jar:
+        for name, spec in REPOSITORY_CLASSES.items():
+            jar.writestr(f"{name}.class", assemble_class(name, **spec))
+        for number in range(filler_classes):
+            name = f"com/example/generated/Generated{number}"
+            interfaces = [f"com/example/generated/Api{number % 50}"] if number >= 50 else []
+            methods = [(f"method{i}", '(ILjava/lang/String;)V', ACC_PUBLIC) for i in range(10)]
+            jar.writestr(f"{name}.class", assemble_class(name, interfaces=interfaces, methods=methods,
+                                                         is_interface=number < 50))
+
+
+def check_correctness(library_index: LibraryIndex):
+    """親クラス・親インターフェースを辿ったメソッドの存在確認"""
+    summary = parse_class_file(assemble_class(
+        'org/springframework/data/jpa/repository/JpaRepository',
+        **REPOSITORY_CLASSES['org/springframework/data/jpa/repository/JpaRepository']))
+    assert summary['super'] == 'java.lang.Object', summary
+    assert summary['interfaces'] == ['org.springframework.data.repository.CrudRepository',
+                                     'org.springframework.data.repository.query.QueryByExampleExecutor'], summary
+    assert summary['is_interface'] and summary['methods'] == {'flush': [0], 'saveAllAndFlush': [1]}, summary
+
+    cases = [
+        ('com.example.repository.UserRepository', 'save', 1, True),        # 2段上の親インターフェース
+        ('com.example.repository.UserRepository', 'findAll', 1, True),     # 2つ目の親インターフェース
+        ('com.example.repository.UserRepository', 'flush', 0, True),
+        ('com.example.repository.UserRepository', 'save', None, True),
+        ('com.example.repository.UserRepository', 'saveAllAndFlush', 3, True),  # 可変長引数
+        ('com.example.repository.UserRepository', 'save', 2, False),
+        ('com.example.repository.UserRepository', 'delete', None, False),
+        ('com.example.support.UserRepositoryImpl', 'findById', 1, True),   # 親クラスが実装するインターフェース
+        ('com.example.support.UserRepositoryImpl', 'findByName', 1, True),
+        ('com.example.support.UserRepositoryImpl', 'constructor', 0, True),
+        ('com.example.cycle.A', 'save', 1, False),                         # 循環しても停止する
+    ]
+    for full_class_name, method_name, arg_count, expected in cases:
+        actual = library_index.has_method(full_class_name, method_name, arg_count)
+        assert actual == expected, f"{full_class_name}.{method_name}/{arg_count}: expected {expected}, got {actual}"
+    return len(cases)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JARライブラリ索引のベンチマーク")
+    parser.add_argument('--classes', type=int, default=20000, help='JARに詰める計測用クラス数（デフォルト: 2万）')
+    parser.add_argument('--lookups', type=int, default=200_000, help='メソッド存在確認の回数（デフォルト: 20万）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        jar_path = os.path.join(temp_dir, 'library.jar')
+        write_jar(jar_path, args.classes)
+
+        start = time.perf_counter()
+        jar_classes = index_jar(jar_path)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  索引化: {len(jar_classes):,}クラス {elapsed:.2f}秒 ({elapsed / len(jar_classes) * 1e6:.1f}µs/クラス)")
+
+        library_index = LibraryIndex()
+        library_index.add_jar(jar_path, jar_classes)
+        case_count = check_correctness(library_index)
+
+        start = time.perf_counter()
+        for i in range(args.lookups):
+            library_index.has_method(f"com.example.generated.Generated{50 + i % 50}", 'method3', 2)
+            library_index.has_method('com.example.repository.UserRepository', 'save', 1)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  メソッド存在確認: {args.lookups * 2:,}回 {elapsed:.2f}秒 ({elapsed / (args.lookups * 2) * 1e6:.2f}µs/回)")
+
+    print(f"✅ 正当性確認: class ファイルの親インターフェースを読み取り、親クラス・親インターフェース経由のメソッド {case_count}件の判定が一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+smart_method_finder のメソッド定義検索マイクロベンチマーク
+
+多数のクラス（一部は別ソースパスに同じ完全クラス名で重複、一部のメソッドはオーバーロードあり）を持つ
+クラスインデックスに対し、多数のimportを持つ起点クラス（201メソッドのControllerを想定）から
+全メソッド名の定義を検索する時間を計測する。比較用に素朴な実装（メソッド名ごとに全importを get_class_info で走査）も
+同じ入力で計測し、候補（クラス・ソースパス・オーバーロード・順序）が一致することを確認する。
+
+使用例:
+  python benchmarks/bench_method_finder.py
+  python benchmarks/bench_method_finder.py --classes 20000 --imports 300 --methods 201
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from class_indexer import MultiSourceClassIndexer  # noqa: E402
+from models import ClassInfo, MethodInfo  # noqa: E402
+from smart_method_finder import find_method_definition_with_imports, resolve_imported_classes  # noqa: E402
+
+
+def legacy_find_method_definition(method_name: str, imports: list, class_indexer, source_path: str) -> list:
+    """素朴な実装（比較用）: import文ごとに get_class_info で解決してメソッドのオーバーロードを列挙"""
+    candidates = []
+    for import_statement in imports:
+        if import_statement.startswith('java.'):
+            continue
+        class_info = class_indexer.get_class_info(import_statement, source_path)
+        if not class_info:
+            continue
+        for method_info in class_info.overloads.get(method_name, ()):
+            candidates.append({
+                'method_name': method_name,
+                'class_name': import_statement.split('.')[-1],
+                'full_class_name': class_info.full_class_name,
+                'source_path': class_info.source_path,
+                'file_path': class_info.file_path,
+                'return_type': method_info.return_type,
+                'parameters': method_info.parameters,
+                'method_info': method_info,
+                'confidence': 'HIGH'
+            })
+    return candidates
+
+
+SOURCES = ('bench:src', 'bench_common:src')
+
+
+def build_indexer(class_count: int, methods_per_class: int, vocabulary: list, rng: random.Random) -> MultiSourceClassIndexer:
+    """
+    メソッド名を共通の語彙から選んだクラスでインデックスを構築
+    1割のクラスは2つ目のソースパスにも同じ完全クラス名で定義し、1割のメソッドは引数の数違いのオーバーロードを持つ
+    """
+    indexer = MultiSourceClassIndexer(cache_enabled=False)
+    indexer.source_resolution_order = {source: (source,) + tuple(other for other in SOURCES if other != source)
+                                       for source in SOURCES}
+    all_classes = {}
+    for number in range(class_count):
+        class_name = f"Class{number}"
+        package = f"com.bench.p{number % 100}"
+        for source_path in SOURCES if number % 10 == 0 else SOURCES[:1]:
+            file_path = f"/{source_path}/{class_name}.java"
+            overloads = {}
+            for method_name in rng.sample(vocabulary, methods_per_class):
+                overloads[method_name] = [
+                    MethodInfo(file_path=file_path, class_name=class_name, method_name=method_name,
+                               return_type='void', parameters=['Long'] * arity, source_path=source_path)
+                    for arity in ((1, 2) if rng.random() < 0.1 else (1,))]
+            indexer._register_class_info(all_classes, ClassInfo(
+                class_name=class_name, full_class_name=f"{package}.{class_name}", file_path=file_path,
+                source_path=source_path, package_name=package,
+                methods={name: methods[0] for name, methods in overloads.items()}, overloads=overloads, imports=[]))
+    indexer.class_index = all_classes
+    return indexer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="メソッド定義検索マイクロベンチマーク")
+    parser.add_argument('--classes', type=int, default=10_000, help='インデックスのクラス数（デフォルト: 10000）')
+    parser.add_argument('--imports', type=int, default=200, help='起点クラスのimport数（デフォルト: 200）')
+    parser.add_argument('--methods', type=int, default=201, help='検索するメソッド名の数（デフォルト: 201）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = [f"method{i}" for i in range(2_000)]
+    indexer = build_indexer(args.classes, 20, vocabulary, rng)
+    imports = [f"com.bench.p{number % 100}.Class{number}" for number in rng.sample(range(args.classes), args.imports)]
+    imports += ['java.util.List', 'java.util.Map']
+    method_names = rng.sample(vocabulary, args.methods)
+
+    start = time.perf_counter()
+    indexer.get_method_name_index()
+    print(f"⏱️  メソッド名の逆引きインデックス構築: {(time.perf_counter() - start) * 1000:.2f}ms")
+
+    # 起点クラスは2つ目のソースパスにある（重複クラスはこちらの定義が優先される）
+    source_path = SOURCES[1]
+    start = time.perf_counter()
+    imported_classes = resolve_imported_classes(imports, indexer, source_path)
+    results = {name: find_method_definition_with_imports(name, imports, indexer, imported_classes, source_path)
+               for name in method_names}
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  逆引き: {args.methods}メソッド × {len(imports)}import {elapsed * 1000:.2f}ms ({args.classes:,}クラス)")
+
+    start = time.perf_counter()
+    legacy_results = {name: legacy_find_method_definition(name, imports, indexer, source_path) for name in method_names}
+    legacy_elapsed = time.perf_counter() - start
+    print(f"⏱️  素朴な実装: {args.methods}メソッド × {len(imports)}import {legacy_elapsed * 1000:.2f}ms")
+
+    assert results == legacy_results, "検索結果が一致しません"
+    found = sum(1 for candidates in results.values() if candidates)
+    overloaded = sum(1 for candidates in results.values() for candidate in candidates if len(candidate['parameters']) == 2)
+    preferred = sum(1 for candidates in results.values() for candidate in candidates if candidate['source_path'] == source_path)
+    print(f"✅ 正当性確認: 候補が素朴な実装と一致（定義発見 {found}/{args.methods}メソッド、"
+          f"オーバーロード候補 {overloaded}件、起点と同じソースパスの候補 {preferred}件）")
+    print(f"🚀 高速化: {legacy_elapsed / elapsed:.1f}倍")
+
+
+if __name__ == "__main__":
+    main()
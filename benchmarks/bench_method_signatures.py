@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+メソッドシグネチャ抽出・オーバーロード選択のベンチマーク
+
+オーバーロード・可変長引数・Map<K, List<V>> 型の引数を含むクラスで
+- parse_parameter_types が総称型の中のカンマで引数を分けず、可変長引数・配列を型に残すこと
+- extract_method_signatures がオーバーロードを宣言順に、引数型・行範囲つきで抽出すること
+- count_call_arguments が入れ子の呼び出し・型引数・文字列・文字リテラル・ラムダ・コメント中のカンマを数えず、
+  比較演算子の < > は型引数と区別すること
+- ClassInfo.find_overloads / find_method が引数の個数で候補を選ぶこと
+  （完全一致を優先し、なければ可変長引数のオーバーロード、個数の指定なしは全オーバーロード）
+を確認した上で、オーバーロードの多い大きなクラスの解析とメソッド選択にかかる時間を計測する。
+
+使用例:
+  python benchmarks/bench_method_signatures.py
+  python benchmarks/bench_method_signatures.py --methods 20000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from class_indexer import MultiSourceClassIndexer  # noqa: E402
+from utils import count_call_arguments, extract_method_signatures, parse_parameter_types  # noqa: E402
+
+OVERLOAD_SOURCE = """package com.example.service;
+
+import java.util.List;
+import java.util.Map;
+
+public class OverloadService {
+    public UserEntity find(Long id) {
+        return repository.find(id);
+    }
+
+    public List<UserEntity> find(String name, int limit) {
+        return repository.search(name, limit);
+    }
+
+    public List<UserEntity> find(Map<String, List<Long>> idsByGroup) {
+        return repository.findAll(idsByGroup.values());
+    }
+
+    public void log(String format, Object... args) {
+        System.out.println(String.format(format, args));
+    }
+
+    public void log(String message) {
+        System.out.println(message);
+    }
+
+    public int save(UserEntity entity) {
+        return save(new UserEntity[]{entity});
+    }
+
+    public int save(UserEntity... entities) {
+        return entities.length;
+    }
+
+    public void merge(final Map<String, List<Long>> idsByGroup, @Deprecated String... names) {
+        log("merge: %s, %s", idsByGroup, names);
+    }
+
+    public void fill(int[][] grid, String labels[]) {
+        find(grid.length);
+    }
+}
+"""
+
+# (メソッド名, 引数型, 開始行, 終了行)
+EXPECTED_SIGNATURES = [
+    ('find', ['Long'], 7, 9),
+    ('find', ['String', 'int'], 11, 13),
+    ('find', ['Map<String,List<Long>>'], 15, 17),
+    ('log', ['String', 'Object...'], 19, 21),
+    ('log', ['String'], 23, 25),
+    ('save', ['UserEntity'], 27, 29),
+    ('save', ['UserEntity...'], 31, 33),
+    ('merge', ['Map<String,List<Long>>', 'String...'], 35, 37),
+    ('fill', ['int[][]', 'String[]'], 39, 41),
+]
+
+# (引数リストの文字列, 期待する引数型)
+PARAMETER_CASES = [
+    ('', []),
+    ('Map<K, List<V>> m', ['Map<K,List<V>>']),
+    ('final Map<String, List<Long>> ids, String... names', ['Map<String,List<Long>>', 'String...']),
+    ('@Deprecated String... names', ['String...']),
+    ('@RequestParam(value = "id") Long id', ['Long']),
+    ('int[][] grid, String labels[]', ['int[][]', 'String[]']),
+]
+
+# (呼び出し式, 期待する引数の個数)
+CALL_CASES = [
+    ('find()', 0),
+    ('find(a)', 1),
+    ('find(a, b)', 2),
+    ('find(map.get(a, b), List.of(c, d, e))', 2),
+    ('log(String.format("%s, %s", a, b), x)', 2),
+    ("sep(',', map.get(\"a,b\"))", 2),
+    ('run(new int[]{1, 2}, (x, y) -> f(x, y))', 2),
+    ('put(new HashMap<String, List<Long>>(), key)', 2),
+    ('put(Collections.<String, Long>emptyMap(), key)', 2),
+    ('put((Map<String, Long>) value, key)', 2),
+    ('check(a < b, c > d)', 2),                          # 比較演算子は型引数ではない
+    ('check(i < MAX, j > MIN, k)', 3),
+    ('call(a /* , b */, c) // , d', 2),
+    ('q("""\n a, b\n """, 1)', 2),
+    ('x(unbalanced', None),
+]
+
+# (メソッド名, 引数の個数, 期待する候補の引数型の一覧) — find_method は先頭の候補
+OVERLOAD_CASES = [
+    ('find', 1, [['Long'], ['Map<String,List<Long>>']]),  # 同じ個数は宣言順
+    ('find', 2, [['String', 'int']]),
+    ('find', 0, []),
+    ('find', None, [['Long'], ['String', 'int'], ['Map<String,List<Long>>']]),
+    ('log', 1, [['String']]),                               # 完全一致を優先
+    ('log', 2, [['String', 'Object...']]),
+    ('log', 5, [['String', 'Object...']]),                  # 可変長引数に複数の値
+    ('log', 0, []),                                         # 可変長引数の前の引数が足りない
+    ('save', 1, [['UserEntity'], ['UserEntity...']]),
+    ('save', 0, [['UserEntity...']]),                       # 可変長引数に値なし
+    ('save', 3, [['UserEntity...']]),
+    ('merge', 1, [['Map<String,List<Long>>', 'String...']]),
+    ('merge', 4, [['Map<String,List<Long>>', 'String...']]),
+    ('fill', 2, [['int[][]', 'String[]']]),
+    ('fill', 3, []),                                        # 配列は可変長引数ではない
+    ('missing', 1, []),
+]
+
+
+def check_correctness() -> int:
+    """引数型の解析・シグネチャ抽出・引数の個数・オーバーロード選択を確認し、確認した件数を返す"""
+    for text, expected in PARAMETER_CASES:
+        actual = parse_parameter_types(text)
+        assert actual == expected, f"引数型の解析が一致しません: {text!r}: expected {expected}, got {actual}"
+
+    signatures = [(sig['method_name'], sig['parameters'], sig['start_line'], sig['end_line'])
+                  for sig in extract_method_signatures(OVERLOAD_SOURCE)]
+    assert signatures == EXPECTED_SIGNATURES, f"シグネチャの抽出結果が一致しません: {signatures}"
+
+    for call, expected in CALL_CASES:
+        actual = count_call_arguments(call, call.index('('))
+        assert actual == expected, f"引数の個数が一致しません: {call!r}: expected {expected}, got {actual}"
+
+    class_info = MultiSourceClassIndexer(cache_enabled=False)._parse_class_info(
+        OVERLOAD_SOURCE, '/app/src/com/example/service/OverloadService.java', 'app/src')
+    assert [method.parameters for method in class_info.overloads['find']] == [['Long'], ['String', 'int'],
+                                                                            ['Map<String,List<Long>>']]
+    for method_name, arg_count, expected in OVERLOAD_CASES:
+        actual = [method.parameters for method in class_info.find_overloads(method_name, arg_count)]
+        assert actual == expected, f"{method_name}/{arg_count}: expected {expected}, got {actual}"
+        picked = class_info.find_method(method_name, arg_count)
+        assert (picked.parameters if picked else None) == (expected[0] if expected else None), \
+            f"{method_name}/{arg_count}: find_method の選択が一致しません"
+
+    return len(PARAMETER_CASES) + len(EXPECTED_SIGNATURES) + len(CALL_CASES) + len(OVERLOAD_CASES)
+
+
+def generate_large_class(methods: int) -> str:
+    """methods 個のメソッド（1名前あたり 0〜3引数と可変長引数の5オーバーロード）を持つクラス"""
+    lines = ['package com.example.generated;', '', 'public class LargeService {']
+    for number in range(methods):
+        name = f"method{number // 5}"
+        arity = number % 5
+        if arity == 4:
+            parameters = 'String prefix, Map<String, List<Long>>... groups'
+        else:
+            parameters = ', '.join(f"Map<String, List<Long>> p{i}" for i in range(arity))
+        lines += [f"    public int {name}({parameters}) {{",
+                  f"        return helper({', '.join(['a'] * arity)});",
+                  '    }', '']
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="メソッドシグネチャ抽出・オーバーロード選択のベンチマーク")
+    parser.add_argument('--methods', type=int, default=5000, help='計測用クラスのメソッド数（デフォルト: 5000）')
+    parser.add_argument('--lookups', type=int, default=200_000, help='メソッド選択の回数（デフォルト: 20万）')
+    args = parser.parse_args()
+
+    case_count = check_correctness()
+
+    content = generate_large_class(args.methods)
+    start = time.perf_counter()
+    class_info = MultiSourceClassIndexer(cache_enabled=False)._parse_class_info(
+        content, '/app/src/com/example/generated/LargeService.java', 'app/src')
+    elapsed = time.perf_counter() - start
+    parsed = sum(len(overloads) for overloads in class_info.overloads.values())
+    assert parsed == args.methods, f"抽出したメソッド数が一致しません: {parsed}"
+    print(f"⏱️  解析: {args.methods:,}メソッド {elapsed:.2f}秒 ({elapsed / args.methods * 1e6:.1f}µs/メソッド)")
+
+    names = len(class_info.overloads)
+    start = time.perf_counter()
+    picks = [class_info.find_method(f"method{i % names}", i % 7) for i in range(args.lookups)]
+    elapsed = time.perf_counter() - start
+    # 0〜3引数は同じ個数のオーバーロード、4引数以上は可変長引数のオーバーロード
+    for i, method in enumerate(picks):
+        assert method is not None and method.is_varargs == (i % 7 > 3) and (method.is_varargs or method.arity == i % 7), \
+            f"method{i % names}/{i % 7}: オーバーロードの選択が一致しません"
+    print(f"⏱️  メソッド選択: {args.lookups:,}回 {elapsed:.2f}秒 ({elapsed / args.lookups * 1e6:.2f}µs/回)")
+
+    print(f"✅ 正当性確認: 引数型の解析・シグネチャ抽出・引数の個数・オーバーロード選択 {case_count}件が一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+クラス名・メソッド名検索（name_search）のベンチマーク
+
+乱数シードから決定的に生成したクラスインデックス相当のレコード（ドメイン語を組み合わせたクラス名・パッケージ、
+共通のメソッド名を多く含むメソッド）から検索インデックスを構築し、
+- 構築時間
+- 前方一致・部分一致・タイプミス・完全クラス名・短い文字列のクエリごとの検索時間（中央値・最大）
+を計測する。全件を走査する参照実装と検索結果（順位を含む）が一致すること、
+クエリが 10ms 未満で終わることも確認する（検索時間はクエリごとに --repeat 回の最小値とし、
+スケジューリングやGCによる一時的な遅延で判定が揺れないようにする）。
+
+使用例:
+  python benchmarks/bench_name_search.py
+  python benchmarks/bench_name_search.py --classes 50000 --queries 500
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from name_search import SEARCH_KINDS, NameSearchIndex, bounded_edit_distance, default_max_distance  # noqa: E402
+
+_DOMAINS = ['User', 'Order', 'Customer', 'Invoice', 'Payment', 'Shipment', 'Flight', 'Booking', 'Ticket', 'Seat',
+            'Crew', 'Airport', 'Baggage', 'Fare', 'Mileage', 'Account', 'Event', 'Schedule', 'Route', 'Cargo']
+_QUALIFIERS = ['', 'Detail', 'History', 'Summary', 'Status', 'Batch', 'Master', 'Request', 'Result', 'Item']
+_ROLES = ['Controller', 'Service', 'ServiceImpl', 'EntityManager', 'ORMapper', 'Entity', 'Dto', 'Validator',
+          'Converter', 'Helper']
+_METHODS = ['find', 'insert', 'update', 'delete', 'select', 'doInsert', 'doUpdate', 'doDelete', 'validate',
+            'convert', 'execute', 'toString', 'equals', 'hashCode']
+
+
+def generate_records(classes: int, seed: int) -> list:
+    """classes 個のクラスのレコード（同じ単純名の別パッケージ・別ソースパスのクラスを含む）"""
+    rng = random.Random(seed)
+    records = []
+    for number in range(classes):
+        domain = rng.choice(_DOMAINS)
+        qualifier = rng.choice(_QUALIFIERS)
+        role = rng.choice(_ROLES)
+        class_name = f"{domain}{qualifier}{role}{number // 2000 or ''}"
+        package = f"com.example.{domain.lower()}.{role.lower()}{number % 7}"
+        fields = [f"{rng.choice(_DOMAINS)}{rng.choice(_QUALIFIERS)}" for _ in range(rng.randint(1, 4))]
+        methods = [rng.choice(_METHODS) for _ in range(rng.randint(2, 6))]
+        methods += [f"get{field}" for field in fields] + [f"set{field}" for field in fields]
+        source = ('aios_cas/src', 'cfw_cas/src')[number % 2]
+        records.append({
+            'class_name': class_name,
+            'full_class_name': f"{package}.{class_name}",
+            'source_path': source,
+            'file_path': f"/{source}/{package.replace('.', '/')}/{class_name}.java",
+            'methods': [(method_name, line * 10) for line, method_name in enumerate(methods, 1)],
+        })
+    return records
+
+
+def generate_queries(records: list, count: int, seed: int) -> list:
+    """(種類, クエリ) の一覧"""
+    rng = random.Random(seed + 1)
+    queries = []
+    for number in range(count):
+        record = rng.choice(records)
+        name = rng.choice([record['class_name']] + [method_name for method_name, _ in record['methods']])
+        kind = ('prefix', 'substring', 'typo', 'fqcn', 'short')[number % 5]
+        if kind == 'prefix':
+            queries.append((kind, name[:rng.randint(3, len(name))]))
+        elif kind == 'substring':
+            start = rng.randrange(0, max(1, len(name) - 4))
+            queries.append((kind, name[start:start + rng.randint(4, 8)]))
+        elif kind == 'typo':
+            chars = list(name)
+            for _ in range(rng.randint(1, 2)):
+                position = rng.randrange(len(chars))
+                operation = rng.choice(('replace', 'delete', 'insert'))
+                if operation == 'replace':
+                    chars[position] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+                elif operation == 'delete' and len(chars) > 4:
+                    del chars[position]
+                else:
+                    chars.insert(position, rng.choice('abcdefghijklmnopqrstuvwxyz'))
+            queries.append((kind, ''.join(chars)))
+        elif kind == 'fqcn':
+            queries.append((kind, record['full_class_name'][:rng.randint(12, len(record['full_class_name']))]))
+        else:
+            queries.append((kind, name[:rng.randint(1, 2)]))
+    return queries
+
+
+def reference_search(index: NameSearchIndex, query: str, limit: int) -> list:
+    """参照実装: すべての検索語を走査して一致の種類・編集距離を求め、対象ごとの最上位の一致を順位順に並べる"""
+    lowered = query.lower()
+    distance_limit = default_max_distance(query)
+    exact_or_partial, fuzzy = {}, {}
+    for term_id, term in enumerate(index.terms):
+        key = term.lower()
+        if key == lowered:
+            match, distance = 'exact', 0
+        elif key.startswith(lowered):
+            match, distance = 'prefix', 0
+        elif lowered in key:
+            match, distance = 'substring', 0
+        else:
+            distance = bounded_edit_distance(lowered, key, distance_limit) if distance_limit else None
+            if distance is None:
+                continue
+            match = 'fuzzy'
+        rank = (('exact', 'prefix', 'substring', 'fuzzy').index(match), distance, term != query, len(term), key, term)
+        targets = fuzzy if match == 'fuzzy' else exact_or_partial
+        for target_id in index.term_targets[term_id]:
+            if target_id not in targets or rank < targets[target_id][0]:
+                targets[target_id] = (rank, term, match, distance)
+
+    results = sorted((value[0], target_id, value[1], value[2], value[3]) for target_id, value in exact_or_partial.items())
+    if len(results) < limit:
+        results += sorted((value[0], target_id, value[1], value[2], value[3]) for target_id, value in fuzzy.items()
+                          if target_id not in exact_or_partial)
+    return [(index.targets[target_id][0], term, match, distance, index.targets[target_id][1], index.targets[target_id][5])
+            for _, target_id, term, match, distance in results[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="クラス名・メソッド名検索のベンチマーク")
+    parser.add_argument('--classes', type=int, default=10000, help='クラス数（デフォルト: 10000）')
+    parser.add_argument('--queries', type=int, default=200, help='クエリ数（デフォルト: 200）')
+    parser.add_argument('--limit', type=int, default=20, help='1クエリの結果件数（デフォルト: 20）')
+    parser.add_argument('--repeat', type=int, default=3, help='1クエリの計測回数（最小値を採用、デフォルト: 3）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    args = parser.parse_args()
+
+    records = generate_records(args.classes, args.seed)
+    start = time.perf_counter()
+    index = NameSearchIndex(records)
+    elapsed = time.perf_counter() - start
+    print(f"📊 {index.class_count:,}クラス, {len(index.targets) - index.class_count:,}メソッド, "
+          f"{len(index.terms):,}語: 構築 {elapsed:.2f}秒")
+
+    timings = {}
+    for kind, query in generate_queries(records, args.queries, args.seed):
+        elapsed = float('inf')
+        for _ in range(max(args.repeat, 1)):
+            start = time.perf_counter()
+            hits = index.search(query, SEARCH_KINDS, args.limit)
+            elapsed = min(elapsed, time.perf_counter() - start)
+        timings.setdefault(kind, []).append(elapsed)
+
+        actual = [(hit.kind, hit.name, hit.match, hit.distance, hit.class_name, hit.method_name) for hit in hits]
+        assert actual == reference_search(index, query, args.limit), f"検索結果が参照実装と一致しません: {query}"
+
+    slowest = 0.0
+    for kind, values in timings.items():
+        slowest = max(slowest, max(values))
+        print(f"⏱️  {kind:9s} {len(values):4d}件: 中央値 {statistics.median(values) * 1000:.2f}ms, "
+              f"最大 {max(values) * 1000:.2f}ms")
+    assert slowest < 0.010, f"10ms 以上かかったクエリがあります（{slowest * 1000:.1f}ms）"
+
+    print("✅ 正当性確認: 全クエリの検索結果が参照実装と一致、全クエリ 10ms 未満")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+get_source_identifier マイクロベンチマーク
+
+ネストしたソースルート・名前の似たソースルート（src / src2）での判定結果を確認した上で、
+100万回の識別子解決にかかる時間を計測する。比較用に旧実装（都度 Path.resolve() + startswith）
+も少ない回数で計測し、100万回相当に換算して表示する。
+
+使用例:
+  python benchmarks/bench_source_identifier.py
+  python benchmarks/bench_source_identifier.py --lookups 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import get_source_identifier, SourceRootResolver  # noqa: E402
+
+
+def legacy_get_source_identifier(file_path: str, source_paths: list) -> str:
+    """旧実装（比較用）"""
+    file_path_abs = str(Path(file_path).resolve())
+
+    for source_path in source_paths:
+        source_path_abs = str(Path(source_path).resolve())
+        if file_path_abs.startswith(source_path_abs):
+            source_name = Path(source_path).parts[-2] if len(Path(source_path).parts) >= 2 else Path(source_path).name
+            return f"{source_name}:{Path(source_path).name}"
+
+    return "unknown"
+
+
+def create_source_roots(base_dir: Path) -> dict:
+    """ネスト・類似名のソースルートを作成"""
+    roots = {
+        'src': base_dir / 'aios_cas' / 'src',
+        'src2': base_dir / 'aios_cas' / 'src2',
+        'nested': base_dir / 'aios_cas' / 'src' / 'generated' / 'src',
+        'other': base_dir / 'cfw_cas' / 'src',
+    }
+    for root in roots.values():
+        (root / 'jp' / 'co').mkdir(parents=True, exist_ok=True)
+
+    # シンボリックリンク経由のソースルート
+    link = base_dir / 'linked_cas'
+    try:
+        os.symlink(base_dir / 'cfw_cas', link)
+        roots['symlink'] = link / 'src'
+    except OSError:
+        pass
+    return roots
+
+
+def check_correctness(roots: dict):
+    """ソース識別子の判定結果を確認（失敗時はAssertionError）"""
+    # ネストしたルートは内側を先に設定しても後に設定しても内側が優先される
+    for source_paths in ([str(roots['src']), str(roots['src2']), str(roots['nested']), str(roots['other'])],
+                         [str(roots['nested']), str(roots['other']), str(roots['src2']), str(roots['src'])]):
+        resolver = SourceRootResolver(source_paths)
+        cases = {
+            roots['src'] / 'jp' / 'co' / 'A.java': 'aios_cas:src',
+            roots['src2'] / 'jp' / 'co' / 'A.java': 'aios_cas:src2',           # /src2 は /src 配下ではない
+            roots['nested'] / 'jp' / 'co' / 'A.java': 'generated:src',         # 最長一致
+            roots['src'] / 'generated' / 'B.java': 'aios_cas:src',
+            roots['other'] / 'jp' / 'co' / 'A.java': 'cfw_cas:src',
+            roots['src'] / '..' / 'src2' / 'C.java': 'aios_cas:src2',          # 正規化
+            roots['src'].parent / 'srcX' / 'D.java': 'unknown',
+            roots['src']: 'aios_cas:src',                                       # ルート自身
+        }
+        if 'symlink' in roots:
+            cases[roots['symlink'] / 'jp' / 'co' / 'A.java'] = 'cfw_cas:src'    # リンク経由のパス
+
+        for file_path, expected in cases.items():
+            actual = resolver.resolve(str(file_path))
+            assert actual == expected, f"{file_path}: expected {expected}, got {actual}"
+            assert get_source_identifier(str(file_path), source_paths) == expected
+
+    # シンボリックリンクのまま設定されたソースルート
+    if 'symlink' in roots:
+        resolver = SourceRootResolver([str(roots['symlink'])])
+        assert resolver.resolve(str(roots['other'] / 'jp' / 'A.java')) == 'linked_cas:src'
+        assert resolver.resolve(str(roots['symlink'] / 'jp' / 'A.java')) == 'linked_cas:src'
+
+    print("✅ 正当性確認: ネスト・類似名・シンボリックリンクのソースルート判定OK")
+
+
+def run_benchmark(roots: dict, lookups: int, legacy_lookups: int):
+    """識別子解決の所要時間を計測"""
+    source_paths = [str(roots['src']), str(roots['src2']), str(roots['nested']), str(roots['other'])]
+    files = [
+        str(roots['src'] / 'jp' / 'co' / 'service' / 'UserService.java'),
+        str(roots['src2'] / 'jp' / 'co' / 'dao' / 'UserDao.java'),
+        str(roots['nested'] / 'jp' / 'co' / 'gen' / 'Generated.java'),
+        str(roots['other'] / 'jp' / 'co' / 'entity' / 'UserEntity.java'),
+    ]
+
+    get_source_identifier(files[0], source_paths)  # 解決器の構築
+
+    start = time.perf_counter()
+    for i in range(lookups):
+        get_source_identifier(files[i & 3], source_paths)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  新実装: {lookups:,}回 {elapsed:.3f}秒 ({elapsed / lookups * 1e6:.2f}µs/回)")
+
+    start = time.perf_counter()
+    for i in range(legacy_lookups):
+        legacy_get_source_identifier(files[i & 3], source_paths)
+    legacy_elapsed = time.perf_counter() - start
+    projected = legacy_elapsed / legacy_lookups * lookups
+    print(f"⏱️  旧実装: {legacy_lookups:,}回 {legacy_elapsed:.3f}秒 "
+          f"({legacy_elapsed / legacy_lookups * 1e6:.2f}µs/回, {lookups:,}回換算 {projected:.1f}秒)")
+    print(f"🚀 高速化: {projected / elapsed:.1f}倍")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="get_source_identifier マイクロベンチマーク")
+    parser.add_argument('--lookups', type=int, default=1_000_000, help='新実装の解決回数（デフォルト: 100万）')
+    parser.add_argument('--legacy-lookups', type=int, default=20_000, help='旧実装の解決回数（デフォルト: 2万）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        roots = create_source_roots(Path(temp_dir).resolve())
+        check_correctness(roots)
+        run_benchmark(roots, args.lookups, args.legacy_lookups)
+
+
+if __name__ == "__main__":
+    main()
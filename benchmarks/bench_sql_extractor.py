@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+埋め込みSQL抽出（sql_extractor）のベンチマーク
+
+合成コードベースの全メソッド本体からSQLを抽出する時間を計測し、
+- SQLとして抽出すべき文字列（定数連結・別名・複数文・文中の "SQL: SELECT ..." 等）の文種別とテーブル
+- 抽出してはならない文字列（ログ・例外メッセージ、SQLの構文が成立しない文章）
+- 複数文を含むメソッドのCRUD種別が最も強い文で決まること
+- WITH 句の文が CTE 本体ではなく本体の文の動詞で判定されること
+- テーブル → メソッドのインデックスの構築時間（同じテーブルを参照するメソッドが多い場合）と重複除去
+を確認する。
+
+使用例:
+  python benchmarks/bench_sql_extractor.py
+  python benchmarks/bench_sql_extractor.py --classes 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_codebase import CodebaseGenerator  # noqa: E402
+from class_indexer import class_key  # noqa: E402
+from models import ClassInfo, MethodInfo  # noqa: E402
+from sql_extractor import build_table_index, extract_sql_statements, extract_string_constants, parse_sql, strongest_statement  # noqa: E402
+from utils import extract_method_signatures, find_java_files, read_file_with_encoding  # noqa: E402
+
+
+# (メソッド本体, 期待する [(文種別, テーブル一覧)])
+POSITIVE_CASES = [
+    ('return query("SELECT ID, NAME FROM USERS WHERE ID = ?", id);', [('SELECT', ['USERS'])]),
+    ('String sql = "SQL: SELECT * FROM users WHERE id = " + id;', [('SELECT', ['USERS'])]),
+    ('execute("insert into orders (id, status) values (?, ?)");', [('INSERT', ['ORDERS'])]),
+    ('execute("update users u set u.name = ? where u.id = ?");', [('UPDATE', ['USERS'])]),
+    ('execute("UPDATE USERS SET (NAME, STATUS) = (?, ?) WHERE ID = ?");', [('UPDATE', ['USERS'])]),
+    ('execute("DELETE FROM " + TABLE + " WHERE ID = ?");', [('DELETE', ['ORDERS'])]),
+    ('execute("MERGE INTO USERS U USING STAGE S ON (U.ID = S.ID) WHEN MATCHED THEN UPDATE SET U.NAME = S.NAME");',
+     [('MERGE', ['USERS', 'STAGE'])]),
+    ('execute("SELECT 1 FROM USERS; DELETE FROM USERS WHERE ID = ?");', [('SELECT', ['USERS']), ('DELETE', ['USERS'])]),
+    ('System.out.println("SQL: UPDATE orders SET status = \'" + status + "\' WHERE order_id = " + id);',
+     [('UPDATE', ['ORDERS'])]),
+    ('execute("WITH T AS (SELECT ID FROM A WHERE X = ?) DELETE FROM B WHERE ID IN (SELECT ID FROM T)");',
+     [('DELETE', ['B', 'A'])]),
+    ('query("with recursive recent (id) as (select id from orders o join users u on o.uid = u.id), '
+     'latest as not materialized (select id from recent) select * from latest");', [('SELECT', ['ORDERS', 'USERS'])]),
+    ('execute("WITH S AS (SELECT ID, NAME FROM STAGE) UPDATE USERS SET NAME = (SELECT NAME FROM S WHERE S.ID = USERS.ID)");',
+     [('UPDATE', ['USERS', 'STAGE'])]),
+]
+
+# SQLとして抽出してはならないメソッド本体
+NEGATIVE_CASES = [
+    'log.warn("Failed to delete user " + id);',
+    'String message = "Failed to delete user " + id;',
+    'String message = "cannot update record, set flag first";',
+    'String message = "Please select one from the list";',
+    'logger.error("DELETE FROM USERS failed: " + e.getMessage());',
+    'LOG.debug("UPDATE USERS SET NAME = ?");',
+    'throw new IllegalStateException("SELECT * FROM USERS returned no rows");',
+    'throw new DataAccessFault("insert into audit failed for " + id);',
+    'RuntimeException error = new RuntimeException("update users set name = ? failed");',
+    'String note = "INSERT " + count + " rows";',
+]
+
+# (メソッド本体, 判定に使う文の文種別): 存在確認の SELECT やログの後の書き込みで判定する
+STRONGEST_CASES = [
+    ('query("SELECT COUNT(*) FROM USERS WHERE ID = ?"); execute("UPDATE USERS SET NAME = ? WHERE ID = ?");', 'UPDATE'),
+    ('log.info("select from cache"); execute("INSERT INTO ORDERS (ID) VALUES (?)");', 'INSERT'),
+    ('query("SELECT ID FROM ORDERS"); execute("DELETE FROM ORDERS WHERE ID = ?"); execute("INSERT INTO ORDERS (ID) VALUES (?)");',
+     'DELETE'),
+]
+
+
+def summarize(statements: list) -> list:
+    return [(statement['verb'], statement['tables']) for statement in statements]
+
+
+def check_cases():
+    """抽出すべき・抽出してはならない文字列と、CRUD種別の判定に使う文の確認"""
+    constants = {'TABLE': 'ORDERS'}
+    for method_body, expected in POSITIVE_CASES:
+        actual = summarize(extract_sql_statements(method_body, constants))
+        assert actual == expected, f"抽出結果が一致しません: {method_body} → {actual}"
+    for method_body in NEGATIVE_CASES:
+        actual = summarize(extract_sql_statements(method_body, constants))
+        assert not actual, f"SQLではない文字列を抽出しました: {method_body} → {actual}"
+    for method_body, expected_verb in STRONGEST_CASES:
+        statement = strongest_statement(extract_sql_statements(method_body, constants))
+        assert statement and statement['verb'] == expected_verb, f"判定に使う文が一致しません: {method_body} → {statement}"
+
+
+def check_with_clause():
+    """WITH 句の文は本体の文の書き込み先を write_tables、CTE 本体のテーブルを read_tables とする"""
+    statement, = parse_sql("WITH T AS (SELECT ID FROM A) DELETE FROM B WHERE ID IN (SELECT ID FROM T)")
+    assert (statement['verb'], statement['crud_type']) == ('DELETE', 'DELETE'), statement
+    assert statement['write_tables'] == ['B'] and statement['read_tables'] == ['A'], statement
+
+
+def check_table_index(method_count: int) -> float:
+    """全メソッドが同じテーブルを参照するクラスインデックスからテーブルインデックスを構築し、所要時間を返す"""
+    statements = parse_sql("SELECT * FROM APP.USERS; UPDATE APP.USERS SET NAME = ?; SELECT ID FROM APP.USERS")
+    all_classes = {}
+    for number in range(method_count):
+        method_info = MethodInfo(f"Dao{number}.java", f"Dao{number}", 'save', 'void', ['String'], 'app:src',
+                                 sql_statements=statements)
+        class_info = ClassInfo(f"Dao{number}", f"com.example.Dao{number}", f"Dao{number}.java", 'app:src', 'com.example',
+                               {'save': method_info}, [], {'save': [method_info]})
+        all_classes[class_key(class_info)] = class_info
+
+    start = time.perf_counter()
+    table_index = build_table_index(all_classes)
+    elapsed = time.perf_counter() - start
+
+    # 同じメソッドの同じ文種別の2文（SELECT）は1件にまとめ、スキーマ修飾なしの名前でも登録する
+    assert sorted(table_index) == ['APP.USERS', 'USERS'], sorted(table_index)
+    for entries in table_index.values():
+        assert len(entries) == method_count * 2, len(entries)
+        assert {(entry['verb'], entry['access']) for entry in entries} == {('SELECT', 'read'), ('UPDATE', 'write')}
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="埋め込みSQL抽出のベンチマーク")
+    parser.add_argument('--classes', type=int, default=5000, help='生成するクラス数（デフォルト: 5000）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    parser.add_argument('--table-methods', type=int, default=20000,
+                        help='テーブルインデックスの計測で同じテーブルを参照するメソッド数（デフォルト: 2万）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        generated = CodebaseGenerator(classes=args.classes, seed=args.seed).generate(os.path.join(work_dir, 'src'))
+        method_bodies = []
+        for source_dir in Path(generated['settings_file']).parent.glob('module*/src'):
+            for java_file in find_java_files(str(source_dir)):
+                content = read_file_with_encoding(java_file)
+                constants = extract_string_constants(content)
+                method_bodies.extend((content[method_sig['start_offset']:method_sig['end_offset']], constants)
+                                     for method_sig in extract_method_signatures(content))
+
+        start = time.perf_counter()
+        statements = sum(len(extract_sql_statements(method_body, constants)) for method_body, constants in method_bodies)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  {generated['files']:,}ファイル, {len(method_bodies):,}メソッド: 抽出 {elapsed:.2f}秒"
+              f" ({elapsed / max(len(method_bodies), 1) * 1e6:.1f}µs/メソッド), SQL {statements:,}文")
+        assert statements, "合成コードベースのSQLを抽出できません"
+
+    elapsed = check_table_index(args.table_methods)
+    print(f"⏱️  テーブルインデックス構築: 同じテーブルを参照する {args.table_methods:,}メソッド {elapsed:.2f}秒")
+
+    check_cases()
+    check_with_clause()
+    print(f"✅ 正当性確認: 抽出すべきSQL {len(POSITIVE_CASES)}件が一致、SQLではない文字列 {len(NEGATIVE_CASES)}件を除外、"
+          f"複数文のメソッド {len(STRONGEST_CASES)}件が最も強い文で判定、WITH 句の文を本体の動詞で判定、テーブルインデックスの重複除去")
+
+
+if __name__ == "__main__":
+    main()
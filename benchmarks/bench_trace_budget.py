@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+探索予算（--max-nodes / --time-budget）のベンチマーク
+
+合成コードベースの起点Controllerから特化インデックスを構築し、
+- 予算なしの全探索（展開メソッド数・到達した EntityManager/ORMapper のメソッド数・所要時間）
+- 展開メソッド数の上限ごとに、優先度付き作業リスト（CRUDに至る経路を優先）と
+  優先度なし（深度順の幅優先）で到達した EntityManager/ORMapper のメソッド数
+- 時間予算を指定した場合に予算の直後で打ち切られること
+- 別ソースパスの同名クラス（同じ完全クラス名）が特化インデックスで別エントリになること
+を計測・確認する。
+
+使用例:
+  python benchmarks/bench_trace_budget.py
+  python benchmarks/bench_trace_budget.py --classes 10000 --fanout 12 --budgets 50,200
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import main  # noqa: E402
+from class_indexer import MultiSourceClassIndexer  # noqa: E402
+from generate_codebase import CodebaseGenerator  # noqa: E402
+from models import TraceOptions  # noqa: E402
+from utils import get_source_identifier, load_settings_and_resolve_paths  # noqa: E402
+
+
+def trace(indexer: MultiSourceClassIndexer, entry_file: str, max_depth: int, options: TraceOptions) -> tuple:
+    """起点ファイルから探索し、(所要時間, 展開メソッド数, EntityManager/ORMapper のメソッド数, 未展開の呼び出し数) を返す"""
+    start_class = os.path.basename(entry_file)[:-len('.java')]
+    start_source = get_source_identifier(entry_file, indexer.source_paths)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        specialized_index = main.build_specialized_index(indexer, start_class, max_depth, False, options, start_source)
+    elapsed = time.perf_counter() - start
+
+    expanded = sum(len(info['used_methods']) for info in specialized_index.values() if info['depth'] > 0)
+    crud_methods = sum(len(info['used_methods']) for info in specialized_index.values()
+                       if info['class_name'].endswith(('EntityManager', 'ORMapper')))
+    frontier = sum(len(info['frontier_calls']) for info in specialized_index.values())
+    return elapsed, expanded, crud_methods, frontier
+
+
+# 同名クラスの混同: a の UserService.run → b の AuditEntityManager.log → b の UserService.other
+SAME_NAME_SOURCES = {
+    'a/com/x/UserService.java': """package com.x;
+
+import com.x.AuditEntityManager;
+
+public class UserService {
+    private AuditEntityManager auditEntityManager;
+
+    public void run() {
+        auditEntityManager.log();
+    }
+}
+""",
+    'b/com/x/UserService.java': """package com.x;
+
+public class UserService {
+    public void other() {
+        int x = 1;
+    }
+}
+""",
+    'b/com/x/AuditEntityManager.java': """package com.x;
+
+import com.x.UserService;
+
+public class AuditEntityManager {
+    private UserService userService;
+
+    public void log() {
+        userService.other();
+    }
+}
+""",
+}
+
+
+def check_same_name_sources(work_dir: str):
+    """別ソースパスの同名クラスのメソッドが、呼び出し先と同じソースパスのエントリに記録されること"""
+    for relative_path, content in SAME_NAME_SOURCES.items():
+        path = os.path.join(work_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    settings_file = os.path.join(work_dir, 'settings.json')
+    with open(settings_file, 'w', encoding='utf-8') as f:
+        f.write('{"java.project.sourcePaths": ["a", "b"]}')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        source_paths, _ = load_settings_and_resolve_paths(settings_file)
+        indexer = MultiSourceClassIndexer(cache_enabled=False)
+        indexer.class_index = indexer.build_class_index(source_paths)
+        entry_file = os.path.join(work_dir, 'a', 'com', 'x', 'UserService.java')
+        specialized_index = main.build_specialized_index(indexer, 'UserService', 5, False, TraceOptions(),
+                                                         get_source_identifier(entry_file, indexer.source_paths))
+
+    entries = {(info['file_path'], info['depth']): info for info in specialized_index.values()}
+    assert len(entries) == 3, f"同名クラスが1エントリにまとめられています: {list(specialized_index)}"
+    callee = entries.get((os.path.join(work_dir, 'b', 'com', 'x', 'UserService.java'), 2))
+    assert callee and callee['used_methods'] == ['other'], f"b の UserService.other が記録されていません: {list(specialized_index)}"
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description="探索予算のベンチマーク")
+    parser.add_argument('--classes', type=int, default=5000, help='生成するクラス数（デフォルト: 5000）')
+    parser.add_argument('--depth', type=int, default=5, help='Service層の数（デフォルト: 5）')
+    parser.add_argument('--fanout', type=int, default=8, help='1クラスあたりの呼び出し先クラス数（デフォルト: 8）')
+    parser.add_argument('--budgets', default='10,20,25', help='展開メソッド数の上限（カンマ区切り）')
+    parser.add_argument('--time-budget', type=float, default=0.005, help='確認する時間予算（秒、デフォルト: 0.005）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        generated = CodebaseGenerator(classes=args.classes, depth=args.depth, fanout=args.fanout,
+                                      seed=args.seed).generate(os.path.join(work_dir, 'src'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            source_paths, _ = load_settings_and_resolve_paths(generated['settings_file'])
+            indexer = MultiSourceClassIndexer(cache_enabled=False)
+            indexer.class_index = indexer.build_class_index(source_paths)
+        max_depth = args.depth + 4
+        print(f"📁 {generated['files']:,}ファイル, 最大探索深度 {max_depth}")
+
+        elapsed, expanded, crud_methods, frontier = trace(indexer, generated['entry_file'], max_depth, TraceOptions())
+        assert frontier == 0, "予算なしの探索で未展開の呼び出しがあります"
+        print(f"⏱️  予算なし: {elapsed:.2f}秒, {expanded}メソッド展開, EntityManager/ORMapper {crud_methods}メソッド")
+
+        prioritized = main._trace_priority
+        for budget in [int(value) for value in args.budgets.split(',')]:
+            options = TraceOptions(max_nodes=budget)
+            _, expanded, with_priority, frontier = trace(indexer, generated['entry_file'], max_depth, options)
+            assert expanded <= budget, "展開メソッド数が上限を超えています"
+
+            # 優先度なし（すべて同じ優先度 = 深度順の幅優先）
+            main._trace_priority = lambda base_indexer, call: 0
+            try:
+                _, _, without_priority, _ = trace(indexer, generated['entry_file'], max_depth, options)
+            finally:
+                main._trace_priority = prioritized
+            print(f"⏱️  上限 {budget:5d}メソッド: EntityManager/ORMapper 優先度あり {with_priority}メソッド / 幅優先 {without_priority}メソッド"
+                  f"（未展開 {frontier}個）")
+
+        elapsed, expanded, _, frontier = trace(indexer, generated['entry_file'], max_depth,
+                                               TraceOptions(time_budget=args.time_budget))
+        print(f"⏱️  時間予算 {args.time_budget}秒: {elapsed:.2f}秒, {expanded}メソッド展開（未展開 {frontier}個）")
+
+        check_same_name_sources(os.path.join(work_dir, 'same_name'))
+
+    print("✅ 正当性確認: 展開メソッド数が上限以内、予算なしの探索は未展開なし、別ソースパスの同名クラスを区別")
+
+
+if __name__ == "__main__":
+    main_benchmark()
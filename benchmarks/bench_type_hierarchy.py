@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+継承・実装関係インデックス（type_hierarchy）のベンチマーク
+
+2つのソースパスにまたがるリポジトリ階層（interface → 親interfaceを継承するinterface → abstractクラス → 実装クラス → サブクラス）で
+- extract_class_hierarchy がクラス宣言から親クラス・親interface・abstract/interface を読み取ること
+  （型パラメータ・型引数・完全クラス名・複数行の宣言・同じ接頭辞のクラス名を含む）
+- find_implementations が推移的な実装クラスを見つけ、abstractメソッドしか持たない中間クラスを除き、
+  本体を持つabstractクラス（サブクラスが継承する実装）は含めること
+- 呼び出し元のソース解決順序（呼び出し元のソース → 依存ソース）で実装クラスを並べ、limit を超える分を後ろから打ち切ること
+を確認した上で、実装クラスの多いinterfaceで find_implementations にかかる時間を計測する
+（結果は全クラスを走査する参照実装と比較する）。
+
+使用例:
+  python benchmarks/bench_type_hierarchy.py
+  python benchmarks/bench_type_hierarchy.py --classes 20000 --sources 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from class_indexer import MultiSourceClassIndexer, class_key  # noqa: E402
+from type_hierarchy import TypeHierarchyIndex  # noqa: E402
+from utils import extract_class_hierarchy, load_settings_and_resolve_paths  # noqa: E402
+
+# (宣言を含むソース, クラス名, 期待する継承・実装情報)
+HIERARCHY_CASES = [
+    ("public class JdbcRepository extends AbstractRepository {",
+     'JdbcRepository', {'superclass': 'AbstractRepository', 'interfaces': [], 'is_interface': False, 'is_abstract': False}),
+    ("public abstract class AbstractRepository<T extends Entity> implements AuditedRepository<T>, Serializable {",
+     'AbstractRepository', {'superclass': '', 'interfaces': ['AuditedRepository', 'Serializable'],
+                            'is_interface': False, 'is_abstract': True}),
+    ("public interface AuditedRepository<T> extends Repository<T, Long>, Auditable {",
+     'AuditedRepository', {'superclass': '', 'interfaces': ['Repository', 'Auditable'],
+                           'is_interface': True, 'is_abstract': True}),
+    ("public class Outer extends com.x.Base<Map<String, List<Long>>> implements java.io.Serializable {",
+     'Outer', {'superclass': 'com.x.Base', 'interfaces': ['java.io.Serializable'],
+               'is_interface': False, 'is_abstract': False}),
+    ("@Repository\npublic final class CachedRepository\n        extends JdbcRepository\n        implements Cache, Closeable {",
+     'CachedRepository', {'superclass': 'JdbcRepository', 'interfaces': ['Cache', 'Closeable'],
+                          'is_interface': False, 'is_abstract': False}),
+    # 同じ接頭辞の別クラス（UserServiceImpl）の宣言を UserService と取り違えない
+    ("class UserServiceImpl extends BaseService implements UserService {\n}\ninterface UserService extends Service {",
+     'UserService', {'superclass': '', 'interfaces': ['Service'], 'is_interface': True, 'is_abstract': True}),
+    ("public class Plain {",
+     'Missing', {'superclass': '', 'interfaces': [], 'is_interface': False, 'is_abstract': False}),
+]
+
+# core: Repository ← AuditedRepository ← AbstractRepository（find は abstract、save は本体あり）← JdbcRepository ← CachedJdbcRepository
+#       Repository ← MemoryRepository
+# app:  AuditedRepository ← AppRepository
+REPOSITORY_SOURCES = {
+    'core/com/x/Repository.java': """package com.x;
+
+public interface Repository<T> {
+    T find(Long id);
+
+    void save(T entity);
+}
+""",
+    'core/com/x/AuditedRepository.java': """package com.x;
+
+public interface AuditedRepository<T> extends Repository<T> {
+    void audit(String message);
+}
+""",
+    'core/com/x/AbstractRepository.java': """package com.x;
+
+public abstract class AbstractRepository implements AuditedRepository<UserEntity> {
+    public abstract UserEntity find(Long id);
+
+    public void save(UserEntity entity) {
+        audit("save");
+    }
+}
+""",
+    'core/com/x/JdbcRepository.java': """package com.x;
+
+public class JdbcRepository extends AbstractRepository {
+    public UserEntity find(Long id) {
+        return null;
+    }
+
+    public void audit(String message) {
+    }
+}
+""",
+    'core/com/x/CachedJdbcRepository.java': """package com.x;
+
+public class CachedJdbcRepository extends JdbcRepository {
+    public UserEntity find(Long id) {
+        return null;
+    }
+}
+""",
+    'core/com/x/MemoryRepository.java': """package com.x;
+
+public class MemoryRepository implements Comparable<MemoryRepository>, Repository<UserEntity> {
+    public UserEntity find(Long id) {
+        return null;
+    }
+
+    public void save(UserEntity entity) {
+    }
+}
+""",
+    'app/com/x/AppRepository.java': """package com.x;
+
+public class AppRepository implements AuditedRepository<UserEntity> {
+    public UserEntity find(Long id) {
+        return null;
+    }
+
+    public void save(UserEntity entity) {
+    }
+
+    public void audit(String message) {
+    }
+}
+""",
+}
+
+
+def implementation_names(hierarchy: TypeHierarchyIndex, class_info, method_name: str, arg_count=None,
+                         source_order=None, limit: int = 5) -> tuple:
+    """find_implementations の結果を (実装クラス名の一覧, 打ち切ったか) で返す"""
+    implementations, truncated = hierarchy.find_implementations(class_info, method_name, arg_count,
+                                                                source_order=source_order, limit=limit)
+    return [sub_info.class_name for sub_info, _ in implementations], truncated
+
+
+def check_repository_hierarchy(work_dir: str) -> int:
+    """リポジトリ階層で実装クラスの探索・順序・打ち切りを確認し、確認した件数を返す"""
+    for relative_path, content in REPOSITORY_SOURCES.items():
+        path = os.path.join(work_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    settings_file = os.path.join(work_dir, 'settings.json')
+    with open(settings_file, 'w', encoding='utf-8') as f:
+        f.write('{"java.project.sourcePaths": ["core", "app"]}')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        source_paths, _ = load_settings_and_resolve_paths(settings_file)
+        indexer = MultiSourceClassIndexer(cache_enabled=False)
+        indexer.class_index = indexer.build_class_index(source_paths)
+    hierarchy = indexer.get_type_hierarchy()
+    repository = indexer.class_index['com.x.Repository']
+    core = indexer.class_index['com.x.JdbcRepository'].source_path
+    app = indexer.class_index['com.x.AppRepository'].source_path
+    from_core, from_app = indexer.source_resolution_order[core], indexer.source_resolution_order[app]
+
+    assert [class_key(info) for info in hierarchy.get_supertypes(indexer.class_index['com.x.AppRepository'])] == \
+        [f"com.x.AuditedRepository@{core}"], "別ソースパスの親interfaceを解決できません"
+    assert hierarchy.unresolved_supertypes[f"com.x.MemoryRepository@{core}"] == ['Comparable']
+
+    core_finds = {'MemoryRepository', 'JdbcRepository', 'CachedJdbcRepository'}
+    cases = 0
+
+    # 推移的な実装（親interfaceを継承したinterfaceの実装・実装クラスのサブクラス）、abstractメソッドの中間クラスは除く
+    names, truncated = implementation_names(hierarchy, repository, 'find', 1, limit=10)
+    assert set(names) == core_finds | {'AppRepository'} and len(names) == 4 and not truncated, names
+    cases += 1
+
+    # 本体を持つabstractクラスは実装（サブクラスが継承するメソッド）として含める
+    names, _ = implementation_names(hierarchy, repository, 'save', None, limit=10)
+    assert set(names) == {'MemoryRepository', 'AbstractRepository', 'AppRepository'} and len(names) == 3, names
+    cases += 1
+
+    # オーバーロードの引数数が一致しない実装は対象外
+    assert implementation_names(hierarchy, repository, 'find', 2, limit=10) == ([], False)
+    cases += 1
+
+    # 途中のinterface・abstractクラスから探索しても推移的に見つける
+    names, _ = implementation_names(hierarchy, indexer.class_index['com.x.AbstractRepository'], 'find', 1, limit=10)
+    assert sorted(names) == ['CachedJdbcRepository', 'JdbcRepository'], names
+    cases += 1
+
+    # 呼び出し元のソースの実装を先に並べる
+    names, truncated = implementation_names(hierarchy, repository, 'find', 1, from_app, limit=10)
+    assert names[0] == 'AppRepository' and set(names[1:]) == core_finds and not truncated, names
+    names, _ = implementation_names(hierarchy, repository, 'find', 1, from_core, limit=10)
+    assert set(names[:3]) == core_finds and names[3] == 'AppRepository', names
+    cases += 2
+
+    # limit を超える分は優先順位の低いソースから打ち切る
+    assert implementation_names(hierarchy, repository, 'find', 1, from_app, limit=1) == (['AppRepository'], True)
+    names, truncated = implementation_names(hierarchy, repository, 'find', 1, from_core, limit=3)
+    assert set(names) == core_finds and truncated, names
+    names, truncated = implementation_names(hierarchy, repository, 'find', 1, from_core, limit=2)
+    assert len(names) == 2 and set(names) <= core_finds and truncated, names
+    assert implementation_names(hierarchy, repository, 'find', 1, from_app, limit=4)[1] is False  # ちょうど上限
+    cases += 4
+
+    # 解決順序に含まれないソースの実装は対象外
+    assert implementation_names(hierarchy, repository, 'find', 1, (app,), limit=10) == (['AppRepository'], False)
+    cases += 1
+
+    return cases
+
+
+def generate_hierarchy(classes: int, sources: int) -> dict:
+    """
+    実装クラスの多い階層のクラスインデックス
+    Handler ← Handler0〜99（偶数番はabstractメソッドのabstractクラス）← Handler{i}（i-100 を継承）
+    """
+    parser = MultiSourceClassIndexer(cache_enabled=False)
+    class_index = {}
+
+    def add(source: str, package: str, class_name: str, content: str):
+        class_info = parser._parse_class_info(
+            f"package {package};\n\n{content}", f"/{source}/{package.replace('.', '/')}/{class_name}.java", source)
+        class_index[class_key(class_info)] = class_info
+        class_index.setdefault(class_info.full_class_name, class_info)
+
+    add('s0', 'com.gen.api', 'Handler', "public interface Handler {\n    void handle(String request);\n}\n")
+    for number in range(classes):
+        source = f"s{number % sources}"
+        if number < 100:
+            header = "implements com.gen.api.Handler"
+        else:
+            header = f"extends com.gen.impl{(number - 100) % sources}.Handler{number - 100}"
+        if number < 100 and number % 2 == 0:
+            declaration, method = 'public abstract class', "    public abstract void handle(String request);\n"
+        else:
+            declaration, method = 'public class', "    public void handle(String request) {\n    }\n"
+        add(source, f"com.gen.impl{number % sources}", f"Handler{number}",
+            f"{declaration} Handler{number} {header} {{\n{method}}}\n")
+    return class_index
+
+
+def reference_implementations(class_index: dict, class_info, method_name: str, arg_count, source_order) -> list:
+    """参照実装: 全クラスの親型を辿って対象の型のサブ型を求め、(ソースの優先順位, クラスキー) の一覧を返す"""
+    hierarchy = TypeHierarchyIndex(class_index)
+    target = class_key(class_info)
+    ranks = {source_id: rank for rank, source_id in enumerate(source_order)}
+    found = []
+    for key, supertypes in hierarchy.supertypes.items():
+        stack, seen = list(supertypes), set()
+        while stack:
+            super_key = stack.pop()
+            if super_key == target:
+                break
+            if super_key not in seen:
+                seen.add(super_key)
+                stack.extend(hierarchy.supertypes.get(super_key, []))
+        else:
+            continue
+        sub_info = class_index[key]
+        method_info = sub_info.find_method(method_name, arg_count)
+        if sub_info.is_interface or sub_info.source_path not in ranks or method_info is None or method_info.is_abstract:
+            continue
+        found.append((ranks[sub_info.source_path], key))
+    return sorted(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="継承・実装関係インデックスのベンチマーク")
+    parser.add_argument('--classes', type=int, default=5000, help='Handler の実装クラス数（デフォルト: 5000）')
+    parser.add_argument('--sources', type=int, default=4, help='ソースパス数（デフォルト: 4）')
+    parser.add_argument('--limit', type=int, default=5, help='実装クラスの展開数の上限（デフォルト: 5）')
+    parser.add_argument('--lookups', type=int, default=200, help='計測する探索の回数（デフォルト: 200）')
+    args = parser.parse_args()
+
+    for content, class_name, expected in HIERARCHY_CASES:
+        actual = extract_class_hierarchy(content, class_name)
+        assert actual == expected, f"{class_name}: expected {expected}, got {actual}"
+    with tempfile.TemporaryDirectory() as work_dir:
+        case_count = len(HIERARCHY_CASES) + check_repository_hierarchy(work_dir)
+
+    class_index = generate_hierarchy(args.classes, args.sources)
+    start = time.perf_counter()
+    hierarchy = TypeHierarchyIndex(class_index)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  階層の構築: {args.classes:,}クラス {elapsed:.2f}秒")
+
+    handler = class_index['com.gen.api.Handler']
+    source_orders = [tuple(f"s{(first + i) % args.sources}" for i in range(args.sources)) for first in range(args.sources)]
+    for limit in (args.limit, args.classes):
+        start = time.perf_counter()
+        for i in range(args.lookups):
+            hierarchy.find_implementations(handler, 'handle', 1, source_orders[i % args.sources], limit)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  実装クラスの探索（上限 {limit:,}件）: {args.lookups:,}回 {elapsed:.2f}秒 "
+              f"({elapsed / args.lookups * 1000:.2f}ms/回)")
+
+        for source_order in source_orders:
+            implementations, truncated = hierarchy.find_implementations(handler, 'handle', 1, source_order, limit)
+            expected = reference_implementations(class_index, handler, 'handle', 1, source_order)
+            ranks = [source_order.index(sub_info.source_path) for sub_info, _ in implementations]
+            assert ranks == [rank for rank, _ in expected[:limit]], f"実装クラスがソースの優先順位どおりに並んでいません: {source_order}"
+            assert truncated == (len(expected) > limit), "打ち切りの判定が参照実装と一致しません"
+            assert {class_key(sub_info) for sub_info, _ in implementations} <= {key for _, key in expected}
+            if not truncated:
+                assert sorted(class_key(sub_info) for sub_info, _ in implementations) == sorted(key for _, key in expected)
+
+    print(f"✅ 正当性確認: 継承・実装情報の抽出と実装クラスの探索 {case_count}件が一致、"
+          f"{args.classes:,}クラスの階層で実装クラスの順序・打ち切りが参照実装と一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ベンチマーク用の合成Javaコードベース生成
+
+Controller → Service（depth層） → EntityManager → ORMapper の階層構造を持つ
+ドメイン単位のコードベースを、乱数シードから決定的に生成する。
+
+- ドメイン数はクラス数 / (depth + 4) （Controller・Service×depth・EntityManager・ORMapper・Entity）
+- 各クラスは次の層の fanout 個のクラスを呼び出す（一部は他ドメインへの呼び出し）
+- ORMapper のメソッドは埋め込みSQLを持ち、Entity ごとのテーブルを参照する
+- 一部のクラスは別ソースパスに同じ完全修飾名の複製を持つ（同名クラスの先勝ち登録の負荷）
+- 一部のファイルは Shift_JIS で書き出す（エンコーディング判定の負荷）
+
+使用例:
+  python benchmarks/generate_codebase.py /tmp/bench_src --classes 5000
+  python benchmarks/generate_codebase.py /tmp/bench_src --classes 50000 --depth 4 --fanout 3 --sources 4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Dict, List
+
+# 1ドメインあたりの Service 以外のクラス数（Controller, EntityManager, ORMapper, Entity）
+_FIXED_CLASSES_PER_DOMAIN = 4
+
+# EntityManager のメソッド → 呼び出す ORMapper のメソッド
+_ENTITY_MANAGER_METHODS = {
+    'create': 'doInsert',
+    'find': 'select',
+    'update': 'doUpdate',
+    'delete': 'doDelete',
+}
+
+# ORMapper のメソッド → 埋め込みSQL（{table} をテーブル名で置換）
+_ORMAPPER_METHODS = {
+    'doInsert': 'INSERT INTO {table} (ID, NAME, STATUS) VALUES (?, ?, ?)',
+    'select': 'SELECT ID, NAME, STATUS FROM {table} WHERE ID = ?',
+    'doUpdate': 'UPDATE {table} SET NAME = ?, STATUS = ? WHERE ID = ?',
+    'doDelete': 'DELETE FROM {table} WHERE ID = ?',
+}
+
+
+class CodebaseGenerator:
+    """合成コードベースの生成設定と書き出し"""
+
+    def __init__(self, classes: int = 1000, depth: int = 2, fanout: int = 3, methods: int = 4,
+                 sources: int = 2, duplicate_ratio: float = 0.05, sjis_ratio: float = 0.1,
+                 cross_domain_ratio: float = 0.2, seed: int = 42):
+        self.depth = max(1, depth)
+        self.fanout = max(1, fanout)
+        self.methods = max(1, methods)
+        self.sources = max(1, sources)
+        self.duplicate_ratio = duplicate_ratio if self.sources > 1 else 0.0
+        self.sjis_ratio = sjis_ratio
+        self.cross_domain_ratio = cross_domain_ratio
+        self.seed = seed
+        self.domains = max(1, classes // (self.depth + _FIXED_CLASSES_PER_DOMAIN))
+
+    def config(self) -> Dict:
+        """生成設定（ベースライン比較時の同一条件チェック用）"""
+        return {
+            'classes': self.domains * (self.depth + _FIXED_CLASSES_PER_DOMAIN),
+            'domains': self.domains,
+            'depth': self.depth,
+            'fanout': self.fanout,
+            'methods': self.methods,
+            'sources': self.sources,
+            'duplicate_ratio': self.duplicate_ratio,
+            'sjis_ratio': self.sjis_ratio,
+            'cross_domain_ratio': self.cross_domain_ratio,
+            'seed': self.seed,
+        }
+
+    def generate(self, output_dir: str) -> Dict:
+        """
+        コードベースと settings.json を output_dir に書き出す
+
+        Returns:
+            生成結果（settings.json のパス、起点Controllerのファイル、ファイル数など）
+        """
+        rng = random.Random(self.seed)
+        # ソース識別子（<親ディレクトリ名>:<ディレクトリ名>）がソースパスごとに異なる配置にする
+        source_dirs = [os.path.join('module%02d' % i, 'src') for i in range(self.sources)]
+        stats = {'files': 0, 'sjis_files': 0, 'duplicate_files': 0}
+        entry_files = []
+
+        for domain in range(self.domains):
+            source_dir = source_dirs[domain % self.sources]
+            for class_name, package, content in self._domain_classes(domain, rng):
+                file_path = self._write_class(output_dir, source_dir, package, class_name, content, rng, stats)
+                if class_name.endswith('Controller'):
+                    entry_files.append(file_path)
+
+                # 別ソースパスに同じ完全修飾名の複製（フォークしたモジュールを想定）
+                if rng.random() < self.duplicate_ratio:
+                    duplicate_dir = source_dirs[(domain + 1 + rng.randrange(self.sources - 1)) % self.sources]
+                    duplicate_content = content.replace('生成クラス', '生成クラス（複製）')
+                    self._write_class(output_dir, duplicate_dir, package, class_name, duplicate_content, rng, stats)
+                    stats['duplicate_files'] += 1
+
+        settings_file = os.path.join(output_dir, 'settings.json')
+        with open(settings_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'files.autoGuessEncoding': True,
+                'java.project.sourcePaths': source_dirs,
+                'java.project.referencedLibraries': []
+            }, f, ensure_ascii=False, indent=4)
+
+        return {
+            'settings_file': settings_file,
+            'entry_file': entry_files[0],
+            'config': self.config(),
+            **stats
+        }
+
+    def _write_class(self, output_dir: str, source_dir: str, package: str, class_name: str,
+                     content: str, rng: random.Random, stats: Dict) -> str:
+        package_dir = os.path.join(output_dir, source_dir, *package.split('.'))
+        os.makedirs(package_dir, exist_ok=True)
+        file_path = os.path.join(package_dir, f"{class_name}.java")
+
+        encoding = 'utf-8'
+        if rng.random() < self.sjis_ratio:
+            encoding = 'shift_jis'
+            stats['sjis_files'] += 1
+        with open(file_path, 'w', encoding=encoding, newline='\n') as f:
+            f.write(content)
+        stats['files'] += 1
+        return file_path
+
+    # ---- クラス生成 ----
+
+    @staticmethod
+    def _domain_name(domain: int) -> str:
+        return 'D%05d' % domain
+
+    def _package(self, domain: int, layer: str) -> str:
+        return f"com.bench.{self._domain_name(domain).lower()}.{layer}"
+
+    def _service_name(self, domain: int, level: int) -> str:
+        return f"{self._domain_name(domain)}Level{level}Service"
+
+    def _pick_domains(self, domain: int, rng: random.Random) -> List[int]:
+        """呼び出し先のドメイン（自ドメイン + 一定割合で他ドメイン）"""
+        picked = [domain]
+        for _ in range(self.fanout - 1):
+            if self.domains > 1 and rng.random() < self.cross_domain_ratio:
+                other = rng.randrange(self.domains)
+                if other not in picked:
+                    picked.append(other)
+        return picked
+
+    def _domain_classes(self, domain: int, rng: random.Random):
+        """1ドメイン分の (クラス名, パッケージ, ソース) を順に返す"""
+        name = self._domain_name(domain)
+        entity = f"{name}Entity"
+        entity_fqcn = f"{self._package(domain, 'entity')}.{entity}"
+
+        yield entity, self._package(domain, 'entity'), self._entity_source(domain, entity)
+        yield (f"{name}ORMapper", self._package(domain, 'ormapper'),
+               self._ormapper_source(domain, f"{name}ORMapper", entity, entity_fqcn))
+        yield (f"{name}EntityManager", self._package(domain, 'manager'),
+               self._entity_manager_source(domain, f"{name}EntityManager", entity, entity_fqcn))
+
+        # Service は最下層（EntityManager を呼ぶ層）から生成
+        for level in range(self.depth, 0, -1):
+            if level == self.depth:
+                callees = [(self._package(d, 'manager'), f"{self._domain_name(d)}EntityManager", list(_ENTITY_MANAGER_METHODS))
+                           for d in self._pick_domains(domain, rng)]
+            else:
+                callees = [(self._package(d, 'service'), self._service_name(d, level + 1), self._service_methods())
+                           for d in self._pick_domains(domain, rng)]
+            yield (self._service_name(domain, level), self._package(domain, 'service'),
+                   self._caller_source(domain, self._package(domain, 'service'), self._service_name(domain, level),
+                                       'サービス', callees, entity, entity_fqcn, rng))
+
+        callees = [(self._package(d, 'service'), self._service_name(d, 1), self._service_methods())
+                   for d in self._pick_domains(domain, rng)]
+        yield (f"{name}Controller", self._package(domain, 'controller'),
+               self._caller_source(domain, self._package(domain, 'controller'), f"{name}Controller",
+                                   'コントローラー', callees, entity, entity_fqcn, rng))
+
+    def _service_methods(self) -> List[str]:
+        return [f"process{i}" for i in range(self.methods)]
+
+    def _entity_source(self, domain: int, entity: str) -> str:
+        return f"""package {self._package(domain, 'entity')};
+
+/**
+ * 生成クラス: {entity}
+ * ベンチマーク用のEntity
+ */
+public class {entity} {{
+
+    private Long id;
+    private String name;
+    private String status;
+
+    public Long getId() {{
+        return id;
+    }}
+
+    public void setId(Long id) {{
+        this.id = id;
+    }}
+
+    public String getName() {{
+        return name;
+    }}
+
+    public void setName(String name) {{
+        this.name = name;
+    }}
+
+    public String getStatus() {{
+        return status;
+    }}
+
+    public void setStatus(String status) {{
+        this.status = status;
+    }}
+}}
+"""
+
+    def _ormapper_source(self, domain: int, class_name: str, entity: str, entity_fqcn: str) -> str:
+        table = f"{self._domain_name(domain)}_TABLE"
+        methods = []
+        for method_name, sql in _ORMAPPER_METHODS.items():
+            parameter = 'Long id' if method_name in ('select', 'doDelete') else f"{entity} entity"
+            return_type = entity if method_name == 'select' else 'void'
+            body = f'        return new {entity}();\n' if method_name == 'select' else ''
+            methods.append(f"""    /**
+     * SQL実行: {method_name}
+     */
+    public {return_type} {method_name}({parameter}) {{
+        String sql = "{sql.format(table=table)}";
+        System.out.println("SQL: " + sql);
+{body}    }}
+""")
+        return f"""package {self._package(domain, 'ormapper')};
+
+import {entity_fqcn};
+
+/**
+ * 生成クラス: {class_name}
+ * データベースアクセスを担当
+ */
+public class {class_name} {{
+
+{chr(10).join(methods)}}}
+"""
+
+    def _entity_manager_source(self, domain: int, class_name: str, entity: str, entity_fqcn: str) -> str:
+        mapper = f"{self._domain_name(domain)}ORMapper"
+        field = mapper[0].lower() + mapper[1:]
+        methods = []
+        for method_name, mapper_method in _ENTITY_MANAGER_METHODS.items():
+            argument = 'id' if mapper_method in ('select', 'doDelete') else 'entity'
+            call = f"{field}.{mapper_method}({argument})"
+            return_statement = f"return {call};" if mapper_method == 'select' else f"{call};\n        return entity;"
+            methods.append(f"""    /**
+     * {entity} の{method_name}処理
+     */
+    public {entity} {method_name}(Long id) {{
+        {entity} entity = new {entity}();
+        entity.setId(id);
+        {return_statement}
+    }}
+""")
+        return f"""package {self._package(domain, 'manager')};
+
+import {entity_fqcn};
+import {self._package(domain, 'ormapper')}.{mapper};
+
+/**
+ * 生成クラス: {class_name}
+ * Entityの永続化を管理
+ */
+public class {class_name} {{
+
+    private {mapper} {field} = new {mapper}();
+
+{chr(10).join(methods)}}}
+"""
+
+    def _caller_source(self, domain: int, package: str, class_name: str, role: str, callees: list,
+                       entity: str, entity_fqcn: str, rng: random.Random) -> str:
+        """Controller / Service のソース（各メソッドが呼び出し先クラスのメソッドを fanout 回呼ぶ）"""
+        imports = {entity_fqcn}
+        fields = []
+        for callee_package, callee_class, _ in callees:
+            # 同一パッケージでも import する（呼び出し解決はimportから呼び出し先クラスを推定するため）
+            imports.add(f"{callee_package}.{callee_class}")
+            field = callee_class[0].lower() + callee_class[1:]
+            fields.append(f"    private {callee_class} {field} = new {callee_class}();")
+
+        methods = []
+        for i in range(self.methods):
+            calls = []
+            for _ in range(self.fanout):
+                _, callee_class, callee_methods = rng.choice(callees)
+                field = callee_class[0].lower() + callee_class[1:]
+                calls.append(f"        result = {field}.{rng.choice(callee_methods)}(id);")
+            methods.append(f"""    /**
+     * {role}処理 {i}
+     */
+    public Object process{i}(Long id) {{
+        Object result = null;
+{chr(10).join(calls)}
+        return result;
+    }}
+""")
+        import_lines = '\n'.join(f"import {name};" for name in sorted(imports))
+        return f"""package {package};
+
+{import_lines}
+
+/**
+ * 生成クラス: {class_name}
+ * ベンチマーク用の{role}（{entity} を扱う）
+ */
+public class {class_name} {{
+
+{chr(10).join(fields)}
+
+{chr(10).join(methods)}}}
+"""
+
+
+def add_generator_arguments(parser):
+    """生成設定のコマンドライン引数を追加（run_benchmarks.py と共用）"""
+    parser.add_argument('--classes', type=int, default=1000, help='生成するクラス数の目安（デフォルト: 1000）')
+    parser.add_argument('--depth', type=int, default=2, help='Service層の段数（デフォルト: 2）')
+    parser.add_argument('--fanout', type=int, default=3, help='1メソッドあたりの呼び出し数・呼び出し先クラス数（デフォルト: 3）')
+    parser.add_argument('--methods', type=int, default=4, help='Controller/Service 1クラスあたりのメソッド数（デフォルト: 4）')
+    parser.add_argument('--sources', type=int, default=2, help='ソースパス数（デフォルト: 2）')
+    parser.add_argument('--duplicate-ratio', type=float, default=0.05,
+                        help='別ソースパスに同名クラスを複製する割合（デフォルト: 0.05）')
+    parser.add_argument('--sjis-ratio', type=float, default=0.1, help='Shift_JISで書き出すファイルの割合（デフォルト: 0.1）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+
+
+def generator_from_arguments(args) -> CodebaseGenerator:
+    return CodebaseGenerator(classes=args.classes, depth=args.depth, fanout=args.fanout, methods=args.methods,
+                             sources=args.sources, duplicate_ratio=args.duplicate_ratio,
+                             sjis_ratio=args.sjis_ratio, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ベンチマーク用の合成Javaコードベース生成")
+    parser.add_argument('output_dir', help='出力ディレクトリ（空であること）')
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    if os.path.exists(args.output_dir) and os.listdir(args.output_dir):
+        print(f"❌ 出力ディレクトリが空ではありません: {args.output_dir}")
+        sys.exit(1)
+
+    generated = generator_from_arguments(args).generate(args.output_dir)
+    print(f"✅ 生成完了: {generated['files']:,}ファイル "
+          f"(Shift_JIS: {generated['sjis_files']:,}, 複製: {generated['duplicate_files']:,})")
+    print(f"⚙️  設定ファイル: {generated['settings_file']}")
+    print(f"🎯 起点ファイル例: {generated['entry_file']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成コードベースによるエンドツーエンドのベンチマーク
+
+generate_codebase.py で生成したコードベースに対して main.py を別プロセスで実行し、
+各シナリオの経過時間・CPU時間・最大メモリ（RSS）・主要フェーズの時間（--stats-json の結果）を記録する。
+ベースラインJSONを指定すると、しきい値を超えて遅く・重くなったシナリオを回帰として報告し終了コード1で終了する。
+
+シナリオ（繰り返しごとに空のキャッシュディレクトリから順に実行）:
+  cold_build          キャッシュなしでのインデックス全件構築（index）
+  warm_load           インデックスキャッシュからの読み込み（tables）
+  parse_cache_rebuild 解析キャッシュを使ったインデックス再構築（index）
+  deep_trace          起点Controllerからの再帰探索（--max-depth は Service層数 + 4）
+  crud                全起点クラスの CRUD マトリクス（crud）
+
+使用例:
+  # 1,000クラスで計測し、結果をベースラインとして保存
+  python benchmarks/run_benchmarks.py --classes 1000 --output benchmarks/baseline_1k.json
+
+  # 同じ条件で再計測し、ベースラインと比較（25%以上の悪化で終了コード1）
+  python benchmarks/run_benchmarks.py --classes 1000 --baseline benchmarks/baseline_1k.json
+
+  # 50,000クラス・Service 4層・3回計測の中央値
+  python benchmarks/run_benchmarks.py --classes 50000 --depth 4 --repeat 3 --output result_50k.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_codebase import add_generator_arguments, generator_from_arguments  # noqa: E402
+
+MAIN_SCRIPT = str(Path(__file__).resolve().parent.parent / 'main.py')
+
+# 結果に記録する主要フェーズ
+RECORDED_PHASES = [
+    'cache_validation', 'cache_load', 'cache_save', 'index_build', 'class_extraction',
+    'javalang_parse', 'call_resolution', 'trace', 'call_graph_extraction', 'crud_analysis'
+]
+
+# 経過時間がこれ未満の差は計測誤差として回帰判定しない（秒）
+MIN_SIGNIFICANT_SECONDS = 0.05
+
+
+def build_scenarios(generated: dict, args) -> list:
+    """(シナリオ名, main.py の引数) のリスト（実行順）"""
+    settings_file = generated['settings_file']
+    return [
+        ('cold_build', ['index', '--settings', settings_file]),
+        ('warm_load', ['tables', '--settings', settings_file]),
+        ('parse_cache_rebuild', ['index', '--settings', settings_file]),
+        ('deep_trace', [generated['entry_file'], '--settings', settings_file,
+                        '--max-depth', str(generated['config']['depth'] + 4)]),
+        ('crud', ['crud', '--settings', settings_file] + (['--workers', str(args.workers)] if args.workers else [])),
+    ]
+
+
+def run_scenario(name: str, main_args: list, cache_dir: str, work_dir: str) -> dict:
+    """main.py を別プロセスで実行し、計測結果を返す"""
+    stats_file = os.path.join(work_dir, f"{name}_stats.json")
+    log_file = os.path.join(work_dir, f"{name}.log")
+    env = dict(os.environ, CLASS_INDEX_CACHE_DIR=cache_dir, PYTHONIOENCODING='utf-8')
+
+    start = time.perf_counter()
+    with open(log_file, 'w', encoding='utf-8') as log:
+        completed = subprocess.run([sys.executable, MAIN_SCRIPT] + main_args + ['--stats-json', stats_file],
+                                   stdout=log, stderr=subprocess.STDOUT, env=env)
+    elapsed = time.perf_counter() - start
+
+    if completed.returncode != 0 or not os.path.exists(stats_file):
+        with open(log_file, 'r', encoding='utf-8', errors='replace') as log:
+            tail = ''.join(log.readlines()[-20:])
+        raise RuntimeError(f"シナリオ {name} が失敗しました (終了コード: {completed.returncode})\n{tail}")
+
+    with open(stats_file, 'r', encoding='utf-8') as f:
+        stats = json.load(f)
+
+    return {
+        # プロセス起動・import を含む経過時間
+        'process_wall_seconds': elapsed,
+        'wall_seconds': stats['total']['wall_seconds'],
+        'cpu_seconds': stats['total']['cpu_seconds'],
+        'peak_rss_bytes': stats['peak_rss_bytes'],
+        'phases': {phase: stats['phases'][phase]['wall_seconds'] for phase in RECORDED_PHASES if phase in stats['phases']},
+        'counters': stats['counters'],
+    }
+
+
+def median_results(runs: list) -> dict:
+    """繰り返し計測の中央値（カウンターは最初の計測の値）"""
+    merged = {}
+    for key in ('process_wall_seconds', 'wall_seconds', 'cpu_seconds', 'peak_rss_bytes'):
+        values = [run[key] for run in runs if run[key] is not None]
+        merged[key] = statistics.median(values) if values else None
+    phases = set().union(*(run['phases'] for run in runs))
+    merged['phases'] = {phase: statistics.median(run['phases'].get(phase, 0.0) for run in runs) for phase in sorted(phases)}
+    merged['counters'] = runs[0]['counters']
+    return merged
+
+
+def compare_with_baseline(results: dict, baseline: dict, time_threshold: float, memory_threshold: float) -> list:
+    """
+    ベースラインとの比較結果を表示し、回帰のリストを返す
+
+    Returns:
+        回帰の説明文のリスト（なければ空）
+    """
+    if baseline.get('config') != results['config']:
+        print("⚠️  ベースラインと生成条件が異なります（比較結果は参考値）")
+        print(f"   ベースライン: {baseline.get('config')}")
+        print(f"   今回:         {results['config']}")
+
+    regressions = []
+    print("\n📏 ベースライン比較")
+    print("   シナリオ / 経過時間（ベースライン→今回） / 最大RSS（ベースライン→今回）")
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            print(f"   {name:<22} （ベースラインなし）")
+            continue
+
+        time_ratio = current['wall_seconds'] / previous['wall_seconds'] if previous['wall_seconds'] else 1.0
+        line = f"   {name:<22}{previous['wall_seconds']:8.3f}→{current['wall_seconds']:8.3f}秒 ({time_ratio - 1:+6.1%})"
+        if (time_ratio > 1 + time_threshold and
+                current['wall_seconds'] - previous['wall_seconds'] >= MIN_SIGNIFICANT_SECONDS):
+            regressions.append(f"{name}: 経過時間 {previous['wall_seconds']:.3f}秒 → {current['wall_seconds']:.3f}秒 "
+                               f"({time_ratio - 1:+.1%})")
+
+        if current['peak_rss_bytes'] and previous.get('peak_rss_bytes'):
+            memory_ratio = current['peak_rss_bytes'] / previous['peak_rss_bytes']
+            line += (f"  {previous['peak_rss_bytes'] / 2**20:7.1f}→{current['peak_rss_bytes'] / 2**20:7.1f}MB "
+                     f"({memory_ratio - 1:+6.1%})")
+            if memory_ratio > 1 + memory_threshold:
+                regressions.append(f"{name}: 最大RSS {previous['peak_rss_bytes'] / 2**20:.1f}MB → "
+                                   f"{current['peak_rss_bytes'] / 2**20:.1f}MB ({memory_ratio - 1:+.1%})")
+        print(line)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="合成コードベースによるエンドツーエンドのベンチマーク",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    add_generator_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=1, help='計測の繰り返し回数（中央値を記録、デフォルト: 1）')
+    parser.add_argument('--workers', type=int, default=None, help='crud シナリオの並列プロセス数（デフォルト: CPU数）')
+    parser.add_argument('--work-dir', help='コードベース・キャッシュの作業ディレクトリ（デフォルト: 一時ディレクトリを作成し終了時に削除）')
+    parser.add_argument('--output', help='計測結果のJSON出力先（ベースラインとして利用可能）')
+    parser.add_argument('--baseline', help='比較するベースラインJSON')
+    parser.add_argument('--time-threshold', type=float, default=0.25, help='経過時間の回帰しきい値（デフォルト: 0.25 = 25%%）')
+    parser.add_argument('--memory-threshold', type=float, default=0.20, help='最大RSSの回帰しきい値（デフォルト: 0.20 = 20%%）')
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='class-index-bench-')
+    try:
+        generator = generator_from_arguments(args)
+        codebase_dir = os.path.join(work_dir, 'codebase')
+        if os.path.exists(codebase_dir):
+            shutil.rmtree(codebase_dir)
+
+        print(f"🏗️  コードベース生成中: {generator.config()}")
+        start = time.perf_counter()
+        generated = generator.generate(codebase_dir)
+        print(f"✅ 生成完了: {generated['files']:,}ファイル (Shift_JIS: {generated['sjis_files']:,}, "
+              f"複製: {generated['duplicate_files']:,}) {time.perf_counter() - start:.1f}秒")
+
+        runs = {}
+        for repetition in range(args.repeat):
+            cache_dir = os.path.join(work_dir, f"cache_{repetition}")
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            for name, main_args in build_scenarios(generated, args):
+                result = run_scenario(name, main_args, cache_dir, work_dir)
+                runs.setdefault(name, []).append(result)
+                rss = f"{result['peak_rss_bytes'] / 2**20:.1f}MB" if result['peak_rss_bytes'] else '-'
+                print(f"   ⏱️  [{repetition + 1}/{args.repeat}] {name:<22} 経過 {result['wall_seconds']:8.3f}秒  "
+                      f"CPU {result['cpu_seconds']:8.3f}秒  最大RSS {rss}")
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+        results = {
+            'config': generated['config'],
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+            },
+            'repeat': args.repeat,
+            'scenarios': {name: median_results(scenario_runs) for name, scenario_runs in runs.items()},
+        }
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            print(f"📄 計測結果を出力: {args.output}")
+
+        if args.baseline:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = compare_with_baseline(results, baseline, args.time_threshold, args.memory_threshold)
+            if regressions:
+                print("\n❌ 回帰を検出:")
+                for regression in regressions:
+                    print(f"   {regression}")
+                sys.exit(1)
+            print("\n✅ 回帰なし")
+
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
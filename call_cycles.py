@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Call cycle detection for Smart Entity CRUD Analyzer
+呼び出しグラフの強連結成分（再帰・相互再帰の呼び出し）を求め、循環の報告と成分の縮約を行う
+
+- 強連結成分は Tarjan のアルゴリズムを明示的なスタックで実行（再帰を使わず、深い呼び出し連鎖でも再帰上限に達しない）
+- ノード数 + 辺数に線形の時間で、全コードベースの呼び出しグラフ（call_graph.CallGraph）にも適用できる
+- 対象は nodes（ノードID → 属性）と edges（呼び出し元ノードID → 呼び出し先ノードIDの集合）を持つグラフ
+  （graph_export.TracedGraph、call_graph.CallGraph）
+- 縮約したグラフは同じ形式のため、graph_export でそのまま出力できる
+"""
+
+import json
+from collections import deque
+from typing import Dict, List
+
+from models import CallCycle
+
+
+def strongly_connected_components(graph) -> List[List[str]]:
+    """
+    強連結成分を列挙（Tarjan のアルゴリズム、反復版）
+
+    Returns:
+        成分ごとのノードID一覧（成分は逆トポロジカル順、成分内は探索順）
+    """
+    edges = graph.edges
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack = set()
+    stack: List[str] = []
+    components = []
+
+    for root in _iter_roots(graph):
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges.get(root, ())))]
+
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges.get(child, ()))))
+                    break
+                if child in on_stack and index[child] < lowlink[node]:
+                    lowlink[node] = index[child]
+            else:
+                # node の呼び出し先をすべて処理した
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    component.reverse()
+                    components.append(component)
+    return components
+
+
+def _iter_roots(graph):
+    """探索の起点（ノード順、ノード表にない呼び出し元も含める）"""
+    yield from graph.nodes
+    yield from graph.edges
+
+
+def find_call_cycles(graph) -> List[CallCycle]:
+    """
+    循環（2ノード以上の強連結成分と自己再帰）を求める
+
+    Returns:
+        循環の一覧（先頭メンバーのノード表での位置順）
+    """
+    cycles = []
+    for component in strongly_connected_components(graph):
+        if len(component) == 1 and component[0] not in graph.edges.get(component[0], ()):
+            continue
+        cycles.append(CallCycle(members=component, path=_cycle_path(graph, component)))
+
+    # 成分は逆トポロジカル順のため、先頭メンバーのノード表での位置順に並べ直す（ノード表にないものは末尾）
+    positions = {}
+    for node_id in _iter_roots(graph):
+        positions.setdefault(node_id, len(positions))
+    cycles.sort(key=lambda cycle: positions.get(cycle.members[0], len(positions)))
+    return cycles
+
+
+def _cycle_path(graph, members: List[str]) -> List[str]:
+    """成分内で先頭メンバーから先頭メンバーへ戻る最短の経路（成分内の辺のみを幅優先探索）"""
+    start = members[0]
+    member_set = set(members)
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for child in graph.edges.get(node, ()):
+            if child == start:
+                path = [start]
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                path.reverse()
+                return path
+            if child in member_set and child not in parents:
+                parents[child] = node
+                queue.append(child)
+    return [start]
+
+
+class CondensedGraph:
+    """
+    循環を1ノードに縮約した呼び出しグラフ
+
+    - nodes / edges: 縮約前と同じ形式（循環のノードIDは cycle#番号、kind='cycle'）
+    - members: 循環のノードID → 縮約前のノードID一覧
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, Dict] = {}
+        self.edges: Dict[str, Dict[str, None]] = {}
+        self.members: Dict[str, List[str]] = {}
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(callee_ids) for callee_ids in self.edges.values())
+
+
+def cycle_node_id(number: int) -> str:
+    """縮約した循環のノードID（番号は1始まり）"""
+    return f"cycle#{number}"
+
+
+def collapse_cycles(graph, cycles: List[CallCycle]) -> CondensedGraph:
+    """循環ごとに成分を1ノードに縮約したグラフ（成分内の辺は除き、成分間の辺は重複なしで残す）"""
+    condensed = CondensedGraph()
+    component_of = {}
+    for number, cycle in enumerate(cycles, 1):
+        cycle_id = cycle_node_id(number)
+        condensed.members[cycle_id] = cycle.members
+        for member in cycle.members:
+            component_of[member] = cycle_id
+
+    for node_id, attributes in graph.nodes.items():
+        cycle_id = component_of.get(node_id)
+        if cycle_id is None:
+            condensed.nodes[node_id] = attributes
+        elif cycle_id not in condensed.nodes:
+            members = condensed.members[cycle_id]
+            condensed.nodes[cycle_id] = {
+                'kind': 'cycle',
+                'size': len(members),
+                'members': ', '.join(node_label(graph, member) for member in members),
+            }
+
+    for caller_id, callee_ids in graph.edges.items():
+        source = component_of.get(caller_id, caller_id)
+        for callee_id in callee_ids:
+            target = component_of.get(callee_id, callee_id)
+            if source != target:
+                condensed.edges.setdefault(source, {})[target] = None
+    return condensed
+
+
+def node_label(graph, node_id: str) -> str:
+    """ノードの表示名（クラス名.メソッド名、呼び出しグラフのノードは /引数数 付き）"""
+    attributes = graph.nodes.get(node_id)
+    if not attributes or not attributes.get('class_name'):
+        return node_id
+    label = attributes['class_name']
+    if attributes.get('method_name'):
+        label = f"{label}.{attributes['method_name']}"
+    if 'arity' in attributes:
+        label = f"{label}/{'?' if attributes['arity'] is None else attributes['arity']}"
+    return label
+
+
+def write_cycle_report(cycles: List[CallCycle], graph, output, output_format: str = 'text'):
+    """
+    循環の一覧を出力
+
+    - text: 循環ごとに経路（A → B → A）と、経路に含まれない成分のメンバー
+    - json: グラフの規模と、循環ごとのメンバー・経路
+    """
+    if output_format == 'json':
+        json.dump({
+            'nodes': len(graph.nodes),
+            'edges': graph.edge_count,
+            'cycles': [{'id': cycle_node_id(number),
+                        'size': len(cycle.members),
+                        'members': [node_label(graph, member) for member in cycle.members],
+                        'path': [node_label(graph, step) for step in cycle.path]}
+                       for number, cycle in enumerate(cycles, 1)]
+        }, output, ensure_ascii=False, indent=2)
+        output.write('\n')
+        return
+
+    recursive = sum(1 for cycle in cycles if len(cycle.members) == 1)
+    output.write(f"🔁 循環呼び出し: {len(cycles)}個（自己再帰 {recursive}個、相互再帰 {len(cycles) - recursive}個）\n")
+    for number, cycle in enumerate(cycles, 1):
+        output.write(f"   🔁 {cycle_node_id(number)} ({len(cycle.members)}メソッド): "
+                     f"{' → '.join(node_label(graph, step) for step in cycle.path)}\n")
+        path_members = set(cycle.path)
+        others = [member for member in cycle.members if member not in path_members]
+        if others:
+            output.write(f"      他の成分メンバー: {', '.join(node_label(graph, member) for member in others)}\n")
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Whole-codebase method call graph for Smart Entity CRUD Analyzer
+全ソースファイルのメソッド単位呼び出しグラフを1パスで構築する
+
+- ファイル単位の構文解析（javalang）はプロセスプールで並列実行
+- ファイル単位の抽出結果は解析キャッシュ（ファイル内容のハッシュ）に保存し、変更のないファイルは再解析しない
+- 呼び出しの解決はクラスインデックスを持つ親プロセスで実行（辞書参照のみで軽量）
+- クラスインデックスが SQLite ストアの場合は構築したグラフの辺をストアの call_edges テーブルにも保存する
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from class_indexer import MultiSourceClassIndexer, class_key, iter_unique_classes
+from index_store import SqliteClassIndex
+from instrumentation import instrumentation
+from models import ClassInfo, TraceOptions
+
+
+# メソッド呼び出しの抽出結果を保存する解析キャッシュの名前空間
+CALL_CACHE_NAMESPACE = 'calls'
+
+
+def method_node_id(class_info: ClassInfo, method_name: str, arity: Optional[int]) -> str:
+    """呼び出しグラフのノードID（完全クラス名@ソース識別子#メソッド名/引数数）"""
+    return f"{class_key(class_info)}#{method_name}/{'?' if arity is None else arity}"
+
+
+def extract_file_method_calls(file_path: str) -> Dict:
+    """
+    1ファイル分のメソッド単位の呼び出しを抽出（プロセスプールのワーカーで実行）
+
+    Returns:
+        {'file_path': str, 'digest': 解析したファイル内容のハッシュ, 'fallback': bool,
+         'methods': [{'method_name', 'arity', 'line', 'calls': [...]}]}
+    """
+    from utils import decode_with_encoding, extract_method_signatures
+    from call_resolver import collect_method_calls, extract_method_calls_regex_fallback
+    from parse_cache import content_hash
+
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    content = decode_with_encoding(data)
+    digest = content_hash(data)
+    methods = []
+
+    try:
+        import javalang
+        tree = javalang.parse.parse(content)
+
+        for _, node in tree.filter(javalang.tree.MethodDeclaration):
+            methods.append({
+                'method_name': node.name,
+                'arity': len(node.parameters or []),
+                'line': node.position.line if node.position else 0,
+                'calls': collect_method_calls(node)
+            })
+        for _, node in tree.filter(javalang.tree.ConstructorDeclaration):
+            methods.append({
+                'method_name': 'constructor',
+                'arity': len(node.parameters or []),
+                'line': node.position.line if node.position else 0,
+                'calls': collect_method_calls(node)
+            })
+        return {'file_path': file_path, 'digest': digest, 'fallback': False, 'methods': methods}
+
+    except Exception:
+        # 構文解析できないファイルはインデックスと同じ方法でメソッド範囲を特定し、正規表現で抽出
+        for method_sig in extract_method_signatures(content):
+            method_body = content[method_sig['start_offset']:method_sig['end_offset']]
+            methods.append({
+                'method_name': method_sig['method_name'],
+                'arity': len(method_sig['parameters']),
+                'line': method_sig['start_line'],
+                'calls': extract_method_calls_regex_fallback(method_body, [])
+            })
+        return {'file_path': file_path, 'digest': digest, 'fallback': True, 'methods': methods}
+
+
+class CallGraph:
+    """
+    メソッド単位の呼び出しグラフ
+
+    - nodes: ノードID → {'class_key', 'class_name', 'method_name', 'arity', 'file_path', 'source_path', 'line'}
+    - edges: 呼び出し元ノードID → 呼び出し先ノードID（挿入順を保持した重複なし集合）
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, Dict] = {}
+        self.edges: Dict[str, Dict[str, None]] = {}
+        self.fallback_files: List[str] = []
+        self._reverse_edges: Optional[Dict[str, List[str]]] = None
+
+    def add_node(self, node_id: str, class_info: ClassInfo, method_name: str, arity: Optional[int], line: int = 0):
+        """ノードを追加（既存ノードは行番号のみ補完）"""
+        node = self.nodes.get(node_id)
+        if node is None:
+            self.nodes[node_id] = {
+                'class_key': class_key(class_info),
+                'class_name': class_info.class_name,
+                'method_name': method_name,
+                'arity': arity,
+                'file_path': class_info.file_path,
+                'source_path': class_info.source_path,
+                'line': line
+            }
+        elif line and not node['line']:
+            node['line'] = line
+
+    def add_edge(self, caller_id: str, callee_id: str):
+        """呼び出し辺を追加"""
+        self.edges.setdefault(caller_id, {})[callee_id] = None
+        self._reverse_edges = None
+
+    def callees(self, node_id: str) -> List[str]:
+        """呼び出し先ノード一覧"""
+        return list(self.edges.get(node_id, ()))
+
+    def callers(self, node_id: str) -> List[str]:
+        """呼び出し元ノード一覧（逆引きは初回のみ構築）"""
+        if self._reverse_edges is None:
+            reverse_edges = {}
+            for caller_id, callee_ids in self.edges.items():
+                for callee_id in callee_ids:
+                    reverse_edges.setdefault(callee_id, []).append(caller_id)
+            self._reverse_edges = reverse_edges
+        return self._reverse_edges.get(node_id, [])
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(callee_ids) for callee_ids in self.edges.values())
+
+
+def _map_files(file_paths: List[str], workers: Optional[int]):
+    """ファイル単位の抽出を並列実行（workers=1 または1ファイル以下なら逐次）"""
+    if workers == 1 or len(file_paths) <= 1:
+        return map(extract_file_method_calls, file_paths)
+
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, len(file_paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(extract_file_method_calls, file_paths, chunksize=chunk_size))
+
+
+def _extract_files(file_paths: List[str], workers: Optional[int], call_cache) -> List[Dict]:
+    """
+    全ファイルの呼び出しを抽出（解析キャッシュがあれば、内容のハッシュが一致するファイルは抽出結果を再利用）
+    キャッシュへはワーカーが実際に解析した内容のハッシュで保存する（確認後にファイルが変更されても取り違えない）
+    """
+    if call_cache is None:
+        return list(_map_files(file_paths, workers))
+
+    from file_prefetcher import FilePrefetcher
+    from parse_cache import content_hash
+
+    results = {}
+    missed_files = []
+    for file_path, data, read_error in FilePrefetcher.from_environment().iter_files(file_paths):
+        cached = call_cache.get(content_hash(data)) if read_error is None else None
+        if cached is not None:
+            results[file_path] = dict(cached, file_path=file_path)
+        else:
+            missed_files.append(file_path)
+    instrumentation.count('call_cache_hits', len(results))
+    instrumentation.count('call_cache_misses', len(missed_files))
+
+    for file_result in _map_files(missed_files, workers):
+        results[file_result['file_path']] = file_result
+        call_cache.put(file_result['digest'], {key: value for key, value in file_result.items() if key != 'file_path'})
+    if missed_files:
+        call_cache.prune()
+    return [results[file_path] for file_path in file_paths]
+
+
+def build_call_graph(indexer: MultiSourceClassIndexer, workers: Optional[int] = None,
+                     options: TraceOptions = None) -> CallGraph:
+    """
+    クラスインデックスの全ファイルからメソッド単位の呼び出しグラフを構築
+
+    Args:
+        indexer: クラスインデックス構築済みのインデクサー
+        workers: 構文解析のプロセス数（None: CPU数、1: 逐次）
+        options: 呼び出し解決オプション（実装クラス展開など）
+    """
+    classes_by_file: Dict[str, List[ClassInfo]] = {}
+    for class_info in iter_unique_classes(indexer.class_index):
+        classes_by_file.setdefault(class_info.file_path, []).append(class_info)
+
+    file_paths = sorted(classes_by_file)
+    print(f"🔗 呼び出しグラフ構築: {len(file_paths)}ファイル (並列数: {workers or os.cpu_count()})")
+
+    graph = CallGraph()
+    call_cache = indexer.parse_cache.with_namespace(CALL_CACHE_NAMESPACE) if indexer.parse_cache else None
+    with instrumentation.phase('call_graph_extraction'):
+        file_results = _extract_files(file_paths, workers, call_cache)
+    instrumentation.count('call_graph_files', len(file_results))
+    
+    for file_result in file_results:
+        if file_result['fallback']:
+            graph.fallback_files.append(file_result['file_path'])
+            instrumentation.count('call_graph_regex_fallbacks')
+
+        for class_info in classes_by_file[file_result['file_path']]:
+            for method in file_result['methods']:
+                caller_id = method_node_id(class_info, method['method_name'], method['arity'])
+                graph.add_node(caller_id, class_info, method['method_name'], method['arity'], method['line'])
+
+                resolved_calls = resolve_calls_for_graph(indexer, method['calls'], class_info, options)
+                for target_class_info, target_method, target_arity in resolved_calls:
+                    callee_id = method_node_id(target_class_info, target_method, target_arity)
+                    target_method_info = target_class_info.find_method(target_method, target_arity)
+                    graph.add_node(callee_id, target_class_info, target_method, target_arity,
+                                   target_method_info.start_line if target_method_info else 0)
+                    graph.add_edge(caller_id, callee_id)
+
+    print(f"✅ 呼び出しグラフ構築完了: {len(graph.nodes)}ノード, {graph.edge_count}辺"
+          f" (正規表現フォールバック: {len(graph.fallback_files)}ファイル"
+          + (f", 解析キャッシュ: {call_cache.summary()}" if call_cache else "") + ")")
+
+    if isinstance(indexer.class_index, SqliteClassIndex):
+        options = options or TraceOptions()
+        graph_options = {'expand_implementations': options.expand_implementations,
+                         'max_implementations': options.max_implementations}
+        try:
+            if indexer.class_index.store.write_call_edges(graph.edges, graph_options):
+                print(f"💾 呼び出しグラフの辺を SQLite ストアに保存: {graph.edge_count}辺")
+        except Exception as e:
+            print(f"⚠️  呼び出しグラフの辺の保存エラー: {e}")
+    return graph
+
+
+def resolve_calls_for_graph(indexer: MultiSourceClassIndexer, method_calls: list, class_info: ClassInfo,
+                            options: TraceOptions = None) -> list:
+    """呼び出しを解決し、(呼び出し先クラス, メソッド名, 引数数) のリストを返す"""
+    from call_resolver import resolve_method_calls
+
+    resolved = []
+    for call in resolve_method_calls(indexer, method_calls, class_info.imports, options, class_info.source_path,
+                                     class_info):
+        if not call.get('resolved', False):
+            continue
+        target_class_info = indexer.get_class_info(call.get('target_full_class', call['target_class']),
+                                                   call.get('target_source'))
+        if target_class_info:
+            resolved.append((target_class_info, call['target_method'], call.get('target_arity')))
+    return resolved
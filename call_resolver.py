@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Method call extraction and resolution for Smart Entity CRUD Analyzer
+メソッド呼び出しの抽出（javalang / 正規表現フォールバック）とクラスインデックスによる解決
+トレーサー（main.py）と全コードベース解析（call_graph.py）で共用する
+"""
+
+from class_indexer import MultiSourceClassIndexer
+from instrumentation import instrumentation
+from models import ClassInfo, TraceOptions
+
+
+def extract_method_calls_from_specific_method(file_content: str, target_method: str, imports: list, method_info=None) -> list:
+    """特定メソッド内からのみメソッド呼び出しを抽出"""
+    
+    # Step 1: 特定メソッドの範囲を特定（インデックスに範囲があればオーバーロード単位で切り出し）
+    if method_info is not None and method_info.has_span:
+        method_body = file_content[method_info.start_offset:method_info.end_offset]
+    else:
+        method_body = extract_method_body(file_content, target_method)
+    if not method_body:
+        return []
+    
+    # Step 2: そのメソッド内のメソッド呼び出しを抽出
+    return extract_method_calls(method_body, imports)
+
+
+def extract_method_body(file_content: str, method_name: str) -> str:
+    """特定メソッドのボディ部分を抽出"""
+    import re
+    
+    # メソッド定義の開始を探す
+    # パターン: public/private/static などのキーワードに続くメソッド名
+    method_pattern = rf'(public|private|protected|static|\s)+.*?\b{re.escape(method_name)}\s*\([^)]*\)\s*\{{'
+    
+    lines = file_content.split('\n')
+    method_start_line = -1
+    
+    # メソッド開始行を見つける
+    for i, line in enumerate(lines):
+        if re.search(method_pattern, line):
+            method_start_line = i
+            break
+    
+    if method_start_line == -1:
+        return ""
+    
+    # 中括弧のバランスを取ってメソッド終了を見つける
+    brace_count = 0
+    method_end_line = -1
+    started = False
+    
+    for i in range(method_start_line, len(lines)):
+        line = lines[i]
+        
+        # 文字列リテラル内の中括弧は無視（簡易版）
+        line_without_strings = re.sub(r'"[^"]*"', '""', line)
+        
+        for char in line_without_strings:
+            if char == '{':
+                brace_count += 1
+                started = True
+            elif char == '}':
+                brace_count -= 1
+                
+                if started and brace_count == 0:
+                    method_end_line = i
+                    break
+        
+        if method_end_line != -1:
+            break
+    
+    if method_end_line == -1:
+        return ""
+    
+    # メソッドボディを抽出
+    method_lines = lines[method_start_line:method_end_line + 1]
+    return '\n'.join(method_lines)
+
+
+def extract_method_calls(file_content: str, imports: list) -> list:
+    """javalangを使ってファイル内容からメソッド呼び出しを抽出"""
+    import javalang
+    
+    instrumentation.count('javalang_parses')
+    try:
+        # JavaコードをASTに変換
+        with instrumentation.phase('javalang_parse'):
+            tree = javalang.parse.parse(file_content)
+        return collect_method_calls(tree)
+    
+    except Exception as e:
+        instrumentation.count('javalang_failures')
+        print(f"      ⚠️ javalang解析エラー、フォールバック実行: {e}")
+        # フォールバック：正規表現ベース
+        with instrumentation.phase('regex_fallback'):
+            return extract_method_calls_regex_fallback(file_content, imports)
+
+
+def collect_method_calls(node_tree) -> list:
+    """javalangのAST（ファイル全体またはメソッド宣言ノード）からメソッド呼び出しを収集"""
+    import javalang
+    
+    method_calls = []
+    
+    # ASTを走査してメソッド呼び出しを抽出
+    for path, node in node_tree.filter(javalang.tree.MethodInvocation):
+        if node.qualifier is None:
+            # 式のセレクタ（this.method()、this.field.method()、a.b().method() の後続部分）
+            method_calls.append(_classify_selector_call(path, node))
+        elif node.qualifier:
+            # object.method() 形式
+            obj_name = None
+            
+            # 様々な修飾子のタイプを処理
+            if isinstance(node.qualifier, str):
+                # javalangは単純な修飾子を文字列で保持: userEntityManager.find(), System.out.println()
+                obj_name = node.qualifier.split('.')[-1]
+            elif hasattr(node.qualifier, 'name'):
+                # 単純な変数参照: userEntityManager.find()
+                obj_name = node.qualifier.name
+            elif hasattr(node.qualifier, 'member'):
+                # フィールドアクセス: this.manager.find()
+                obj_name = node.qualifier.member
+            elif hasattr(node.qualifier, 'type'):
+                # 型参照: ClassName.staticMethod()
+                if hasattr(node.qualifier.type, 'name'):
+                    obj_name = node.qualifier.type.name
+            
+            if obj_name:
+                method_name = node.member
+                method_calls.append({
+                    'type': 'instance_call',
+                    'object': obj_name,
+                    'method': method_name,
+                    'arg_count': len(node.arguments or []),
+                    'pattern': f"{obj_name}.{method_name}()"
+                })
+            else:
+                # 解析できない修飾子の場合
+                method_name = node.member
+                method_calls.append({
+                    'type': 'unknown_call',
+                    'method': method_name,
+                    'arg_count': len(node.arguments or []),
+                    'pattern': f"?.{method_name}()",
+                    'qualifier': str(type(node.qualifier))
+                })
+        else:
+            # 直接メソッド呼び出し method()
+            method_name = node.member
+            method_calls.append({
+                'type': 'local_call',
+                'method': method_name,
+                'arg_count': len(node.arguments or []),
+                'pattern': f"{method_name}()"
+            })
+    
+    # コンストラクタ呼び出しを抽出
+    for _, node in node_tree.filter(javalang.tree.ClassCreator):
+        class_name = node.type.name
+        method_calls.append({
+            'type': 'constructor_call',
+            'class': class_name,
+            'method': 'constructor',
+            'arg_count': len(node.arguments or []),
+            'pattern': f"new {class_name}()"
+        })
+    
+    return method_calls
+
+
+def _classify_selector_call(path, node) -> dict:
+    """セレクタとしてのメソッド呼び出しを this.method()（自クラス）/ this.field.method() / 解析不能な連鎖呼び出しに分類"""
+    import javalang
+    
+    method_name = node.member
+    arg_count = len(node.arguments or [])
+    selectors = path[-1] if path and isinstance(path[-1], list) else None
+    parent = path[-2] if selectors is not None and len(path) >= 2 else None
+    
+    if isinstance(parent, javalang.tree.This) and parent.qualifier is None:
+        position = next((i for i, selector in enumerate(selectors) if selector is node), -1)
+        if position == 0:
+            # this.method()
+            return {
+                'type': 'local_call',
+                'method': method_name,
+                'arg_count': arg_count,
+                'pattern': f"this.{method_name}()"
+            }
+        if position == 1 and isinstance(selectors[0], javalang.tree.MemberReference):
+            # this.field.method()
+            obj_name = selectors[0].member
+            return {
+                'type': 'instance_call',
+                'object': obj_name,
+                'method': method_name,
+                'arg_count': arg_count,
+                'pattern': f"{obj_name}.{method_name}()"
+            }
+    
+    # a.b().method() 等の呼び出し結果に対する呼び出し（受け手の型が分からない）
+    return {
+        'type': 'unknown_call',
+        'method': method_name,
+        'arg_count': arg_count,
+        'pattern': f"?.{method_name}()",
+        'qualifier': 'selector'
+    }
+
+
+# 正規表現フォールバックで「修飾なしの呼び出し」と誤認しやすい予約語
+_NON_METHOD_KEYWORDS = frozenset({
+    'if', 'for', 'while', 'switch', 'catch', 'synchronized', 'return', 'throw', 'new',
+    'super', 'this', 'try', 'do', 'else', 'assert', 'case'
+})
+
+
+def extract_method_calls_regex_fallback(file_content: str, imports: list) -> list:
+    """正規表現ベースのフォールバック実装"""
+    import re
+    from utils import count_call_arguments
+    
+    method_calls = []
+    
+    # パターン1: object.method() 形式
+    pattern1 = re.compile(r'(\w+)\.(\w+)\s*\(')
+    
+    for match in pattern1.finditer(file_content):
+        obj_name, method_name = match.group(1), match.group(2)
+        if obj_name == 'this':
+            # this.method() は自クラスのメソッド呼び出し
+            method_calls.append({
+                'type': 'local_call',
+                'method': method_name,
+                'arg_count': count_call_arguments(file_content, match.end() - 1),
+                'pattern': f"this.{method_name}()"
+            })
+            continue
+        method_calls.append({
+            'type': 'instance_call',
+            'object': obj_name,
+            'method': method_name,
+            'arg_count': count_call_arguments(file_content, match.end() - 1),
+            'pattern': f"{obj_name}.{method_name}()"
+        })
+    
+    # パターン2: new ClassName() 形式
+    pattern2 = re.compile(r'new\s+(\w+)\s*\(')
+    
+    for match in pattern2.finditer(file_content):
+        class_name = match.group(1)
+        method_calls.append({
+            'type': 'constructor_call',
+            'class': class_name,
+            'method': 'constructor',
+            'arg_count': count_call_arguments(file_content, match.end() - 1),
+            'pattern': f"new {class_name}()"
+        })
+    
+    # パターン3: 修飾なしの method() 形式（演算子・区切り記号・return 等の直後のみ。型名に続くメソッド宣言は除外）
+    pattern3 = re.compile(r'(?<![\w.$@])(\w+)\s*\(')
+    preceding_pattern = re.compile(r'(?:[=(),;{}!&|?:+\-*/%]|\breturn|\belse|\bthrow)$')
+    
+    for match in pattern3.finditer(file_content):
+        method_name = match.group(1)
+        if method_name in _NON_METHOD_KEYWORDS or method_name[:1].isdigit():
+            continue
+        pos = match.start()
+        while pos > 0 and file_content[pos - 1].isspace():
+            pos -= 1
+        preceding = file_content[max(0, pos - 8):pos]
+        if preceding and not preceding_pattern.search(preceding):
+            continue
+        method_calls.append({
+            'type': 'local_call',
+            'method': method_name,
+            'arg_count': count_call_arguments(file_content, match.end() - 1),
+            'pattern': f"{method_name}()"
+        })
+    
+    return method_calls
+
+
+def resolve_method_calls(indexer: MultiSourceClassIndexer, method_calls: list, imports: list, options: TraceOptions = None, caller_source: str = None,
+                         caller_class_info: ClassInfo = None) -> list:
+    """
+    メソッド呼び出しをクラスインデックスで解決
+    caller_source（呼び出し元のソース識別子）が指定された場合、同名クラスは呼び出し元→依存ソースの順で解決する
+    caller_class_info（呼び出し元クラス）が指定された場合、method() / this.method() は呼び出し元クラスのメソッドとして解決する
+    """
+    with instrumentation.phase('call_resolution'):
+        resolved = _resolve_method_calls(indexer, method_calls, imports, options, caller_source, caller_class_info)
+    
+    instrumentation.count('resolutions_attempted', len(method_calls))
+    instrumentation.count('resolutions_succeeded', sum(1 for call in resolved if call.get('resolved', False)))
+    return resolved
+
+
+def _resolve_method_calls(indexer: MultiSourceClassIndexer, method_calls: list, imports: list, options: TraceOptions = None, caller_source: str = None,
+                          caller_class_info: ClassInfo = None) -> list:
+    """resolve_method_calls の本体"""
+    
+    options = options or TraceOptions()
+    resolved = []
+    
+    for call in method_calls:
+        if call['type'] == 'local_call':
+            # 自クラスのメソッド呼び出しの解決（継承したメソッド等、呼び出し元クラスに定義がないものは従来どおり扱わない）
+            target_method_info = None
+            if caller_class_info is not None:
+                target_method_info = caller_class_info.find_method(call['method'], call.get('arg_count'))
+            
+            if target_method_info:
+                resolved.append({
+                    'call_pattern': call['pattern'],
+                    'target_class': caller_class_info.class_name,
+                    'target_method': call['method'],
+                    'target_arity': target_method_info.arity,
+                    'target_parameters': list(target_method_info.parameters),
+                    'target_file': caller_class_info.file_path,
+                    'target_package': caller_class_info.package_name,
+                    'target_source': caller_class_info.source_path,
+                    'target_full_class': caller_class_info.full_class_name,
+                    'resolved': True
+                })
+        
+        elif call['type'] == 'constructor_call':
+            # コンストラクタ呼び出しの解決
+            class_name = call['class']
+            
+            # クラス情報を取得（import・呼び出し元ソースパスを考慮）
+            target_class_info = _lookup_class(indexer, class_name, imports, caller_source)
+            if target_class_info:
+                resolved.append({
+                    'call_pattern': call['pattern'],
+                    'target_class': class_name,
+                    'target_method': 'constructor',
+                    'target_arity': call.get('arg_count'),
+                    'target_file': target_class_info.file_path,
+                    'target_package': target_class_info.package_name,
+                    'target_source': target_class_info.source_path,
+                    'target_full_class': target_class_info.full_class_name,
+                    'resolved': True
+                })
+            else:
+                resolved.append(_resolve_library_call(indexer, call, class_name, imports) or {
+                    'call_pattern': call['pattern'],
+                    'target_class': class_name,
+                    'resolved': False
+                })
+        
+        elif call['type'] == 'instance_call':
+            # インスタンスメソッド呼び出しの解決
+            obj_name = call['object']
+            method_name = call['method']
+            
+            # オブジェクト名からクラス名を推測（簡易版）
+            guessed_class = guess_class_from_object_name(obj_name, imports)
+            
+            if guessed_class:
+                target_class_info = _lookup_class(indexer, guessed_class, imports, caller_source)
+                # 呼び出し側の引数数でオーバーロードを特定（引数数不明なら同名の先頭定義）
+                target_method_info = None
+                if target_class_info:
+                    target_method_info = target_class_info.find_method(method_name, call.get('arg_count'))
+                
+                if target_method_info:
+                    resolved.append({
+                        'call_pattern': call['pattern'],
+                        'target_class': guessed_class,
+                        'target_method': method_name,
+                        'target_arity': target_method_info.arity,
+                        'target_parameters': list(target_method_info.parameters),
+                        'target_file': target_class_info.file_path,
+                        'target_package': target_class_info.package_name,
+                        'target_source': target_class_info.source_path,
+                        'target_full_class': target_class_info.full_class_name,
+                        'resolved': True
+                    })
+                    
+                    # interface/abstract宣言への呼び出しは実装クラスへ展開（本体のない宣言で探索が途切れるため）
+                    if options.expand_implementations and (target_class_info.is_interface or target_method_info.is_abstract):
+                        resolved.extend(_expand_implementation_calls(indexer, call, target_class_info, options, caller_source))
+                elif not target_class_info:
+                    resolved.append(_resolve_library_call(indexer, call, guessed_class, imports) or {
+                        'call_pattern': call['pattern'],
+                        'target_class': guessed_class,
+                        'target_method': method_name,
+                        'resolved': False
+                    })
+                else:
+                    resolved.append({
+                        'call_pattern': call['pattern'],
+                        'target_class': guessed_class,
+                        'target_method': method_name,
+                        'resolved': False
+                    })
+            else:
+                # ClassName.staticMethod() 形式はライブラリのクラスとして解決を試みる
+                library_call = None
+                if obj_name[:1].isupper():
+                    library_call = _resolve_library_call(indexer, call, obj_name, imports)
+                resolved.append(library_call or {
+                    'call_pattern': call['pattern'],
+                    'resolved': False
+                })
+    
+    return resolved
+
+
+def _lookup_class(indexer: MultiSourceClassIndexer, class_name: str, imports: list, caller_source: str = None):
+    """import済みの完全クラス名→単純クラス名の順に、呼び出し元ソースパスを優先してクラスを検索"""
+    
+    for imp in imports:
+        if imp.endswith('.' + class_name):
+            class_info = indexer.get_class_info(imp, caller_source)
+            if class_info:
+                return class_info
+            break
+    
+    return indexer.get_class_info(class_name, caller_source)
+
+
+def _resolve_library_call(indexer: MultiSourceClassIndexer, call: dict, class_name: str, imports: list) -> dict:
+    """JARライブラリのクラスへの呼び出しを終端として解決（クラス・メソッド・引数の数が一致しなければNone）"""
+    
+    library_index = getattr(indexer, 'library_index', None)
+    if not library_index:
+        return None
+    
+    full_class_name = library_index.resolve_class(class_name, imports)
+    if not full_class_name:
+        return None
+    
+    # ライブラリに存在しないメソッド・引数の数の呼び出しは終端とせず未解決のまま残す
+    if not library_index.has_method(full_class_name, call['method'], call.get('arg_count')):
+        return None
+    
+    return {
+        'call_pattern': call['pattern'],
+        'target_class': class_name,
+        'target_method': call['method'],
+        'target_full_class': full_class_name,
+        'target_library': library_index.jar_of(full_class_name),
+        'terminal': True,
+        'resolved': False
+    }
+
+
+def _expand_implementation_calls(indexer: MultiSourceClassIndexer, call: dict, declared_class_info, options: TraceOptions,
+                                 caller_source: str = None) -> list:
+    """
+    interface/abstractクラスへの呼び出しを実装クラスへの呼び出しに展開
+    実装クラスは呼び出し元のソースパス → 依存ソースの順（クラス解決と同じ順序）に優先し、上限を超える分は後ろから打ち切る
+    """
+    
+    hierarchy = indexer.get_type_hierarchy()
+    implementations, truncated = hierarchy.find_implementations(
+        declared_class_info, call['method'], call.get('arg_count'),
+        source_order=indexer.source_resolution_order.get(caller_source) if caller_source else None,
+        limit=options.max_implementations
+    )
+    
+    if truncated:
+        print(f"      ⚠️ {declared_class_info.class_name}.{call['method']}() の実装クラスが多いため{options.max_implementations}件のみ展開")
+    
+    expanded = []
+    for impl_class_info, impl_method_info in implementations:
+        expanded.append({
+            'call_pattern': call['pattern'],
+            'target_class': impl_class_info.class_name,
+            'target_method': call['method'],
+            'target_arity': impl_method_info.arity,
+            'target_parameters': list(impl_method_info.parameters),
+            'target_file': impl_class_info.file_path,
+            'target_package': impl_class_info.package_name,
+            'target_source': impl_class_info.source_path,
+            'target_full_class': impl_class_info.full_class_name,
+            'via_interface': declared_class_info.class_name,
+            'resolved': True
+        })
+    
+    return expanded
+
+
+def guess_class_from_object_name(obj_name: str, imports: list) -> str:
+    """オブジェクト名からクラス名を推測"""
+    
+    # よくあるパターン: userEntityManager → UserEntityManager
+    if 'entitymanager' in obj_name.lower():
+        for imp in imports:
+            if 'EntityManager' in imp:
+                return imp.split('.')[-1]
+    
+    if 'ormapper' in obj_name.lower():
+        for imp in imports:
+            if 'ORMapper' in imp:
+                return imp.split('.')[-1]
+    
+    if 'service' in obj_name.lower():
+        for imp in imports:
+            if 'Service' in imp:
+                return imp.split('.')[-1]
+    
+    # その他のパターンも追加可能
+    return None
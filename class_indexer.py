@@ -8,19 +8,52 @@ Class indexer for Smart Entity CRUD Analyzer
 import os
 import json
 import time
+import hashlib
 from pathlib import Path
 from typing import Dict, List
-from collections import defaultdict
 
 from models import ClassInfo, MethodInfo
 from utils import (
-    read_file_with_encoding, 
+    decode_with_encoding,
     get_source_identifier,
     extract_package_and_class_name,
     extract_method_signatures,
     extract_imports,
-    find_java_files
+    extract_class_hierarchy,
+    find_java_files,
+    atomic_write_json
 )
+from sql_extractor import contains_sql_hint, extract_string_constants, extract_sql_statements, build_table_index
+from parse_cache import ParseCache, content_hash
+from file_prefetcher import FilePrefetcher
+from instrumentation import instrumentation
+from index_cache import CACHE_FORMAT_VERSION, settings_file_digest, index_cache_path, index_store_kind, validate_cache_metadata
+from index_store import SqliteIndexStore, SqliteClassIndex, SqliteMethodNameIndex
+from git_changes import find_git_roots, capture_git_state, detect_changed_files, merge_git_states
+
+
+def class_key(class_info: ClassInfo) -> str:
+    """クラスを一意に識別するキー（完全クラス名@ソース識別子）"""
+    return f"{class_info.full_class_name}@{class_info.source_path}"
+
+
+def iter_unique_classes(all_classes: Dict[str, ClassInfo]):
+    """
+    クラスインデックスから重複なしでクラス情報を列挙
+    インデックスは1クラスを複数キーで登録しているため、完全特定キーのみを採用する
+    """
+    for key, class_info in all_classes.items():
+        if key == class_key(class_info):
+            yield class_info
+
+
+def build_index_shard_file(source_paths: List[str], shard_index: int, shard_count: int, output_file: str,
+                           settings_digest: str = '') -> int:
+    """シャード1つ分の部分インデックスを出力（プロセスプールのワーカーから呼び出す）"""
+    indexer = MultiSourceClassIndexer(cache_enabled=False)
+    indexer.settings_digest = settings_digest
+    indexer.parse_cache = ParseCache.from_environment(CACHE_FORMAT_VERSION)
+    return indexer.build_index_shard(source_paths, shard_index, shard_count, output_file)
 
 
 class MultiSourceClassIndexer:
@@ -36,12 +69,25 @@ class MultiSourceClassIndexer:
     def __init__(self, cache_enabled: bool = True):
         self.source_paths = []  # 解決済み絶対パスリスト
         self.cache_enabled = cache_enabled
-        self.cache_file = "multi_source_class_index_cache.json"
+        self.cache_file = None  # None: キャッシュディレクトリ内で設定ファイル・ソースパスのハッシュから決定
+        self.settings_digest = ''  # 設定ファイル内容のハッシュ（キャッシュのキー・検証に使用）
+        self._type_hierarchy = None  # 継承・実装関係インデックス（遅延構築）
+        self._name_search = None  # (クラスインデックス, 名前検索インデックス)（遅延構築）
+        self._method_name_index = None  # (クラスインデックス, メソッド名 → 定義クラスの逆引き)（遅延構築）
+        self.library_index = None  # JARライブラリ索引（jar_indexer.LibraryIndex）
+        self.source_resolution_order = {}  # ソース識別子 → クラス解決時に探すソース識別子の順序
+        self.table_index = {}  # テーブル名 → 埋め込みSQLでテーブルを参照するメソッド一覧
+        self.parse_cache = None  # ファイル内容ハッシュ単位の抽出結果キャッシュ（parse_cache.ParseCache）
+        self.file_prefetcher = None  # ファイル先読み（None: 構築ごとに環境変数の設定で作成）
+        self._git_state = None  # 構築時の git の状態（キャッシュに記録し、次回の変更ファイル検出に使用）
+        self.store_kind = index_store_kind()  # キャッシュの保存形式（json / sqlite）
         
-    def build_class_index(self, source_paths: List[str]) -> Dict[str, ClassInfo]:
+    def build_class_index(self, source_paths: List[str], force_rebuild: bool = False) -> Dict[str, ClassInfo]:
         """
         複数ソースパスからクラスインデックスを構築
         
+        force_rebuild: キャッシュを読まずに全件構築する（構築結果・git の状態はキャッシュに保存する）
+        
         戻り値のキー形式：
         - "ClassName" : 最初に見つかったクラス（後方互換性）
         - "ClassName@aios_cas:src" : ソースパス特定版
@@ -49,45 +95,73 @@ class MultiSourceClassIndexer:
         - "full.package.ClassName@aios_cas:src" : 完全クラス名+ソース特定版
         """
         self.source_paths = source_paths
+        self._build_source_resolution_order(source_paths)
+        self._resolve_cache_file(source_paths)
         
-        # キャッシュチェック
-        if self.cache_enabled and self._is_cache_valid(source_paths):
-            print("🚀 キャッシュからクラスインデックスを読み込み中...")
-            return self._load_from_cache()
+        # キャッシュチェック（git 作業ツリー内なら git で変更ファイルを検出し、変更分だけ再解析）
+        self._git_state = None
+        git_roots = None
+        if self.cache_enabled:
+            with instrumentation.phase('cache_validation'):
+                git_roots = find_git_roots(source_paths)
+        if self.cache_enabled and not force_rebuild:
+            if git_roots is not None:
+                refreshed_classes = self._refresh_from_git(source_paths, git_roots)
+                if refreshed_classes:
+                    return refreshed_classes
+            else:
+                with instrumentation.phase('cache_validation'):
+                    cache_valid = self._is_cache_valid(source_paths)
+                if cache_valid:
+                    print("🚀 キャッシュからクラスインデックスを読み込み中...")
+                    with instrumentation.phase('cache_load'):
+                        cached_classes = self._load_from_cache()
+                    if cached_classes:
+                        if not self.table_index:
+                            self.table_index = build_table_index(cached_classes)
+                        return cached_classes
+        
+        # 走査前の git の状態を記録（構築中に変更されたファイルは次回の変更ファイルとして検出される）
+        if git_roots is not None:
+            self._git_state = capture_git_state(git_roots)
         
-        all_classes = {}
+        all_classes = self._new_class_index()
         
         print(f"🏗️  複数ソースパス対応クラスインデックス構築開始")
         print(f"📁 対象ソースパス: {len(source_paths)}個")
         
         # ソースパス別統計
         source_stats = {}
+        work_items = []
         
-        for source_path in source_paths:
-            source_identifier = get_source_identifier(source_path, source_paths)
+        for source_path, source_identifier, java_files in self._iter_source_files(source_paths):
             source_stats[source_identifier] = 0
+            print(f"   🔍 解析対象: {source_identifier} ({source_path})")
             
-            print(f"   🔍 解析中: {source_identifier} ({source_path})")
-            
-            if not Path(source_path).exists():
+            if java_files is None:
                 print(f"   ⚠️  ソースパス未発見: {source_path}")
                 continue
-            
-            # Java ファイルを検索
-            java_files = find_java_files(source_path)
             print(f"   📄 Javaファイル: {len(java_files)}個")
-            
-            for java_file in java_files:
-                try:
-                    class_info = self._extract_class_info(java_file, source_path, source_identifier)
-                    if class_info:
-                        # 複数のキーでインデックス登録
-                        self._register_class_info(all_classes, class_info)
-                        source_stats[source_identifier] += 1
-                        
-                except Exception as e:
-                    print(f"   ⚠️  ファイル解析エラー {Path(java_file).name}: {e}")
-                    continue
+            work_items.extend((source_path, source_identifier, java_file) for java_file in java_files)
+        
+        # ファイル読み込みはI/Oスレッドで先読みし、走査順に解析・登録する
+        prefetcher = self.file_prefetcher or FilePrefetcher.from_environment()
+        parse_seconds = 0.0
+        for (source_path, source_identifier, java_file), data, read_error in prefetcher.iter_files(work_items, lambda item: item[2]):
+            parse_start = time.perf_counter()
+            try:
+                if read_error is not None:
+                    raise read_error
+                with instrumentation.phase('class_extraction'):
+                    class_info = self._extract_class_info(java_file, source_path, source_identifier, data)
+                if class_info:
+                    # 複数のキーでインデックス登録
+                    self._register_class_info(all_classes, class_info)
+                    source_stats[source_identifier] += 1
+                    
+            except Exception as e:
+                print(f"   ⚠️  ファイル解析エラー {Path(java_file).name}: {e}")
+            parse_seconds += time.perf_counter() - parse_start
         
         # 統計出力
         total_classes = len([k for k in all_classes.keys() if '@' not in k and '.' not in k])  # 基本クラス名のみカウント
@@ -99,19 +173,372 @@ class MultiSourceClassIndexer:
         
         print(f"   🔑 総インデックスキー数: {len(all_classes)}個")
         
+        # 埋め込みSQLのテーブル → メソッド インデックス
+        self.table_index = build_table_index(all_classes)
+        print(f"   🗄️  埋め込みSQL参照テーブル: {len(self.table_index)}個")
+        print(f"   📥 ファイル読み込み: {prefetcher.summary(parse_seconds)}")
+        self._report_parse_cache()
+        
         # キャッシュに保存
         if self.cache_enabled:
+            with instrumentation.phase('cache_save'):
+                self._save_to_cache(all_classes, source_paths)
+        
+        return all_classes
+
+    def _refresh_from_git(self, source_paths: List[str], git_roots: Dict[str, str]) -> Dict[str, ClassInfo]:
+        """
+        キャッシュを読み込み、構築時に記録した git の状態からの変更ファイルだけを再解析して更新
+        git の状態が記録されていない・変更を検出できない場合は stat 走査で有効性を判定する
+
+        Returns:
+            クラスインデックス（キャッシュを使えない場合は空 → 全件構築）
+        """
+        if not os.path.exists(self.cache_file):
+            return {}
+        with instrumentation.phase('cache_load'):
+            cache_data = self._read_cache_data()
+        if not cache_data:
+            return {}
+        
+        with instrumentation.phase('cache_validation'):
+            changes = detect_changed_files(git_roots, cache_data['metadata'].get('git'))
+        if changes is None:
+            print("⚠️  git で変更ファイルを検出できません - 更新時刻で確認します")
+            with instrumentation.phase('cache_validation'):
+                if not self._is_cache_valid(source_paths):
+                    return {}
+            print("🚀 キャッシュからクラスインデックスを読み込み中...")
+            with instrumentation.phase('cache_load'):
+                return self._restore_from_cache_data(cache_data)
+        
+        changed_paths, self._git_state = changes
+        changed_files = self._map_changed_files(changed_paths, source_paths)
+        if changed_files and len({get_source_identifier(path, source_paths) for path in source_paths}) != len(source_paths):
+            # ソース識別子からソースパスを一意に決められない場合は走査順を再現できない
+            return {}
+        instrumentation.count('git_changed_files', len(changed_files))
+        if not changed_files:
+            print(f"✅ キャッシュが最新です (git: 構築時から .java ファイルの変更なし)")
+            print("🚀 キャッシュからクラスインデックスを読み込み中...")
+            with instrumentation.phase('cache_load'):
+                return self._restore_from_cache_data(cache_data)
+        
+        print(f"🔄 git で検出した変更ファイル: {len(changed_files)}個 - 変更分を再解析します")
+        with instrumentation.phase('cache_load'):
+            cached_classes = self._restore_from_cache_data(cache_data)
+        if not cached_classes:
+            return {}
+        with instrumentation.phase('incremental_refresh'):
+            all_classes = self._reindex_changed_files(cached_classes, changed_files, source_paths)
+        
+        with instrumentation.phase('cache_save'):
             self._save_to_cache(all_classes, source_paths)
+        return all_classes
+
+    @staticmethod
+    def _map_changed_files(changed_paths: set, source_paths: List[str]) -> set:
+        """
+        git の変更ファイル（realpath）をソースパス配下のファイルパス（find_java_files と同じ表記）に変換
+        ソースパス外・.java 以外のファイルは除く
+        """
+        changed_files = set()
+        for source_path in source_paths:
+            real_source_path = os.path.realpath(source_path)
+            prefix = real_source_path.rstrip(os.sep) + os.sep
+            for changed_path in changed_paths:
+                if changed_path.endswith('.java') and changed_path.startswith(prefix):
+                    changed_files.add(os.path.join(source_path, os.path.relpath(changed_path, real_source_path)))
+        return changed_files
+
+    @staticmethod
+    def _scan_order_key(source_order: int, source_path: str, file_path: str) -> tuple:
+        """
+        全件構築（find_java_files）の走査順を再現するソートキー
+        ソースパス順 → 各ディレクトリではファイル（名前順）の後にサブディレクトリ（名前順）
+        """
+        parts = os.path.relpath(file_path, source_path).split(os.sep)
+        return (source_order, tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),))
+
+    def _reindex_changed_files(self, cached_classes: Dict[str, ClassInfo], changed_files: set, source_paths: List[str]) -> Dict[str, ClassInfo]:
+        """
+        変更ファイルのクラス情報だけを差し替えてクラスインデックスを再登録
+        全件構築と同じ走査順で登録し直すため、同名クラスの先勝ちも全件構築と一致する
+        """
+        source_orders = {get_source_identifier(source_path, source_paths): (order, source_path)
+                         for order, source_path in enumerate(source_paths)}
         
+        # 変更のないファイルのクラス情報はキャッシュから引き継ぐ
+        entries = []
+        seen = set()
+        for class_info in cached_classes.values():
+            if id(class_info) in seen:
+                continue
+            seen.add(id(class_info))
+            if class_info.file_path in changed_files or class_info.source_path not in source_orders:
+                continue
+            order, source_path = source_orders[class_info.source_path]
+            entries.append((self._scan_order_key(order, source_path, class_info.file_path), class_info))
+        
+        # 変更ファイル（削除済みを除く）を、含まれる全ソースパスで再解析
+        work_items = []
+        for order, source_path in enumerate(source_paths):
+            source_identifier = get_source_identifier(source_path, source_paths)
+            prefix = source_path.rstrip(os.sep) + os.sep
+            for java_file in sorted(changed_files):
+                if java_file.startswith(prefix) and os.path.isfile(java_file):
+                    work_items.append((order, source_path, source_identifier, java_file))
+        
+        prefetcher = self.file_prefetcher or FilePrefetcher.from_environment()
+        for (order, source_path, source_identifier, java_file), data, read_error in prefetcher.iter_files(work_items, lambda item: item[3]):
+            try:
+                if read_error is not None:
+                    raise read_error
+                with instrumentation.phase('class_extraction'):
+                    class_info = self._extract_class_info(java_file, source_path, source_identifier, data)
+                if class_info:
+                    entries.append((self._scan_order_key(order, source_path, java_file), class_info))
+            except Exception as e:
+                print(f"   ⚠️  ファイル解析エラー {Path(java_file).name}: {e}")
+        
+        entries.sort(key=lambda entry: entry[0])
+        all_classes = self._new_class_index()
+        for _, class_info in entries:
+            self._register_class_info(all_classes, class_info)
+        
+        self.table_index = build_table_index(all_classes)
+        deleted_count = len([java_file for java_file in changed_files if not os.path.isfile(java_file)])
+        print(f"🏛️  クラスインデックス更新完了: 再解析 {len(work_items)}ファイル, 削除 {deleted_count}ファイル, "
+              f"総インデックスキー数 {len(all_classes)}個")
+        self._report_parse_cache()
+        return all_classes
+
+    def set_settings_file(self, settings_path: str):
+        """設定ファイルの内容をキャッシュのキーに含める（設定の異なる実行同士でキャッシュを取り違えない）"""
+        self.settings_digest = settings_file_digest(settings_path)
+
+    def _resolve_cache_file(self, source_paths: List[str]):
+        """
+        キャッシュファイルのパスを決定（明示指定されていない場合）
+        <キャッシュディレクトリ>/index/class_index_<設定ファイル・解決済みソースパスのハッシュ>.json（SQLite ストアは .sqlite）
+        """
+        if self.cache_file:
+            return
+        self.cache_file = index_cache_path(self.settings_digest, source_paths, self.store_kind)
+    
+    def _new_class_index(self):
+        """
+        構築用の空のクラスインデックス
+        SQLite ストアでは登録したクラスを一時ファイルのストアに直接書き込む（構築中も全クラスをメモリに保持しない）
+        """
+        if self.store_kind == 'sqlite' and self.cache_enabled:
+            return SqliteClassIndex(SqliteIndexStore.create(self.cache_file),
+                                    self._serialize_class_info, self._deserialize_class_info)
+        return {}
+
+    def _iter_source_files(self, source_paths: List[str]):
+        """
+        ソースパスごとの対象Javaファイルを走査順に列挙（存在しないソースパスの java_files は None）
+        全件構築・シャード構築の両方がこの順序を使うため、先勝ち登録の結果が一致する
+        """
+        for source_path in source_paths:
+            source_identifier = get_source_identifier(source_path, source_paths)
+            if not Path(source_path).exists():
+                yield source_path, source_identifier, None
+                continue
+            yield source_path, source_identifier, find_java_files(source_path)
+
+    def build_file_manifest(self, source_paths: List[str]) -> List[tuple]:
+        """
+        全件構築と同じ走査順のファイル一覧（作業マニフェスト）を作成
+
+        Returns:
+            [(通し番号, ソースパス, ソース識別子, Javaファイル)]
+        """
+        manifest = []
+        for source_path, source_identifier, java_files in self._iter_source_files(source_paths):
+            for java_file in java_files or []:
+                manifest.append((len(manifest), source_path, source_identifier, java_file))
+        return manifest
+
+    @staticmethod
+    def manifest_digest(manifest: List[tuple]) -> str:
+        """マニフェストのダイジェスト（ソース識別子＋ソースルートからの相対パスで計算し、ホスト間で比較可能）"""
+        digest = hashlib.sha1()
+        for ordinal, source_path, source_identifier, java_file in manifest:
+            digest.update(f"{ordinal}\t{source_identifier}\t{os.path.relpath(java_file, source_path)}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def build_index_shard(self, source_paths: List[str], shard_index: int, shard_count: int, output_file: str) -> int:
+        """
+        マニフェストの shard_index 番目のシャード（通し番号 % shard_count == shard_index）を解析し、部分インデックスを出力
+
+        Returns:
+            シャードで抽出したクラス数
+        """
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"シャード指定が不正です: {shard_index}/{shard_count}")
+
+        # 走査前の git の状態を記録（結合時にキャッシュのメタデータへ引き継ぐ）
+        git_roots = find_git_roots(source_paths)
+        git_state = capture_git_state(git_roots) if git_roots is not None else None
+
+        manifest = self.build_file_manifest(source_paths)
+        shard_files = [entry for entry in manifest if entry[0] % shard_count == shard_index]
+        print(f"🧩 シャード {shard_index}/{shard_count}: {len(shard_files)}/{len(manifest)}ファイル")
+
+        entries = []
+        prefetcher = self.file_prefetcher or FilePrefetcher.from_environment()
+        for (ordinal, source_path, source_identifier, java_file), data, read_error in prefetcher.iter_files(shard_files, lambda entry: entry[3]):
+            try:
+                if read_error is not None:
+                    raise read_error
+                class_info = self._extract_class_info(java_file, source_path, source_identifier, data)
+                if class_info:
+                    entries.append([ordinal, self._serialize_class_info(class_info)])
+            except Exception as e:
+                print(f"   ⚠️  ファイル解析エラー {Path(java_file).name}: {e}")
+
+        shard_data = {
+            'metadata': {
+                'format_version': CACHE_FORMAT_VERSION,
+                'created_at': time.time(),
+                'source_paths': source_paths,
+                'shard_index': shard_index,
+                'shard_count': shard_count,
+                'manifest_size': len(manifest),
+                'manifest_digest': self.manifest_digest(manifest),
+                'settings_digest': self.settings_digest,
+                'git': git_state
+            },
+            'classes': entries
+        }
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(shard_data, f, ensure_ascii=False)
+        self._report_parse_cache()
+
+        print(f"✅ 部分インデックスを出力: {output_file} ({len(entries)}クラス)")
+        return len(entries)
+
+    def merge_index_shards(self, shard_files: List[str]) -> Dict[str, ClassInfo]:
+        """
+        部分インデックスを結合（マニフェストの通し番号順に登録し、全件構築と同じ先勝ちになる）
+        全シャードが同じマニフェスト・同じ分割数で揃っていない場合はエラー
+        """
+        shards = {}
+        git_states = []
+        reference = None
+        for shard_file in shard_files:
+            with open(shard_file, 'r', encoding='utf-8') as f:
+                shard_data = json.load(f)
+            metadata = shard_data.get('metadata', {})
+
+            if metadata.get('format_version') != CACHE_FORMAT_VERSION:
+                raise ValueError(f"部分インデックスの形式が異なります: {shard_file}")
+            signature = (metadata.get('shard_count'), metadata.get('manifest_digest'))
+            if reference is None:
+                reference = signature
+                source_paths = metadata.get('source_paths', [])
+                settings_digest = metadata.get('settings_digest', '')
+            elif signature != reference:
+                raise ValueError(f"マニフェストまたは分割数が他のシャードと一致しません: {shard_file}")
+            if metadata['shard_index'] in shards:
+                raise ValueError(f"シャード {metadata['shard_index']} が重複しています: {shard_file}")
+            shards[metadata['shard_index']] = shard_data['classes']
+            git_states.append(metadata.get('git'))
+
+        if reference is None:
+            raise ValueError("部分インデックスが指定されていません")
+        shard_count = reference[0]
+        missing = [str(index) for index in range(shard_count) if index not in shards]
+        if missing:
+            raise ValueError(f"シャードが不足しています: {', '.join(missing)} (全{shard_count}シャード)")
+
+        entries = sorted((entry for classes in shards.values() for entry in classes), key=lambda entry: entry[0])
+
+        self.source_paths = list(source_paths)
+        self.settings_digest = settings_digest
+        self._git_state = merge_git_states(git_states)
+        self._build_source_resolution_order(self.source_paths)
+        self._resolve_cache_file(self.source_paths)
+        all_classes = self._new_class_index()
+        for _, class_data in entries:
+            self._register_class_info(all_classes, self._deserialize_class_info(class_data))
+
+        self.table_index = build_table_index(all_classes)
+        print(f"🧩 部分インデックス結合完了: {shard_count}シャード, {len(entries)}クラス, {len(all_classes)}キー")
+
+        if self.cache_enabled:
+            self._save_to_cache(all_classes, self.source_paths)
+
         return all_classes
+
+    def _report_parse_cache(self):
+        """解析キャッシュの利用状況を出力し、サイズ上限を超えていれば古いエントリを削除"""
+        if self.parse_cache is None:
+            return
+        removed = self.parse_cache.prune()
+        print(f"   💾 解析キャッシュ: {self.parse_cache.summary()}" + (f", 削除: {removed}" if removed else ""))
     
-    def _extract_class_info(self, file_path: str, source_path: str, source_identifier: str) -> ClassInfo:
+    def _extract_class_info(self, file_path: str, source_path: str, source_identifier: str, data: bytes = None) -> ClassInfo:
         """
         Javaファイルからクラス情報を抽出
+        data（先読み済みのファイル内容）が指定されない場合はファイルを読み込む
+        解析キャッシュが有効な場合、同じ内容のファイルの抽出結果を再利用する
+        """
+        if data is None:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        instrumentation.count('files_read')
+        instrumentation.count('bytes_read', len(data))
+        
+        digest = None
+        if self.parse_cache is not None:
+            digest = content_hash(data)
+            cached = self.parse_cache.get(digest)
+            if cached is not None:
+                instrumentation.count('parse_cache_hits')
+                return self._restore_cached_class_info(cached, file_path, source_identifier)
+            instrumentation.count('parse_cache_misses')
+        
+        instrumentation.count('class_parses')
+        class_info = self._parse_class_info(decode_with_encoding(data), file_path, source_identifier)
+        if class_info is None:
+            instrumentation.count('class_parse_failures')
+        
+        if digest is not None:
+            self.parse_cache.put(digest, self._detach_class_info(class_info))
+        return class_info
+    
+    def _detach_class_info(self, class_info: ClassInfo) -> dict:
+        """解析キャッシュ用に、ファイルパス・ソース識別子を除いたクラス情報を作成（クラスなしは None）"""
+        if class_info is None:
+            return {'class': None}
+        class_data = self._serialize_class_info(class_info)
+        class_data['file_path'] = class_data['source_path'] = ''
+        for overloads in class_data['overloads'].values():
+            for method_data in overloads:
+                method_data['file_path'] = method_data['source_path'] = ''
+        return {'class': class_data}
+    
+    def _restore_cached_class_info(self, cached: dict, file_path: str, source_identifier: str) -> ClassInfo:
+        """解析キャッシュの抽出結果にファイルパス・ソース識別子を付け直して復元"""
+        class_data = cached.get('class')
+        if class_data is None:
+            return None
+        class_data['file_path'] = file_path
+        class_data['source_path'] = source_identifier
+        for overloads in class_data['overloads'].values():
+            for method_data in overloads:
+                method_data['file_path'] = file_path
+                method_data['source_path'] = source_identifier
+        return self._deserialize_class_info(class_data)
+    
+    def _parse_class_info(self, content: str, file_path: str, source_identifier: str) -> ClassInfo:
+        """
+        Javaソースの内容からクラス情報を抽出
         """
         try:
-            content = read_file_with_encoding(file_path)
-            
             # パッケージ名・クラス名を抽出
             package_name, class_name = extract_package_and_class_name(content)
             
@@ -121,9 +548,13 @@ class MultiSourceClassIndexer:
             # 完全クラス名を構築
             full_class_name = f"{package_name}.{class_name}" if package_name else class_name
             
-            # メソッドシグネチャを抽出
+            # メソッドシグネチャを抽出（オーバーロードは全て保持）
             method_signatures = extract_method_signatures(content)
             methods = {}
+            overloads = {}
+            
+            # 埋め込みSQL抽出用の文字列定数（SQLキーワードを含まないファイルは省略）
+            string_constants = extract_string_constants(content) if contains_sql_hint(content) else None
             
             for method_sig in method_signatures:
                 method_info = MethodInfo(
@@ -131,14 +562,27 @@ class MultiSourceClassIndexer:
                     class_name=class_name,
                     method_name=method_sig['method_name'],
                     return_type=method_sig['return_type'],
-                    parameters=[],  # 簡略版では未実装
-                    source_path=source_identifier
+                    parameters=method_sig['parameters'],
+                    source_path=source_identifier,
+                    is_abstract=method_sig['is_abstract'],
+                    start_offset=method_sig['start_offset'],
+                    end_offset=method_sig['end_offset'],
+                    start_line=method_sig['start_line'],
+                    end_line=method_sig['end_line']
                 )
-                methods[method_sig['method_name']] = method_info
+                if string_constants is not None and not method_sig['is_abstract']:
+                    method_body = content[method_sig['start_offset']:method_sig['end_offset']]
+                    method_info.sql_statements = extract_sql_statements(method_body, string_constants)
+                # 同名メソッドは最初の定義を代表とする（後方互換性）
+                methods.setdefault(method_sig['method_name'], method_info)
+                overloads.setdefault(method_sig['method_name'], []).append(method_info)
             
             # import文を抽出
             imports = extract_imports(content)
             
+            # 継承・実装関係を抽出
+            hierarchy = extract_class_hierarchy(content, class_name)
+            
             return ClassInfo(
                 class_name=class_name,
                 full_class_name=full_class_name,
@@ -146,7 +590,12 @@ class MultiSourceClassIndexer:
                 source_path=source_identifier,
                 package_name=package_name,
                 methods=methods,
-                imports=imports
+                imports=imports,
+                overloads=overloads,
+                superclass=hierarchy['superclass'],
+                interfaces=hierarchy['interfaces'],
+                is_interface=hierarchy['is_interface'],
+                is_abstract=hierarchy['is_abstract']
             )
             
         except Exception as e:
@@ -180,15 +629,16 @@ class MultiSourceClassIndexer:
         クラス検索（複数ソースパス対応）
         
         検索順序:
-        1. preferred_sourceが指定されている場合、そのソース優先
+        1. preferred_sourceが指定されている場合、そのソース→依存ソースの順で優先
         2. 完全クラス名での検索
         3. 基本クラス名での検索
         """
-        # 1. ソース特定検索
+        # 1. ソース特定検索（事前計算した解決順序に従う）
         if preferred_source:
-            source_specific_key = f"{class_name}@{preferred_source}"
-            if source_specific_key in all_classes:
-                return all_classes[source_specific_key]
+            for source_id in self.source_resolution_order.get(preferred_source, (preferred_source,)):
+                source_specific_key = f"{class_name}@{source_id}"
+                if source_specific_key in all_classes:
+                    return all_classes[source_specific_key]
         
         # 2. 完全クラス名検索
         if class_name in all_classes and '.' in class_name:
@@ -200,12 +650,85 @@ class MultiSourceClassIndexer:
         
         return None
     
-    def get_class_info(self, class_name: str) -> ClassInfo:
-        """クラス情報を取得"""
+    def get_class_info(self, class_name: str, preferred_source: str = None) -> ClassInfo:
+        """クラス情報を取得（preferred_source: 呼び出し元のソース識別子）"""
         if hasattr(self, 'class_index') and self.class_index:
-            return self.search_class(self.class_index, class_name)
+            return self.search_class(self.class_index, class_name, preferred_source)
         return None
     
+    def _build_source_resolution_order(self, source_paths: List[str]):
+        """
+        ソース識別子ごとのクラス解決順序を事前計算
+        呼び出し元と同じソースパスを最優先し、続いて依存先（設定ファイル記載順の他ソースパス）を探す
+        """
+        source_ids = []
+        for source_path in source_paths:
+            source_id = get_source_identifier(source_path, source_paths)
+            if source_id not in source_ids:
+                source_ids.append(source_id)
+        
+        self.source_resolution_order = {
+            source_id: tuple([source_id] + [other for other in source_ids if other != source_id])
+            for source_id in source_ids
+        }
+    
+    def get_type_hierarchy(self):
+        """継承・実装関係インデックスを取得（class_index に対して初回のみ構築）"""
+        class_index = getattr(self, 'class_index', None) or {}
+        if self._type_hierarchy is None or self._type_hierarchy.all_classes is not class_index:
+            from type_hierarchy import TypeHierarchyIndex
+            self._type_hierarchy = TypeHierarchyIndex(class_index)
+        return self._type_hierarchy
+    
+    def get_method_name_index(self) -> Dict[str, set]:
+        """
+        メソッド名 → 定義クラスのクラスキー（完全クラス名@ソース識別子）集合 の逆引きインデックスを取得
+        （class_index に対して初回のみ構築。SQLite ストアでは全クラスを読み込まず、メソッド名ごとにストアの索引を引く）
+        """
+        class_index = getattr(self, 'class_index', None) or {}
+        if self._method_name_index is None or self._method_name_index[0] is not class_index:
+            if isinstance(class_index, SqliteClassIndex):
+                method_name_index = SqliteMethodNameIndex(class_index.store)
+            else:
+                method_name_index = {}
+                for class_info in iter_unique_classes(class_index):
+                    key = class_key(class_info)
+                    for method_name in class_info.overloads:
+                        method_name_index.setdefault(method_name, set()).add(key)
+            self._method_name_index = (class_index, method_name_index)
+        return self._method_name_index[1]
+    
+    def get_name_search(self):
+        """クラス名・メソッド名の検索インデックスを取得（class_index に対して初回のみ構築）"""
+        class_index = getattr(self, 'class_index', None) or {}
+        if self._name_search is None or self._name_search[0] is not class_index:
+            from name_search import NameSearchIndex, class_index_records
+            self._name_search = (class_index, NameSearchIndex(class_index_records(class_index)))
+        return self._name_search[1]
+    
+    def search_names(self, query: str, kinds=('class', 'method'), limit: int = 20, max_distance: int = None) -> list:
+        """
+        クラス名・完全クラス名・メソッド名を前方一致・部分一致・あいまい一致で検索
+        
+        Returns:
+            models.SearchHit の一覧（完全一致 > 前方一致 > 部分一致 > あいまい一致の順）
+        """
+        return self.get_name_search().search(query, kinds, limit, max_distance)
+    
+    def find_table_usages(self, table_name: str, access: str = None, crud_types: List[str] = None) -> List[dict]:
+        """
+        埋め込みSQLでテーブルを参照するメソッドを検索（ソースの再走査なし）
+
+        Args:
+            table_name: テーブル名（大文字小文字は区別しない、スキーマ修飾なしでも検索可）
+            access: 'write' / 'read' で参照種別を限定
+            crud_types: ['CREATE', 'UPDATE'] 等で文種別を限定
+        """
+        usages = self.table_index.get(table_name.upper(), [])
+        return [usage for usage in usages
+                if (access is None or usage['access'] == access) and
+                   (crud_types is None or usage['crud_type'] in crud_types)]
+
     def debug_print_index(self, all_classes: Dict[str, ClassInfo], max_entries: int = 10):
         """デバッグ用：インデックス内容を出力"""
         print(f"\n🔍 クラスインデックス内容（最初の{max_entries}件）:")
@@ -254,56 +777,98 @@ class MultiSourceClassIndexer:
             print(f"⚠️  キャッシュ有効性確認エラー: {e}")
             return False
     
+    def _cache_metadata(self, all_classes: Dict[str, ClassInfo], source_paths: List[str]) -> dict:
+        """キャッシュのメタデータ（JSON・SQLite ストア共通）"""
+        return {
+            'format_version': CACHE_FORMAT_VERSION,
+            'created_at': time.time(),
+            'source_paths': source_paths,
+            'settings_digest': self.settings_digest,
+            'git': self._git_state,
+            'total_classes': len([k for k in all_classes.keys() if '@' not in k and '.' not in k])
+        }
+    
     def _save_to_cache(self, all_classes: Dict[str, ClassInfo], source_paths: List[str]):
         """クラスインデックスをキャッシュに保存"""
+        if self.store_kind == 'sqlite':
+            self._save_to_store(all_classes, source_paths)
+            return
         try:
             cache_data = {
-                'metadata': {
-                    'created_at': time.time(),
-                    'source_paths': source_paths,
-                    'total_classes': len([k for k in all_classes.keys() if '@' not in k and '.' not in k])
-                },
-                'classes': {}
+                'metadata': self._cache_metadata(all_classes, source_paths),
+                'classes': [],
+                'index': {},
+                'table_index': self.table_index
             }
             
-            for class_key, class_info in all_classes.items():
-                # メソッド情報をシリアライズ
-                methods_data = {}
-                for method_name, method_info in class_info.methods.items():
-                    methods_data[method_name] = {
-                        'file_path': method_info.file_path,
-                        'class_name': method_info.class_name,
-                        'method_name': method_info.method_name,
-                        'return_type': method_info.return_type,
-                        'parameters': method_info.parameters,
-                        'source_path': method_info.source_path
-                    }
-                
-                # クラス情報をシリアライズ
-                cache_data['classes'][class_key] = {
-                    'class_name': class_info.class_name,
-                    'full_class_name': class_info.full_class_name,
-                    'file_path': class_info.file_path,
-                    'source_path': class_info.source_path,
-                    'package_name': class_info.package_name,
-                    'methods': methods_data,
-                    'imports': class_info.imports
-                }
+            # 1クラスを複数キーで登録しているため、クラス情報は1回だけ保存しキーからは位置で参照する
+            positions = {}
+            for key, class_info in all_classes.items():
+                position = positions.get(id(class_info))
+                if position is None:
+                    position = positions[id(class_info)] = len(cache_data['classes'])
+                    cache_data['classes'].append(self._serialize_class_info(class_info))
+                cache_data['index'][key] = position
             
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            # 一時ファイルへの書き出し + rename（ロックで同時書き込みを直列化）
+            # インデントなし（indent 指定時は json の C 実装エンコーダが使われず保存が遅くなる）
+            atomic_write_json(self.cache_file, cache_data)
             
             print(f"✅ クラスインデックスをキャッシュに保存: {self.cache_file}")
             
         except Exception as e:
             print(f"⚠️  キャッシュ保存エラー: {e}")
     
+    def _save_to_store(self, all_classes: Dict[str, ClassInfo], source_paths: List[str]):
+        """クラスインデックスを SQLite ストアに保存（構築中のストアは確定、辞書のインデックスは新しいストアに書き込む）"""
+        store = None
+        try:
+            if not isinstance(all_classes, SqliteClassIndex) or all_classes.store.temp_path is None:
+                view = self._new_class_index()
+                view.update(all_classes)
+                all_classes = view
+            store = all_classes.store
+            store.commit(self._cache_metadata(all_classes, source_paths), self.table_index)
+            print(f"✅ クラスインデックスを SQLite ストアに保存: {self.cache_file}")
+        except Exception as e:
+            if store is not None:
+                store.abort()
+            print(f"⚠️  キャッシュ保存エラー: {e}")
+    
     def _load_from_cache(self) -> Dict[str, ClassInfo]:
         """キャッシュからクラスインデックスを読み込み"""
+        cache_data = self._read_cache_data()
+        return self._restore_from_cache_data(cache_data) if cache_data else {}
+    
+    def _read_cache_data(self) -> dict:
+        """
+        キャッシュファイルを読み込み、形式・ソースパス・設定ファイルを確認（使えない場合は None）
+        SQLite ストアはメタデータだけを読み、{'metadata', 'store'} を返す
+        """
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            if self.store_kind == 'sqlite':
+                store = SqliteIndexStore.open(self.cache_file)
+                cache_data = {'metadata': store.metadata, 'store': store}
+            else:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    cache_data = json.load(f)
+            
+            # 旧形式（オーバーロード情報を持たない等）・別の設定やソースパスで作成されたキャッシュは使わない
+            try:
+                validate_cache_metadata(cache_data.get('metadata', {}), self.source_paths, self.settings_digest)
+            except ValueError as e:
+                print(f"⚠️  {e} - 再構築します")
+                return None
             
+            return cache_data
+            
+        except Exception as e:
+            print(f"❌ キャッシュ読み込みエラー: {e}")
+            return None
+    
+    def _restore_from_cache_data(self, cache_data: dict) -> Dict[str, ClassInfo]:
+        """読み込み済みのキャッシュからクラスインデックスを復元"""
+        try:
             all_classes = {}
             metadata = cache_data.get('metadata', {})
             
@@ -312,35 +877,99 @@ class MultiSourceClassIndexer:
             print(f"   📁 ソースパス数: {len(metadata.get('source_paths', []))}")
             print(f"   📦 総クラス数: {metadata.get('total_classes', 0)}")
             
-            for class_key, class_data in cache_data.get('classes', {}).items():
-                # メソッド情報を復元
-                methods = {}
-                for method_name, method_data in class_data.get('methods', {}).items():
-                    methods[method_name] = MethodInfo(
-                        file_path=method_data['file_path'],
-                        class_name=method_data['class_name'],
-                        method_name=method_data['method_name'],
-                        return_type=method_data['return_type'],
-                        parameters=method_data['parameters'],
-                        source_path=method_data['source_path']
-                    )
-                
-                # クラス情報を復元
-                class_info = ClassInfo(
-                    class_name=class_data['class_name'],
-                    full_class_name=class_data['full_class_name'],
-                    file_path=class_data['file_path'],
-                    source_path=class_data['source_path'],
-                    package_name=class_data['package_name'],
-                    methods=methods,
-                    imports=class_data['imports']
-                )
+            if 'store' in cache_data:
+                # SQLite ストアはクラス情報を参照時に読み込む
+                all_classes = SqliteClassIndex(cache_data['store'], self._serialize_class_info, self._deserialize_class_info)
+                self.table_index = cache_data['store'].read_table_index()
+            else:
+                # 同じクラスのキーは同じクラス情報を共有する（全件構築時と同じ）
+                classes = [self._deserialize_class_info(class_data) for class_data in cache_data.get('classes', [])]
+                for key, position in cache_data.get('index', {}).items():
+                    all_classes[key] = classes[position]
                 
-                all_classes[class_key] = class_info
+                self.table_index = cache_data.get('table_index', {})
             
             print(f"✅ キャッシュからクラスインデックスを読み込み完了: {len(all_classes)}個のキー")
             return all_classes
             
         except Exception as e:
             print(f"❌ キャッシュ読み込みエラー: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    @staticmethod
+    def _serialize_method_info(method_info: MethodInfo) -> dict:
+        """メソッド情報をキャッシュ用の辞書に変換"""
+        return {
+            'file_path': method_info.file_path,
+            'class_name': method_info.class_name,
+            'method_name': method_info.method_name,
+            'return_type': method_info.return_type,
+            'parameters': method_info.parameters,
+            'source_path': method_info.source_path,
+            'is_abstract': method_info.is_abstract,
+            'start_offset': method_info.start_offset,
+            'end_offset': method_info.end_offset,
+            'start_line': method_info.start_line,
+            'end_line': method_info.end_line,
+            'sql_statements': method_info.sql_statements
+        }
+    
+    @staticmethod
+    def _deserialize_method_info(method_data: dict) -> MethodInfo:
+        """キャッシュの辞書からメソッド情報を復元"""
+        return MethodInfo(
+            file_path=method_data['file_path'],
+            class_name=method_data['class_name'],
+            method_name=method_data['method_name'],
+            return_type=method_data['return_type'],
+            parameters=method_data['parameters'],
+            source_path=method_data['source_path'],
+            is_abstract=method_data.get('is_abstract', False),
+            start_offset=method_data.get('start_offset', 0),
+            end_offset=method_data.get('end_offset', 0),
+            start_line=method_data.get('start_line', 0),
+            end_line=method_data.get('end_line', 0),
+            sql_statements=method_data.get('sql_statements', [])
+        )
+    
+    def _serialize_class_info(self, class_info: ClassInfo) -> dict:
+        """クラス情報をキャッシュ用の辞書に変換"""
+        return {
+            'class_name': class_info.class_name,
+            'full_class_name': class_info.full_class_name,
+            'file_path': class_info.file_path,
+            'source_path': class_info.source_path,
+            'package_name': class_info.package_name,
+            'overloads': {
+                method_name: [self._serialize_method_info(m) for m in overloads]
+                for method_name, overloads in class_info.overloads.items()
+            },
+            'imports': class_info.imports,
+            'superclass': class_info.superclass,
+            'interfaces': class_info.interfaces,
+            'is_interface': class_info.is_interface,
+            'is_abstract': class_info.is_abstract
+        }
+    
+    def _deserialize_class_info(self, class_data: dict) -> ClassInfo:
+        """キャッシュの辞書からクラス情報を復元"""
+        overloads = {
+            method_name: [self._deserialize_method_info(m) for m in overloads_data]
+            for method_name, overloads_data in class_data.get('overloads', {}).items()
+        }
+        methods = {method_name: overloads[0] for method_name, overloads in overloads.items() if overloads}
+        
+        return ClassInfo(
+            class_name=class_data['class_name'],
+            full_class_name=class_data['full_class_name'],
+            file_path=class_data['file_path'],
+            source_path=class_data['source_path'],
+            package_name=class_data['package_name'],
+            methods=methods,
+            imports=class_data['imports'],
+            overloads=overloads,
+            superclass=class_data.get('superclass', ''),
+            interfaces=class_data.get('interfaces', []),
+            is_interface=class_data.get('is_interface', False),
+            is_abstract=class_data.get('is_abstract', False)
+        )
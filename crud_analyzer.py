@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Entity CRUD matrix analyzer for Smart Entity CRUD Analyzer
+起点クラス（Controller/Batch等）× Entity × CRUD のマトリクスを全コードベース1パスで作成
+
+- 呼び出しグラフは call_graph で全ファイルを並列に1回だけ構築
+- 起点クラスごとに呼び出しグラフを幅優先探索し、ORMapper/EntityManager の終端メソッドで停止
+- 終端メソッドのCRUD種別はインデックス時に抽出した埋め込みSQL → メソッド名パターンの順で判定
+"""
+
+import re
+import csv
+import json
+from collections import deque
+from typing import Dict, List, Optional
+
+from class_indexer import MultiSourceClassIndexer, iter_unique_classes
+from call_graph import CallGraph, build_call_graph
+from models import (
+    CrudType, ClassInfo, CodeLocation, MethodCall, MethodDefinition, MethodChain,
+    CRUDOperation, EntityAnalysisResult, CrudMatrixResult, TraceOptions
+)
+from sql_extractor import strongest_statement
+from utils import read_file_with_encoding
+
+
+# 終端クラスの判定用サフィックス
+ORMAPPER_SUFFIX = 'ORMapper'
+ENTITY_MANAGER_SUFFIX = 'EntityManager'
+ENTITY_SUFFIX = 'Entity'
+
+# 起点クラスのデフォルトパターン
+DEFAULT_ENTRY_PATTERN = r'(Controller|Batch|UCControl|Action)$'
+
+# メソッド名 → CRUD種別（do/exec 等の接頭辞を除いた先頭一致）
+_METHOD_NAME_PATTERNS = [
+    (CrudType.CREATE, re.compile(r'^(?:do|exec|execute)?(?:insert|create|add|regist|save|persist)', re.IGNORECASE)),
+    (CrudType.UPDATE, re.compile(r'^(?:do|exec|execute)?(?:update|modify|change|edit|merge|upsert)', re.IGNORECASE)),
+    (CrudType.DELETE, re.compile(r'^(?:do|exec|execute)?(?:delete|remove|erase|purge)', re.IGNORECASE)),
+    (CrudType.READ, re.compile(r'^(?:do|exec|execute)?(?:select|find|get|search|count|exists|load|fetch|read|query|list)',
+                               re.IGNORECASE)),
+]
+
+_TYPE_NAME_PATTERN = re.compile(r'\w+')
+
+# 判定根拠ごとの信頼度
+SQL_CONFIDENCE = 0.9
+METHOD_NAME_CONFIDENCE = 0.7
+
+
+def classify_method_name(method_name: str) -> Optional[CrudType]:
+    """メソッド名のパターンからCRUD種別を判定（判定できなければNone）"""
+    for crud_type, pattern in _METHOD_NAME_PATTERNS:
+        if pattern.match(method_name):
+            return crud_type
+    return None
+
+
+class CrudMatrixAnalyzer:
+    """
+    起点クラス × Entity × CRUD マトリクスの解析器
+
+    終端メソッド:
+      - ORMapper クラスのメソッド
+      - ORMapper を呼び出さない EntityManager クラスのメソッド
+    """
+
+    def __init__(self, indexer: MultiSourceClassIndexer, entry_pattern: str = DEFAULT_ENTRY_PATTERN,
+                 workers: Optional[int] = None, options: TraceOptions = None):
+        self.indexer = indexer
+        self.entry_pattern = re.compile(entry_pattern)
+        self.workers = workers
+        self.options = options
+        self.graph: Optional[CallGraph] = None
+        self._entity_names = {class_info.class_name for class_info in iter_unique_classes(indexer.class_index)
+                              if self._is_entity_class(class_info.class_name)}
+        self._file_contents: Dict[str, str] = {}
+        self._terminal_cache: Dict[str, Optional[Dict]] = {}
+
+    @staticmethod
+    def _is_entity_class(class_name: str) -> bool:
+        return class_name.endswith(ENTITY_SUFFIX) and class_name != ENTITY_SUFFIX
+
+    def analyze(self) -> CrudMatrixResult:
+        """全起点クラスを解析してCRUDマトリクスを作成"""
+        self.graph = build_call_graph(self.indexer, self.workers, self.options)
+
+        result = CrudMatrixResult()
+        for entity_name in sorted(self._entity_names):
+            entity_class_info = self.indexer.get_class_info(entity_name)
+            result.entities[entity_name] = EntityAnalysisResult(
+                name=entity_name,
+                package=entity_class_info.package_name if entity_class_info else ""
+            )
+
+        entry_nodes: Dict[str, List[str]] = {}
+        for node_id, node in self.graph.nodes.items():
+            if self.entry_pattern.search(node['class_name']) and node['method_name'] != 'constructor':
+                entry_nodes.setdefault(node['class_name'], []).append(node_id)
+
+        print(f"🎯 起点クラス: {len(entry_nodes)}個 (パターン: {self.entry_pattern.pattern})")
+        for entry_class in sorted(entry_nodes):
+            result.entry_points.append(entry_class)
+            self._analyze_entry_class(entry_class, entry_nodes[entry_class], result)
+
+        for entity_result in result.entities.values():
+            entity_result.no_pattern_detected = not entity_result.method_chains
+
+        return result
+
+    def _analyze_entry_class(self, entry_class: str, start_node_ids: List[str], result: CrudMatrixResult):
+        """起点クラスの全メソッドから幅優先探索し、到達した終端メソッドをマトリクスに記録"""
+        parents: Dict[str, Optional[str]] = {node_id: None for node_id in start_node_ids}
+        queue = deque(start_node_ids)
+
+        while queue:
+            node_id = queue.popleft()
+            terminal = self._get_terminal(node_id)
+            if terminal is not None and parents[node_id] is not None:
+                self._record_terminal(entry_class, node_id, terminal, parents, result)
+                continue
+
+            for callee_id in self.graph.callees(node_id):
+                if callee_id not in parents:
+                    parents[callee_id] = node_id
+                    queue.append(callee_id)
+
+    def _get_terminal(self, node_id: str) -> Optional[Dict]:
+        """終端メソッドならCRUD判定結果を返す（終端でなければNone、結果はノード単位でキャッシュ）"""
+        if node_id in self._terminal_cache:
+            return self._terminal_cache[node_id]
+
+        node = self.graph.nodes[node_id]
+        class_name = node['class_name']
+        is_ormapper = class_name.endswith(ORMAPPER_SUFFIX)
+        is_terminal = is_ormapper or (
+            class_name.endswith(ENTITY_MANAGER_SUFFIX) and
+            not any(self.graph.nodes[callee_id]['class_name'].endswith(ORMAPPER_SUFFIX)
+                    for callee_id in self.graph.callees(node_id)))
+
+        terminal = None
+        if is_terminal:
+            class_info = self.indexer.class_index.get(node['class_key'])
+            method_info = class_info.find_method(node['method_name'], node['arity']) if class_info else None
+            method_body = self._get_method_body(node['file_path'], method_info)
+
+            # 埋め込みSQLはインデックス構築時に抽出済み（複数文の場合は最も強い文で判定）
+            statement = strongest_statement(method_info.sql_statements) if method_info else None
+            crud_type = CrudType(statement['crud_type']) if statement else None
+            sql_pattern = statement['sql'] if statement else None
+            evidence = f"SQL: {statement['verb']} {', '.join(statement['tables'])}" if statement else ""
+            confidence = SQL_CONFIDENCE
+            if crud_type is None:
+                crud_type = classify_method_name(node['method_name'])
+                evidence = f"メソッド名: {node['method_name']}"
+                confidence = METHOD_NAME_CONFIDENCE
+
+            terminal = {
+                'crud_type': crud_type,
+                'entity': self._infer_entity(class_info, method_info) if class_info else None,
+                'sql_pattern': sql_pattern,
+                'confidence': confidence,
+                'evidence': evidence,
+                'is_ormapper': is_ormapper,
+                'method_body': method_body,
+                'has_implementation': bool(method_info and not method_info.is_abstract)
+            }
+
+        self._terminal_cache[node_id] = terminal
+        return terminal
+
+    def _get_method_body(self, file_path: str, method_info) -> str:
+        """メソッド定義の範囲からメソッド本体を取得（ファイル内容は解析中キャッシュ）"""
+        if method_info is None or not method_info.has_span:
+            return ""
+        content = self._file_contents.get(file_path)
+        if content is None:
+            content = read_file_with_encoding(file_path)
+            self._file_contents[file_path] = content
+        return content[method_info.start_offset:method_info.end_offset]
+
+    def _infer_entity(self, class_info: ClassInfo, method_info) -> Optional[str]:
+        """
+        終端クラスが扱うEntityを推定
+        推定順序: クラス名（UserORMapper/UserEntityManager → UserEntity, User）→ 引数型 → 戻り値型
+        """
+        base_name = class_info.class_name
+        for suffix in (ORMAPPER_SUFFIX, ENTITY_MANAGER_SUFFIX):
+            if base_name.endswith(suffix):
+                base_name = base_name[:-len(suffix)]
+                break
+
+        for candidate in (base_name + ENTITY_SUFFIX, base_name):
+            if candidate in self._entity_names:
+                return candidate
+
+        if method_info is not None:
+            for type_text in list(method_info.parameters) + [method_info.return_type]:
+                for type_name in _TYPE_NAME_PATTERN.findall(type_text or ''):
+                    if type_name in self._entity_names:
+                        return type_name
+        return None
+
+    def _record_terminal(self, entry_class: str, node_id: str, terminal: Dict,
+                         parents: Dict[str, Optional[str]], result: CrudMatrixResult):
+        """到達した終端メソッドをマトリクス・Entity解析結果に記録"""
+        node = self.graph.nodes[node_id]
+        method_label = f"{node['class_name']}.{node['method_name']}"
+
+        if terminal['crud_type'] is None:
+            if method_label not in result.unclassified_terminals:
+                result.unclassified_terminals.append(method_label)
+            return
+        if terminal['entity'] is None:
+            if method_label not in result.unresolved_entity_terminals:
+                result.unresolved_entity_terminals.append(method_label)
+            return
+
+        crud_type = terminal['crud_type'].value
+        entity_result = result.entities[terminal['entity']]
+        result.add_cell(entry_class, terminal['entity'], crud_type)
+
+        location = CodeLocation(
+            file_path=node['file_path'],
+            line_number=node['line'],
+            line_content=terminal['method_body'].split('\n', 1)[0].strip(),
+            context=entry_class
+        )
+        entity_result.add_operations([CRUDOperation(
+            operation_type=crud_type,
+            method_name=method_label,
+            sql_pattern=terminal['sql_pattern'],
+            confidence=terminal['confidence'],
+            source_location=location,
+            evidence=terminal['evidence']
+        )])
+
+        # 起点メソッド → 終端メソッドの呼び出し経路
+        path = []
+        current = node_id
+        while current is not None:
+            path.append(current)
+            current = parents[current]
+        path.reverse()
+
+        start_node = self.graph.nodes[path[0]]
+        chain_steps = [MethodCall(
+            method_name=self.graph.nodes[step_id]['method_name'],
+            class_name=self.graph.nodes[step_id]['class_name'],
+            location=CodeLocation(self.graph.nodes[step_id]['file_path'], self.graph.nodes[step_id]['line'], ""),
+            parameter_count=self.graph.nodes[step_id]['arity'] or 0
+        ) for step_id in path[1:]]
+
+        has_entity_manager = any(step.class_name.endswith(ENTITY_MANAGER_SUFFIX) for step in chain_steps)
+        if terminal['is_ormapper']:
+            pattern_type = "EntityManager→ORMapper" if has_entity_manager else "Direct ORMapper"
+        else:
+            pattern_type = "EntityManager"
+
+        entity_result.method_chains.append(MethodChain(
+            start_location=CodeLocation(start_node['file_path'], start_node['line'], "",
+                                        context=f"{start_node['class_name']}.{start_node['method_name']}"),
+            chain_steps=chain_steps,
+            final_destination=MethodDefinition(
+                class_name=node['class_name'],
+                method_name=node['method_name'],
+                file_path=node['file_path'],
+                method_body=terminal['method_body'],
+                line_number=node['line'],
+                is_ormapper=terminal['is_ormapper'],
+                has_implementation=terminal['has_implementation']
+            ),
+            reached_ormapper=terminal['is_ormapper'],
+            pattern_type=pattern_type
+        ))
+
+
+_CRUD_ORDER = [crud_type.value for crud_type in CrudType]
+
+
+def _format_cell(crud_types: List[str]) -> str:
+    """セル表記（例: ['READ', 'CREATE'] → 'CR'）"""
+    return ''.join(crud_type[0] for crud_type in _CRUD_ORDER if crud_type in crud_types)
+
+
+def crud_matrix_to_rows(result: CrudMatrixResult) -> List[List[str]]:
+    """マトリクスを表形式（ヘッダー行 + 起点クラスごとの行）に変換"""
+    entity_names = [name for name, entity_result in result.entities.items() if entity_result.method_chains]
+    rows = [['entry_point'] + entity_names]
+    for entry_point in result.entry_points:
+        cells = result.matrix.get(entry_point, {})
+        rows.append([entry_point] + [_format_cell(cells.get(name, [])) for name in entity_names])
+    return rows
+
+
+def crud_matrix_to_dict(result: CrudMatrixResult) -> Dict:
+    """マトリクスと Entity ごとの CRUD 操作を JSON 化可能な辞書に変換"""
+    entities = {}
+    for name, entity_result in result.entities.items():
+        entities[name] = {
+            'package': entity_result.package,
+            'operations': {
+                crud_type: [{
+                    'method': op.method_name,
+                    'file': op.source_location.file_path if op.source_location else '',
+                    'line': op.source_location.line_number if op.source_location else 0,
+                    'sql': op.sql_pattern,
+                    'confidence': op.confidence,
+                    'evidence': op.evidence
+                } for op in entity_result._get_operations_by_type(crud_type)]
+                for crud_type in _CRUD_ORDER
+            },
+            'chains': len(entity_result.method_chains),
+            'confidence': entity_result.calculate_confidence(),
+            'no_pattern_detected': entity_result.no_pattern_detected
+        }
+
+    return {
+        'matrix': {entry_point: {name: [crud_type for crud_type in _CRUD_ORDER if crud_type in crud_types]
+                                 for name, crud_types in result.matrix.get(entry_point, {}).items()}
+                   for entry_point in result.entry_points},
+        'entities': entities,
+        'unclassified_terminals': result.unclassified_terminals,
+        'unresolved_entity_terminals': result.unresolved_entity_terminals
+    }
+
+
+def write_crud_matrix(result: CrudMatrixResult, output_file, output_format: str = 'csv'):
+    """マトリクスを CSV または JSON で出力"""
+    if output_format == 'json':
+        json.dump(crud_matrix_to_dict(result), output_file, ensure_ascii=False, indent=2)
+        output_file.write('\n')
+    else:
+        csv.writer(output_file).writerows(crud_matrix_to_rows(result))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Git change detection for Smart Entity CRUD Analyzer
+git 作業ツリー内のソースパスについて、インデックス構築時からの変更ファイルを git に問い合わせる
+
+- 構築時に各リポジトリの HEAD と未コミットの変更ファイルを記録する（キャッシュのメタデータ）
+- 次回は git diff --name-only（記録した HEAD → 作業ツリー）と git status --porcelain で変更ファイルを求め、
+  全 .java ファイルの stat 走査を行わない
+- 記録時に未コミットだったファイルは git からは変更の有無を判断できないため、記録した更新時刻・サイズと比較する
+- .gitignore で無視された .java ファイル（生成ソース等）も git status に現れないため、未コミットのファイルと同様に
+  更新時刻・サイズを記録して比較する（find_java_files は無視されたファイルもインデックスに含める）
+- git 管理外のソースパスがある・git が使えない場合は None を返し、呼び出し側は stat 走査にフォールバックする
+"""
+
+import os
+import subprocess
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# git コマンドのタイムアウト（秒）
+GIT_TIMEOUT = 60
+
+
+def _run_git(args: List[str], cwd: str) -> Optional[str]:
+    """git コマンドを実行して標準出力を返す（失敗時は None）"""
+    try:
+        result = subprocess.run(['git', *args], cwd=cwd, capture_output=True, timeout=GIT_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode('utf-8', errors='surrogateescape')
+
+
+def find_git_roots(source_paths: List[str]) -> Optional[Dict[str, str]]:
+    """
+    ソースパスを含む git リポジトリの HEAD を取得
+
+    Returns:
+        リポジトリのルート → HEAD のコミット（いずれかのソースパスが git 管理外なら None）
+    """
+    roots = {}
+    for source_path in source_paths:
+        if not os.path.isdir(source_path):
+            return None
+        output = _run_git(['rev-parse', '--show-toplevel', 'HEAD'], source_path)
+        lines = output.splitlines() if output else []
+        if len(lines) < 2:
+            return None
+        roots[os.path.realpath(lines[0])] = lines[1]
+    return roots
+
+
+def _working_tree_changes(root: str) -> Optional[Set[str]]:
+    """
+    未コミットの変更ファイル（ステージ済み・未ステージ・未追跡、リネームは新旧両方）と
+    git が無視する .java ファイルのルートからの相対パス
+    """
+    output = _run_git(['status', '--porcelain', '-z', '--untracked-files=all'], root)
+    ignored = _run_git(['ls-files', '-z', '--others', '--ignored', '--exclude-standard', '--', '*.java'], root)
+    if output is None or ignored is None:
+        return None
+
+    changed = set()
+    entries = iter(output.split('\0'))
+    for entry in entries:
+        if len(entry) < 4:
+            continue
+        changed.add(entry[3:])
+        if entry[0] in 'RC':
+            # リネーム・コピーは次の要素が元のパス
+            changed.add(next(entries, ''))
+    changed.update(ignored.split('\0'))
+    changed.discard('')
+    return changed
+
+
+def _file_signature(path: str) -> Optional[list]:
+    """ファイルの [更新時刻(ns), サイズ]（存在しなければ None）"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _dirty_signatures(root: str, dirty: Set[str]) -> Dict[str, Optional[list]]:
+    """未コミットの変更ファイル・無視された .java ファイル → 更新時刻・サイズ"""
+    return {path: _file_signature(os.path.join(root, path)) for path in sorted(dirty)}
+
+
+def capture_git_state(git_roots: Dict[str, str]) -> Optional[dict]:
+    """
+    キャッシュに記録する git の状態（HEAD と、未コミットの変更ファイル・無視された .java ファイル）
+
+    Returns:
+        {リポジトリのルート: {'head': コミット, 'dirty': {相対パス: [更新時刻(ns), サイズ]}}}（取得できなければ None）
+    """
+    state = {}
+    for root, head in git_roots.items():
+        dirty = _working_tree_changes(root)
+        if dirty is None:
+            return None
+        state[root] = {'head': head, 'dirty': _dirty_signatures(root, dirty)}
+    return state
+
+
+def merge_git_states(states: List[Optional[dict]]) -> Optional[dict]:
+    """
+    シャードごとに記録した git の状態を1つにまとめる（シャード分割構築の結合用）
+
+    未コミットの変更ファイルは和集合とし、シャード間で更新時刻・サイズが一致しないファイルは
+    次回必ず変更ファイルとして検出されるよう空の記録にする。
+    いずれかのシャードの状態がない・リポジトリ構成や HEAD が一致しない場合は None
+    """
+    if not states or any(not state for state in states):
+        return None
+    roots = set(states[0])
+    if any(set(state) != roots for state in states):
+        return None
+
+    merged = {}
+    for root in roots:
+        heads = {state[root].get('head') for state in states}
+        if len(heads) != 1:
+            return None
+        dirty = {}
+        for state in states:
+            for path, signature in state[root].get('dirty', {}).items():
+                dirty[path] = signature if dirty.get(path, signature) == signature else []
+        merged[root] = {'head': heads.pop(), 'dirty': dict(sorted(dirty.items()))}
+    return merged
+
+
+def detect_changed_files(git_roots: Dict[str, str], recorded_state: dict) -> Optional[Tuple[Set[str], dict]]:
+    """
+    記録した状態からの変更ファイルを検出
+
+    Args:
+        git_roots: find_git_roots の結果（現在の HEAD）
+        recorded_state: capture_git_state の結果（インデックス構築時）
+
+    Returns:
+        (変更ファイルの絶対パス（realpath）, 現在の git の状態)
+        リポジトリ構成が変わった・記録した HEAD がない等で検出できなければ None
+    """
+    if not recorded_state or set(recorded_state) != set(git_roots):
+        return None
+
+    changed = set()
+    current_state = {}
+    for root, head in git_roots.items():
+        recorded = recorded_state[root]
+        recorded_dirty = recorded.get('dirty', {})
+        dirty = _working_tree_changes(root)
+        if dirty is None:
+            return None
+
+        relative_paths = dirty | set(recorded_dirty)
+        if recorded.get('head') != head:
+            # 記録した HEAD → 作業ツリー（コミット済み・未コミットの変更、削除を含む）
+            # HEAD が同じなら HEAD からの変更はすべて git status に含まれる
+            output = _run_git(['diff', '--name-only', '-z', '--no-renames', recorded.get('head', ''), '--'], root)
+            if output is None:
+                return None
+            relative_paths.update(path for path in output.split('\0') if path)
+
+        # 記録時に未コミットだった・無視されていたファイルは、記録時から更新時刻・サイズが変わっていなければ変更なし
+        dirty_signatures = _dirty_signatures(root, dirty)
+        for path in recorded_dirty:
+            signature = dirty_signatures[path] if path in dirty_signatures else _file_signature(os.path.join(root, path))
+            if signature == recorded_dirty[path]:
+                relative_paths.discard(path)
+
+        changed.update(os.path.join(root, path) for path in relative_paths)
+        current_state[root] = {'head': head, 'dirty': dirty_signatures}
+    return changed, current_state
+
+
+def git_diff_text(root: str, revision: str) -> Optional[str]:
+    """
+    リビジョン（範囲）の unified diff（変更行のみ、-U0）
+    revision が1つのコミットなら作業ツリーとの差分、A..B / A...B ならコミット間の差分（失敗時は None）
+    """
+    return _run_git(['diff', '-U0', '--no-color', '--no-ext-diff', '--no-renames', revision, '--'], root)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Graph exporters for Smart Entity CRUD Analyzer
+特化インデックス（起点ファイルからの再帰探索結果）のメソッド単位の呼び出しグラフをファイルに出力する
+
+- DOT（Graphviz）、GraphML（Gephi/yEd/networkx 等）、CSR（ノード表 + 隣接配列の JSON）に対応
+- ノード・辺は1件ずつファイルに書き込み、出力全体を文字列として組み立てない
+- 出力対象は nodes（ノードID → 属性）と edges（呼び出し元ノードID → 呼び出し先ノードIDの集合）を持つグラフ
+  （TracedGraph、call_graph.CallGraph のいずれも出力できる）
+"""
+
+import json
+import os
+from typing import Dict, Iterable, Optional, TextIO
+from xml.sax.saxutils import escape, quoteattr
+
+
+# 出力形式 → 既定の拡張子
+GRAPH_FORMATS = {
+    'dot': ('.dot', '.gv'),
+    'graphml': ('.graphml',),
+    'csr': ('.json',),
+}
+
+# CSR の配列を1行に書き込む要素数
+_CSR_LINE_SIZE = 1024
+
+
+class TracedGraph:
+    """
+    特化インデックスのメソッド単位の呼び出しグラフ
+
+    - nodes: ノードID（起点ファイルはクラスキー 完全クラス名@ソース識別子、それ以外は クラスキー#メソッド名、
+      JARライブラリは 完全クラス名#メソッド名）→ 属性（class_name は単純クラス名）
+      kind は entry（起点ファイル）/ method（探索したメソッド）/ unexplored（最大深度等で未探索）/
+      frontier（--max-nodes / --time-budget による打ち切りで未展開）/ library（JAR、終端）
+    - edges: 呼び出し元ノードID → 呼び出し先ノードID（挿入順を保持した重複なし集合）
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, Dict] = {}
+        self.edges: Dict[str, Dict[str, None]] = {}
+
+    @classmethod
+    def from_specialized_index(cls, specialized_index: dict) -> 'TracedGraph':
+        """特化インデックス（build_specialized_index の結果）からグラフを作成（ノードは深度順）"""
+        graph = cls()
+        library_keys = set()
+        frontier_keys = set()
+        for class_key, info in sorted(specialized_index.items(), key=lambda x: x[1]['depth']):
+            class_attributes = {
+                'class_name': info['class_name'],
+                'package_name': info.get('package_name'),
+                'file_path': info.get('file_path'),
+                'source_path': info.get('source_path'),
+                'depth': info['depth'],
+            }
+            if info['depth'] == 0:
+                graph.nodes.setdefault(class_key, dict(class_attributes, kind='entry'))
+            for method_name in info.get('used_methods', []):
+                graph.nodes.setdefault(f"{class_key}#{method_name}",
+                                       dict(class_attributes, kind='method', method_name=method_name))
+            library_keys.update(info.get('library_calls', []))
+            frontier_keys.update(info.get('frontier_calls', []))
+
+        for info in specialized_index.values():
+            for caller_id, callee_ids in info.get('method_calls', {}).items():
+                for callee_id in callee_ids:
+                    if callee_id not in graph.nodes:
+                        target_key, _, target_method = callee_id.rpartition('#')
+                        if callee_id in library_keys:
+                            kind = 'library'
+                        elif callee_id in frontier_keys:
+                            kind = 'frontier'
+                        else:
+                            kind = 'unexplored'
+                        graph.nodes[callee_id] = {
+                            'kind': kind,
+                            'class_name': simple_class_name(target_key),
+                            'method_name': target_method,
+                        }
+                    graph.edges.setdefault(caller_id, {})[callee_id] = None
+        return graph
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(callee_ids) for callee_ids in self.edges.values())
+
+
+def simple_class_name(class_key: str) -> str:
+    """クラスキー（完全クラス名@ソース識別子、または完全クラス名）の単純クラス名"""
+    return class_key.split('@', 1)[0].rsplit('.', 1)[-1]
+
+
+def method_label(method_key: str) -> str:
+    """メソッドキー（クラスキー#メソッド名）の表示名（クラス名.メソッド名）"""
+    class_key, _, method_name = method_key.rpartition('#')
+    return f"{simple_class_name(class_key)}.{method_name}"
+
+
+def graph_format_for_path(path: str) -> Optional[str]:
+    """出力ファイルの拡張子から出力形式を推定（推定できなければ None）"""
+    extension = os.path.splitext(path)[1].lower()
+    for graph_format, extensions in GRAPH_FORMATS.items():
+        if extension in extensions:
+            return graph_format
+    return None
+
+
+def _attribute_items(attributes: Dict) -> Iterable:
+    """出力するノード属性（値が None の属性は除く）"""
+    return ((name, value) for name, value in attributes.items() if value is not None)
+
+
+def _dot_quote(value) -> str:
+    """DOT の二重引用符付き文字列"""
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'"{text}"'
+
+
+def write_dot(graph, f: TextIO, graph_name: str = 'call_graph'):
+    """DOT 形式で出力（ラベルは クラス名.メソッド名、その他の属性はノード属性として出力）"""
+    f.write(f"digraph {_dot_quote(graph_name)} {{\n")
+    f.write("  node [shape=box];\n")
+    for node_id, attributes in graph.nodes.items():
+        label = attributes.get('class_name', node_id)
+        if attributes.get('method_name'):
+            label = f"{label}.{attributes['method_name']}"
+        items = [f"label={_dot_quote(label)}"]
+        items.extend(f"{name}={_dot_quote(value)}" for name, value in _attribute_items(attributes))
+        f.write(f"  {_dot_quote(node_id)} [{', '.join(items)}];\n")
+    for caller_id, callee_ids in graph.edges.items():
+        caller = _dot_quote(caller_id)
+        for callee_id in callee_ids:
+            f.write(f"  {caller} -> {_dot_quote(callee_id)};\n")
+    f.write("}\n")
+
+
+def _graphml_type(value) -> str:
+    """GraphML の attr.type"""
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int):
+        return 'int'
+    return 'string'
+
+
+def write_graphml(graph, f: TextIO):
+    """GraphML 形式で出力（ノード属性は <key> として宣言）"""
+    # 属性の宣言はノードより前に必要なため、属性名・型だけを先に集める
+    attribute_types = {}
+    for attributes in graph.nodes.values():
+        for name, value in _attribute_items(attributes):
+            attribute_types.setdefault(name, _graphml_type(value))
+
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+    for name, attribute_type in attribute_types.items():
+        f.write(f'  <key id={quoteattr(name)} for="node" attr.name={quoteattr(name)} attr.type="{attribute_type}"/>\n')
+    f.write('  <graph id="call_graph" edgedefault="directed">\n')
+    for node_id, attributes in graph.nodes.items():
+        f.write(f'    <node id={quoteattr(node_id)}>')
+        for name, value in _attribute_items(attributes):
+            text = str(value).lower() if isinstance(value, bool) else str(value)
+            f.write(f'<data key={quoteattr(name)}>{escape(text)}</data>')
+        f.write('</node>\n')
+    for caller_id, callee_ids in graph.edges.items():
+        source = quoteattr(caller_id)
+        for callee_id in callee_ids:
+            f.write(f'    <edge source={source} target={quoteattr(callee_id)}/>\n')
+    f.write('  </graph>\n')
+    f.write('</graphml>\n')
+
+
+def _write_int_array(f: TextIO, values: Iterable[int]):
+    """整数配列を _CSR_LINE_SIZE 件ずつの行に分けて書き込む（JSON の配列本体）"""
+    line = []
+    first = True
+    for value in values:
+        line.append(str(value))
+        if len(line) >= _CSR_LINE_SIZE:
+            f.write(('' if first else ',\n') + ','.join(line))
+            first = False
+            line = []
+    if line:
+        f.write(('' if first else ',\n') + ','.join(line))
+
+
+def write_csr(graph, f: TextIO):
+    """
+    CSR（圧縮行格納）形式の JSON で出力
+
+    {"format": "csr", "node_count": N, "edge_count": M, "nodes": [{"id": ノードID, 属性...}, ...],
+     "offsets": [N+1個], "targets": [M個]}
+    ノード i の呼び出し先は targets[offsets[i]:offsets[i+1]]（ノード表の番号）
+    """
+    node_numbers = {node_id: number for number, node_id in enumerate(graph.nodes)}
+    edge_count = sum(len(graph.edges.get(node_id, ())) for node_id in graph.nodes)
+
+    f.write(f'{{"format": "csr", "directed": true, "node_count": {len(node_numbers)}, "edge_count": {edge_count},\n')
+    f.write('"nodes": [\n')
+    for number, (node_id, attributes) in enumerate(graph.nodes.items()):
+        node = {'id': node_id}
+        node.update(_attribute_items(attributes))
+        f.write(('' if number == 0 else ',\n') + json.dumps(node, ensure_ascii=False))
+    f.write('\n],\n"offsets": [\n')
+
+    def offsets():
+        offset = 0
+        yield offset
+        for node_id in graph.nodes:
+            offset += len(graph.edges.get(node_id, ()))
+            yield offset
+
+    _write_int_array(f, offsets())
+    f.write('\n],\n"targets": [\n')
+    _write_int_array(f, (node_numbers[callee_id]
+                         for node_id in graph.nodes
+                         for callee_id in graph.edges.get(node_id, ())))
+    f.write('\n]}\n')
+
+
+_WRITERS = {
+    'dot': write_dot,
+    'graphml': write_graphml,
+    'csr': write_csr,
+}
+
+
+def export_graph(graph, output_path: str, graph_format: str):
+    """グラフを指定形式でファイルに出力"""
+    with open(output_path, 'w', encoding='utf-8', newline='\n') as f:
+        _WRITERS[graph_format](graph, f)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Change-impact analyzer for Smart Entity CRUD Analyzer
+変更（ファイル・行範囲、または git の差分）から、変更メソッドに到達する起点クラス（Controller/Batch等）を求める
+
+- 変更行範囲はインデックスのメソッド範囲（開始・終了行）でメソッドに対応付ける
+- どのメソッドにも含まれない変更（フィールド・import・コンストラクタ・コメント等）はクラスの全メソッドの変更として扱う
+- 変更メソッドが親型（interface/abstractクラス）のメソッドを実装している場合、親型の宣言への呼び出し元も対象とする
+- 呼び出しグラフ（call_graph）の逆辺を変更メソッドから幅優先探索し、到達した起点クラスのメソッドを影響ありとする
+"""
+
+import os
+import re
+import json
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from class_indexer import MultiSourceClassIndexer, class_key, iter_unique_classes
+from call_graph import CallGraph, build_call_graph, method_node_id
+from crud_analyzer import DEFAULT_ENTRY_PATTERN
+from models import ClassInfo, ImpactResult, TraceOptions
+
+
+# 変更内容: ファイルパス → 変更行範囲 [(開始行, 終了行)]（None はファイル全体）
+Changes = Dict[str, Optional[List[Tuple[int, int]]]]
+
+_HUNK_PATTERN = re.compile(r'^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+_LINE_RANGE_PATTERN = re.compile(r'^(.*\.java):(\d+)(?:-(\d+))?$')
+
+
+def _diff_path(header_path: str) -> Optional[str]:
+    """差分ヘッダ（--- / +++）のパス（/dev/null は None、a/ b/ の接頭辞は除く）"""
+    path = header_path.split('\t')[0].strip()
+    if path.startswith('"') and path.endswith('"'):
+        path = path[1:-1]
+    if path == '/dev/null':
+        return None
+    if path[:2] in ('a/', 'b/'):
+        path = path[2:]
+    return path
+
+
+def parse_unified_diff(diff_text: str, base_dir: str) -> Changes:
+    """
+    unified diff（git diff -U0 等）から変更後ファイルの変更行範囲を抽出
+
+    - 追加・変更行は変更後の行番号の範囲、削除のみのハンクは削除位置の直前の行
+    - 削除されたファイルは変更前のパスをファイル全体の変更（None）として記録
+
+    Args:
+        diff_text: unified diff
+        base_dir: 差分内の相対パスの基準ディレクトリ（git diff ではリポジトリのルート）
+    """
+    changes: Changes = {}
+    old_path = current = None
+    old_remaining = new_remaining = 0
+
+    for line in diff_text.splitlines():
+        # ハンク本文（'--- ' で始まる削除行をヘッダと取り違えないよう、行数で範囲を判定）
+        if old_remaining > 0 or new_remaining > 0:
+            if line.startswith('-'):
+                old_remaining -= 1
+            elif line.startswith('+'):
+                new_remaining -= 1
+            elif not line.startswith('\\'):
+                old_remaining -= 1
+                new_remaining -= 1
+            continue
+
+        if line.startswith('--- '):
+            old_path = _diff_path(line[4:])
+        elif line.startswith('+++ '):
+            new_path = _diff_path(line[4:])
+            if new_path is None:
+                current = None
+                if old_path is not None:
+                    changes[os.path.join(base_dir, old_path)] = None
+            else:
+                current = os.path.join(base_dir, new_path)
+                changes.setdefault(current, [])
+        elif line.startswith('@@'):
+            match = _HUNK_PATTERN.match(line)
+            if not match:
+                continue
+            old_remaining = int(match.group(1)) if match.group(1) is not None else 1
+            start = int(match.group(2))
+            new_remaining = int(match.group(3)) if match.group(3) is not None else 1
+            if current is not None and changes[current] is not None:
+                end = start + new_remaining - 1 if new_remaining else start
+                changes[current].append((max(start, 1), max(end, 1)))
+    return changes
+
+
+def parse_file_arguments(file_specs: List[str]) -> Changes:
+    """
+    ファイル指定（path.java / path.java:行 / path.java:開始行-終了行）を変更内容に変換
+    同じファイルの複数指定は行範囲を結合し、範囲なしの指定があればファイル全体とする
+    """
+    changes: Changes = {}
+    for spec in file_specs:
+        match = _LINE_RANGE_PATTERN.match(spec)
+        if match:
+            file_path = os.path.abspath(match.group(1))
+            start = int(match.group(2))
+            end = int(match.group(3)) if match.group(3) else start
+            ranges = changes.setdefault(file_path, [])
+            if ranges is not None:
+                ranges.append((min(start, end), max(start, end)))
+        else:
+            changes[os.path.abspath(spec)] = None
+    return changes
+
+
+def merge_changes(*change_sets: Changes) -> Changes:
+    """複数の変更内容を結合（どれかでファイル全体なら全体）"""
+    merged: Changes = {}
+    for changes in change_sets:
+        for file_path, ranges in changes.items():
+            if file_path in merged and merged[file_path] is None:
+                continue
+            if ranges is None:
+                merged[file_path] = None
+            else:
+                merged.setdefault(file_path, []).extend(ranges)
+    return merged
+
+
+class ImpactAnalyzer:
+    """変更メソッドから呼び出しグラフを逆にたどり、影響を受ける起点クラスを求める解析器"""
+
+    def __init__(self, indexer: MultiSourceClassIndexer, entry_pattern: str = DEFAULT_ENTRY_PATTERN,
+                 workers: Optional[int] = None, options: TraceOptions = None):
+        self.indexer = indexer
+        self.entry_pattern = re.compile(entry_pattern)
+        self.workers = workers
+        self.options = options
+        self.graph: Optional[CallGraph] = None
+        self._nodes_by_class: Dict[str, List[str]] = {}
+
+    def analyze(self, changes: Changes) -> ImpactResult:
+        """変更内容の影響を受ける起点クラス・メソッドを解析"""
+        result = ImpactResult()
+        changed_classes = self._map_files_to_classes(changes, result)
+        result.changed_files = len(changes)
+        if not changed_classes:
+            return result
+
+        self.graph = build_call_graph(self.indexer, self.workers, self.options)
+        for node_id, node in self.graph.nodes.items():
+            self._nodes_by_class.setdefault(node['class_key'], []).append(node_id)
+
+        seeds: Dict[str, Optional[str]] = {}
+        for class_info, ranges in changed_classes:
+            for node_id in self._changed_nodes(class_info, ranges, result):
+                seeds.setdefault(node_id, None)
+        result.changed_methods = list(seeds)
+
+        # 実装メソッドの変更は、親型の宣言（interface/abstract）経由の呼び出し元にも影響する
+        for node_id in list(seeds):
+            for declaration_id in self._declaration_nodes(node_id):
+                seeds.setdefault(declaration_id, node_id)
+
+        parents = self._walk_callers(seeds)
+        result.reached_methods = len(parents)
+        for node_id in parents:
+            key, method_name, _ = _split_node_id(node_id)
+            class_name = _simple_class_name(key)
+            if method_name == 'constructor' or not self.entry_pattern.search(class_name):
+                continue
+            result.affected.setdefault(class_name, {})[node_id] = self._path_to_change(node_id, parents)
+
+        result.affected = {entry_class: dict(sorted(result.affected[entry_class].items()))
+                           for entry_class in sorted(result.affected)}
+        return result
+
+    def _map_files_to_classes(self, changes: Changes, result: ImpactResult) -> List[Tuple[ClassInfo, Optional[list]]]:
+        """変更ファイルをインデックスのクラスに対応付け（対応しない .java ファイルは未対応として記録）"""
+        java_changes = {os.path.realpath(file_path): ranges for file_path, ranges in changes.items()
+                        if file_path.endswith('.java')}
+        changed_names = {os.path.basename(file_path) for file_path in java_changes}
+
+        matched_files = set()
+        changed_classes = []
+        for class_info in iter_unique_classes(self.indexer.class_index):
+            # ファイル名で絞り込んでから実パスを比較（全クラスの realpath を避ける）
+            if os.path.basename(class_info.file_path) not in changed_names:
+                continue
+            real_path = os.path.realpath(class_info.file_path)
+            if real_path in java_changes:
+                matched_files.add(real_path)
+                changed_classes.append((class_info, java_changes[real_path]))
+
+        result.unmatched_files = sorted(file_path for file_path in java_changes if file_path not in matched_files)
+        return changed_classes
+
+    def _changed_nodes(self, class_info: ClassInfo, ranges: Optional[list], result: ImpactResult) -> List[str]:
+        """変更行範囲に重なるメソッドのノード（メソッド外の変更を含む場合はクラスの全ノード）"""
+        methods = [method_info for overloads in class_info.overloads.values() for method_info in overloads]
+        if ranges is not None:
+            changed = []
+            for start, end in ranges:
+                overlapping = [method_node_id(class_info, method_info.method_name, method_info.arity)
+                               for method_info in methods
+                               if method_info.start_line <= end and start <= method_info.end_line]
+                if not overlapping:
+                    break
+                changed.extend(overlapping)
+            else:
+                return list(dict.fromkeys(changed))
+
+        # ファイル全体、またはフィールド・import・コンストラクタ等の変更はクラス全体に影響しうる
+        result.class_level_changes.append(class_key(class_info))
+        class_nodes = [method_node_id(class_info, method_info.method_name, method_info.arity) for method_info in methods]
+        return list(dict.fromkeys(class_nodes + self._nodes_by_class.get(class_key(class_info), [])))
+
+    def _declaration_nodes(self, node_id: str) -> List[str]:
+        """実装メソッドに対応する親型（推移的）の同名・同引数数のメソッドのノード"""
+        key, method_name, arity = _split_node_id(node_id)
+        class_info = self.indexer.class_index.get(key)
+        if class_info is None or method_name == 'constructor':
+            return []
+
+        hierarchy = self.indexer.get_type_hierarchy()
+        declarations = []
+        visited = {class_key(class_info)}
+        queue = deque(hierarchy.get_supertypes(class_info))
+        while queue:
+            supertype = queue.popleft()
+            if class_key(supertype) in visited:
+                continue
+            visited.add(class_key(supertype))
+            queue.extend(hierarchy.get_supertypes(supertype))
+            declaration_id = method_node_id(supertype, method_name, arity)
+            if declaration_id in self.graph.nodes:
+                declarations.append(declaration_id)
+        return declarations
+
+    def _walk_callers(self, seeds: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+        """
+        変更メソッドから呼び出し元へ幅優先探索
+
+        Returns:
+            到達ノード → 変更メソッド側の次のノード（変更メソッド自身は None）
+        """
+        parents = dict(seeds)
+        queue = deque(seeds)
+        while queue:
+            node_id = queue.popleft()
+            for caller_id in self.graph.callers(node_id):
+                if caller_id not in parents:
+                    parents[caller_id] = node_id
+                    queue.append(caller_id)
+        return parents
+
+    @staticmethod
+    def _path_to_change(node_id: str, parents: Dict[str, Optional[str]]) -> List[str]:
+        """起点メソッドから変更メソッドまでの呼び出し経路（ノードID）"""
+        path = [node_id]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        return path
+
+
+def _split_node_id(node_id: str) -> Tuple[str, str, Optional[int]]:
+    """ノードID（method_node_id の形式）→ (クラスキー, メソッド名, 引数数)"""
+    key, method = node_id.rsplit('#', 1)
+    method_name, arity = method.rsplit('/', 1)
+    return key, method_name, None if arity == '?' else int(arity)
+
+
+def _simple_class_name(key: str) -> str:
+    """クラスキー（完全クラス名@ソース識別子）→ クラス名"""
+    return key.split('@', 1)[0].rsplit('.', 1)[-1]
+
+
+def _node_label(node_id: str) -> str:
+    """ノードの表示名（クラス名.メソッド名/引数数）"""
+    key, method_name, arity = _split_node_id(node_id)
+    return f"{_simple_class_name(key)}.{method_name}/{'?' if arity is None else arity}"
+
+
+def write_impact_result(result: ImpactResult, output, output_format: str = 'text'):
+    """
+    影響解析結果を出力
+
+    - text: 起点クラスごとに影響を受けるメソッドと、変更メソッドまでの呼び出し経路
+    - names: 影響を受ける起点クラス名のみ（1行1クラス、回帰テストの選択用）
+    - json: 変更メソッド・未対応ファイル・起点クラス → メソッド → 経路
+    """
+    if output_format == 'names':
+        for entry_class in result.affected:
+            output.write(f"{entry_class}\n")
+        return
+
+    if output_format == 'json':
+        json.dump({
+            'changed_files': result.changed_files,
+            'changed_methods': [_node_label(node_id) for node_id in result.changed_methods],
+            'class_level_changes': result.class_level_changes,
+            'unmatched_files': result.unmatched_files,
+            'reached_methods': result.reached_methods,
+            'affected': {entry_class: {_node_label(node_id): [_node_label(step) for step in path]
+                                       for node_id, path in methods.items()}
+                         for entry_class, methods in result.affected.items()}
+        }, output, ensure_ascii=False, indent=2)
+        output.write('\n')
+        return
+
+    output.write(f"📝 変更メソッド: {len(result.changed_methods)}個\n")
+    for node_id in result.changed_methods:
+        output.write(f"   ✏️  {_node_label(node_id)}\n")
+    for key in result.class_level_changes:
+        output.write(f"   🧱 クラス全体の変更として扱ったクラス: {key}\n")
+    for file_path in result.unmatched_files:
+        output.write(f"   ⚠️  インデックスにクラスがないファイル（削除・新規未索引など）: {file_path}\n")
+    output.write(f"🎯 影響を受ける起点クラス: {len(result.affected)}個 (到達メソッド: {result.reached_methods}個)\n")
+    for entry_class, methods in result.affected.items():
+        output.write(f"   📍 {entry_class}\n")
+        for node_id, path in methods.items():
+            output.write(f"      {' → '.join(_node_label(step) for step in path)}\n")
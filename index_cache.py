@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class index cache for Smart Entity CRUD Analyzer
+クラスインデックスのキャッシュファイル（配置・形式）と、キャッシュのみを参照する軽量クエリ
+
+- lookup / method / stats サブコマンドはこのモジュールだけでキャッシュを参照する
+- 構文解析・インデックス構築のモジュール（javalang, class_indexer, models 等）を import しないため起動が速い
+- キャッシュのJSONはクラス情報に復元せず、辞書のまま参照する
+- CLASS_INDEX_STORE=sqlite の場合は JSON の代わりに SQLite ストア（index_store）を使う
+
+キャッシュ形式（format_version 8）:
+  classes: クラス情報の配列（1クラス1要素）
+  index:   インデックスキー → classes の位置（ClassName / ClassName@src / fqcn / fqcn@src）
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+from utils import get_cache_dir
+
+
+# キャッシュ形式のバージョン（形式変更時に更新し、旧キャッシュを無効化する）
+CACHE_FORMAT_VERSION = 8
+
+# クラスインデックスの保存形式を選ぶ環境変数（json / sqlite）
+INDEX_STORE_ENV = 'CLASS_INDEX_STORE'
+INDEX_STORE_KINDS = ('json', 'sqlite')
+
+
+def index_store_kind() -> str:
+    """クラスインデックスの保存形式（環境変数 CLASS_INDEX_STORE、デフォルト json）"""
+    kind = os.environ.get(INDEX_STORE_ENV, '').strip().lower() or 'json'
+    if kind not in INDEX_STORE_KINDS:
+        raise ValueError(f"{INDEX_STORE_ENV} の値が不正です: {kind}（{' / '.join(INDEX_STORE_KINDS)}）")
+    return kind
+
+
+def settings_file_digest(settings_path: str) -> str:
+    """設定ファイル内容のハッシュ（キャッシュのキー・検証に使用）"""
+    with open(settings_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def index_cache_path(settings_digest: str, source_paths: List[str], store_kind: str = 'json') -> str:
+    """
+    クラスインデックスのキャッシュファイルのパス
+    <キャッシュディレクトリ>/index/class_index_<設定ファイル・解決済みソースパスのハッシュ>.json（SQLite ストアは .sqlite）
+    """
+    key = hashlib.sha256('\n'.join([settings_digest] + list(source_paths)).encode('utf-8')).hexdigest()
+    return os.path.join(get_cache_dir(), 'index', f"class_index_{key[:24]}.{store_kind}")
+
+
+def validate_cache_metadata(metadata: Dict, source_paths: List[str], settings_digest: str):
+    """
+    キャッシュの形式・ソースパス・設定ファイルが一致することを確認
+
+    Raises:
+        ValueError: 形式が古い、または別の設定・ソースパスで作成されたキャッシュ
+    """
+    if metadata.get('format_version') != CACHE_FORMAT_VERSION:
+        raise ValueError("キャッシュ形式が古いです")
+    if (metadata.get('source_paths') != list(source_paths) or
+            metadata.get('settings_digest', '') != settings_digest):
+        raise ValueError("キャッシュのソースパス・設定ファイルが一致しません")
+
+
+def read_index_cache(cache_file: str, source_paths: List[str], settings_digest: str) -> Dict:
+    """
+    キャッシュファイルを読み込み、形式・ソースパス・設定ファイルが一致することを確認
+
+    Raises:
+        FileNotFoundError: キャッシュファイルがない
+        ValueError: 形式が古い、または別の設定・ソースパスで作成されたキャッシュ
+    """
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        cache_data = json.load(f)
+
+    validate_cache_metadata(cache_data.get('metadata', {}), source_paths, settings_digest)
+    return cache_data
+
+
+def format_method_signature(method_data: dict, class_name: str = '') -> str:
+    """メソッドのシグネチャ表記（戻り値型 [クラス名.]メソッド名(引数型, ...)）"""
+    parameters = ', '.join(str(parameter) for parameter in method_data.get('parameters', []))
+    qualified_name = f"{class_name}.{method_data['method_name']}" if class_name else method_data['method_name']
+    return f"{method_data.get('return_type', '')} {qualified_name}({parameters})".strip()
+
+
+class IndexQuery:
+    """キャッシュ済みクラスインデックスへの参照専用クエリ（クラス情報は辞書のまま扱う）"""
+
+    def __init__(self, cache_data: Dict, cache_file: str = ''):
+        self.cache_file = cache_file
+        self.metadata = cache_data.get('metadata', {})
+        self.classes: List[dict] = cache_data.get('classes', [])
+        self.index: Dict[str, int] = cache_data.get('index', {})
+        self.table_index: Dict[str, list] = cache_data.get('table_index', {})
+
+    @classmethod
+    def load(cls, settings_file: str, source_paths: List[str]):
+        """
+        設定ファイル・ソースパスに対応するキャッシュを読み込む（例外は read_index_cache と同じ）
+        SQLite ストアの場合は同じクエリを持つ index_store.SqliteIndexStore を返す（クラス情報は必要な分だけ読む）
+        """
+        settings_digest = settings_file_digest(settings_file) if settings_file and os.path.exists(settings_file) else ''
+        store_kind = index_store_kind()
+        cache_file = index_cache_path(settings_digest, source_paths, store_kind)
+        if store_kind == 'sqlite':
+            from index_store import SqliteIndexStore
+            store = SqliteIndexStore.open(cache_file)
+            validate_cache_metadata(store.metadata, source_paths, settings_digest)
+            return store
+        return cls(read_index_cache(cache_file, source_paths, settings_digest), cache_file)
+
+    def find_classes(self, name: str) -> List[dict]:
+        """
+        クラス名・完全クラス名（@ソース識別子 指定可）に一致するクラスを列挙
+        先頭はクラス解決で採用されるクラス（最初に登録されたもの）
+        """
+        first = self.index.get(name)
+        if '@' in name:
+            return [self.classes[first]] if first is not None else []
+
+        matched = [position for position, class_data in enumerate(self.classes)
+                   if name in (class_data['class_name'], class_data['full_class_name'])]
+        if first is not None and first in matched:
+            matched.remove(first)
+            matched.insert(0, first)
+        return [self.classes[position] for position in matched]
+
+    def find_methods(self, method_name: str, class_name: Optional[str] = None) -> List[tuple]:
+        """
+        メソッド定義を列挙（class_name 指定時はそのクラスのみ）
+
+        Returns:
+            [(クラス情報, メソッド情報)]
+        """
+        classes = self.find_classes(class_name) if class_name else self.classes
+        return [(class_data, method_data)
+                for class_data in classes
+                for method_data in class_data.get('overloads', {}).get(method_name, [])]
+
+    def search_records(self) -> Iterable[dict]:
+        """名前検索（name_search.NameSearchIndex）用に、クラスごとの名前・位置とメソッド名・開始行を列挙"""
+        for class_data in self.classes:
+            yield {
+                'class_name': class_data['class_name'],
+                'full_class_name': class_data['full_class_name'],
+                'source_path': class_data['source_path'],
+                'file_path': class_data['file_path'],
+                'methods': [(method_name, methods[0].get('start_line', 0))
+                            for method_name, methods in class_data.get('overloads', {}).items() if methods],
+            }
+
+    def report_records(self) -> Iterable[dict]:
+        """集計レポート（index_report.IndexReport）用に、クラスごとのパッケージ・メソッド数・import を列挙"""
+        for class_data in self.classes:
+            yield {
+                'class_name': class_data['class_name'],
+                'full_class_name': class_data['full_class_name'],
+                'source_path': class_data['source_path'],
+                'package_name': class_data.get('package_name', ''),
+                'is_interface': class_data.get('is_interface', False),
+                'method_count': sum(len(methods) for methods in class_data.get('overloads', {}).values()),
+                'imports': class_data.get('imports', []),
+            }
+
+    def iter_call_edges(self) -> Iterable[tuple]:
+        """保存済みの呼び出しグラフの辺（JSON キャッシュは呼び出しグラフを保存しないため常に空）"""
+        return iter(())
+
+    def stats(self) -> Dict:
+        """インデックスの統計"""
+        per_source = {}
+        method_count = 0
+        for class_data in self.classes:
+            per_source[class_data['source_path']] = per_source.get(class_data['source_path'], 0) + 1
+            method_count += sum(len(overloads) for overloads in class_data.get('overloads', {}).values())
+        return {
+            'cache_file': self.cache_file,
+            'cache_size_bytes': os.path.getsize(self.cache_file) if self.cache_file and os.path.exists(self.cache_file) else 0,
+            'created_at': self.metadata.get('created_at', 0),
+            'classes': len(self.classes),
+            'index_keys': len(self.index),
+            'methods': method_count,
+            'sources': per_source,
+            'tables': len(self.table_index),
+        }
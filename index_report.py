@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index aggregation report for Smart Entity CRUD Analyzer
+クラスインデックス（と保存済みの呼び出しグラフの辺）から、パッケージ・ソースパス単位の集計を1回の走査で求める
+
+- sources: ソースパスごとのパッケージ数・クラス数・interface数・メソッド数
+- packages: ソースパス・パッケージごとのクラス数・interface数・メソッド数
+- duplicates: 複数のソースパスで定義されている単純クラス名（同名クラスは先勝ちで解決される）
+- dependencies: ソースパス間の依存数（import と、保存済みの呼び出しグラフがあれば呼び出し）
+各クラス・各辺は1回だけ読み、集計値だけを保持する（import の解決は読み終えた後に集計値に対して行う）
+"""
+
+import csv
+import json
+from typing import Dict, Iterable, List, TextIO
+
+# 集計の節
+REPORT_SECTIONS = ('sources', 'packages', 'duplicates', 'dependencies')
+
+# 節 → 列（CSV の見出し、JSON のキー）
+REPORT_COLUMNS = {
+    'sources': ['source_path', 'packages', 'classes', 'interfaces', 'methods'],
+    'packages': ['source_path', 'package_name', 'classes', 'interfaces', 'methods'],
+    'duplicates': ['class_name', 'source_count', 'class_count', 'source_paths', 'full_class_names'],
+    'dependencies': ['from_source', 'to_source', 'imports', 'calls'],
+}
+
+
+class IndexReport:
+    """
+    クラスインデックスの集計
+
+    add_class / add_call_edge で1件ずつ集計し、sections() で節ごとの行を返す
+    """
+
+    def __init__(self):
+        self.class_count = 0
+        self.call_edge_count = 0
+        self._sources: Dict[str, List[int]] = {}  # ソース識別子 → [クラス数, interface数, メソッド数]（登録順）
+        self._packages: Dict[tuple, List[int]] = {}  # (ソース識別子, パッケージ名) → 同上
+        self._names: Dict[str, Dict[str, List[str]]] = {}  # 単純クラス名 → ソース識別子 → 完全クラス名一覧
+        self._class_sources: Dict[str, List[str]] = {}  # 完全クラス名 → 定義しているソース識別子（登録順）
+        self._imports: Dict[tuple, int] = {}  # (importしたクラスのソース識別子, import名) → 件数
+        self._calls: Dict[tuple, int] = {}  # (呼び出し元ソース識別子, 呼び出し先ソース識別子) → 辺の数
+
+    def add_class(self, record: dict):
+        """
+        クラスを集計
+
+        Args:
+            record: {'class_name', 'full_class_name', 'source_path', 'package_name', 'is_interface',
+                     'method_count', 'imports'}（IndexQuery.report_records 等）
+        """
+        source = record['source_path']
+        interface = 1 if record.get('is_interface') else 0
+        methods = record.get('method_count', 0)
+        self.class_count += 1
+        for totals in (self._sources.setdefault(source, [0, 0, 0]),
+                       self._packages.setdefault((source, record.get('package_name', '')), [0, 0, 0])):
+            totals[0] += 1
+            totals[1] += interface
+            totals[2] += methods
+
+        self._names.setdefault(record['class_name'], {}).setdefault(source, []).append(record['full_class_name'])
+        self._class_sources.setdefault(record['full_class_name'], []).append(source)
+        for import_name in record.get('imports', ()):
+            key = (source, import_name)
+            self._imports[key] = self._imports.get(key, 0) + 1
+
+    def add_call_edge(self, caller: str, callee: str):
+        """呼び出しグラフの辺を集計（ノードIDは 完全クラス名@ソース識別子#メソッド名/引数の数）"""
+        key = (_node_source(caller), _node_source(callee))
+        self._calls[key] = self._calls.get(key, 0) + 1
+        self.call_edge_count += 1
+
+    def sections(self) -> Dict[str, List[dict]]:
+        """節 → 行（列は REPORT_COLUMNS の順）"""
+        source_order = {source: position for position, source in enumerate(self._sources)}
+
+        package_counts = {}
+        for source, _ in self._packages:
+            package_counts[source] = package_counts.get(source, 0) + 1
+        sources = [{'source_path': source, 'packages': package_counts.get(source, 0),
+                    'classes': totals[0], 'interfaces': totals[1], 'methods': totals[2]}
+                   for source, totals in self._sources.items()]
+
+        packages = [{'source_path': source, 'package_name': package,
+                     'classes': totals[0], 'interfaces': totals[1], 'methods': totals[2]}
+                    for (source, package), totals in sorted(self._packages.items(),
+                                                           key=lambda item: (source_order[item[0][0]], item[0][1]))]
+
+        duplicates = []
+        for class_name in sorted(self._names):
+            per_source = self._names[class_name]
+            if len(per_source) < 2:
+                continue
+            full_class_names = list(dict.fromkeys(name for names in per_source.values() for name in names))
+            duplicates.append({'class_name': class_name,
+                               'source_count': len(per_source),
+                               'class_count': sum(len(names) for names in per_source.values()),
+                               'source_paths': list(per_source),
+                               'full_class_names': full_class_names})
+
+        dependencies = {}
+        for (source, import_name), count in self._imports.items():
+            # 同じソースパスに定義があればそれを、なければ最初に登録されたソースパスの定義を参照する（クラス解決と同じ優先順）
+            defined = self._class_sources.get(import_name)
+            if not defined:
+                continue  # JDK・ライブラリ等
+            target = source if source in defined else defined[0]
+            if target != source:
+                totals = dependencies.setdefault((source, target), [0, 0])
+                totals[0] += count
+        for (caller_source, callee_source), count in self._calls.items():
+            if caller_source != callee_source:
+                dependencies.setdefault((caller_source, callee_source), [0, 0])[1] += count
+        unknown = len(source_order)
+        dependency_rows = [{'from_source': source, 'to_source': target, 'imports': totals[0], 'calls': totals[1]}
+                           for (source, target), totals in sorted(
+                               dependencies.items(),
+                               key=lambda item: (source_order.get(item[0][0], unknown), source_order.get(item[0][1], unknown), item[0]))]
+
+        return {'sources': sources, 'packages': packages, 'duplicates': duplicates, 'dependencies': dependency_rows}
+
+
+def _node_source(node_id: str) -> str:
+    """呼び出しグラフのノードIDのソース識別子"""
+    return node_id.partition('#')[0].rpartition('@')[2]
+
+
+def build_index_report(query) -> IndexReport:
+    """キャッシュ済みインデックス（IndexQuery / SqliteIndexStore）のクラスと呼び出しグラフの辺を1回ずつ走査して集計"""
+    report = IndexReport()
+    for record in query.report_records():
+        report.add_class(record)
+    for caller, callee in query.iter_call_edges():
+        report.add_call_edge(caller, callee)
+    return report
+
+
+def write_report_json(report: IndexReport, output: TextIO, sections: Iterable[str] = REPORT_SECTIONS):
+    """集計を JSON で出力（節ごとの行の配列と、集計したクラス数・呼び出しグラフの辺の数）"""
+    rows = report.sections()
+    json.dump({
+        'classes': report.class_count,
+        'call_edges': report.call_edge_count,
+        **{section: rows[section] for section in sections}
+    }, output, ensure_ascii=False, indent=2)
+    output.write('\n')
+
+
+def write_report_csv(rows: List[dict], output: TextIO, section: str):
+    """1つの節の行（IndexReport.sections の結果）を CSV で出力（一覧の列はセミコロン区切り）"""
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(REPORT_COLUMNS[section])
+    for row in rows:
+        writer.writerow([';'.join(value) if isinstance(value, list) else value
+                         for value in (row[column] for column in REPORT_COLUMNS[section])])
@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite index store for Smart Entity CRUD Analyzer
+クラスインデックスの SQLite ストア（環境変数 CLASS_INDEX_STORE=sqlite で JSON キャッシュの代わりに使用）
+
+- クラス・メソッド・import・呼び出しグラフの辺をテーブルに保存し、クラス名・完全クラス名・ソース識別子・メソッド名に索引を張る
+- クラス情報は参照されたものだけを読み込む（全クラスをメモリに展開しない）
+- 構築は一時ファイルへの一括挿入 → os.replace で置換（参照中のプロセスは置換前のファイルを読み続ける）
+- 参照側は読み取り専用で開くため、複数の探索プロセスが同じストアを同時に参照できる
+- クラス情報はキャッシュのJSONと同じ辞書形式で受け渡す（models 等を import せず、lookup 等の軽量クエリからも使う）
+"""
+
+import os
+import json
+import sqlite3
+import tempfile
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+
+# 一括読み込み・IN 句の1回あたりの件数
+_BATCH_SIZE = 500
+
+# 呼び出しグラフの辺を書き込む際のロック待ち（秒）
+_WRITE_TIMEOUT = 30
+
+# 参照が外れても保持しておく最近使ったクラス情報の件数（探索で同じクラスを繰り返し参照するため）
+_RECENT_CLASSES = 1024
+
+_SCHEMA = """
+CREATE TABLE metadata (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE classes (
+    id INTEGER PRIMARY KEY,
+    class_name TEXT NOT NULL,
+    full_class_name TEXT NOT NULL,
+    source_path TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    package_name TEXT NOT NULL,
+    superclass TEXT NOT NULL,
+    interfaces TEXT NOT NULL,
+    is_interface INTEGER NOT NULL,
+    is_abstract INTEGER NOT NULL
+);
+CREATE TABLE class_keys (
+    key TEXT PRIMARY KEY,
+    class_id INTEGER NOT NULL,
+    position INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE methods (
+    class_id INTEGER NOT NULL,
+    ordinal INTEGER NOT NULL,
+    method_name TEXT NOT NULL,
+    return_type TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    is_abstract INTEGER NOT NULL,
+    start_offset INTEGER NOT NULL,
+    end_offset INTEGER NOT NULL,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    sql_statements TEXT NOT NULL,
+    PRIMARY KEY (class_id, ordinal)
+) WITHOUT ROWID;
+CREATE TABLE imports (
+    class_id INTEGER NOT NULL,
+    ordinal INTEGER NOT NULL,
+    import_name TEXT NOT NULL,
+    PRIMARY KEY (class_id, ordinal)
+) WITHOUT ROWID;
+CREATE TABLE call_edges (
+    caller TEXT NOT NULL,
+    callee TEXT NOT NULL,
+    PRIMARY KEY (caller, callee)
+) WITHOUT ROWID;
+"""
+
+# 一括挿入後に作成する索引
+_INDEXES = """
+CREATE INDEX classes_by_name ON classes (class_name, source_path);
+CREATE INDEX classes_by_full_name ON classes (full_class_name, source_path);
+CREATE INDEX classes_by_source ON classes (source_path);
+CREATE INDEX class_keys_by_position ON class_keys (position);
+CREATE INDEX methods_by_name ON methods (method_name);
+CREATE INDEX imports_by_name ON imports (import_name);
+CREATE INDEX call_edges_by_callee ON call_edges (callee);
+"""
+
+_CLASS_COLUMNS = ('id, class_name, full_class_name, source_path, file_path, package_name, '
+                  'superclass, interfaces, is_interface, is_abstract')
+_METHOD_COLUMNS = ('class_id, method_name, return_type, parameters, is_abstract, '
+                   'start_offset, end_offset, start_line, end_line, sql_statements')
+
+
+def _connect_readonly(path: str) -> sqlite3.Connection:
+    """読み取り専用で開く（存在しなければ FileNotFoundError）"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True)
+
+
+def _chunks(items: list, size: int = _BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SqliteIndexStore:
+    """
+    クラスインデックスの SQLite ファイル
+
+    class_keys はインデックスキー（ClassName / ClassName@src / fqcn / fqcn@src）→ クラスの行ID で、
+    position は辞書への最初の登録順（JSON キャッシュの index と同じキー・順序・先勝ちを再現する）
+    """
+
+    def __init__(self, connection: sqlite3.Connection, path: str, temp_path: str = None):
+        self.connection = connection
+        self.path = path
+        self.temp_path = temp_path  # 構築中の一時ファイル（commit で path に置換）
+        self.metadata: Dict = {}
+        self._next_position = 0
+
+    @classmethod
+    def create(cls, path: str) -> 'SqliteIndexStore':
+        """構築用の空のストアを一時ファイルに作成（commit までは path に影響しない）"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.sqlite')
+        os.close(fd)
+        connection = sqlite3.connect(temp_path)
+        # 一時ファイルは置換前に壊れても参照されないため、ジャーナル・同期書き込みを省く
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(_SCHEMA)
+        return cls(connection, path, temp_path)
+
+    @classmethod
+    def open(cls, path: str) -> 'SqliteIndexStore':
+        """構築済みのストアを読み取り専用で開く（存在しなければ FileNotFoundError）"""
+        store = cls(_connect_readonly(path), path)
+        store.metadata = store.read_metadata()
+        return store
+
+    # ---- 構築 ----
+
+    def add_class(self, class_data: dict) -> int:
+        """クラス（メソッド・import を含む）を挿入し、行IDを返す"""
+        cursor = self.connection.execute(
+            "INSERT INTO classes (class_name, full_class_name, source_path, file_path, package_name, "
+            "superclass, interfaces, is_interface, is_abstract) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (class_data['class_name'], class_data['full_class_name'], class_data['source_path'],
+             class_data['file_path'], class_data['package_name'], class_data.get('superclass', ''),
+             json.dumps(class_data.get('interfaces', [])), int(class_data.get('is_interface', False)),
+             int(class_data.get('is_abstract', False))))
+        class_id = cursor.lastrowid
+
+        method_rows = []
+        for method_name, overloads in class_data.get('overloads', {}).items():
+            for method_data in overloads:
+                method_rows.append((
+                    class_id, len(method_rows), method_name, method_data['return_type'],
+                    json.dumps(method_data['parameters'], ensure_ascii=False), int(method_data.get('is_abstract', False)),
+                    method_data.get('start_offset', 0), method_data.get('end_offset', 0),
+                    method_data.get('start_line', 0), method_data.get('end_line', 0),
+                    json.dumps(method_data.get('sql_statements', []), ensure_ascii=False)))
+        self.connection.executemany(
+            "INSERT INTO methods (class_id, ordinal, method_name, return_type, parameters, is_abstract, "
+            "start_offset, end_offset, start_line, end_line, sql_statements) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            method_rows)
+        self.connection.executemany("INSERT INTO imports (class_id, ordinal, import_name) VALUES (?, ?, ?)",
+                                    [(class_id, ordinal, name) for ordinal, name in enumerate(class_data.get('imports', []))])
+        return class_id
+
+    def set_key(self, key: str, class_id: int):
+        """キー → クラスを登録（既存のキーは登録順を保ったままクラスを置き換える。辞書への代入と同じ）"""
+        self.connection.execute(
+            "INSERT INTO class_keys (key, class_id, position) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET class_id = excluded.class_id",
+            (key, class_id, self._next_position))
+        self._next_position += 1
+
+    def commit(self, metadata: dict, table_index: dict):
+        """
+        メタデータを書き込み、索引を作成して一時ファイルを path に置換
+        どのキーからも参照されなくなったクラス（同じ fqcn@src で後から登録されたクラスに置き換えられたもの）は削除する
+        """
+        connection = self.connection
+        connection.execute("DELETE FROM classes WHERE id NOT IN (SELECT class_id FROM class_keys)")
+        connection.execute("DELETE FROM methods WHERE class_id NOT IN (SELECT id FROM classes)")
+        connection.execute("DELETE FROM imports WHERE class_id NOT IN (SELECT id FROM classes)")
+        connection.executemany("INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)",
+                               [(name, json.dumps(value, ensure_ascii=False)) for name, value in metadata.items()] +
+                               [('table_index', json.dumps(table_index, ensure_ascii=False))])
+        connection.executescript(_INDEXES)
+        connection.commit()
+        connection.close()
+
+        os.replace(self.temp_path, self.path)
+        self.temp_path = None
+        # 置換後は読み取り専用で開き直す（行IDは同じなので読み込み済みのクラス情報はそのまま使える）
+        self.connection = _connect_readonly(self.path)
+        self.metadata = dict(metadata)
+
+    def abort(self):
+        """構築を中止して一時ファイルを削除"""
+        if self.temp_path is None:
+            return
+        self.connection.close()
+        try:
+            os.unlink(self.temp_path)
+        except OSError:
+            pass
+        self.temp_path = None
+
+    # ---- 参照 ----
+
+    def read_metadata(self) -> Dict:
+        """メタデータ（テーブルインデックスを除く）"""
+        return {name: json.loads(value)
+                for name, value in self.connection.execute("SELECT name, value FROM metadata WHERE name != 'table_index'")}
+
+    def read_table_index(self) -> Dict:
+        row = self.connection.execute("SELECT value FROM metadata WHERE name = 'table_index'").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    @property
+    def table_index(self) -> Dict:
+        return self.read_table_index()
+
+    def class_ids_with_method(self, method_name: str) -> List[int]:
+        """メソッドを定義するクラスの行ID（登録順）"""
+        return [row[0] for row in self.connection.execute(
+            "SELECT DISTINCT class_id FROM methods WHERE method_name = ? ORDER BY class_id", (method_name,))]
+
+    def class_keys_with_method(self, method_name: str) -> set:
+        """メソッドを定義するクラスのクラスキー（完全クラス名@ソース識別子）の集合（クラス情報は復元しない）"""
+        return {row[0] for row in self.connection.execute(
+            "SELECT DISTINCT classes.full_class_name || '@' || classes.source_path FROM methods "
+            "JOIN classes ON classes.id = methods.class_id WHERE methods.method_name = ?", (method_name,))}
+
+    def class_id(self, key: str) -> Optional[int]:
+        row = self.connection.execute("SELECT class_id FROM class_keys WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def has_keys(self) -> bool:
+        return self.connection.execute("SELECT 1 FROM class_keys LIMIT 1").fetchone() is not None
+
+    def key_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM class_keys").fetchone()[0]
+
+    def iter_key_chunks(self) -> Iterable[List[tuple]]:
+        """(キー, 行ID) を登録順に一定件数ずつ列挙"""
+        cursor = self.connection.execute("SELECT key, class_id FROM class_keys ORDER BY position")
+        while True:
+            rows = cursor.fetchmany(_BATCH_SIZE)
+            if not rows:
+                return
+            yield rows
+
+    def load_classes(self, class_ids: Iterable[int]) -> Dict[int, dict]:
+        """行ID → クラス情報の辞書（キャッシュのJSONと同じ形式）"""
+        classes = {}
+        for chunk in _chunks(list(class_ids)):
+            placeholders = ', '.join('?' * len(chunk))
+            for row in self.connection.execute(f"SELECT {_CLASS_COLUMNS} FROM classes WHERE id IN ({placeholders})", chunk):
+                classes[row[0]] = {
+                    'class_name': row[1], 'full_class_name': row[2], 'source_path': row[3], 'file_path': row[4],
+                    'package_name': row[5], 'overloads': {}, 'imports': [], 'superclass': row[6],
+                    'interfaces': json.loads(row[7]), 'is_interface': bool(row[8]), 'is_abstract': bool(row[9])
+                }
+            for row in self.connection.execute(
+                    f"SELECT {_METHOD_COLUMNS} FROM methods WHERE class_id IN ({placeholders}) ORDER BY class_id, ordinal", chunk):
+                class_data = classes[row[0]]
+                class_data['overloads'].setdefault(row[1], []).append(self._method_data(class_data, row))
+            for class_id, import_name in self.connection.execute(
+                    f"SELECT class_id, import_name FROM imports WHERE class_id IN ({placeholders}) ORDER BY class_id, ordinal", chunk):
+                classes[class_id]['imports'].append(import_name)
+        return classes
+
+    @staticmethod
+    def _method_data(class_data: dict, row: tuple) -> dict:
+        return {
+            'file_path': class_data['file_path'], 'class_name': class_data['class_name'], 'method_name': row[1],
+            'return_type': row[2], 'parameters': json.loads(row[3]), 'source_path': class_data['source_path'],
+            'is_abstract': bool(row[4]), 'start_offset': row[5], 'end_offset': row[6], 'start_line': row[7],
+            'end_line': row[8], 'sql_statements': json.loads(row[9])
+        }
+
+    # ---- 呼び出しグラフの辺 ----
+
+    def write_call_edges(self, edges: Dict[str, Iterable[str]], graph_options: dict) -> bool:
+        """
+        呼び出しグラフの辺を保存（構築済みのストアを書き込み可能で開き直して置き換える）
+        別のプロセスがストアを再構築していた場合（メタデータの作成日時が異なる）は保存しない
+        """
+        connection = sqlite3.connect(self.path, timeout=_WRITE_TIMEOUT)
+        try:
+            with connection:
+                row = connection.execute("SELECT value FROM metadata WHERE name = 'created_at'").fetchone()
+                if not row or json.loads(row[0]) != self.metadata.get('created_at'):
+                    return False
+                connection.execute("DELETE FROM call_edges")
+                connection.executemany("INSERT OR IGNORE INTO call_edges (caller, callee) VALUES (?, ?)",
+                                       ((caller, callee) for caller, callees in edges.items() for callee in callees))
+                connection.execute("INSERT OR REPLACE INTO metadata (name, value) VALUES ('call_graph', ?)",
+                                   (json.dumps(graph_options),))
+            return True
+        finally:
+            connection.close()
+
+    def callers_of(self, node_id: str) -> List[str]:
+        """保存した呼び出しグラフで node_id を呼び出すメソッド"""
+        return [row[0] for row in self.connection.execute(
+            "SELECT caller FROM call_edges WHERE callee = ? ORDER BY caller", (node_id,))]
+
+    def callees_of(self, node_id: str) -> List[str]:
+        """保存した呼び出しグラフで node_id が呼び出すメソッド"""
+        return [row[0] for row in self.connection.execute(
+            "SELECT callee FROM call_edges WHERE caller = ? ORDER BY callee", (node_id,))]
+
+    # ---- 軽量クエリ（index_cache.IndexQuery と同じインターフェース） ----
+
+    def find_classes(self, name: str) -> List[dict]:
+        """
+        クラス名・完全クラス名（@ソース識別子 指定可）に一致するクラスを列挙
+        先頭はクラス解決で採用されるクラス（最初に登録されたもの）
+        """
+        first = self.class_id(name)
+        if '@' in name:
+            return list(self.load_classes([first]).values()) if first is not None else []
+
+        matched = [row[0] for row in self.connection.execute(
+            "SELECT id FROM classes WHERE class_name = ? UNION SELECT id FROM classes WHERE full_class_name = ? ORDER BY id",
+            (name, name))]
+        if first is not None and first in matched:
+            matched.remove(first)
+            matched.insert(0, first)
+        classes = self.load_classes(matched)
+        return [classes[class_id] for class_id in matched]
+
+    def find_methods(self, method_name: str, class_name: Optional[str] = None) -> List[tuple]:
+        """
+        メソッド定義を列挙（class_name 指定時はそのクラスのみ）
+
+        Returns:
+            [(クラス情報, メソッド情報)]
+        """
+        if class_name:
+            classes = self.find_classes(class_name)
+        else:
+            classes = list(self.load_classes(self.class_ids_with_method(method_name)).values())
+        return [(class_data, method_data)
+                for class_data in classes
+                for method_data in class_data.get('overloads', {}).get(method_name, [])]
+
+    def search_records(self) -> Iterable[dict]:
+        """名前検索用に、クラスごとの名前・位置とメソッド名・開始行を列挙（クラス情報は復元しない）"""
+        methods = {}
+        for class_id, method_name, start_line in self.connection.execute(
+                "SELECT class_id, method_name, start_line FROM methods ORDER BY class_id, ordinal"):
+            methods.setdefault(class_id, []).append((method_name, start_line))
+        for class_id, class_name, full_class_name, source_path, file_path in self.connection.execute(
+                "SELECT id, class_name, full_class_name, source_path, file_path FROM classes ORDER BY id"):
+            yield {'class_name': class_name, 'full_class_name': full_class_name, 'source_path': source_path,
+                   'file_path': file_path, 'methods': methods.get(class_id, [])}
+
+    def report_records(self) -> Iterable[dict]:
+        """
+        集計レポート用に、クラスごとのパッケージ・メソッド数・import を列挙
+        （クラス・メソッド数・import の各表を行ID順に1回ずつ読み、クラス情報は復元しない）
+        """
+        method_counts = self.connection.execute(
+            "SELECT class_id, COUNT(*) FROM methods GROUP BY class_id ORDER BY class_id")
+        imports = self.connection.execute("SELECT class_id, import_name FROM imports ORDER BY class_id, ordinal")
+        method_row = method_counts.fetchone()
+        import_row = imports.fetchone()
+        for class_id, class_name, full_class_name, source_path, package_name, is_interface in self.connection.execute(
+                "SELECT id, class_name, full_class_name, source_path, package_name, is_interface FROM classes ORDER BY id"):
+            method_count = 0
+            if method_row is not None and method_row[0] == class_id:
+                method_count = method_row[1]
+                method_row = method_counts.fetchone()
+            import_names = []
+            while import_row is not None and import_row[0] == class_id:
+                import_names.append(import_row[1])
+                import_row = imports.fetchone()
+            yield {'class_name': class_name, 'full_class_name': full_class_name, 'source_path': source_path,
+                   'package_name': package_name, 'is_interface': bool(is_interface),
+                   'method_count': method_count, 'imports': import_names}
+
+    def iter_call_edges(self) -> Iterable[tuple]:
+        """保存済みの呼び出しグラフの辺 (呼び出し元ノードID, 呼び出し先ノードID)"""
+        cursor = self.connection.execute("SELECT caller, callee FROM call_edges")
+        while True:
+            rows = cursor.fetchmany(_BATCH_SIZE)
+            if not rows:
+                return
+            yield from rows
+
+    def stats(self) -> Dict:
+        """インデックスの統計"""
+        connection = self.connection
+        return {
+            'cache_file': self.path,
+            'cache_size_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            'created_at': self.metadata.get('created_at', 0),
+            'classes': connection.execute("SELECT COUNT(*) FROM classes").fetchone()[0],
+            'index_keys': self.key_count(),
+            'methods': connection.execute("SELECT COUNT(*) FROM methods").fetchone()[0],
+            'sources': dict(connection.execute(
+                "SELECT source_path, COUNT(*) FROM classes GROUP BY source_path ORDER BY MIN(id)").fetchall()),
+            'tables': len(self.read_table_index()),
+            'call_edges': connection.execute("SELECT COUNT(*) FROM call_edges").fetchone()[0],
+        }
+
+
+class SqliteClassIndex:
+    """
+    SQLite ストアのクラスインデックスを class_index の辞書と同じように参照するビュー
+    （キー・列挙順・同名クラスの先勝ちは辞書と同じ）
+
+    クラス情報は参照時に読み込み、参照されている間は同じオブジェクトを返す（弱参照キャッシュ）。
+    最近使ったクラス情報は参照が外れても一定件数保持する。
+    構築時は _register_class_info の代入をそのままストアへの挿入にする。
+    """
+
+    def __init__(self, store: SqliteIndexStore, encode: Callable, decode: Callable):
+        self.store = store
+        self._encode = encode  # クラス情報 → 辞書
+        self._decode = decode  # 辞書 → クラス情報
+        self._objects = weakref.WeakValueDictionary()  # 行ID → クラス情報
+        self._recent = OrderedDict()  # 行ID → クラス情報（最近使ったもの）
+        self._key_ids = {}  # キー → 行ID（None: キーなし）（構築後の参照時のみ）
+        self._last_registered = None  # (クラス情報, 行ID)
+
+    def _load(self, class_ids: Iterable[int]) -> dict:
+        """行ID → クラス情報（読み込み済みのものは同じオブジェクト）"""
+        loaded = {}
+        missing = []
+        for class_id in class_ids:
+            class_info = self._objects.get(class_id)
+            if class_info is None:
+                missing.append(class_id)
+            else:
+                loaded[class_id] = class_info
+        for class_id, class_data in self.store.load_classes(missing).items():
+            loaded[class_id] = self._objects[class_id] = self._decode(class_data)
+        return loaded
+
+    def _class_id(self, key: str) -> Optional[int]:
+        if self.store.temp_path is not None:
+            # 構築中はキーの参照先が変わる
+            return self.store.class_id(key)
+        if key not in self._key_ids:
+            self._key_ids[key] = self.store.class_id(key)
+        return self._key_ids[key]
+
+    def get(self, key: str, default=None):
+        class_id = self._class_id(key)
+        if class_id is None:
+            return default
+        class_info = self._load([class_id])[class_id]
+        self._recent[class_id] = class_info
+        self._recent.move_to_end(class_id)
+        if len(self._recent) > _RECENT_CLASSES:
+            self._recent.popitem(last=False)
+        return class_info
+
+    def __getitem__(self, key: str):
+        class_info = self.get(key)
+        if class_info is None:
+            raise KeyError(key)
+        return class_info
+
+    def __contains__(self, key: str) -> bool:
+        return self._class_id(key) is not None
+
+    def __setitem__(self, key: str, class_info):
+        # _register_class_info は1クラスのキーを続けて代入するため、直前と同じクラスなら同じ行を参照する
+        if self._last_registered is None or self._last_registered[0] is not class_info:
+            class_id = self.store.add_class(self._encode(class_info))
+            self._objects[class_id] = class_info
+            self._last_registered = (class_info, class_id)
+        self.store.set_key(key, self._last_registered[1])
+
+    def update(self, all_classes: dict):
+        """辞書のクラスインデックスをキーの順序のまま登録（同じクラスは1行にまとめる）"""
+        class_ids = {}
+        for key, class_info in all_classes.items():
+            class_id = class_ids.get(id(class_info))
+            if class_id is None:
+                class_id = class_ids[id(class_info)] = self.store.add_class(self._encode(class_info))
+                self._objects[class_id] = class_info
+            self.store.set_key(key, class_id)
+
+    def __len__(self) -> int:
+        return self.store.key_count()
+
+    def __bool__(self) -> bool:
+        return self.store.has_keys()
+
+    def items(self):
+        for rows in self.store.iter_key_chunks():
+            loaded = self._load({class_id for _, class_id in rows})
+            for key, class_id in rows:
+                yield key, loaded[class_id]
+
+    def keys(self):
+        for rows in self.store.iter_key_chunks():
+            for key, _ in rows:
+                yield key
+
+    def values(self):
+        for _, class_info in self.items():
+            yield class_info
+
+    def __iter__(self):
+        return self.keys()
+
+
+class SqliteMethodNameIndex:
+    """
+    メソッド名 → 定義クラスのクラスキー集合 の逆引きを、ストアの methods 表の索引で引くビュー
+    （MultiSourceClassIndexer.get_method_name_index の辞書と同じように get で参照する。全クラスは読み込まない）
+    """
+
+    def __init__(self, store: SqliteIndexStore):
+        self.store = store
+        self._class_keys = {}  # メソッド名 → クラスキーの集合（参照したもののみ）
+
+    def get(self, method_name: str, default=None):
+        if method_name not in self._class_keys:
+            self._class_keys[method_name] = self.store.class_keys_with_method(method_name)
+        return self._class_keys[method_name] or default
+
+    def __contains__(self, method_name: str) -> bool:
+        return bool(self.get(method_name))
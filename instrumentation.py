@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instrumentation for Smart Entity CRUD Analyzer
+フェーズ別の経過時間・CPU時間、処理件数、最大メモリ使用量（RSS）の計測
+
+- 計測は --stats / --stats-json / --profile 指定時のみ有効（無効時の phase()/count() はほぼ無コスト）
+- フェーズは入れ子にでき、各フェーズの時間は内側のフェーズを含む
+"""
+
+import os
+import sys
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class Instrumentation:
+    """フェーズ別タイマーとカウンターの集計"""
+
+    def __init__(self):
+        self.enabled = False
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self._started_wall = 0.0
+        self._started_cpu = 0.0
+
+    def start(self):
+        """計測を開始（集計をリセット）"""
+        self.enabled = True
+        self.phases = {}
+        self.counters = {}
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+
+    @contextmanager
+    def phase(self, name: str):
+        """フェーズの経過時間・CPU時間を計測"""
+        if not self.enabled:
+            yield
+            return
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            record = self.phases.get(name)
+            if record is None:
+                record = self.phases[name] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0}
+            record['calls'] += 1
+            record['wall'] += time.perf_counter() - wall_start
+            record['cpu'] += time.process_time() - cpu_start
+
+    def count(self, name: str, amount: int = 1):
+        """カウンターを加算"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @staticmethod
+    def peak_rss_bytes() -> Optional[int]:
+        """最大常駐メモリ（RSS、取得できない環境ではNone）"""
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux は KB 単位、macOS はバイト単位
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    def to_dict(self) -> Dict:
+        """JSON出力用の集計結果"""
+        return {
+            'total': {
+                'wall_seconds': time.perf_counter() - self._started_wall,
+                'cpu_seconds': time.process_time() - self._started_cpu
+            },
+            'phases': {
+                name: {'calls': record['calls'], 'wall_seconds': record['wall'], 'cpu_seconds': record['cpu']}
+                for name, record in self.phases.items()
+            },
+            'counters': dict(self.counters),
+            'peak_rss_bytes': self.peak_rss_bytes(),
+            'pid': os.getpid()
+        }
+
+    def print_summary(self):
+        """計測結果のサマリーを出力"""
+        stats = self.to_dict()
+        print("\n📈 実行統計")
+        print("=" * 60)
+        print(f"⏱️  全体: 経過 {stats['total']['wall_seconds']:.3f}秒 / CPU {stats['total']['cpu_seconds']:.3f}秒")
+
+        if stats['phases']:
+            print("🧭 フェーズ別（経過時間順、内側のフェーズを含む）:")
+            for name, record in sorted(stats['phases'].items(), key=lambda item: -item[1]['wall_seconds']):
+                print(f"   {name:<28} 経過 {record['wall_seconds']:8.3f}秒  CPU {record['cpu_seconds']:8.3f}秒"
+                      f"  ({record['calls']}回)")
+
+        if stats['counters']:
+            print("🔢 カウンター:")
+            for name, value in sorted(stats['counters'].items()):
+                print(f"   {name:<28} {value:>10,}")
+
+        if stats['peak_rss_bytes'] is not None:
+            print(f"💾 最大メモリ使用量（RSS）: {stats['peak_rss_bytes'] / (1024 * 1024):.1f} MB")
+
+
+# プロセス全体で共有する計測器
+instrumentation = Instrumentation()
+
+
+def add_instrumentation_arguments(parser):
+    """計測関連のコマンドライン引数を追加"""
+    parser.add_argument('--stats', action='store_true', help='フェーズ別時間・処理件数・最大メモリのサマリーを出力')
+    parser.add_argument('--stats-json', metavar='FILE', help='計測結果をJSONファイルに出力')
+    parser.add_argument('--profile', metavar='FILE', help='cProfileの結果（pstats形式）をファイルに出力')
+
+
+@contextmanager
+def instrumented_run(args):
+    """
+    --stats / --stats-json / --profile の指定に従って計測しながら実行
+    sys.exit() で終了した場合も計測結果を出力する
+    """
+    stats_json = getattr(args, 'stats_json', None)
+    profile_file = getattr(args, 'profile', None)
+    show_stats = getattr(args, 'stats', False)
+
+    if not (show_stats or stats_json or profile_file):
+        yield
+        return
+
+    instrumentation.start()
+    profiler = None
+    if profile_file:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_file)
+            print(f"\n🔬 プロファイル結果を出力: {profile_file} (python -m pstats {profile_file} で参照)")
+            if show_stats:
+                import pstats
+                print("🔬 累積時間の上位20関数:")
+                pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(20)
+
+        if show_stats:
+            instrumentation.print_summary()
+        if stats_json:
+            with open(stats_json, 'w', encoding='utf-8') as f:
+                json.dump(instrumentation.to_dict(), f, ensure_ascii=False, indent=2)
+            print(f"📈 計測結果を出力: {stats_json}")
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JAR library indexer for Smart Entity CRUD Analyzer
+referencedLibraries のJARからクラス名・メソッド名を索引化（JVM不要）
+
+- JARはzipの中央ディレクトリから .class エントリを列挙
+- class ファイルは定数プール・インターフェース表・メソッドテーブルのみを直接読み取る
+- JARパス＋更新時刻＋サイズをキーとした長期キャッシュを別ファイルに保持
+"""
+
+import os
+import json
+import time
+import struct
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils import get_cache_dir, atomic_write_json, file_lock
+
+
+# class ファイルのアクセスフラグ
+ACC_PUBLIC = 0x0001
+ACC_PROTECTED = 0x0004
+ACC_VARARGS = 0x0080
+ACC_SYNTHETIC = 0x1000
+ACC_INTERFACE = 0x0200
+
+# 定数プールのタグ → 固定長エントリのバイト数（Utf8は可変長のため別処理）
+_CONSTANT_SIZES = {
+    3: 4,   # Integer
+    4: 4,   # Float
+    5: 8,   # Long（2スロット消費）
+    6: 8,   # Double（2スロット消費）
+    7: 2,   # Class
+    8: 2,   # String
+    9: 4,   # Fieldref
+    10: 4,  # Methodref
+    11: 4,  # InterfaceMethodref
+    12: 4,  # NameAndType
+    15: 3,  # MethodHandle
+    16: 2,  # MethodType
+    17: 4,  # Dynamic
+    18: 4,  # InvokeDynamic
+    19: 2,  # Module
+    20: 2,  # Package
+}
+
+# ライブラリインデックスのキャッシュ形式バージョン
+LIBRARY_CACHE_FORMAT_VERSION = 3
+
+
+def count_descriptor_parameters(descriptor: str) -> int:
+    """メソッドディスクリプタ "(ILjava/lang/String;[J)V" から引数の個数を数える"""
+    count = 0
+    i = descriptor.find('(') + 1
+    end = descriptor.find(')')
+    while 0 < i < end:
+        ch = descriptor[i]
+        if ch == '[':
+            i += 1
+            continue
+        if ch == 'L':
+            i = descriptor.find(';', i) + 1
+        else:
+            i += 1
+        count += 1
+    return count
+
+
+def parse_class_file(data: bytes) -> Optional[Dict]:
+    """
+    class ファイルのバイト列からクラス名・親クラス・親インターフェース・公開メソッドを抽出
+
+    Returns:
+        {'name': 'a.b.C', 'super': 'a.b.Base', 'interfaces': ['a.b.Api', ...], 'is_interface': bool, 'public': bool,
+         'methods': {'method': [引数数, ...]}, 'varargs': {'method': [可変長引数を除いた引数数, ...]}}
+        class ファイルとして不正な場合は None
+    """
+    if len(data) < 10 or data[:4] != b'\xca\xfe\xba\xbe':
+        return None
+
+    try:
+        constant_pool_count = struct.unpack_from('>H', data, 8)[0]
+        offset = 10
+        utf8_entries = {}
+        class_entries = {}
+
+        index = 1
+        while index < constant_pool_count:
+            tag = data[offset]
+            offset += 1
+            if tag == 1:
+                length = struct.unpack_from('>H', data, offset)[0]
+                offset += 2
+                utf8_entries[index] = data[offset:offset + length].decode('utf-8', errors='replace')
+                offset += length
+            elif tag in _CONSTANT_SIZES:
+                if tag == 7:
+                    class_entries[index] = struct.unpack_from('>H', data, offset)[0]
+                offset += _CONSTANT_SIZES[tag]
+                if tag in (5, 6):
+                    index += 1
+            else:
+                return None
+            index += 1
+
+        access_flags, this_class, super_class, interfaces_count = struct.unpack_from('>HHHH', data, offset)
+        offset += 8
+        interface_indexes = struct.unpack_from(f'>{interfaces_count}H', data, offset)
+        offset += interfaces_count * 2
+
+        def class_name_at(cp_index: int) -> str:
+            name = utf8_entries.get(class_entries.get(cp_index, 0), '')
+            return name.replace('/', '.').replace('$', '.')
+
+        # フィールドテーブルを読み飛ばす
+        fields_count = struct.unpack_from('>H', data, offset)[0]
+        offset += 2
+        for _ in range(fields_count):
+            offset += 6
+            attributes_count = struct.unpack_from('>H', data, offset)[0]
+            offset += 2
+            for _ in range(attributes_count):
+                offset += 2 + 4 + struct.unpack_from('>I', data, offset + 2)[0]
+
+        # メソッドテーブル
+        methods: Dict[str, List[int]] = {}
+        varargs: Dict[str, List[int]] = {}
+        methods_count = struct.unpack_from('>H', data, offset)[0]
+        offset += 2
+        for _ in range(methods_count):
+            method_flags, name_index, descriptor_index, attributes_count = struct.unpack_from('>HHHH', data, offset)
+            offset += 8
+            for _ in range(attributes_count):
+                offset += 2 + 4 + struct.unpack_from('>I', data, offset + 2)[0]
+
+            if not method_flags & (ACC_PUBLIC | ACC_PROTECTED) or method_flags & ACC_SYNTHETIC:
+                continue
+            method_name = utf8_entries.get(name_index, '')
+            if method_name == '<clinit>':
+                continue
+            if method_name == '<init>':
+                method_name = 'constructor'
+
+            arity = count_descriptor_parameters(utf8_entries.get(descriptor_index, '()'))
+            arities = methods.setdefault(method_name, [])
+            if arity not in arities:
+                arities.append(arity)
+            if method_flags & ACC_VARARGS:
+                # 可変長引数は0個以上の引数に対応する
+                minimum_arities = varargs.setdefault(method_name, [])
+                if arity - 1 not in minimum_arities:
+                    minimum_arities.append(arity - 1)
+
+        return {
+            'name': class_name_at(this_class),
+            'super': class_name_at(super_class) if super_class else '',
+            'interfaces': [class_name_at(cp_index) for cp_index in interface_indexes],
+            'is_interface': bool(access_flags & ACC_INTERFACE),
+            'public': bool(access_flags & ACC_PUBLIC),
+            'methods': methods,
+            'varargs': varargs
+        }
+
+    except (struct.error, IndexError):
+        return None
+
+
+def index_jar(jar_path: str) -> Dict[str, Dict]:
+    """
+    JAR内の全クラスを索引化
+    zip の中央ディレクトリから .class エントリのみを読み、匿名クラスは除外する
+    """
+    classes = {}
+    with zipfile.ZipFile(jar_path) as jar:
+        for entry in jar.infolist():
+            entry_name = entry.filename
+            if not entry_name.endswith('.class') or entry_name.endswith(('module-info.class', 'package-info.class')):
+                continue
+
+            # 匿名クラス（Outer$1）はソースから参照されないため除外
+            simple_part = entry_name.rsplit('/', 1)[-1][:-len('.class')]
+            if any(part.isdigit() for part in simple_part.split('$')[1:]):
+                continue
+
+            class_summary = parse_class_file(jar.read(entry))
+            if class_summary and class_summary['name']:
+                classes[class_summary.pop('name')] = class_summary
+
+    return classes
+
+
+class LibraryIndex:
+    """
+    JARライブラリのクラス・メソッド索引
+
+    - classes: 完全クラス名 → {'jar', 'super', 'interfaces', 'is_interface', 'public', 'methods', 'varargs'}
+    - simple_names: 単純クラス名 → [完全クラス名]
+    """
+
+    def __init__(self):
+        self.classes: Dict[str, Dict] = {}
+        self.simple_names: Dict[str, List[str]] = {}
+
+    def add_jar(self, jar_path: str, jar_classes: Dict[str, Dict]):
+        """JAR単位の索引を追加（先に追加されたJARのクラスを優先）"""
+        for full_class_name, class_summary in jar_classes.items():
+            if full_class_name in self.classes:
+                continue
+            self.classes[full_class_name] = dict(class_summary, jar=jar_path)
+            simple_name = full_class_name.rsplit('.', 1)[-1]
+            self.simple_names.setdefault(simple_name, []).append(full_class_name)
+
+    def resolve_class(self, class_name: str, imports: list) -> Optional[str]:
+        """
+        ソース上のクラス名を完全クラス名に解決
+        解決順序: 完全クラス名 → import → 単純名（ライブラリ内で一意の場合のみ）
+        """
+        if class_name in self.classes:
+            return class_name
+
+        for imp in imports:
+            if imp.endswith('.' + class_name) and imp in self.classes:
+                return imp
+
+        candidates = self.simple_names.get(class_name, [])
+        if len(candidates) == 1:
+            return candidates[0]
+        return None
+
+    def has_method(self, full_class_name: str, method_name: str, arg_count: Optional[int] = None) -> bool:
+        """
+        公開メソッドの存在確認（親クラス・親インターフェースも辿る、arg_countがNoneなら名前のみで判定）
+        インターフェースの class ファイル上の親クラスは java.lang.Object のため、継承したメソッドは親インターフェースにある
+        """
+        visited = set()
+        pending = [full_class_name]
+        while pending:
+            current = pending.pop()
+            if not current or current not in self.classes or current in visited:
+                continue
+            visited.add(current)
+            class_summary = self.classes[current]
+            arities = class_summary['methods'].get(method_name)
+            if arities is not None and (arg_count is None or arg_count in arities):
+                return True
+            minimum_arities = class_summary.get('varargs', {}).get(method_name, ())
+            if arg_count is not None and any(arg_count >= minimum for minimum in minimum_arities):
+                return True
+            # 親クラスを先に探す（後に積んだものから取り出す）
+            pending.extend(reversed(class_summary.get('interfaces', ())))
+            pending.append(class_summary.get('super'))
+        return False
+
+    def jar_of(self, full_class_name: str) -> str:
+        """クラスを含むJARのパス"""
+        return self.classes.get(full_class_name, {}).get('jar', '')
+
+
+class LibraryIndexer:
+    """
+    referencedLibraries のJAR索引を構築・キャッシュ
+
+    JARはほとんど変更されないため、クラスインデックスとは別の長期キャッシュに保持し、
+    JARパス・更新時刻・サイズが一致するエントリは再解析しない
+    """
+
+    def __init__(self, cache_enabled: bool = True, cache_file: str = None):
+        self.cache_enabled = cache_enabled
+        # JAR単位のエントリはJARの絶対パスで識別するため、設定ファイルによらず1ファイルを共有する
+        self.cache_file = cache_file or os.path.join(get_cache_dir(), 'jar_library_index.json')
+
+    def build_library_index(self, jar_paths: List[str]) -> LibraryIndex:
+        """JARライブラリ索引を構築（キャッシュ済みJARは再利用）"""
+        cached_jars = self._load_cache() if self.cache_enabled else {}
+        jar_entries = {}
+        reused_count = 0
+        indexed_count = 0
+
+        for jar_path in jar_paths:
+            jar_path = str(Path(jar_path).resolve())
+            try:
+                stat = os.stat(jar_path)
+            except OSError as e:
+                print(f"   ⚠️  JAR未発見: {jar_path} ({e})")
+                continue
+
+            cached = cached_jars.get(jar_path)
+            if cached and cached.get('mtime') == stat.st_mtime and cached.get('size') == stat.st_size:
+                jar_entries[jar_path] = cached
+                reused_count += 1
+                continue
+
+            try:
+                jar_entries[jar_path] = {
+                    'mtime': stat.st_mtime,
+                    'size': stat.st_size,
+                    'classes': index_jar(jar_path)
+                }
+                indexed_count += 1
+            except (zipfile.BadZipFile, OSError) as e:
+                print(f"   ⚠️  JAR解析エラー {Path(jar_path).name}: {e}")
+
+        library_index = LibraryIndex()
+        for jar_path, entry in jar_entries.items():
+            library_index.add_jar(jar_path, entry['classes'])
+
+        print(f"📚 ライブラリインデックス: {len(jar_entries)}個のJAR "
+              f"(再利用: {reused_count}, 新規解析: {indexed_count}), {len(library_index.classes)}クラス")
+
+        if self.cache_enabled and indexed_count > 0:
+            self._save_cache(jar_entries)
+
+        return library_index
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        """JAR単位のキャッシュを読み込み"""
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            if cache_data.get('metadata', {}).get('format_version') != LIBRARY_CACHE_FORMAT_VERSION:
+                return {}
+            return cache_data.get('jars', {})
+        except Exception as e:
+            print(f"⚠️  ライブラリキャッシュ読み込みエラー: {e}")
+            return {}
+
+    def _save_cache(self, jar_entries: Dict[str, Dict]):
+        """JAR単位のキャッシュを保存（他の設定ファイルで索引化されたJARのエントリは残す）"""
+        try:
+            with file_lock(self.cache_file + '.lock'):
+                merged_entries = self._load_cache()
+                merged_entries.update(jar_entries)
+                cache_data = {
+                    'metadata': {
+                        'format_version': LIBRARY_CACHE_FORMAT_VERSION,
+                        'created_at': time.time()
+                    },
+                    'jars': merged_entries
+                }
+                atomic_write_json(self.cache_file, cache_data, lock=False)
+            print(f"✅ ライブラリインデックスをキャッシュに保存: {self.cache_file}")
+        except Exception as e:
+            print(f"⚠️  ライブラリキャッシュ保存エラー: {e}")
@@ -5,62 +5,102 @@ Class Index Analyzer - Main Entry Point
 クラスインデックスを活用した高度な解析ツール
 """
 
+from __future__ import annotations
+
 import argparse
 import os
 import sys
-import json
+from contextlib import contextmanager, redirect_stdout
 from pathlib import Path
-from datetime import datetime
+from typing import TYPE_CHECKING
+
+# 解析モジュール（class_indexer, call_resolver 等）は使用する関数内で import する
+# （キャッシュ参照のみのサブコマンドで構文解析・インデックス構築のモジュールを読み込まないため）
+from instrumentation import instrumentation, add_instrumentation_arguments, instrumented_run
 
-# クラスインデックス機能
-from class_indexer import MultiSourceClassIndexer
-from utils import load_settings_and_resolve_paths
+if TYPE_CHECKING:
+    # 型注釈のみで使用（実行時は読み込まない）
+    from class_indexer import MultiSourceClassIndexer
+    from models import TraceOptions
 
 
 def main():
     """メイン実行関数"""
+    # サブコマンド（crud 等）はそれぞれの引数体系で実行
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        return SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+    
     print("🚀 特定Javaファイルから再帰的探索した特化クラスインデックス")
     print("=" * 60)
     
     # コマンドライン引数の解析
     args = parse_arguments()
     
-    try:
-        # Javaファイルの検証
-        if not args.java_file.endswith('.java'):
-            raise Exception("Javaファイル（.java）を指定してください")
-        
-        if not os.path.exists(args.java_file):
-            raise Exception(f"ファイルが見つかりません: {args.java_file}")
-        
-        # ファイル名からクラス名を推定
-        file_name = os.path.basename(args.java_file)
-        class_name = file_name.replace('.java', '')
-        
-        print(f"\n📄 起点Javaファイル: {args.java_file}")
-        print(f"🎯 起点クラス名: {class_name}")
-        print(f"📏 最大探索深度: {args.max_depth}")
-        
-        # Step 1: 基本クラスインデックス構築
-        print("\n📚 Step 1: 基本クラスインデックス構築")
-        base_indexer = build_base_class_index(args)
-        
-        # Step 2: 特化クラスインデックス構築
-        print("\n🔍 Step 2: 特化クラスインデックス構築")
-        specialized_index = build_specialized_index(base_indexer, class_name, args.max_depth, args.show_method_source)
-        
-        # Step 3: 結果表示
-        print("\n📊 Step 3: 結果表示")
-        display_specialized_index(specialized_index)
-        
-        print("\n✅ 特化インデックス構築完了")
-        
-    except KeyboardInterrupt:
-        print("\n\n⚠️  処理が中断されました")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ エラー: {e}")
-        sys.exit(1)
+    from models import TraceOptions
+    from utils import get_source_identifier
+    
+    graph_format = resolve_graph_format(args)
+    
+    with instrumented_run(args):
+        try:
+            # Javaファイルの検証
+            if not args.java_file.endswith('.java'):
+                raise Exception("Javaファイル（.java）を指定してください")
+            
+            if not os.path.exists(args.java_file):
+                raise Exception(f"ファイルが見つかりません: {args.java_file}")
+            
+            # ファイル名からクラス名を推定
+            file_name = os.path.basename(args.java_file)
+            class_name = file_name.replace('.java', '')
+            
+            print(f"\n📄 起点Javaファイル: {args.java_file}")
+            print(f"🎯 起点クラス名: {class_name}")
+            print(f"📏 最大探索深度: {args.max_depth}")
+            
+            # Step 1: 基本クラスインデックス構築
+            print("\n📚 Step 1: 基本クラスインデックス構築")
+            base_indexer = build_base_class_index(args)
+            
+            # Step 2: 特化クラスインデックス構築
+            print("\n🔍 Step 2: 特化クラスインデックス構築")
+            trace_options = TraceOptions(
+                expand_implementations=args.expand_implementations,
+                max_implementations=args.max_implementations,
+                max_nodes=args.max_nodes,
+                time_budget=args.time_budget
+            )
+            start_source = get_source_identifier(os.path.abspath(args.java_file), base_indexer.source_paths)
+            with instrumentation.phase('trace'):
+                specialized_index = build_specialized_index(base_indexer, class_name, args.max_depth, args.show_method_source, trace_options, start_source)
+            
+            # Step 3: 結果表示
+            print("\n📊 Step 3: 結果表示")
+            from call_cycles import collapse_cycles, find_call_cycles, write_cycle_report
+            from graph_export import TracedGraph, export_graph
+            with instrumentation.phase('cycle_detection'):
+                traced_graph = TracedGraph.from_specialized_index(specialized_index)
+                cycles = find_call_cycles(traced_graph)
+            with instrumentation.phase('display'):
+                display_specialized_index(specialized_index)
+                if cycles:
+                    print()
+                    write_cycle_report(cycles, traced_graph, sys.stdout)
+            
+            if args.export_graph:
+                with instrumentation.phase('graph_export'):
+                    graph = collapse_cycles(traced_graph, cycles) if args.collapse_cycles else traced_graph
+                    export_graph(graph, args.export_graph, graph_format)
+                print(f"\n💾 呼び出しグラフを出力: {args.export_graph} ({graph_format}, {len(graph.nodes)}ノード, {graph.edge_count}辺)")
+            
+            print("\n✅ 特化インデックス構築完了")
+            
+        except KeyboardInterrupt:
+            print("\n\n⚠️  処理が中断されました")
+            sys.exit(1)
+        except Exception as e:
+            print(f"\n❌ エラー: {e}")
+            sys.exit(1)
 
 
 def parse_arguments():
@@ -75,6 +115,12 @@ def parse_arguments():
   
   # メソッド定義の詳細検索（ソースコード表示）
   python main.py DataAccessUtil.java --settings test_settings.json --show-method-source
+  
+  # 展開するメソッド数・時間に上限を設けて探索（CRUDに至る経路を優先、打ち切り時は途中結果）
+  python main.py UserController.java --settings test_settings.json --max-nodes 500 --time-budget 30
+  
+  # 探索したメソッド単位の呼び出しグラフを出力（DOT / GraphML / CSR）
+  python main.py UserController.java --settings test_settings.json --export-graph trace.graphml
         """
     )
     
@@ -102,14 +148,102 @@ def parse_arguments():
         help='メソッド定義のソースコードも表示'
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        '--no-library-index',
+        action='store_true',
+        help='referencedLibraries のJAR索引を作成しない'
+    )
+    
+    parser.add_argument(
+        '--expand-implementations',
+        action='store_true',
+        help='interface/abstractクラスへの呼び出しを実装クラスへ展開して探索'
+    )
+    
+    parser.add_argument(
+        '--max-implementations',
+        type=int,
+        default=5,
+        help='1呼び出しあたりの実装クラス展開数の上限（デフォルト: 5）'
+    )
+    
+    parser.add_argument(
+        '--max-nodes',
+        type=int,
+        help='展開するメソッド数の上限（起点ファイルを除く、達したら途中結果を表示）'
+    )
+    
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        metavar='SECONDS',
+        help='探索の時間予算（秒、達したら途中結果を表示）'
+    )
+    
+    parser.add_argument(
+        '--export-graph',
+        metavar='FILE',
+        help='探索したメソッド単位の呼び出しグラフをファイルに出力'
+    )
+    
+    parser.add_argument(
+        '--graph-format',
+        choices=['dot', 'graphml', 'csr'],
+        help='グラフの出力形式（省略時は拡張子 .dot/.gv, .graphml, .json から判定）'
+    )
+    
+    parser.add_argument(
+        '--collapse-cycles',
+        action='store_true',
+        help='循環（再帰・相互再帰）の呼び出しを1ノードに縮約して出力'
+    )
+    
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    if args.max_nodes is not None and args.max_nodes < 0:
+        parser.error("--max-nodes には0以上の値を指定してください")
+    if args.time_budget is not None and args.time_budget < 0:
+        parser.error("--time-budget には0以上の値を指定してください")
+    if (args.graph_format or args.collapse_cycles) and not args.export_graph:
+        parser.error("--graph-format / --collapse-cycles には --export-graph の指定が必要です")
+    return args
 
 
-def build_base_class_index(args) -> MultiSourceClassIndexer:
-    """クラスインデックスを構築"""
+def resolve_graph_format(args):
+    """--export-graph の出力形式（--graph-format 省略時は拡張子から判定、判定できなければ終了）"""
+    if not args.export_graph:
+        return None
+    
+    from graph_export import graph_format_for_path
+    graph_format = args.graph_format or graph_format_for_path(args.export_graph)
+    if graph_format is None:
+        print(f"❌ エラー: グラフの出力形式を判定できません: {args.export_graph}（--graph-format で指定してください）")
+        sys.exit(2)
+    return graph_format
+
+
+@contextmanager
+def result_output(to_stdout: bool):
+    """
+    結果の出力先（標準出力）を返し、to_stdout の間はログ・進捗の print を標準エラー出力へ送る
+    （CSV・JSON 等を標準出力へ書く場合に、標準出力を結果だけにしてパイプで受け取れるようにする）
+    """
+    stdout = sys.stdout
+    if not to_stdout:
+        yield stdout
+        return
+    with redirect_stdout(sys.stderr):
+        yield stdout
+
+
+def resolve_index_paths(args) -> tuple:
+    """設定ファイルから有効なソースパスとJARパスを解決（(ソースパス一覧, JARパス一覧)）"""
+    from utils import load_settings_and_resolve_paths
     
     # 設定ファイルから複数ソースパスを取得
     source_paths = []
+    jar_paths = []
     
     if args.settings and os.path.exists(args.settings):
         print(f"📄 設定ファイル読み込み: {args.settings}")
@@ -134,7 +268,7 @@ def build_base_class_index(args) -> MultiSourceClassIndexer:
     
     # フォールバック：Javaファイルの親ディレクトリを使用
     if not source_paths:
-        parent_dir = os.path.dirname(args.java_file)
+        parent_dir = os.path.dirname(getattr(args, 'java_file', None) or '')
         if parent_dir:
             source_paths = [parent_dir]
             print(f"📁 Javaファイルの親ディレクトリを使用: {parent_dir}")
@@ -142,14 +276,6 @@ def build_base_class_index(args) -> MultiSourceClassIndexer:
             source_paths = ['.']
             print(f"📁 現在のディレクトリを使用")
     
-    # クラスインデックス構築
-    print("🔨 クラスインデックス構築開始...")
-    
-    indexer = MultiSourceClassIndexer()
-    
-    # キャッシュ設定（デフォルトで有効）
-    indexer.cache_enabled = True
-    
     # 存在するソースパスのみフィルタ
     valid_source_paths = []
     for source_path in source_paths:
@@ -162,64 +288,220 @@ def build_base_class_index(args) -> MultiSourceClassIndexer:
     if not valid_source_paths:
         raise Exception("有効なソースパスが見つかりませんでした")
     
+    return valid_source_paths, jar_paths
+
+
+def build_base_class_index(args) -> MultiSourceClassIndexer:
+    """クラスインデックスを構築"""
+    from class_indexer import MultiSourceClassIndexer, CACHE_FORMAT_VERSION
+    from parse_cache import ParseCache
+    
+    valid_source_paths, jar_paths = resolve_index_paths(args)
+    
+    # クラスインデックス構築
+    print("🔨 クラスインデックス構築開始...")
+    
+    indexer = MultiSourceClassIndexer()
+    
+    # キャッシュ設定（デフォルトで有効）
+    indexer.cache_enabled = True
+    indexer.parse_cache = ParseCache.from_environment(CACHE_FORMAT_VERSION)
+    if args.settings and os.path.exists(args.settings):
+        indexer.set_settings_file(args.settings)
+    
     # クラスインデックス構築（一括）
     print("   🔨 インデックス構築実行中...")
-    indexer.class_index = indexer.build_class_index(valid_source_paths)
+    with instrumentation.phase('index_build'):
+        indexer.class_index = indexer.build_class_index(valid_source_paths)
     
     total_classes = len(indexer.class_index)
     print(f"✅ クラスインデックス構築完了: {total_classes}クラス登録")
     
+    # JARライブラリ索引（ライブラリ呼び出しを終端として扱うため）
+    if jar_paths and not getattr(args, 'no_library_index', False):
+        from jar_indexer import LibraryIndexer
+        library_indexer = LibraryIndexer(cache_enabled=indexer.cache_enabled)
+        with instrumentation.phase('library_index'):
+            indexer.library_index = library_indexer.build_library_index(jar_paths)
+    
     return indexer
 
 
-def build_specialized_index(base_indexer: MultiSourceClassIndexer, start_class: str, max_depth: int, show_method_source: bool = False) -> dict:
-    """特定クラスから再帰的に探索した特化インデックスを構築（メソッド単位）"""
-    
+def build_specialized_index(base_indexer: MultiSourceClassIndexer, start_class: str, max_depth: int, show_method_source: bool = False, options: TraceOptions = None, start_source: str = None) -> dict:
+    """
+    特定クラスから探索した特化インデックスを構築（メソッド単位、start_sourceは起点ファイルのソース識別子）
+    
+    - エントリはクラスキー（完全クラス名@ソース識別子）単位で、別ソースパスの同名クラスを混同しない
+      （メソッドは クラスキー#メソッド名、JARライブラリは 完全クラス名#メソッド名 で記録）
+    - 呼び出し先メソッドは優先度付きの作業リストで展開し、CRUDに至る可能性の高い経路
+      （EntityManager/ORMapper、それらをimportするクラス）を先に探索する
+    - 展開済みのメソッドにより浅い深度で到達した場合は、その深度で展開し直す
+    - options.max_nodes / options.time_budget に達したら探索を打ち切り、
+      未展開の呼び出しを呼び出し元クラスの frontier_calls に記録した途中結果を返す
+    """
+    import heapq
+    import itertools
+    import time
+    from class_indexer import class_key
+    from models import TraceOptions
+    options = options or TraceOptions()
     specialized_index = {}
-    visited_methods = set()  # メソッド単位の訪問管理
     
     print(f"   🎯 起点クラス: {start_class}")
     print(f"   🔄 メソッド単位の再帰的探索開始...")
     
     # 起点クラスのファイル情報を取得
-    start_class_info = base_indexer.get_class_info(start_class)
+    start_class_info = base_indexer.get_class_info(start_class, start_source)
     if not start_class_info:
         print(f"   ❌ 起点クラスが見つかりません: {start_class}")
+        suggestions = base_indexer.search_names(start_class, kinds=('class',), limit=5)
+        if suggestions:
+            print(f"   💡 候補: {', '.join(f'{hit.full_class_name} ({hit.source_path})' for hit in suggestions)}")
+        return specialized_index
+    
+    if max_depth <= 0:
         return specialized_index
     
+    started = time.perf_counter()
+    worklist = []  # (優先度, 深度, 順番, 呼び出し元のクラスキー, 解決済み呼び出し)
+    sequence = itertools.count()
+    best_depths = {}  # 訪問キー → 到達した最小深度
+    expanded_depths = {}  # 訪問キー → 展開した深度
+    
+    def discover(caller_key: str, caller_depth: int, resolved_calls: list):
+        """解決できた呼び出し先を作業リストに追加（未到達、またはより浅い深度で到達したもののみ、caller_keyは呼び出し元のクラスキー）"""
+        for call in resolved_calls:
+            if not call.get('resolved', False):
+                continue
+            
+            # メソッドはソースパス・オーバーロード単位で管理
+            visit_key = _trace_visit_key(call)
+            depth = caller_depth + 1
+            if visit_key in best_depths and best_depths[visit_key] <= depth:
+                continue
+            
+            if visit_key not in best_depths:
+                method_key = _trace_method_key(call)
+                if method_key not in specialized_index[caller_key]['dependencies']:
+                    specialized_index[caller_key]['dependencies'].append(method_key)
+            best_depths[visit_key] = depth
+            if depth < max_depth:
+                priority = _trace_priority(base_indexer, call)
+                heapq.heappush(worklist, (priority, depth, next(sequence), caller_key, call))
+    
     # 起点ファイルの全メソッドを探索対象とする
-    _build_recursive_from_start_file(base_indexer, start_class_info, 0, max_depth, visited_methods, specialized_index, show_method_source)
+    resolved_calls = _trace_start_file(base_indexer, start_class_info, specialized_index, show_method_source, options)
+    if resolved_calls is not None:
+        discover(class_key(start_class_info), 0, resolved_calls)
+    
+    expanded_count = 0
+    stop_reason = None
+    while worklist:
+        item = heapq.heappop(worklist)
+        _, depth, _, caller_key, call = item
+        visit_key = _trace_visit_key(call)
+        if best_depths[visit_key] != depth or expanded_depths.get(visit_key, max_depth) <= depth:
+            continue  # より浅い深度で追加済み・展開済み
+        
+        if options.max_nodes is not None and expanded_count >= options.max_nodes:
+            stop_reason = f"探索メソッド数の上限（{options.max_nodes}）"
+        elif options.time_budget is not None and time.perf_counter() - started >= options.time_budget:
+            stop_reason = f"時間予算（{options.time_budget}秒）"
+        if stop_reason:
+            heapq.heappush(worklist, item)
+            break
+        
+        expanded_depths[visit_key] = depth
+        expanded_count += 1
+        resolved_calls = _trace_method(base_indexer, call, depth, specialized_index, options)
+        if resolved_calls is not None:
+            discover(_trace_class_key(call), depth, resolved_calls)
+    
+    if stop_reason:
+        # 打ち切り時点で未展開の呼び出し（フロンティア）を呼び出し元に記録
+        frontier = set()
+        for _, depth, _, caller_key, call in worklist:
+            visit_key = _trace_visit_key(call)
+            if best_depths[visit_key] != depth or expanded_depths.get(visit_key, max_depth) <= depth:
+                continue
+            frontier.add(visit_key)
+            method_key = _trace_method_key(call)
+            if method_key not in specialized_index[caller_key]['frontier_calls']:
+                specialized_index[caller_key]['frontier_calls'].append(method_key)
+        print(f"   ⏸️ {stop_reason}に達したため探索を打ち切り: {expanded_count}メソッド展開済み、{len(frontier)}メソッド未展開")
     
     print(f"   📦 特化インデックス構築完了: {len(specialized_index)}クラス")
     
     return specialized_index
 
 
-def _build_recursive_from_start_file(base_indexer: MultiSourceClassIndexer, start_class_info, current_depth: int, max_depth: int, visited_methods: set, specialized_index: dict, show_method_source: bool = False):
-    """起点ファイルの全メソッドから再帰的探索を開始"""
+def _trace_visit_key(call: dict) -> tuple:
+    """探索の訪問キー（クラスキー, メソッド名, 引数の数）"""
+    return (_trace_class_key(call), call['target_method'], call.get('target_arity'))
+
+
+def _trace_class_key(call: dict) -> str:
+    """呼び出し先のクラスキー（完全クラス名@ソース識別子、JARライブラリは完全クラス名）"""
+    full_class_name = call.get('target_full_class') or call['target_class']
+    if call.get('terminal', False):
+        return full_class_name
+    return f"{full_class_name}@{call.get('target_source')}"
+
+
+def _trace_method_key(call: dict) -> str:
+    """呼び出し先のメソッドキー（クラスキー#メソッド名）"""
+    return f"{_trace_class_key(call)}#{call['target_method']}"
+
+
+def _trace_priority(base_indexer: MultiSourceClassIndexer, call: dict) -> int:
+    """作業リストの優先度（0: EntityManager/ORMapper、1: それらをimportするクラス、2: その他）"""
+    from crud_analyzer import ENTITY_MANAGER_SUFFIX, ORMAPPER_SUFFIX
+    
+    suffixes = (ENTITY_MANAGER_SUFFIX, ORMAPPER_SUFFIX)
+    if call['target_class'].endswith(suffixes):
+        return 0
+    class_info = base_indexer.get_class_info(call.get('target_full_class') or call['target_class'], call.get('target_source'))
+    if class_info and any(import_name.endswith(suffixes) for import_name in class_info.imports):
+        return 1
+    return 2
+
+
+def _new_specialized_entry(class_info, depth: int) -> dict:
+    """特化インデックスのクラスエントリ"""
+    return {
+        'class_name': class_info.class_name,
+        'full_class_name': class_info.full_class_name,
+        'file_path': class_info.file_path,
+        'package_name': class_info.package_name,
+        'source_path': class_info.source_path,
+        'methods': dict(class_info.methods) if class_info.methods else {},
+        'imports': list(class_info.imports) if class_info.imports else [],
+        'depth': depth,
+        'used_methods': [],  # 使用されたメソッドのみ記録（起点ファイルでは全メソッドが対象）
+        'dependencies': [],
+        'library_calls': [],  # JARライブラリへの呼び出し（終端）
+        'method_calls': {},  # 呼び出し元 → 呼び出し先（メソッドキー、グラフ出力用）
+        'frontier_calls': []  # 探索の打ち切りで展開しなかった呼び出し先
+    }
+
+
+def _trace_start_file(base_indexer: MultiSourceClassIndexer, start_class_info, specialized_index: dict, show_method_source: bool = False, options: TraceOptions = None):
+    """起点ファイルの全メソッド呼び出しを解決（解決結果、ファイルを解析できなければ None）"""
     
-    if current_depth >= max_depth:
-        return
+    from class_indexer import class_key
     
     # 起点クラスを特化インデックスに追加
     start_class = start_class_info.class_name
-    if start_class not in specialized_index:
-        specialized_index[start_class] = {
-            'class_name': start_class_info.class_name,
-            'file_path': start_class_info.file_path,
-            'package_name': start_class_info.package_name,
-            'methods': dict(start_class_info.methods) if start_class_info.methods else {},
-            'imports': list(start_class_info.imports) if start_class_info.imports else [],
-            'depth': current_depth,
-            'used_methods': [],  # 起点ファイルでは全メソッドが対象
-            'dependencies': []
-        }
-    
-    print(f"   {'  ' * current_depth}├─ {start_class} (深度: {current_depth}) [起点ファイル - 全メソッド探査]")
+    start_key = class_key(start_class_info)
+    if start_key not in specialized_index:
+        specialized_index[start_key] = _new_specialized_entry(start_class_info, 0)
+    
+    print(f"   ├─ {start_class} (深度: 0) [起点ファイル - 全メソッド探査]")
     
     # 起点ファイルの内容を解析
     try:
         from utils import read_file_with_encoding
+        from call_resolver import extract_method_calls, resolve_method_calls
         file_content = read_file_with_encoding(start_class_info.file_path)
         
         # ファイル全体からメソッド呼び出しを抽出
@@ -232,108 +514,112 @@ def _build_recursive_from_start_file(base_indexer: MultiSourceClassIndexer, star
             if method_name and method_name != 'constructor':
                 method_names.add(method_name)
         
-        print(f"   {'  ' * current_depth}  📋 使用メソッド名: {len(method_names)}種類")
+        print(f"     📋 使用メソッド名: {len(method_names)}種類")
         sorted_methods = sorted(method_names)[:10]  # 最初の10個をアルファベット順
-        print(f"   {'  ' * current_depth}    {', '.join(sorted_methods)}")
+        print(f"       {', '.join(sorted_methods)}")
         if len(method_names) > 10:
-            print(f"   {'  ' * current_depth}    ... 他{len(method_names) - 10}個")
+            print(f"       ... 他{len(method_names) - 10}個")
         
-        # 🆕 メソッド定義検索オプション
-        if len(method_names) <= 100:  # 詳細検索実行（大規模プロジェクト対応）
-            from smart_method_finder import batch_find_method_definitions
-            print(f"   {'  ' * current_depth}  🔍 メソッド定義検索を実行中...")
-            results = batch_find_method_definitions(list(method_names), start_class_info.imports, base_indexer, show_method_source)
-            
-            # 一意特定できたメソッドの数を表示
-            unique_count = len([name for name, candidates in results.items() if len(candidates) == 1])
-            if unique_count > 0:
-                print(f"   {'  ' * current_depth}  ✅ {unique_count}/{len(method_names)}個のメソッド定義を一意特定")
+        # 🆕 メソッド定義検索（解決済みのimportクラスとの照合のみのため、メソッド数によらず実行）
+        from smart_method_finder import batch_find_method_definitions
+        print(f"     🔍 メソッド定義検索を実行中...")
+        results = batch_find_method_definitions(list(method_names), start_class_info.imports, base_indexer, show_method_source,
+                                                start_class_info.source_path)
         
-        resolved_calls = resolve_method_calls(base_indexer, method_calls, start_class_info.imports)
+        # 一意特定できたメソッドの数を表示
+        unique_count = len([name for name, candidates in results.items() if len(candidates) == 1])
+        if unique_count > 0:
+            print(f"     ✅ {unique_count}/{len(method_names)}個のメソッド定義を一意特定")
         
-        # 解決できた依存関係を探索
-        for call in resolved_calls:
-            if call.get('resolved', False):
-                target_class_name = call['target_class']
-                target_method_name = call['target_method']
-                method_key = f"{target_class_name}.{target_method_name}"
-                
-                # 既に訪問済みのメソッドはスキップ
-                if method_key in visited_methods:
-                    continue
-                
-                visited_methods.add(method_key)
-                specialized_index[start_class]['dependencies'].append(method_key)
-                
-                # 依存メソッドを再帰的に探索
-                _build_recursive_from_specific_method(base_indexer, target_class_name, target_method_name, current_depth + 1, max_depth, visited_methods, specialized_index)
+        resolved_calls = resolve_method_calls(base_indexer, method_calls, start_class_info.imports, options, start_class_info.source_path,
+                                              start_class_info)
+        
+        # ライブラリ呼び出しは終端として記録
+        _record_library_calls(specialized_index[start_key], resolved_calls)
+        _record_method_calls(specialized_index[start_key], start_key, resolved_calls)
+        return resolved_calls
     
     except Exception as e:
-        print(f"   {'  ' * current_depth}  ⚠️ ファイル読み込みエラー: {e}")
+        print(f"     ⚠️ ファイル読み込みエラー: {e}")
+        return None
 
 
-def _build_recursive_from_specific_method(base_indexer: MultiSourceClassIndexer, target_class: str, target_method: str, current_depth: int, max_depth: int, visited_methods: set, specialized_index: dict):
-    """特定メソッドから再帰的に依存関係を探索"""
-    
-    if current_depth >= max_depth:
-        return
-    
-    # クラス情報を取得
-    class_info = base_indexer.get_class_info(target_class)
+def _trace_method(base_indexer: MultiSourceClassIndexer, call: dict, current_depth: int, specialized_index: dict, options: TraceOptions = None):
+    """
+    解決済み呼び出しの呼び出し先メソッド内の呼び出しを解決（解決結果、解析できなければ None）
+    target_arityでオーバーロードを、target_sourceで同名クラスのソースパスを特定する（via_interfaceは展開元の型）
+    """
+    target_class = call['target_class']
+    target_method = call['target_method']
+    
+    # クラス情報を取得（完全クラス名とソース識別子で、別ソースパスの同名クラスと区別する）
+    class_info = base_indexer.get_class_info(call.get('target_full_class') or target_class, call.get('target_source'))
     if not class_info:
-        return
+        return None
     
-    # 特化インデックスにクラスを追加（初回のみ）
-    if target_class not in specialized_index:
-        specialized_index[target_class] = {
-            'class_name': class_info.class_name,
-            'file_path': class_info.file_path,
-            'package_name': class_info.package_name,
-            'methods': dict(class_info.methods) if class_info.methods else {},
-            'imports': list(class_info.imports) if class_info.imports else [],
-            'depth': current_depth,
-            'used_methods': [],  # 使用されたメソッドのみ記録
-            'dependencies': []
-        }
+    # 特化インデックスにクラスを追加（初回のみ、深度は到達した最小の深度）
+    target_key = _trace_class_key(call)
+    if target_key not in specialized_index:
+        specialized_index[target_key] = _new_specialized_entry(class_info, current_depth)
+    elif current_depth < specialized_index[target_key]['depth']:
+        specialized_index[target_key]['depth'] = current_depth
     
     # 使用メソッドを記録
-    if target_method not in specialized_index[target_class]['used_methods']:
-        specialized_index[target_class]['used_methods'].append(target_method)
+    if target_method not in specialized_index[target_key]['used_methods']:
+        specialized_index[target_key]['used_methods'].append(target_method)
     
-    print(f"   {'  ' * current_depth}├─ {target_class}.{target_method}() (深度: {current_depth})")
+    via_interface = call.get('via_interface')
+    via_label = f" [{via_interface}経由]" if via_interface else ""
+    print(f"   {'  ' * current_depth}├─ {target_class}.{target_method}() (深度: {current_depth}){via_label}")
     
     # 特定メソッドの内容のみを解析
     try:
         from utils import read_file_with_encoding
+        from call_resolver import extract_method_calls_from_specific_method, resolve_method_calls
         file_content = read_file_with_encoding(class_info.file_path)
         
-        # 特定メソッド内からのみメソッド呼び出しを抽出
-        method_calls = extract_method_calls_from_specific_method(file_content, target_method, class_info.imports)
-        resolved_calls = resolve_method_calls(base_indexer, method_calls, class_info.imports)
+        # 特定メソッド（該当オーバーロード）内からのみメソッド呼び出しを抽出
+        method_info = class_info.find_method(target_method, call.get('target_arity'))
+        method_calls = extract_method_calls_from_specific_method(file_content, target_method, class_info.imports, method_info)
+        resolved_calls = resolve_method_calls(base_indexer, method_calls, class_info.imports, options, class_info.source_path,
+                                              class_info)
         
-        # 解決できた依存関係を再帰的に探索
-        for call in resolved_calls:
-            if call.get('resolved', False):
-                next_class = call['target_class']
-                next_method = call['target_method']
-                method_key = f"{next_class}.{next_method}"
-                
-                # 循環参照チェック
-                if method_key in visited_methods:
-                    continue
-                
-                visited_methods.add(method_key)
-                specialized_index[target_class]['dependencies'].append(method_key)
-                
-                # 再帰的に探索
-                _build_recursive_from_specific_method(base_indexer, next_class, next_method, current_depth + 1, max_depth, visited_methods, specialized_index)
+        # ライブラリ呼び出しは終端として記録
+        _record_library_calls(specialized_index[target_key], resolved_calls)
+        _record_method_calls(specialized_index[target_key], _trace_method_key(call), resolved_calls)
+        return resolved_calls
     
     except Exception as e:
         print(f"   {'  ' * current_depth}  ⚠️ メソッド解析エラー: {e}")
+        return None
+
+
+def _record_library_calls(class_entry: dict, resolved_calls: list):
+    """終端（JARライブラリ）呼び出しを特化インデックスのクラスエントリに記録"""
+    
+    for call in resolved_calls:
+        if call.get('terminal', False):
+            library_key = _trace_method_key(call)
+            if library_key not in class_entry['library_calls']:
+                class_entry['library_calls'].append(library_key)
+
+
+def _record_method_calls(class_entry: dict, caller_key: str, resolved_calls: list):
+    """
+    呼び出し元（起点ファイルはクラスキー、それ以外はメソッドキー）→ 呼び出し先のメソッドキーを記録
+    訪問済みのメソッドへの呼び出し（循環・合流）も辺として残す
+    """
+    for call in resolved_calls:
+        if call.get('resolved', False) or call.get('terminal', False):
+            callee_key = _trace_method_key(call)
+            callees = class_entry['method_calls'].setdefault(caller_key, [])
+            if callee_key not in callees:
+                callees.append(callee_key)
 
 
 def display_specialized_index(specialized_index: dict):
     """特化インデックスの内容を表示（メソッド単位版）"""
+    from graph_export import method_label, simple_class_name
     
     if not specialized_index:
         print("   ⚠️ 特化インデックスが空です")
@@ -345,11 +631,13 @@ def display_specialized_index(specialized_index: dict):
     # 深度順にソート
     sorted_classes = sorted(specialized_index.items(), key=lambda x: x[1]['depth'])
     
-    for class_name, info in sorted_classes:
+    for _, info in sorted_classes:
         indent = "   " + "  " * info['depth']
-        print(f"{indent}📍 {class_name} (深度: {info['depth']})")
+        print(f"{indent}📍 {info['class_name']} (深度: {info['depth']})")
         print(f"{indent}   📄 {info['file_path']}")
         print(f"{indent}   📦 {info['package_name']}")
+        if info.get('source_path'):
+            print(f"{indent}   📁 {info['source_path']}")
         
         # 使用メソッド表示（起点ファイルは全メソッド、依存ファイルは使用メソッドのみ）
         if info['depth'] == 0:
@@ -362,17 +650,24 @@ def display_specialized_index(specialized_index: dict):
         
         if info['dependencies']:
             print(f"{indent}   🔗 メソッド依存: {len(info['dependencies'])}個")
-            # 依存メソッドをクラス別にグループ化して表示
+            # 依存メソッドをクラス別（クラスキー単位）にグループ化して表示
             dep_by_class = {}
             for dep in info['dependencies']:
-                if '.' in dep:
-                    cls, method = dep.split('.', 1)
-                    if cls not in dep_by_class:
-                        dep_by_class[cls] = []
-                    dep_by_class[cls].append(method)
+                dep_class_key, _, method = dep.rpartition('#')
+                dep_by_class.setdefault(dep_class_key, []).append(method)
             
-            for dep_class, methods in dep_by_class.items():
-                print(f"{indent}     → {dep_class}: {', '.join(methods)}")
+            for dep_class_key, methods in dep_by_class.items():
+                print(f"{indent}     → {simple_class_name(dep_class_key)}: {', '.join(methods)}")
+        
+        library_calls = info.get('library_calls', [])
+        if library_calls:
+            print(f"{indent}   📚 ライブラリ呼び出し（終端）: {len(library_calls)}個")
+            print(f"{indent}     → {', '.join(method_label(key) for key in library_calls)}")
+        
+        frontier_calls = info.get('frontier_calls', [])
+        if frontier_calls:
+            print(f"{indent}   ⏸️ 未展開（探索の打ち切り）: {len(frontier_calls)}個")
+            print(f"{indent}     → {', '.join(method_label(key) for key in frontier_calls)}")
         
         print()
     
@@ -395,303 +690,704 @@ def display_specialized_index(specialized_index: dict):
             print(f"     深度 {depth}: {depth_counts[depth]}クラス ({method_count}メソッド - 起点)")
         else:
             print(f"     深度 {depth}: {depth_counts[depth]}クラス ({method_count}使用メソッド)")
-
-
-# ここから下は既存のメソッド抽出・解決関数を再利用
-
-
-def extract_method_calls_from_specific_method(file_content: str, target_method: str, imports: list) -> list:
-    """特定メソッド内からのみメソッド呼び出しを抽出"""
-    import re
-    
-    # Step 1: 特定メソッドの範囲を特定
-    method_body = extract_method_body(file_content, target_method)
-    if not method_body:
-        return []
     
-    # Step 2: そのメソッド内のメソッド呼び出しを抽出
-    return extract_method_calls(method_body, imports)
+    frontier_count = sum(len(info.get('frontier_calls', [])) for info in specialized_index.values())
+    if frontier_count:
+        print(f"   ⏸️ 探索の打ち切りで未展開の呼び出し: {frontier_count}個（途中結果）")
 
 
-def extract_method_body(file_content: str, method_name: str) -> str:
-    """特定メソッドのボディ部分を抽出"""
-    import re
+def display_dependency_trace(resolved_calls: list):
+    """依存関係追跡結果を表示"""
     
-    # メソッド定義の開始を探す
-    # パターン: public/private/static などのキーワードに続くメソッド名
-    method_pattern = rf'(public|private|protected|static|\s)+.*?\b{re.escape(method_name)}\s*\([^)]*\)\s*\{{'
+    resolved_count = len([call for call in resolved_calls if call.get('resolved', False)])
+    total_count = len(resolved_calls)
     
-    lines = file_content.split('\n')
-    method_start_line = -1
+    print(f"   📊 解決結果: {resolved_count}/{total_count} 個のメソッド呼び出しを解決")
+    print()
     
-    # メソッド開始行を見つける
-    for i, line in enumerate(lines):
-        if re.search(method_pattern, line):
-            method_start_line = i
-            break
+    if resolved_count > 0:
+        print("   ✅ 解決済み依存関係:")
+        for call in resolved_calls:
+            if call.get('resolved', False):
+                print(f"      📞 {call['call_pattern']}")
+                print(f"         → {call['target_class']}.{call['target_method']}")
+                print(f"         📄 {call['target_file']}")
+                print()
     
-    if method_start_line == -1:
-        return ""
+    library_calls = [call for call in resolved_calls if call.get('terminal', False)]
+    if library_calls:
+        print("   📚 ライブラリ呼び出し（終端）:")
+        for call in library_calls:
+            print(f"      📞 {call['call_pattern']} → {call['target_full_class']} ({Path(call['target_library']).name})")
+        print()
     
-    # 中括弧のバランスを取ってメソッド終了を見つける
-    brace_count = 0
-    method_end_line = -1
-    started = False
+    unresolved_calls = [call for call in resolved_calls if not call.get('resolved', False) and not call.get('terminal', False)]
+    if unresolved_calls:
+        print("   ⚠️  未解決の呼び出し:")
+        for call in unresolved_calls:
+            print(f"      ❓ {call['call_pattern']}")
+        print()
     
-    for i in range(method_start_line, len(lines)):
-        line = lines[i]
-        
-        # 文字列リテラル内の中括弧は無視（簡易版）
-        line_without_strings = re.sub(r'"[^"]*"', '""', line)
+
+def run_crud_command(argv: list):
+    """crud サブコマンド: 起点クラス × Entity × CRUD マトリクスを出力"""
+    parser = argparse.ArgumentParser(
+        prog="main.py crud",
+        description="起点クラス（Controller/Batch等）× Entity × CRUD マトリクスを全コードベースから作成",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  python main.py crud --settings test_settings.json
+  python main.py crud --settings test_settings.json --format json --output crud_matrix.json
+        """
+    )
+    parser.add_argument('--settings', required=True, help='設定ファイルパス')
+    parser.add_argument('--format', choices=['csv', 'json'], default='csv', help='出力形式（デフォルト: csv）')
+    parser.add_argument('--output', help='出力ファイル（省略時は標準出力）')
+    parser.add_argument('--workers', type=int, default=None, help='構文解析の並列プロセス数（デフォルト: CPU数）')
+    parser.add_argument('--entry-pattern', default=None,
+                        help='起点クラス名の正規表現（デフォルト: (Controller|Batch|UCControl|Action)$）')
+    parser.add_argument('--no-library-index', action='store_true', help='referencedLibraries のJAR索引を作成しない')
+    parser.add_argument('--expand-implementations', action='store_true',
+                        help='interface/abstractクラスへの呼び出しを実装クラスへ展開')
+    parser.add_argument('--max-implementations', type=int, default=5,
+                        help='1呼び出しあたりの実装クラス展開数の上限（デフォルト: 5）')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    from crud_analyzer import CrudMatrixAnalyzer, DEFAULT_ENTRY_PATTERN, write_crud_matrix
+    from models import TraceOptions
+    
+    # 結果を標準出力に書く場合、ログ・進捗は標準エラー出力へ
+    with result_output(not args.output) as result_stream:
+        print("🚀 Entity CRUD マトリクス解析")
+        print("=" * 60)
         
-        for char in line_without_strings:
-            if char == '{':
-                brace_count += 1
-                started = True
-            elif char == '}':
-                brace_count -= 1
+        with instrumented_run(args):
+            try:
+                print("\n📚 Step 1: 基本クラスインデックス構築")
+                base_indexer = build_base_class_index(args)
                 
-                if started and brace_count == 0:
-                    method_end_line = i
-                    break
-        
-        if method_end_line != -1:
-            break
-    
-    if method_end_line == -1:
-        return ""
-    
-    # メソッドボディを抽出
-    method_lines = lines[method_start_line:method_end_line + 1]
-    return '\n'.join(method_lines)
+                print("\n🔍 Step 2: 呼び出しグラフ構築・CRUD判定")
+                analyzer = CrudMatrixAnalyzer(
+                    base_indexer,
+                    entry_pattern=args.entry_pattern or DEFAULT_ENTRY_PATTERN,
+                    workers=args.workers,
+                    options=TraceOptions(
+                        expand_implementations=args.expand_implementations,
+                        max_implementations=args.max_implementations
+                    )
+                )
+                with instrumentation.phase('crud_analysis'):
+                    result = analyzer.analyze()
+                
+                print("\n📊 Step 3: 結果出力")
+                if args.output:
+                    with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                        write_crud_matrix(result, f, args.format)
+                    print(f"✅ CRUDマトリクスを出力: {args.output}")
+                else:
+                    write_crud_matrix(result, result_stream, args.format)
+                
+                if result.unclassified_terminals:
+                    print(f"⚠️  CRUD種別を判定できない終端メソッド: {', '.join(result.unclassified_terminals)}")
+                if result.unresolved_entity_terminals:
+                    print(f"⚠️  Entityを特定できない終端メソッド: {', '.join(result.unresolved_entity_terminals)}")
+                
+            except KeyboardInterrupt:
+                print("\n\n⚠️  処理が中断されました")
+                sys.exit(1)
+            except Exception as e:
+                print(f"\n❌ エラー: {e}")
+                sys.exit(1)
 
 
-def extract_method_calls(file_content: str, imports: list) -> list:
-    """javalangを使ってファイル内容からメソッド呼び出しを抽出"""
-    import javalang
-    
-    method_calls = []
-    
-    try:
-        # JavaコードをASTに変換
-        tree = javalang.parse.parse(file_content)
+def run_impact_command(argv: list):
+    """impact サブコマンド: 変更ファイル・git の差分から影響を受ける起点クラスを出力"""
+    parser = argparse.ArgumentParser(
+        prog="main.py impact",
+        description="変更メソッドに呼び出しグラフを逆にたどって到達する起点クラス（Controller/Batch等）を求める",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  python main.py impact --settings test_settings.json --files test_java_src/com/example/mapper/UserEntityManager.java
+  python main.py impact --settings test_settings.json --files test_java_src/com/example/mapper/UserEntityManager.java:20-35
+  python main.py impact --settings test_settings.json --git-diff origin/main --format names
+  git diff -U0 HEAD~3 | python main.py impact --settings test_settings.json --diff -
+        """
+    )
+    parser.add_argument('--settings', required=True, help='設定ファイルパス')
+    parser.add_argument('--files', nargs='+', default=[],
+                        help='変更ファイル（path.java でファイル全体、path.java:開始行-終了行 で行範囲）')
+    parser.add_argument('--git-diff', metavar='REVISION',
+                        help='git の差分（REVISION と作業ツリー、または A..B のコミット間）を変更とする')
+    parser.add_argument('--diff', metavar='FILE',
+                        help='unified diff ファイル（- で標準入力、パスは git リポジトリのルート基準）')
+    parser.add_argument('--format', choices=['text', 'names', 'json'], default='text',
+                        help='出力形式（text: 経路付き、names: 起点クラス名のみ、json）')
+    parser.add_argument('--output', help='出力ファイル（省略時は標準出力）')
+    parser.add_argument('--workers', type=int, default=None, help='構文解析の並列プロセス数（デフォルト: CPU数）')
+    parser.add_argument('--entry-pattern', default=None,
+                        help='起点クラス名の正規表現（デフォルト: (Controller|Batch|UCControl|Action)$）')
+    parser.add_argument('--no-library-index', action='store_true', help='referencedLibraries のJAR索引を作成しない')
+    parser.add_argument('--expand-implementations', action='store_true',
+                        help='interface/abstractクラスへの呼び出しを実装クラスへ展開')
+    parser.add_argument('--max-implementations', type=int, default=5,
+                        help='1呼び出しあたりの実装クラス展開数の上限（デフォルト: 5）')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    if not (args.files or args.git_diff or args.diff):
+        parser.error("--files / --git-diff / --diff のいずれかで変更を指定してください")
+    
+    from crud_analyzer import DEFAULT_ENTRY_PATTERN
+    from git_changes import find_git_roots, git_diff_text
+    from impact_analyzer import ImpactAnalyzer, merge_changes, parse_file_arguments, parse_unified_diff, write_impact_result
+    from models import TraceOptions
+    
+    # 結果を標準出力に書く場合、ログ・進捗は標準エラー出力へ
+    with result_output(not args.output and args.format != 'text') as result_stream:
+        print("🚀 変更影響解析")
+        print("=" * 60)
         
-        # ASTを走査してメソッド呼び出しを抽出
-        for _, node in tree.filter(javalang.tree.MethodInvocation):
-            if hasattr(node, 'qualifier') and node.qualifier:
-                # object.method() 形式
-                obj_name = None
+        with instrumented_run(args):
+            try:
+                print("\n📚 Step 1: 基本クラスインデックス構築")
+                base_indexer = build_base_class_index(args)
+                
+                print("\n📝 Step 2: 変更の読み込み")
+                change_sets = [parse_file_arguments(args.files)]
+                if args.git_diff:
+                    git_roots = find_git_roots(base_indexer.source_paths)
+                    if git_roots is None:
+                        raise Exception("ソースパスが git の作業ツリー内にありません")
+                    for root in git_roots:
+                        diff_text = git_diff_text(root, args.git_diff)
+                        if diff_text is None:
+                            raise Exception(f"git diff に失敗しました: {args.git_diff} ({root})")
+                        change_sets.append(parse_unified_diff(diff_text, root))
+                if args.diff:
+                    if args.diff == '-':
+                        diff_text = sys.stdin.read()
+                    else:
+                        with open(args.diff, 'r', encoding='utf-8') as f:
+                            diff_text = f.read()
+                    git_roots = find_git_roots([os.getcwd()])
+                    change_sets.append(parse_unified_diff(diff_text, next(iter(git_roots)) if git_roots else os.getcwd()))
+                changes = merge_changes(*change_sets)
+                print(f"📄 変更ファイル: {len(changes)}個 (.java: {len([path for path in changes if path.endswith('.java')])}個)")
                 
-                # 様々な修飾子のタイプを処理
-                if hasattr(node.qualifier, 'name'):
-                    # 単純な変数参照: userEntityManager.find()
-                    obj_name = node.qualifier.name
-                elif hasattr(node.qualifier, 'member'):
-                    # フィールドアクセス: this.manager.find()
-                    obj_name = node.qualifier.member
-                elif hasattr(node.qualifier, 'type'):
-                    # 型参照: ClassName.staticMethod()
-                    if hasattr(node.qualifier.type, 'name'):
-                        obj_name = node.qualifier.type.name
+                print("\n🔍 Step 3: 呼び出しグラフ構築・逆探索")
+                analyzer = ImpactAnalyzer(
+                    base_indexer,
+                    entry_pattern=args.entry_pattern or DEFAULT_ENTRY_PATTERN,
+                    workers=args.workers,
+                    options=TraceOptions(
+                        expand_implementations=args.expand_implementations,
+                        max_implementations=args.max_implementations
+                    )
+                )
+                with instrumentation.phase('impact_analysis'):
+                    result = analyzer.analyze(changes)
                 
-                if obj_name:
-                    method_name = node.member
-                    method_calls.append({
-                        'type': 'instance_call',
-                        'object': obj_name,
-                        'method': method_name,
-                        'pattern': f"{obj_name}.{method_name}()"
-                    })
+                print("\n📊 Step 4: 結果出力")
+                if args.output:
+                    with open(args.output, 'w', encoding='utf-8') as f:
+                        write_impact_result(result, f, args.format)
+                    print(f"✅ 影響解析結果を出力: {args.output}")
                 else:
-                    # 解析できない修飾子の場合
-                    method_name = node.member
-                    method_calls.append({
-                        'type': 'unknown_call',
-                        'method': method_name,
-                        'pattern': f"?.{method_name}()",
-                        'qualifier': str(type(node.qualifier))
-                    })
-            else:
-                # 直接メソッド呼び出し this.method() or method()
-                method_name = node.member
-                method_calls.append({
-                    'type': 'local_call',
-                    'method': method_name,
-                    'pattern': f"{method_name}()"
-                })
+                    write_impact_result(result, result_stream, args.format)
+                
+            except KeyboardInterrupt:
+                print("\n\n⚠️  処理が中断されました")
+                sys.exit(1)
+            except Exception as e:
+                print(f"\n❌ エラー: {e}")
+                sys.exit(1)
+
+
+def run_cycles_command(argv: list):
+    """cycles サブコマンド: 全コードベースの呼び出しグラフから再帰・相互再帰の呼び出しを検出"""
+    parser = argparse.ArgumentParser(
+        prog="main.py cycles",
+        description="全コードベースのメソッド単位呼び出しグラフの強連結成分（循環呼び出し）を出力",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  python main.py cycles --settings test_settings.json
+  python main.py cycles --settings test_settings.json --format json --output cycles.json
+  python main.py cycles --settings test_settings.json --export-graph condensed.graphml
+        """
+    )
+    parser.add_argument('--settings', required=True, help='設定ファイルパス')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='出力形式（デフォルト: text）')
+    parser.add_argument('--output', help='出力ファイル（省略時は標準出力）')
+    parser.add_argument('--export-graph', metavar='FILE', help='循環を1ノードに縮約した呼び出しグラフをファイルに出力')
+    parser.add_argument('--graph-format', choices=['dot', 'graphml', 'csr'],
+                        help='グラフの出力形式（省略時は拡張子 .dot/.gv, .graphml, .json から判定）')
+    parser.add_argument('--workers', type=int, default=None, help='構文解析の並列プロセス数（デフォルト: CPU数）')
+    parser.add_argument('--no-library-index', action='store_true', help='referencedLibraries のJAR索引を作成しない')
+    parser.add_argument('--expand-implementations', action='store_true',
+                        help='interface/abstractクラスへの呼び出しを実装クラスへ展開')
+    parser.add_argument('--max-implementations', type=int, default=5,
+                        help='1呼び出しあたりの実装クラス展開数の上限（デフォルト: 5）')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    if args.graph_format and not args.export_graph:
+        parser.error("--graph-format には --export-graph の指定が必要です")
+    graph_format = resolve_graph_format(args)
+    
+    from call_cycles import collapse_cycles, find_call_cycles, write_cycle_report
+    from call_graph import build_call_graph
+    from graph_export import export_graph
+    from models import TraceOptions
+    
+    # 結果を標準出力に書く場合、ログ・進捗は標準エラー出力へ
+    with result_output(not args.output and args.format == 'json') as result_stream:
+        print("🚀 循環呼び出しの検出")
+        print("=" * 60)
         
-        # コンストラクタ呼び出しを抽出
-        for _, node in tree.filter(javalang.tree.ClassCreator):
-            class_name = node.type.name
-            method_calls.append({
-                'type': 'constructor_call',
-                'class': class_name,
-                'method': 'constructor',
-                'pattern': f"new {class_name}()"
-            })
-    
-    except Exception as e:
-        print(f"      ⚠️ javalang解析エラー、フォールバック実行: {e}")
-        # フォールバック：正規表現ベース
-        return extract_method_calls_regex_fallback(file_content, imports)
-    
-    return method_calls
+        with instrumented_run(args):
+            try:
+                print("\n📚 Step 1: 基本クラスインデックス構築")
+                base_indexer = build_base_class_index(args)
+                
+                print("\n🔍 Step 2: 呼び出しグラフ構築・強連結成分の検出")
+                options = TraceOptions(
+                    expand_implementations=args.expand_implementations,
+                    max_implementations=args.max_implementations
+                )
+                graph = build_call_graph(base_indexer, args.workers, options)
+                with instrumentation.phase('cycle_detection'):
+                    cycles = find_call_cycles(graph)
+                
+                print("\n📊 Step 3: 結果出力")
+                if args.output:
+                    with open(args.output, 'w', encoding='utf-8') as f:
+                        write_cycle_report(cycles, graph, f, args.format)
+                    print(f"✅ 循環呼び出しを出力: {args.output} ({len(cycles)}個)")
+                else:
+                    write_cycle_report(cycles, graph, result_stream, args.format)
+                
+                if args.export_graph:
+                    with instrumentation.phase('graph_export'):
+                        condensed = collapse_cycles(graph, cycles)
+                        export_graph(condensed, args.export_graph, graph_format)
+                    print(f"💾 縮約した呼び出しグラフを出力: {args.export_graph} ({graph_format}, {len(condensed.nodes)}ノード, {condensed.edge_count}辺)")
+                
+            except KeyboardInterrupt:
+                print("\n\n⚠️  処理が中断されました")
+                sys.exit(1)
+            except Exception as e:
+                print(f"\n❌ エラー: {e}")
+                sys.exit(1)
 
 
-def extract_method_calls_regex_fallback(file_content: str, imports: list) -> list:
-    """正規表現ベースのフォールバック実装"""
-    import re
-    
-    method_calls = []
-    
-    # パターン1: object.method() 形式
-    pattern1 = re.compile(r'(\w+)\.(\w+)\s*\(')
-    matches1 = pattern1.findall(file_content)
-    
-    for obj_name, method_name in matches1:
-        method_calls.append({
-            'type': 'instance_call',
-            'object': obj_name,
-            'method': method_name,
-            'pattern': f"{obj_name}.{method_name}()"
-        })
-    
-    # パターン2: new ClassName() 形式
-    pattern2 = re.compile(r'new\s+(\w+)\s*\(')
-    matches2 = pattern2.findall(file_content)
-    
-    for class_name in matches2:
-        method_calls.append({
-            'type': 'constructor_call',
-            'class': class_name,
-            'method': 'constructor',
-            'pattern': f"new {class_name}()"
-        })
-    
-    return method_calls
+def run_tables_command(argv: list):
+    """tables サブコマンド: 埋め込みSQLのテーブル → メソッド インデックスを検索"""
+    parser = argparse.ArgumentParser(
+        prog="main.py tables",
+        description="埋め込みSQLで参照されるテーブルと、参照しているメソッドを検索（キャッシュ済みインデックスを参照）",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  # テーブル一覧（参照メソッド数）
+  python main.py tables --settings test_settings.json
+  
+  # USERS テーブルに書き込むメソッド
+  python main.py tables --settings test_settings.json --table users --writes
+        """
+    )
+    parser.add_argument('--settings', required=True, help='設定ファイルパス')
+    parser.add_argument('--table', help='検索するテーブル名（大文字小文字を区別しない）')
+    parser.add_argument('--writes', action='store_true', help='書き込み（INSERT/UPDATE/DELETE/MERGE対象）のみ')
+    parser.add_argument('--reads', action='store_true', help='読み取り（FROM/JOIN参照）のみ')
+    parser.add_argument('--crud', help='文種別で絞り込み（例: CREATE,UPDATE）')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    with instrumented_run(args):
+        try:
+            base_indexer = build_base_class_index(args)
+            table_index = base_indexer.table_index
+            
+            if not args.table:
+                print(f"\n🗄️  埋め込みSQL参照テーブル: {len(table_index)}個")
+                for table_name in sorted(table_index):
+                    usages = table_index[table_name]
+                    writes = sum(1 for usage in usages if usage['access'] == 'write')
+                    print(f"   {table_name}: {len(usages)}メソッド (書き込み: {writes}, 読み取り: {len(usages) - writes})")
+                return
+            
+            access = 'write' if args.writes else 'read' if args.reads else None
+            crud_types = [crud_type.strip().upper() for crud_type in args.crud.split(',')] if args.crud else None
+            usages = base_indexer.find_table_usages(args.table, access, crud_types)
+            
+            print(f"\n🗄️  テーブル {args.table.upper()} を参照するメソッド: {len(usages)}件")
+            for usage in usages:
+                print(f"   {usage['crud_type']:<6} {usage['access']:<5} "
+                      f"{usage['class_name']}.{usage['method_name']}({usage['arity']}) 📁 {usage['source_path']}")
+            
+        except KeyboardInterrupt:
+            print("\n\n⚠️  処理が中断されました")
+            sys.exit(1)
+        except Exception as e:
+            print(f"\n❌ エラー: {e}")
+            sys.exit(1)
 
 
-def resolve_method_calls(indexer: MultiSourceClassIndexer, method_calls: list, imports: list) -> list:
-    """メソッド呼び出しをクラスインデックスで解決"""
+def run_index_command(argv: list):
+    """index サブコマンド: クラスインデックスの構築（シャード分割構築に対応）"""
+    parser = argparse.ArgumentParser(
+        prog="main.py index",
+        description="クラスインデックスを構築（--shard i/N で部分インデックスを構築し、merge-index で結合）",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  # 4分割のうち0番目のシャードを構築（ホストごとに i を変えて実行）
+  python main.py index --settings settings.json --shard 0/4 --output index_shard_0.json
+  
+  # 部分インデックスを結合してキャッシュに保存
+  python main.py merge-index index_shard_*.json
+  
+  # ローカルの4プロセスでシャード構築 → 結合まで実行
+  python main.py index --settings settings.json --local-shards 4
+        """
+    )
+    parser.add_argument('--settings', required=True, help='設定ファイルパス')
+    parser.add_argument('--shard', help='構築するシャード（i/N 形式、i は0始まり）')
+    parser.add_argument('--output', help='部分インデックスの出力先（デフォルト: index_shard_<i>_of_<N>.json）')
+    parser.add_argument('--local-shards', type=int, help='ローカルのN個のプロセスでシャード構築し、結合までを実行')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args(argv)
     
-    resolved = []
+    from class_indexer import MultiSourceClassIndexer, CACHE_FORMAT_VERSION
+    from parse_cache import ParseCache
     
-    for call in method_calls:
-        if call['type'] == 'constructor_call':
-            # コンストラクタ呼び出しの解決
-            class_name = call['class']
+    with instrumented_run(args):
+        try:
+            source_paths, _ = resolve_index_paths(args)
+            indexer = MultiSourceClassIndexer()
+            indexer.parse_cache = ParseCache.from_environment(CACHE_FORMAT_VERSION)
+            if os.path.exists(args.settings):
+                indexer.set_settings_file(args.settings)
             
-            # インポートから完全クラス名を探す
-            full_class_name = None
-            for imp in imports:
-                if imp.endswith('.' + class_name):
-                    full_class_name = imp
-                    break
+            if args.shard:
+                try:
+                    shard_index, shard_count = (int(part) for part in args.shard.split('/'))
+                except ValueError:
+                    raise Exception(f"--shard は i/N 形式で指定してください: {args.shard}")
+                output_file = args.output or f"index_shard_{shard_index}_of_{shard_count}.json"
+                indexer.build_index_shard(source_paths, shard_index, shard_count, output_file)
             
-            if not full_class_name:
-                full_class_name = class_name
+            elif args.local_shards:
+                import tempfile
+                from concurrent.futures import ProcessPoolExecutor
+                from class_indexer import build_index_shard_file
+                
+                shard_count = args.local_shards
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    shard_files = [os.path.join(temp_dir, f"index_shard_{i}_of_{shard_count}.json") for i in range(shard_count)]
+                    with ProcessPoolExecutor(max_workers=shard_count) as executor:
+                        list(executor.map(build_index_shard_file, [source_paths] * shard_count, range(shard_count),
+                                          [shard_count] * shard_count, shard_files,
+                                          [indexer.settings_digest] * shard_count))
+                    indexer.merge_index_shards(shard_files)
             
-            # クラス情報を取得
-            target_class_info = indexer.get_class_info(class_name)
-            if target_class_info:
-                resolved.append({
-                    'call_pattern': call['pattern'],
-                    'target_class': class_name,
-                    'target_method': 'constructor',
-                    'target_file': target_class_info.file_path,
-                    'target_package': target_class_info.package_name,
-                    'resolved': True
-                })
             else:
-                resolved.append({
-                    'call_pattern': call['pattern'],
-                    'target_class': class_name,
-                    'resolved': False
-                })
-        
-        elif call['type'] == 'instance_call':
-            # インスタンスメソッド呼び出しの解決
-            obj_name = call['object']
-            method_name = call['method']
+                # 全件構築（キャッシュを読まずに再構築し、git の状態とともに保存）
+                indexer.build_class_index(source_paths, force_rebuild=True)
             
-            # オブジェクト名からクラス名を推測（簡易版）
-            guessed_class = guess_class_from_object_name(obj_name, imports)
-            
-            if guessed_class:
-                target_class_info = indexer.get_class_info(guessed_class)
-                if target_class_info and method_name in target_class_info.methods:
-                    resolved.append({
-                        'call_pattern': call['pattern'],
-                        'target_class': guessed_class,
-                        'target_method': method_name,
-                        'target_file': target_class_info.file_path,
-                        'target_package': target_class_info.package_name,
-                        'resolved': True
-                    })
-                else:
-                    resolved.append({
-                        'call_pattern': call['pattern'],
-                        'target_class': guessed_class,
-                        'target_method': method_name,
-                        'resolved': False
-                    })
-            else:
-                resolved.append({
-                    'call_pattern': call['pattern'],
-                    'resolved': False
-                })
-    
-    return resolved
+        except KeyboardInterrupt:
+            print("\n\n⚠️  処理が中断されました")
+            sys.exit(1)
+        except Exception as e:
+            print(f"\n❌ エラー: {e}")
+            sys.exit(1)
 
 
-def guess_class_from_object_name(obj_name: str, imports: list) -> str:
-    """オブジェクト名からクラス名を推測"""
-    
-    # よくあるパターン: userEntityManager → UserEntityManager
-    if 'entitymanager' in obj_name.lower():
-        for imp in imports:
-            if 'EntityManager' in imp:
-                return imp.split('.')[-1]
+def run_merge_index_command(argv: list):
+    """merge-index サブコマンド: 部分インデックスを結合してクラスインデックスのキャッシュに保存"""
+    parser = argparse.ArgumentParser(
+        prog="main.py merge-index",
+        description="index --shard で構築した部分インデックスを結合（全件構築と同じ先勝ち登録）"
+    )
+    parser.add_argument('shard_files', nargs='+', help='部分インデックスファイル（全シャード分）')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args(argv)
     
-    if 'ormapper' in obj_name.lower():
-        for imp in imports:
-            if 'ORMapper' in imp:
-                return imp.split('.')[-1]
+    from class_indexer import MultiSourceClassIndexer
     
-    if 'service' in obj_name.lower():
-        for imp in imports:
-            if 'Service' in imp:
-                return imp.split('.')[-1]
+    with instrumented_run(args):
+        try:
+            MultiSourceClassIndexer().merge_index_shards(args.shard_files)
+        except Exception as e:
+            print(f"\n❌ エラー: {e}")
+            sys.exit(1)
+
+
+def load_index_query(args):
+    """キャッシュ済みクラスインデックスを参照専用で読み込む（キャッシュがなければ index の実行を案内）"""
+    from index_cache import IndexQuery
     
-    # その他のパターンも追加可能
-    return None
+    source_paths, _ = resolve_index_paths(args)
+    try:
+        return IndexQuery.load(args.settings, source_paths)
+    except FileNotFoundError:
+        raise Exception(f"クラスインデックスのキャッシュがありません。先に python main.py index --settings {args.settings} を実行してください")
+    except ValueError as e:
+        raise Exception(f"{e}。python main.py index --settings {args.settings} で再構築してください")
 
 
-def display_dependency_trace(resolved_calls: list):
-    """依存関係追跡結果を表示"""
+def _add_query_arguments(parser):
+    parser.add_argument('--settings', required=True, help='設定ファイルパス')
+    add_instrumentation_arguments(parser)
+
+
+def run_lookup_command(argv: list):
+    """lookup サブコマンド: キャッシュ済みインデックスからクラスを検索"""
+    parser = argparse.ArgumentParser(
+        prog="main.py lookup",
+        description="クラス名・完全クラス名でクラスを検索（キャッシュのみ参照、構文解析なし）"
+    )
+    parser.add_argument('class_name', help='クラス名・完全クラス名（Name@ソース識別子 も指定可）')
+    parser.add_argument('--methods', action='store_true', help='メソッド一覧も表示')
+    _add_query_arguments(parser)
+    args = parser.parse_args(argv)
     
-    resolved_count = len([call for call in resolved_calls if call.get('resolved', False)])
-    total_count = len(resolved_calls)
+    from index_cache import format_method_signature
     
-    print(f"   📊 解決結果: {resolved_count}/{total_count} 個のメソッド呼び出しを解決")
-    print()
+    with instrumented_run(args):
+        try:
+            query = load_index_query(args)
+            classes = query.find_classes(args.class_name)
+            if not classes:
+                raise Exception(f"クラスが見つかりません: {args.class_name}")
+            
+            for number, class_data in enumerate(classes):
+                marker = " [解決時に採用]" if number == 0 and len(classes) > 1 else ""
+                print(f"\n🏛️  {class_data['class_name']} ({class_data['full_class_name']}){marker}")
+                print(f"   📄 {class_data['file_path']}")
+                print(f"   📁 {class_data['source_path']}")
+                if class_data.get('superclass'):
+                    print(f"   🧬 extends {class_data['superclass']}")
+                if class_data.get('interfaces'):
+                    keyword = 'extends' if class_data.get('is_interface') else 'implements'
+                    print(f"   🧬 {keyword} {', '.join(class_data['interfaces'])}")
+                overloads = class_data.get('overloads', {})
+                print(f"   🔧 メソッド: {sum(len(methods) for methods in overloads.values())}個")
+                if args.methods:
+                    for methods in overloads.values():
+                        for method_data in methods:
+                            print(f"      L{method_data.get('start_line', 0)}-{method_data.get('end_line', 0)} "
+                                  f"{format_method_signature(method_data)}")
+        except Exception as e:
+            print(f"\n❌ エラー: {e}")
+            sys.exit(1)
+
+
+def run_method_command(argv: list):
+    """method サブコマンド: キャッシュ済みインデックスからメソッド定義を検索"""
+    parser = argparse.ArgumentParser(
+        prog="main.py method",
+        description="メソッド定義の位置を検索（キャッシュのみ参照、構文解析なし）",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  python main.py method UserEntityManager.find --settings test_settings.json
+  python main.py method doInsert --settings test_settings.json
+        """
+    )
+    parser.add_argument('method', help='メソッド名、または クラス名.メソッド名（完全クラス名も可）')
+    _add_query_arguments(parser)
+    args = parser.parse_args(argv)
     
-    if resolved_count > 0:
-        print("   ✅ 解決済み依存関係:")
-        for call in resolved_calls:
-            if call.get('resolved', False):
-                print(f"      📞 {call['call_pattern']}")
-                print(f"         → {call['target_class']}.{call['target_method']}")
-                print(f"         📄 {call['target_file']}")
-                print()
+    from index_cache import format_method_signature
     
-    unresolved_calls = [call for call in resolved_calls if not call.get('resolved', False)]
-    if unresolved_calls:
-        print("   ⚠️  未解決の呼び出し:")
-        for call in unresolved_calls:
-            print(f"      ❓ {call['call_pattern']}")
-        print()
+    with instrumented_run(args):
+        try:
+            query = load_index_query(args)
+            class_name, _, method_name = args.method.rpartition('.')
+            definitions = query.find_methods(method_name, class_name or None)
+            
+            print(f"\n📋 {args.method} の定義: {len(definitions)}件")
+            for class_data, method_data in definitions:
+                print(f"   📍 {format_method_signature(method_data, class_data['class_name'])}")
+                print(f"      📄 {method_data['file_path']}:{method_data.get('start_line', 0)}"
+                      f"-{method_data.get('end_line', 0)} 📁 {class_data['source_path']}")
+        except Exception as e:
+            print(f"\n❌ エラー: {e}")
+            sys.exit(1)
+
+
+def run_search_command(argv: list):
+    """search サブコマンド: クラス名・メソッド名の一部やタイプミスを含む名前で検索"""
+    parser = argparse.ArgumentParser(
+        prog="main.py search",
+        description="クラス名・完全クラス名・メソッド名を前方一致・部分一致・あいまい一致で検索（キャッシュのみ参照、構文解析なし）",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  python main.py search UserServ --settings test_settings.json
+  python main.py search UsrService --kind class --settings test_settings.json
+  python main.py search insert --kind method --limit 50 --settings test_settings.json
+        """
+    )
+    parser.add_argument('query', help='検索文字列（名前の一部・先頭部分、タイプミスを含む名前も可）')
+    parser.add_argument('--kind', choices=['class', 'method', 'all'], default='all',
+                        help='検索対象（class: クラス名・完全クラス名、method: メソッド名、デフォルト: all）')
+    parser.add_argument('--limit', type=int, default=20, help='表示する最大件数（デフォルト: 20）')
+    parser.add_argument('--max-distance', type=int, default=None,
+                        help='あいまい一致で許容する編集距離（デフォルト: 3文字以下は0、7文字以下は1、それ以上は2）')
+    _add_query_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.limit <= 0:
+        parser.error("--limit には1以上を指定してください")
+    if args.max_distance is not None and args.max_distance < 0:
+        parser.error("--max-distance には0以上を指定してください")
+    
+    import time
+    from name_search import SEARCH_KINDS, NameSearchIndex
+    
+    with instrumented_run(args):
+        try:
+            query = load_index_query(args)
+            with instrumentation.phase('search_index'):
+                search_index = NameSearchIndex(query.search_records())
+            kinds = SEARCH_KINDS if args.kind == 'all' else (args.kind,)
+            started = time.perf_counter()
+            with instrumentation.phase('search'):
+                hits = search_index.search(args.query, kinds, args.limit, args.max_distance)
+            elapsed = time.perf_counter() - started
+            
+            print(f"\n🔎 {args.query} の検索結果: {len(hits)}件"
+                  f"（{search_index.class_count}クラス・{len(search_index.terms)}語から {elapsed * 1000:.1f}ms）")
+            for hit in hits:
+                match = hit.match if hit.match != 'fuzzy' else f"fuzzy, 距離{hit.distance}"
+                if hit.kind == 'method':
+                    print(f"   🔧 {hit.class_name}.{hit.method_name} [{match}]")
+                    print(f"      📄 {hit.file_path}:{hit.line} 📁 {hit.source_path}")
+                else:
+                    print(f"   🏛️  {hit.class_name} ({hit.full_class_name}) [{match}]")
+                    print(f"      📄 {hit.file_path} 📁 {hit.source_path}")
+        except Exception as e:
+            print(f"\n❌ エラー: {e}")
+            sys.exit(1)
+
+
+def run_report_command(argv: list):
+    """report サブコマンド: パッケージ・ソースパス単位の集計をCSV/JSONで出力"""
+    parser = argparse.ArgumentParser(
+        prog="main.py report",
+        description="パッケージ・ソースパス単位の集計（クラス数・メソッド数・ソースパス間の同名クラス・依存数）を出力（キャッシュのみ参照、構文解析なし）",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+節:
+  sources       ソースパスごとのパッケージ数・クラス数・interface数・メソッド数
+  packages      ソースパス・パッケージごとのクラス数・interface数・メソッド数
+  duplicates    複数のソースパスで定義されている単純クラス名
+  dependencies  ソースパス間の依存数（import、保存済みの呼び出しグラフがあれば呼び出しも）
+
+使用例:
+  python main.py report --settings test_settings.json
+  python main.py report --settings test_settings.json --format json --output report.json
+  python main.py report --settings test_settings.json --format csv --section packages --output packages.csv
+  python main.py report --settings test_settings.json --format csv --output report_dir
+        """
+    )
+    parser.add_argument('--format', choices=['json', 'csv'], default='json', help='出力形式（デフォルト: json）')
+    parser.add_argument('--section', choices=['all', 'sources', 'packages', 'duplicates', 'dependencies'], default='all',
+                        help='出力する節（デフォルト: all）')
+    parser.add_argument('--output', help='出力ファイル（省略時は標準出力）。csv で全節を出力する場合は出力ディレクトリ（節ごとに 節名.csv）')
+    _add_query_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.format == 'csv' and args.section == 'all' and not args.output:
+        parser.error("csv で全節を出力する場合は --output に出力ディレクトリを指定してください（1節のみは --section）")
+    
+    from index_report import REPORT_SECTIONS, build_index_report, write_report_csv, write_report_json
+    
+    sections = REPORT_SECTIONS if args.section == 'all' else (args.section,)
+    
+    # 結果を標準出力に書く場合、ログ・進捗は標準エラー出力へ
+    with result_output(not args.output) as result_stream:
+        with instrumented_run(args):
+            try:
+                query = load_index_query(args)
+                with instrumentation.phase('report_aggregation'):
+                    report = build_index_report(query)
+                
+                if args.format == 'json':
+                    if args.output:
+                        with open(args.output, 'w', encoding='utf-8') as f:
+                            write_report_json(report, f, sections)
+                    else:
+                        write_report_json(report, result_stream, sections)
+                else:
+                    rows = report.sections()
+                    if args.section == 'all':
+                        os.makedirs(args.output, exist_ok=True)
+                        for section in sections:
+                            with open(os.path.join(args.output, f"{section}.csv"), 'w', encoding='utf-8', newline='') as f:
+                                write_report_csv(rows[section], f, section)
+                    elif args.output:
+                        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                            write_report_csv(rows[args.section], f, args.section)
+                    else:
+                        write_report_csv(rows[args.section], result_stream, args.section)
+                
+                if args.output:
+                    print(f"✅ 集計レポートを出力: {args.output} ({report.class_count}クラス, 呼び出しグラフの辺 {report.call_edge_count}個)")
+            except Exception as e:
+                print(f"\n❌ エラー: {e}")
+                sys.exit(1)
+
+
+def run_stats_command(argv: list):
+    """stats サブコマンド: キャッシュ済みインデックスの統計"""
+    parser = argparse.ArgumentParser(
+        prog="main.py stats",
+        description="クラスインデックスの統計（キャッシュのみ参照、構文解析なし）"
+    )
+    _add_query_arguments(parser)
+    args = parser.parse_args(argv)
     
+    import time
+    
+    with instrumented_run(args):
+        try:
+            stats = load_index_query(args).stats()
+            print(f"\n📊 クラスインデックス統計")
+            print(f"   💾 キャッシュ: {stats['cache_file']} ({stats['cache_size_bytes'] / 1024:.0f}KB)")
+            print(f"   🕒 作成日時: {time.ctime(stats['created_at'])}")
+            print(f"   🏛️  クラス数: {stats['classes']}")
+            print(f"   🔧 メソッド数: {stats['methods']}")
+            print(f"   🔑 インデックスキー数: {stats['index_keys']}")
+            print(f"   🗄️  埋め込みSQL参照テーブル: {stats['tables']}個")
+            if 'call_edges' in stats:
+                print(f"   🔗 保存済み呼び出しグラフの辺: {stats['call_edges']}個")
+            for source_id, count in stats['sources'].items():
+                print(f"   📦 {source_id}: {count}個のクラス")
+        except Exception as e:
+            print(f"\n❌ エラー: {e}")
+            sys.exit(1)
+
+
+# サブコマンド名 → 実行関数
+SUBCOMMANDS = {
+    'index': run_index_command,
+    'merge-index': run_merge_index_command,
+    'crud': run_crud_command,
+    'impact': run_impact_command,
+    'cycles': run_cycles_command,
+    'tables': run_tables_command,
+    'lookup': run_lookup_command,
+    'method': run_method_command,
+    'search': run_search_command,
+    'report': run_report_command,
+    'stats': run_stats_command,
+}
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
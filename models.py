@@ -5,7 +5,7 @@ Data models for Smart Entity CRUD Analyzer
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from enum import Enum
 
 
@@ -25,14 +25,56 @@ class ClassInfo:
     file_path: str                     # ファイルパス
     source_path: str                   # ソースパス (aios_cas/src or cfw_cas/src)
     package_name: str                  # パッケージ名
-    methods: Dict[str, 'MethodInfo']   # メソッド一覧
+    methods: Dict[str, 'MethodInfo']   # メソッド一覧（同名オーバーロードは最初の定義）
     imports: List[str]                 # import文一覧
+    overloads: Dict[str, List['MethodInfo']] = field(default_factory=dict)  # メソッド名 → 全オーバーロード
+    superclass: str = ""               # extends指定の親クラス名（記述どおり、ジェネリクス除去）
+    interfaces: List[str] = field(default_factory=list)  # implements指定（interfaceの場合は親interface）
+    is_interface: bool = False         # interface宣言か
+    is_abstract: bool = False          # abstractクラスまたはinterfaceか
+    _arity_index: Optional[Dict[Tuple[str, int], List['MethodInfo']]] = field(
+        default=None, init=False, repr=False, compare=False)  # (メソッド名, 引数数) → オーバーロード
     
     def __post_init__(self):
         """ソースパス情報の正規化"""
         if self.source_path:
             # ソースパスを正規化（末尾のスラッシュを統一）
             self.source_path = self.source_path.rstrip('/')
+        
+        # オーバーロード情報がない場合（旧形式）はメソッド一覧から補完
+        if not self.overloads and self.methods:
+            self.overloads = {name: [method] for name, method in self.methods.items()}
+    
+    def _build_arity_index(self):
+        """(メソッド名, 引数数) → オーバーロード のインデックスを構築"""
+        self._arity_index = {}
+        for method_name, overloads in self.overloads.items():
+            for method in overloads:
+                self._arity_index.setdefault((method_name, method.arity), []).append(method)
+    
+    def find_overloads(self, method_name: str, arg_count: Optional[int] = None) -> List['MethodInfo']:
+        """
+        メソッド名と呼び出し側の引数数からオーバーロード候補を取得
+        arg_countがNone（引数数不明）の場合は同名の全オーバーロードを返す
+        """
+        if arg_count is None:
+            return self.overloads.get(method_name, [])
+        
+        if self._arity_index is None:
+            self._build_arity_index()
+        
+        exact = self._arity_index.get((method_name, arg_count))
+        if exact:
+            return exact
+        
+        # 可変長引数のオーバーロード
+        return [method for method in self.overloads.get(method_name, [])
+                if method.is_varargs and arg_count >= method.arity - 1]
+    
+    def find_method(self, method_name: str, arg_count: Optional[int] = None) -> Optional['MethodInfo']:
+        """メソッド名と引数数に一致する最初のオーバーロードを取得"""
+        candidates = self.find_overloads(method_name, arg_count)
+        return candidates[0] if candidates else None
 
 
 @dataclass
@@ -42,8 +84,38 @@ class MethodInfo:
     class_name: str
     method_name: str
     return_type: str
-    parameters: List[str]
+    parameters: List[str]              # パラメータ型一覧
     source_path: str                   # 追加：どのソースパス由来か
+    is_abstract: bool = False          # 本体なし（interface/abstractメソッド）
+    start_offset: int = 0              # メソッド定義の開始位置（文字オフセット）
+    end_offset: int = 0                # メソッド定義の終了位置（文字オフセット）
+    start_line: int = 0                # 開始行（1始まり）
+    end_line: int = 0                  # 終了行（1始まり）
+    sql_statements: List[Dict] = field(default_factory=list)  # 埋め込みSQL（sql_extractor.parse_sql の結果）
+    
+    @property
+    def arity(self) -> int:
+        """パラメータ数"""
+        return len(self.parameters)
+    
+    @property
+    def is_varargs(self) -> bool:
+        """可変長引数メソッドか"""
+        return bool(self.parameters) and self.parameters[-1].endswith('...')
+    
+    @property
+    def has_span(self) -> bool:
+        """メソッド定義の範囲が記録されているか"""
+        return self.end_offset > self.start_offset
+
+
+@dataclass
+class TraceOptions:
+    """再帰探索（トレーサー）のオプション"""
+    expand_implementations: bool = False   # interface/abstract呼び出しを実装クラスへ展開
+    max_implementations: int = 5           # 1呼び出しあたりの実装クラス展開数の上限
+    max_nodes: Optional[int] = None        # 展開するメソッド数の上限（起点ファイルを除く、None は無制限）
+    time_budget: Optional[float] = None    # 探索の時間予算（秒、None は無制限）
 
 
 @dataclass
@@ -152,48 +224,63 @@ class CRUDOperation:
     evidence: str = ""
 
 
+# CRUD種別（EntityAnalysisResult の操作の格納順）
+_CRUD_OPERATION_TYPES = ("CREATE", "READ", "UPDATE", "DELETE")
+
+
 @dataclass
 class EntityAnalysisResult:
-    """単一Entityの解析結果"""
+    """
+    単一Entityの解析結果
+
+    CRUD操作は種別ごとに 重複判定キー（メソッド名, ファイルパス, 行番号）→ 操作 の辞書（挿入順）で保持し、
+    add_operations でのみ追加する。create_operations 等は追加順の一覧（コピー）を返す
+    """
     name: str
     package: str = ""
     usage_locations: List[EntityUsage] = field(default_factory=list)
-    create_operations: List[CRUDOperation] = field(default_factory=list)
-    read_operations: List[CRUDOperation] = field(default_factory=list)
-    update_operations: List[CRUDOperation] = field(default_factory=list)
-    delete_operations: List[CRUDOperation] = field(default_factory=list)
     method_chains: List[MethodChain] = field(default_factory=list)
     no_pattern_detected: bool = False  # EntityManager/ORMapper/EntityCollection未検出フラグ
     analysis_failed: bool = False  # 判定不可能フラグ
+    _operations: Dict[str, Dict[Tuple[str, str, int], CRUDOperation]] = field(
+        default_factory=lambda: {crud_type: {} for crud_type in _CRUD_OPERATION_TYPES},
+        init=False, repr=False)  # CRUD種別 → 重複判定キー → CRUD操作
+    
+    @property
+    def create_operations(self) -> List[CRUDOperation]:
+        return self._get_operations_by_type("CREATE")
+    
+    @property
+    def read_operations(self) -> List[CRUDOperation]:
+        return self._get_operations_by_type("READ")
+    
+    @property
+    def update_operations(self) -> List[CRUDOperation]:
+        return self._get_operations_by_type("UPDATE")
+    
+    @property
+    def delete_operations(self) -> List[CRUDOperation]:
+        return self._get_operations_by_type("DELETE")
     
     def add_operations(self, operations: List[CRUDOperation]):
-        """CRUD操作を追加（Entity レベルで重複除去）"""
+        """CRUD操作を追加（Entity レベルで重複除去: メソッド名＋ソース位置が同じ操作は最初の1件のみ、未知の種別は無視）"""
         for op in operations:
-            # 同じメソッド名の操作が既に存在するかチェック
-            existing_ops = self._get_operations_by_type(op.operation_type)
-            is_duplicate = any(existing_op.method_name == op.method_name for existing_op in existing_ops)
-            
-            if not is_duplicate:
-                if op.operation_type == "CREATE":
-                    self.create_operations.append(op)
-                elif op.operation_type == "READ":
-                    self.read_operations.append(op)
-                elif op.operation_type == "UPDATE":
-                    self.update_operations.append(op)
-                elif op.operation_type == "DELETE":
-                    self.delete_operations.append(op)
-    
-    def _get_operations_by_type(self, operation_type: str) -> List[CRUDOperation]:
-        """指定タイプの操作リストを取得"""
-        if operation_type == "CREATE":
-            return self.create_operations
-        elif operation_type == "READ":
-            return self.read_operations
-        elif operation_type == "UPDATE":
-            return self.update_operations
-        elif operation_type == "DELETE":
-            return self.delete_operations
-        return []
+            operations_by_key = self._operations.get(op.operation_type)
+            if operations_by_key is not None:
+                operations_by_key.setdefault(self._operation_key(op), op)
+    
+    def _get_operations_by_type(self, operation_type: str) -> Optional[List[CRUDOperation]]:
+        """指定タイプの操作の一覧（追加順のコピー、未知のタイプはNone）"""
+        operations_by_key = self._operations.get(operation_type)
+        return list(operations_by_key.values()) if operations_by_key is not None else None
+    
+    @staticmethod
+    def _operation_key(op: CRUDOperation) -> Tuple[str, str, int]:
+        """重複判定キー（メソッド名, ファイルパス, 行番号）"""
+        location = op.source_location
+        if location is None:
+            return (op.method_name, "", 0)
+        return (op.method_name, location.file_path, location.line_number)
     
     def calculate_confidence(self) -> float:
         """信頼度計算（ORMapperまで到達できた割合）"""
@@ -205,10 +292,57 @@ class EntityAnalysisResult:
     
     def get_total_operations(self) -> int:
         """総CRUD操作数"""
-        return (len(self.create_operations) + len(self.read_operations) + 
-                len(self.update_operations) + len(self.delete_operations))
+        return sum(len(operations_by_key) for operations_by_key in self._operations.values())
     
     def has_full_crud(self) -> bool:
         """完全CRUD実装判定"""
-        return (len(self.create_operations) > 0 and len(self.read_operations) > 0 and
-                len(self.update_operations) > 0 and len(self.delete_operations) > 0)
\ No newline at end of file
+        return all(self._operations.values())
+
+
+@dataclass
+class CrudMatrixResult:
+    """起点クラス × Entity × CRUD のマトリクス解析結果"""
+    matrix: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)  # 起点クラス → Entity → CRUD種別
+    entities: Dict[str, EntityAnalysisResult] = field(default_factory=dict)  # Entity名 → 解析結果
+    entry_points: List[str] = field(default_factory=list)                   # 起点クラス一覧
+    unclassified_terminals: List[str] = field(default_factory=list)         # CRUD種別を判定できなかった終端メソッド
+    unresolved_entity_terminals: List[str] = field(default_factory=list)    # 対象Entityを特定できなかった終端メソッド
+
+    def add_cell(self, entry_point: str, entity_name: str, crud_type: str):
+        """マトリクスのセルにCRUD種別を追加（重複なし）"""
+        cell = self.matrix.setdefault(entry_point, {}).setdefault(entity_name, [])
+        if crud_type not in cell:
+            cell.append(crud_type)
+
+
+@dataclass
+class ImpactResult:
+    """変更影響解析の結果"""
+    changed_files: int = 0                                                   # 指定された変更ファイル数
+    changed_methods: List[str] = field(default_factory=list)                 # 変更メソッド（呼び出しグラフのノードID）
+    class_level_changes: List[str] = field(default_factory=list)             # クラス全体の変更として扱ったクラス
+    unmatched_files: List[str] = field(default_factory=list)                 # インデックスのクラスに対応しない変更ファイル
+    reached_methods: int = 0                                                  # 逆探索で到達したメソッド数
+    affected: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)   # 起点クラス → 起点メソッド → 変更メソッドまでの経路
+
+
+@dataclass
+class CallCycle:
+    """呼び出しグラフの循環（強連結成分）"""
+    members: List[str] = field(default_factory=list)   # 成分に含まれるノードID（探索順）
+    path: List[str] = field(default_factory=list)      # 循環の一例（先頭のノードから先頭のノードへ戻る経路）
+
+
+@dataclass
+class SearchHit:
+    """クラス名・メソッド名検索（name_search）の結果"""
+    kind: str                          # class / method
+    name: str                          # 一致した名前（クラス名・完全クラス名・メソッド名）
+    match: str                         # exact / prefix / substring / fuzzy
+    distance: int                      # 編集距離（fuzzy 以外は 0）
+    class_name: str
+    full_class_name: str
+    source_path: str
+    file_path: str
+    method_name: Optional[str] = None  # kind=method のメソッド名
+    line: int = 0                      # kind=method の開始行
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Name search index for Smart Entity CRUD Analyzer
+クラス名・完全クラス名・メソッド名の前方一致・部分一致・あいまい（タイプミス許容）検索
+
+- 前方一致: 小文字化した検索語の整列済み配列を二分探索（トライを平坦化したもの。接頭辞が同じ検索語は連続区間になる）
+- 部分一致: 検索語のトライグラム → 検索語IDの転置リストを積集合で絞り込み、文字列で確認
+- あいまい一致: 共有トライグラム数の下限（編集1回で失われるトライグラムは3個まで）で候補を絞り、
+  幅を制限した編集距離（Levenshtein）で確認。転置リストの長いトライグラム（完全クラス名のパッケージ部分等）は数えず、
+  数えなかった分だけ下限を下げる
+- 大文字小文字は区別しない。順位は 完全一致 > 前方一致 > 部分一致 > あいまい一致、続いて編集距離・名前の短い順
+- 順位順に必要な件数だけ展開し、上位の一致で件数が足りれば部分一致・あいまい一致は求めない
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models import SearchHit
+
+
+# 検索対象の種別（class: クラス名・完全クラス名、method: メソッド名）
+SEARCH_KINDS = ('class', 'method')
+
+# 一致の種類 → 順位
+_MATCH_ORDER = {'exact': 0, 'prefix': 1, 'substring': 2, 'fuzzy': 3}
+
+# トライグラムの前後に付ける文字（語頭・語末のトライグラムを区別する）
+_PAD = '\x00'
+
+# あいまい一致で数える転置リストの長さの上限（検索語数に対する割合の逆数。最低限必要な数の短い転置リストは長さによらず数える）
+_FUZZY_POSTINGS_DIVISOR = 8
+
+# 前方一致の区間の終端（小文字化した検索語 + この文字 より前が前方一致）
+_MAX_CHAR = '\U0010ffff'
+
+
+def _trigrams(text: str, padded: bool = True) -> set:
+    """トライグラムの集合（padded: 前後に2文字ずつ埋めて語頭・語末も含める）"""
+    if padded:
+        text = f"{_PAD}{_PAD}{text}{_PAD}{_PAD}"
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def default_max_distance(query: str) -> int:
+    """あいまい一致で許容する編集距離（3文字以下は0、7文字以下は1、それ以上は2）"""
+    if len(query) <= 3:
+        return 0
+    return 1 if len(query) <= 7 else 2
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """編集距離（limit を超える場合は None、対角線から limit 以内の帯だけを計算）"""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    over = limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        for j in range(low, high + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != b[j - 1]))
+        if min(current[max(0, low - 1):high + 1]) > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class NameSearchIndex:
+    """
+    クラス名・メソッド名の検索インデックス
+
+    - targets: 検索結果の対象（クラス、またはクラスのメソッド）
+    - terms: 検索語（元の表記）と種別・対象。クラスは単純名と完全クラス名の2語、メソッドはメソッド名
+    """
+
+    def __init__(self, records: Iterable[dict]):
+        """
+        Args:
+            records: クラスごとの {'class_name', 'full_class_name', 'source_path', 'file_path',
+                     'methods': [(メソッド名, 開始行), ...]}（IndexQuery.search_records 等）
+        """
+        self.targets: List[tuple] = []  # (種別, クラス名, 完全クラス名, ソースパス, ファイルパス, メソッド名, 行)
+        self.terms: List[str] = []
+        self.term_kinds: List[str] = []
+        self.term_targets: List[List[int]] = []
+        self.class_count = 0
+        self._term_ids: Dict[tuple, int] = {}
+        self._build(records)
+
+    def _add_term(self, name: str, kind: str, target_id: int):
+        term_id = self._term_ids.get((name, kind))
+        if term_id is None:
+            term_id = self._term_ids[(name, kind)] = len(self.terms)
+            self.terms.append(name)
+            self.term_kinds.append(kind)
+            self.term_targets.append([])
+        self.term_targets[term_id].append(target_id)
+
+    def _build(self, records: Iterable[dict]):
+        for record in records:
+            location = (record['class_name'], record['full_class_name'], record['source_path'], record['file_path'])
+            class_target = len(self.targets)
+            self.targets.append(('class',) + location + (None, 0))
+            self.class_count += 1
+            self._add_term(record['class_name'], 'class', class_target)
+            if record['full_class_name'] != record['class_name']:
+                self._add_term(record['full_class_name'], 'class', class_target)
+
+            seen = set()
+            for method_name, line in record.get('methods', ()):
+                if method_name in seen:
+                    continue  # オーバーロードは最初の定義のみ
+                seen.add(method_name)
+                self.targets.append(('method',) + location + (method_name, line))
+                self._add_term(method_name, 'method', len(self.targets) - 1)
+
+        self._lowered = [term.lower() for term in self.terms]
+        order = sorted(range(len(self._lowered)), key=self._lowered.__getitem__)
+        self._sorted_keys = [self._lowered[term_id] for term_id in order]
+        self._sorted_terms = order
+        # 名前の順位（短い順、大文字小文字を区別しない辞書順）。同名のクラス名・メソッド名は同じ順位
+        names = sorted(set(self.terms), key=lambda name: (len(name), name.lower(), name))
+        positions = {name: position for position, name in enumerate(names)}
+        self._order = [positions[term] for term in self.terms]
+        self._postings: Dict[str, List[int]] = {}
+        for term_id, lowered in enumerate(self._lowered):
+            for trigram in _trigrams(lowered):
+                self._postings.setdefault(trigram, []).append(term_id)
+        self._fuzzy_postings_cap = len(self.terms) // _FUZZY_POSTINGS_DIVISOR
+
+    def search(self, query: str, kinds: Iterable[str] = SEARCH_KINDS, limit: int = 20,
+               max_distance: Optional[int] = None) -> List[SearchHit]:
+        """
+        名前を検索
+
+        Args:
+            query: 検索文字列（名前の一部・先頭部分・タイプミスを含む名前）
+            kinds: 検索対象の種別（'class' / 'method'）
+            limit: 結果の最大件数
+            max_distance: あいまい一致で許容する編集距離（None は default_max_distance）
+        """
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+        distance_limit = default_max_distance(query) if max_distance is None else max_distance
+        return self._collect_hits(self._ranked_terms(query, distance_limit), set(kinds), limit)
+
+    def _ranked_terms(self, query: str, distance_limit: int) -> Iterator[tuple]:
+        """
+        一致した検索語を順位順に列挙 (順位, 検索語ID, 一致の種類, 編集距離)
+
+        一致の種類ごとに必要になった時点で求める（上位の一致で件数が足りれば部分一致・あいまい一致は求めない）
+        """
+        lowered = query.lower()
+        order = self._order.__getitem__
+
+        # 完全一致・前方一致（整列済み配列の連続区間、先頭は完全一致）
+        low = bisect_left(self._sorted_keys, lowered)
+        high = bisect_left(self._sorted_keys, lowered + _MAX_CHAR, low)
+        exact_end = low
+        while exact_end < high and self._sorted_keys[exact_end] == lowered:
+            exact_end += 1
+        for term_id in sorted(self._sorted_terms[low:exact_end], key=lambda term_id: (self.terms[term_id] != query, order(term_id))):
+            yield ('exact', self.terms[term_id] != query, order(term_id)), term_id, 'exact', 0
+        for term_id in sorted(self._sorted_terms[exact_end:high], key=order):
+            yield ('prefix', order(term_id)), term_id, 'prefix', 0
+
+        # 部分一致
+        substring = [term_id for term_id in self._substring_candidates(lowered)
+                     if lowered in self._lowered[term_id] and not self._lowered[term_id].startswith(lowered)]
+        for term_id in sorted(substring, key=order):
+            yield ('substring', order(term_id)), term_id, 'substring', 0
+
+        # あいまい一致
+        if distance_limit > 0:
+            fuzzy = sorted((distance, order(term_id), term_id)
+                           for term_id, distance in self._fuzzy_candidates(lowered, distance_limit))
+            for distance, position, term_id in fuzzy:
+                yield ('fuzzy', distance, position), term_id, 'fuzzy', distance
+
+    def _collect_hits(self, ranked_terms: Iterable[tuple], kinds: set, limit: int) -> List[SearchHit]:
+        """
+        順位順の検索語を対象へ展開し、上位 limit 件を返す
+
+        同じ対象に複数の検索語が一致した場合（クラス名と完全クラス名）は上位の一致のみを採用する。
+        同じ順位の検索語（同名のクラス名とメソッド名）の対象は対象ID順。
+        """
+        hits = []
+        seen = set()
+        for _, group in groupby(ranked_terms, key=itemgetter(0)):
+            targets = sorted((target_id, term_id, match, distance)
+                             for _, term_id, match, distance in group if self.term_kinds[term_id] in kinds
+                             for target_id in self.term_targets[term_id])
+            for target_id, term_id, match, distance in targets:
+                if target_id in seen:
+                    continue
+                seen.add(target_id)
+                kind, class_name, full_class_name, source_path, file_path, method_name, line = self.targets[target_id]
+                hits.append(SearchHit(kind=kind, name=self.terms[term_id], match=match, distance=distance,
+                                      class_name=class_name, full_class_name=full_class_name,
+                                      source_path=source_path, file_path=file_path,
+                                      method_name=method_name, line=line))
+                if len(hits) >= limit:
+                    return hits
+        return hits
+
+    def _substring_candidates(self, lowered: str) -> Iterable[int]:
+        """部分一致の候補（3文字以上はトライグラムの転置リストの積集合、短い文字列は全検索語）"""
+        if len(lowered) < 3:
+            return range(len(self._lowered))
+        postings = sorted((self._postings.get(trigram, []) for trigram in _trigrams(lowered, padded=False)), key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+
+    def _fuzzy_candidates(self, lowered: str, limit: int) -> Iterable[tuple]:
+        """部分一致しない検索語のうち編集距離 limit 以内のもの (検索語ID, 編集距離)"""
+        query_trigrams = _trigrams(lowered)
+        threshold = len(query_trigrams) - 3 * limit
+        if threshold <= 0:
+            return  # トライグラムで絞り込めない短い文字列は対象外
+        # 転置リストの短い順に数える。threshold 個以上を共有する検索語は、数えなかったトライグラムをすべて共有していても
+        # 数えたトライグラムを threshold - 数えなかった数 個以上共有する（短い方から 3 * limit + 1 個は必ず数える）
+        postings = sorted((self._postings.get(trigram, ()) for trigram in query_trigrams), key=len)
+        counted = len(postings) - threshold + 1
+        while counted < len(postings) and len(postings[counted]) <= self._fuzzy_postings_cap:
+            counted += 1
+        minimum = threshold - (len(postings) - counted)
+        shared = Counter()
+        for posting in postings[:counted]:
+            shared.update(posting)
+        for term_id, count in shared.items():
+            term = self._lowered[term_id]
+            if count < minimum or abs(len(term) - len(lowered)) > limit or lowered in term:
+                continue
+            distance = bounded_edit_distance(lowered, term, limit)
+            if distance is not None:
+                yield term_id, distance
+
+
+def class_index_records(class_index) -> Iterable[dict]:
+    """クラスインデックス（辞書、または SQLite ストアのビュー）から検索用のレコードを列挙"""
+    from index_store import SqliteClassIndex
+    if isinstance(class_index, SqliteClassIndex):
+        # クラス情報を復元せず、名前と行番号だけを読む
+        return class_index.store.search_records()
+
+    from class_indexer import iter_unique_classes
+    return ({'class_name': class_info.class_name,
+             'full_class_name': class_info.full_class_name,
+             'source_path': class_info.source_path,
+             'file_path': class_info.file_path,
+             'methods': [(method_name, method_info.start_line) for method_name, method_info in class_info.methods.items()]}
+            for class_info in iter_unique_classes(class_index))
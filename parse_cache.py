@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-addressed parse cache for Smart Entity CRUD Analyzer
+ファイル内容のハッシュをキーとした、ファイル単位の抽出結果キャッシュ
+
+- 同じ内容のファイルは作業コピー・ブランチが異なっても1回だけ解析する
+- 抽出結果はファイルパス・ソース識別子を除いた形で保存し、読み込み時に付け直す
+- 書き込みは一時ファイル + os.replace の原子的置換（複数プロセスが同時に書き込んでも壊れない）
+- 合計サイズが上限を超えたら最終利用時刻（mtime）の古い順に削除（LRU）
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, Optional
+
+from utils import get_cache_dir, atomic_write_json
+
+
+# キャッシュディレクトリ配下の解析キャッシュの配置先
+PARSE_CACHE_DIR_NAME = 'parse'
+
+# 合計サイズ上限のデフォルト（MB）
+DEFAULT_MAX_SIZE_MB = 512
+
+# 上限超過時に削除後のサイズをここまで下げる（毎回の削除を避けるための余裕）
+_PRUNE_TARGET_RATIO = 0.8
+
+
+def content_hash(data: bytes) -> str:
+    """ファイル内容のハッシュ（キャッシュキー）"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    """
+    ファイル内容ハッシュ → 抽出結果 のディスクキャッシュ
+
+    配置: <cache_dir>/parse/v<形式バージョン>/[<名前空間>/]<ハッシュ先頭2文字>/<ハッシュ>.json
+    形式バージョンにはクラスインデックスのキャッシュ形式（CACHE_FORMAT_VERSION）を使い、抽出内容の変更時に切り替える
+    名前空間はクラス情報以外の抽出結果（呼び出しグラフ用のメソッド呼び出し等）を分けて保存する
+    """
+
+    def __init__(self, cache_dir: str, format_version: int, max_size_bytes: int = DEFAULT_MAX_SIZE_MB * 1024 * 1024,
+                 namespace: str = ''):
+        self.cache_dir = cache_dir
+        self.format_version = format_version
+        self.root_dir = os.path.join(cache_dir, PARSE_CACHE_DIR_NAME)
+        self.version_dir = os.path.join(self.root_dir, f"v{format_version}")
+        self.store_dir = os.path.join(self.version_dir, namespace) if namespace else self.version_dir
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @classmethod
+    def from_environment(cls, format_version: int) -> Optional['ParseCache']:
+        """
+        環境変数から構築（CLASS_INDEX_PARSE_CACHE=0 で無効）
+        - CLASS_INDEX_CACHE_DIR: キャッシュディレクトリ（デフォルト: ~/.cache/class-index-analyzer）
+        - CLASS_INDEX_PARSE_CACHE_MAX_MB: 合計サイズ上限（デフォルト: 512）
+        """
+        if os.environ.get('CLASS_INDEX_PARSE_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+            return None
+        try:
+            max_size_mb = float(os.environ.get('CLASS_INDEX_PARSE_CACHE_MAX_MB', DEFAULT_MAX_SIZE_MB))
+        except ValueError:
+            max_size_mb = DEFAULT_MAX_SIZE_MB
+        return cls(get_cache_dir(), format_version, int(max_size_mb * 1024 * 1024))
+
+    def with_namespace(self, namespace: str) -> 'ParseCache':
+        """同じキャッシュディレクトリ・サイズ上限で、別の名前空間に保存するキャッシュ"""
+        return ParseCache(self.cache_dir, self.format_version, self.max_size_bytes, namespace)
+
+    def _entry_path(self, digest: str) -> str:
+        return os.path.join(self.store_dir, digest[:2], f"{digest}.json")
+
+    def get(self, digest: str) -> Optional[Dict]:
+        """抽出結果を取得（なければNone）。利用時刻を更新してLRUの対象から外す"""
+        entry_path = self._entry_path(digest)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # 未登録、他プロセスによる削除、破損エントリはいずれも未ヒット扱い
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, digest: str, entry: Dict):
+        """抽出結果を保存（同じ内容を複数プロセスが同時に書いても最後の置換が残るだけで壊れない）"""
+        try:
+            # 同じ内容のエントリは同じ結果のため、書き込み同士のロックは不要
+            atomic_write_json(self._entry_path(digest), entry, lock=False)
+            self.writes += 1
+        except OSError as e:
+            print(f"⚠️  解析キャッシュ保存エラー: {e}")
+
+    def prune(self) -> int:
+        """
+        合計サイズが上限を超えていれば利用時刻の古いエントリから削除
+        旧形式バージョンのディレクトリも削除対象に含める
+
+        Returns:
+            削除したエントリ数
+        """
+        entries = []
+        total_size = 0
+        for dir_path, _, file_names in os.walk(self.root_dir):
+            for file_name in file_names:
+                if file_name.startswith('.tmp-'):
+                    continue  # 他プロセスが書き込み中
+                file_path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                # 旧形式のエントリは最優先で削除（名前空間によらず現在の形式バージョンは同じ扱い）
+                is_current = dir_path.startswith(self.version_dir + os.sep)
+                entries.append((is_current, stat.st_mtime, stat.st_size, file_path))
+                total_size += stat.st_size
+
+        if total_size <= self.max_size_bytes:
+            return 0
+
+        target_size = self.max_size_bytes * _PRUNE_TARGET_RATIO
+        removed = 0
+        for _, _, size, file_path in sorted(entries):
+            if total_size <= target_size:
+                break
+            try:
+                os.unlink(file_path)
+            except OSError:
+                continue
+            total_size -= size
+            removed += 1
+        return removed
+
+    def summary(self) -> str:
+        return f"ヒット: {self.hits}, 未ヒット: {self.misses}, 保存: {self.writes}"
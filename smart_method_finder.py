@@ -4,107 +4,141 @@
 Smart method finder using import context
 """
 
-def find_method_definition_with_imports(method_name: str, imports: list, class_indexer):
+from collections import OrderedDict
+
+
+def resolve_imported_classes(imports: list, class_indexer, source_path: str = None) -> dict:
+    """
+    importされたクラスをクラスインデックスで解決（JDK標準ライブラリは除外）
+    import文の完全クラス名で、呼び出し元のソースパスを優先して解決する（call_resolver と同じ解決順）
+    
+    Returns:
+        クラスキー（完全クラス名@ソース識別子） → [(import順の位置, 単純クラス名, import文, クラス情報)]
+    """
+    from class_indexer import class_key
+    
+    imported_classes = {}
+    for position, import_statement in enumerate(imports):
+        if import_statement.startswith('java.'):
+            continue  # JDK標準ライブラリは除外
+        
+        class_info = class_indexer.get_class_info(import_statement, source_path)
+        if class_info:
+            # com.example.mapper.UserEntityManager → UserEntityManager
+            class_name = import_statement.split('.')[-1]
+            imported_classes.setdefault(class_key(class_info), []).append((position, class_name, import_statement, class_info))
+    return imported_classes
+
+
+def find_method_definition_with_imports(method_name: str, imports: list, class_indexer, imported_classes: dict = None,
+                                        source_path: str = None):
     """
     importコンテキストを使ったスマートなメソッド定義検索
+    メソッド名の逆引きインデックスの定義クラスと、importされたクラスの共通部分を候補とする（オーバーロードごとに1候補）
     
     Args:
         method_name: 検索対象のメソッド名
         imports: 起点ファイルのimport文リスト
         class_indexer: マルチソースクラスインデックス
+        imported_classes: resolve_imported_classes の結果（一括検索時に再利用）
+        source_path: 起点ファイルのソース識別子（import の解決で優先）
     """
-    candidates = []
+    if imported_classes is None:
+        imported_classes = resolve_imported_classes(imports, class_indexer, source_path)
     
-    # Step 1: importされたクラス名を抽出
-    imported_classes = []
-    for import_statement in imports:
-        if import_statement.startswith('java.'):
-            continue  # JDK標準ライブラリは除外
-        
-        # com.example.mapper.UserEntityManager → UserEntityManager
-        class_name = import_statement.split('.')[-1]
-        imported_classes.append({
-            'class_name': class_name,
-            'full_name': import_statement
-        })
-    
-    # Step 2: importされたクラスからのみメソッドを検索
-    for imported_class in imported_classes:
-        class_name = imported_class['class_name']
-        
-        # クラス情報を取得
-        class_info = class_indexer.get_class_info(class_name)
-        if class_info and hasattr(class_info, 'methods') and class_info.methods:
-            
-            # メソッドが存在するかチェック
-            if method_name in class_info.methods:
-                method_info = class_info.methods[method_name]
-                
-                candidate = {
-                    'method_name': method_name,
-                    'class_name': class_name,
-                    'full_class_name': imported_class['full_name'],
-                    'file_path': class_info.file_path,
-                    'return_type': method_info.return_type,
-                    'parameters': method_info.parameters,
-                    'confidence': 'HIGH'  # importされているので高信頼度
-                }
-                candidates.append(candidate)
-    
-    # Step 3: 結果の整理
+    # メソッドを定義するクラスのうち、importされているもの
+    defining_classes = class_indexer.get_method_name_index().get(method_name, ())
+    matched = [entry for key in imported_classes.keys() & defining_classes for entry in imported_classes[key]]
+    
+    # import文の記述順に整列
+    candidates = []
+    for _, class_name, import_statement, class_info in sorted(matched, key=lambda entry: entry[0]):
+        for method_info in class_info.find_overloads(method_name):
+            candidates.append({
+                'method_name': method_name,
+                'class_name': class_name,
+                'full_class_name': class_info.full_class_name,
+                'source_path': class_info.source_path,
+                'file_path': class_info.file_path,
+                'return_type': method_info.return_type,
+                'parameters': method_info.parameters,
+                'method_info': method_info,
+                'confidence': 'HIGH'  # importされているので高信頼度
+            })
     return candidates
 
 
-def extract_method_source_from_file(file_path: str, method_name: str):
-    """ファイルから特定メソッドのソースコードを抽出"""
-    try:
-        from utils import read_file_with_encoding
-        import javalang
+class MethodSourceReader:
+    """
+    記録済みのメソッド範囲（オフセット）からソースコードを切り出す
+    
+    - ファイル内容は復号済みのテキストを最近使ったものから max_files 件まで保持し、1ファイル1回の読み込みで済ませる
+    - 範囲はクラスインデックス構築時に文字列・コメントを考慮して求めたものを使うため、再解析しない
+    """
+    
+    def __init__(self, max_files: int = 64):
+        self.max_files = max(1, max_files)
+        self._contents = OrderedDict()
+        self.files_read = 0
+    
+    def read(self, file_path: str) -> str:
+        """ファイル内容（復号済み）をキャッシュから取得"""
+        content = self._contents.get(file_path)
+        if content is not None:
+            self._contents.move_to_end(file_path)
+            return content
         
+        from utils import read_file_with_encoding
         content = read_file_with_encoding(file_path)
-        tree = javalang.parse.parse(content)
-        lines = content.split('\n')
+        self.files_read += 1
+        self._contents[file_path] = content
+        if len(self._contents) > self.max_files:
+            self._contents.popitem(last=False)
+        return content
+    
+    def method_source(self, file_path: str, method_name: str, method_info=None):
+        """
+        メソッドのソースコードと行番号を取得
+        method_info に範囲がない場合（旧形式のインデックス等）はファイル内容からシグネチャを抽出して範囲を求める
+        """
+        try:
+            content = self.read(file_path)
+        except OSError:
+            return None
         
-        for _, node in tree.filter(javalang.tree.MethodDeclaration):
-            if node.name == method_name:
-                # メソッドの開始・終了行を特定
-                start_line = node.position.line - 1 if hasattr(node, 'position') and node.position else 0
-                
-                # 簡易的な終了行推定
-                brace_count = 0
-                end_line = start_line
-                in_method = False
-                
-                for i in range(start_line, len(lines)):
-                    line = lines[i]
-                    if '{' in line:
-                        brace_count += line.count('{')
-                        in_method = True
-                    if '}' in line:
-                        brace_count -= line.count('}')
-                        if in_method and brace_count == 0:
-                            end_line = i
-                            break
-                
-                # ソースコード抽出
-                source_lines = lines[start_line:end_line + 1]
-                return {
-                    'source_code': '\n'.join(source_lines),
-                    'start_line': start_line + 1,
-                    'end_line': end_line + 1,
-                    'return_type': node.return_type.name if node.return_type else 'void',
-                    'parameters': [{'name': p.name, 'type': p.type.name if hasattr(p.type, 'name') else str(p.type)} 
-                                  for p in node.parameters] if node.parameters else [],
-                    'modifiers': [str(m) for m in node.modifiers] if node.modifiers else []
-                }
+        if method_info is not None and method_info.has_span:
+            start_offset, end_offset = method_info.start_offset, method_info.end_offset
+            return_type, parameters = method_info.return_type, method_info.parameters
+        else:
+            from utils import extract_method_signatures
+            method_sig = next((sig for sig in extract_method_signatures(content) if sig['method_name'] == method_name), None)
+            if method_sig is None:
+                return None
+            start_offset, end_offset = method_sig['start_offset'], method_sig['end_offset']
+            return_type, parameters = method_sig['return_type'], method_sig['parameters']
         
-        return None
-    
-    except Exception as e:
-        return None
+        # インデントを含めるため行頭から切り出す
+        line_start = content.rfind('\n', 0, start_offset) + 1
+        start_line = content.count('\n', 0, start_offset) + 1
+        return {
+            'source_code': content[line_start:end_offset],
+            'start_line': start_line,
+            'end_line': start_line + content.count('\n', start_offset, end_offset),
+            'return_type': return_type,
+            'parameters': parameters
+        }
+
+
+# 既定のソース読み込み（一括検索中に同じファイルを再読み込みしない）
+_default_source_reader = MethodSourceReader()
+
+
+def extract_method_source_from_file(file_path: str, method_name: str, method_info=None, reader: MethodSourceReader = None):
+    """ファイルから特定メソッドのソースコードを抽出（記録済みの範囲を使用し、構文解析しない）"""
+    return (reader or _default_source_reader).method_source(file_path, method_name, method_info)
 
 
-def display_method_definition(method_name: str, candidates: list, show_source: bool = False):
+def display_method_definition(method_name: str, candidates: list, show_source: bool = False, source_reader: MethodSourceReader = None):
     """メソッド定義の結果を表示"""
     
     if not candidates:
@@ -121,7 +155,8 @@ def display_method_definition(method_name: str, candidates: list, show_source: b
         
         if show_source:
             # ソースコードを表示
-            source_info = extract_method_source_from_file(candidate['file_path'], method_name)
+            source_info = extract_method_source_from_file(candidate['file_path'], method_name,
+                                                          candidate.get('method_info'), source_reader)
             if source_info:
                 print(f"   📍 行番号: {source_info['start_line']}-{source_info['end_line']}")
                 print("\n💻 ソースコード:")
@@ -132,26 +167,29 @@ def display_method_definition(method_name: str, candidates: list, show_source: b
     else:
         print(f"⚠️  複数のメソッド定義候補: {len(candidates)}個")
         for i, candidate in enumerate(candidates, 1):
-            print(f"   {i}. {candidate['class_name']}.{method_name}()")
+            print(f"   {i}. {candidate['class_name']}.{method_name}({', '.join(candidate['parameters'])})")
             print(f"      📄 {candidate['file_path']}")
             print(f"      ↩️  {candidate['return_type']}")
 
 
-def batch_find_method_definitions(method_names: list, imports: list, class_indexer, show_source: bool = False):
-    """複数メソッドの定義を一括検索"""
+def batch_find_method_definitions(method_names: list, imports: list, class_indexer, show_source: bool = False,
+                                  source_path: str = None):
+    """複数メソッドの定義を一括検索（source_path: 起点ファイルのソース識別子）"""
     
     print(f"🔍 一括メソッド定義検索: {len(method_names)}個のメソッド")
     print(f"📥 検索範囲: import済み{len([imp for imp in imports if not imp.startswith('java.')])}クラス")
     print()
     
     results = {}
+    imported_classes = resolve_imported_classes(imports, class_indexer, source_path)
+    source_reader = MethodSourceReader() if show_source else None
     
     for method_name in method_names:
         print(f"🔎 {method_name}()を検索中...")
-        candidates = find_method_definition_with_imports(method_name, imports, class_indexer)
+        candidates = find_method_definition_with_imports(method_name, imports, class_indexer, imported_classes, source_path)
         results[method_name] = candidates
         
-        display_method_definition(method_name, candidates, show_source)
+        display_method_definition(method_name, candidates, show_source, source_reader)
         print()
     
     # サマリー
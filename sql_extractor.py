@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Embedded SQL extractor for Smart Entity CRUD Analyzer
+メソッド本体の文字列リテラルに埋め込まれたSQLを抽出し、文種別と参照テーブルを判定
+
+- 文字列リテラルと定数（static final String）の + 連結を評価してSQL文字列を復元
+- 軽量SQLトークナイザーで SELECT/INSERT/UPDATE/DELETE/MERGE と参照テーブルを判定
+  （DELETE FROM t / INSERT INTO t / UPDATE t SET col = / SELECT … FROM t の構文が成立する文のみ）
+- WITH 句の文は CTE 本体を読み飛ばし、本体の文の動詞で判定する（CTE 本体のテーブルは読み取り）
+- ロガー呼び出し（log.info(...) 等）と例外の生成（throw new …(...)）の引数はログ・メッセージの文言のため対象外
+- テーブル → メソッド のインデックスをクラスインデックスと一緒にキャッシュする
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from models import CrudType
+
+
+# SQLを含む可能性があるファイルの事前判定（含まないファイルは抽出処理自体を省略）
+_SQL_HINT_PATTERN = re.compile(r'\b(?:SELECT|INSERT|UPDATE|DELETE|MERGE)\b', re.IGNORECASE)
+
+# Java式のトークン（テキストブロック・文字列・文字・コメント・識別子・演算子）
+_JAVA_TOKEN_PATTERN = re.compile(
+    r'"""[\s\S]*?"""'
+    r'|"(?:[^"\\\n]|\\.)*"'
+    r"|'(?:[^'\\\n]|\\.)*'"
+    r'|//[^\n]*'
+    r'|/\*[\s\S]*?\*/'
+    r'|[A-Za-z_$][\w$]*(?:\s*\.\s*[A-Za-z_$][\w$]*)*'
+    r'|\d[\w.]*'
+    r'|\+=|\+\+|\+|\S'
+)
+
+# 文字列定数の宣言（static final String NAME = 式;）
+_STRING_CONSTANT_PATTERN = re.compile(r'\bfinal\s+(?:static\s+)?String\s+(\w+)\s*=\s*([^;]+);')
+
+# SQLのトークン（文字列リテラル・引用符付き識別子・コメント・識別子・数値・記号）
+_SQL_TOKEN_PATTERN = re.compile(
+    r"'(?:[^']|'')*'"
+    r'|"[^"]*"'
+    r'|--[^\n]*'
+    r'|/\*[\s\S]*?\*/'
+    r'|[A-Za-z_#@$][\w#@$]*(?:\.[A-Za-z_#@$][\w#@$]*)*'
+    r'|\d+(?:\.\d+)?'
+    r'|\S'
+)
+
+# 引数の文字列リテラルをSQLとして扱わないロガー（受け手の変数名）とログ出力メソッド
+_LOGGER_NAME_PATTERN = re.compile(r'^_?(?:log|logger)$', re.IGNORECASE)
+_LOG_METHODS = {'trace', 'debug', 'info', 'warn', 'warning', 'error', 'fatal', 'severe', 'fine', 'finer', 'finest', 'log'}
+
+# 例外クラスとみなすクラス名の接尾辞（throw を伴わない new XxxException(...) も対象外）
+_EXCEPTION_SUFFIXES = ('Exception', 'Error')
+
+# 文種別の強さ（複数文を含むメソッドは書き込み → 読み取りの順に強い文で判定する）
+_CRUD_STRENGTH = {
+    CrudType.DELETE.value: 3,
+    CrudType.UPDATE.value: 2,
+    CrudType.CREATE.value: 1,
+    CrudType.READ.value: 0,
+}
+
+_JAVA_ESCAPES = {'n': ' ', 't': ' ', 'r': ' ', '"': '"', "'": "'", '\\': '\\'}
+
+_SQL_VERB_CRUD = {
+    'SELECT': CrudType.READ,
+    'INSERT': CrudType.CREATE,
+    'UPDATE': CrudType.UPDATE,
+    'DELETE': CrudType.DELETE,
+    'MERGE': CrudType.UPDATE,
+}
+
+# テーブル名・別名として扱わないSQLキーワード
+_SQL_KEYWORDS = {
+    'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'MERGE', 'INTO', 'FROM', 'WHERE', 'SET', 'VALUES', 'VALUE',
+    'JOIN', 'INNER', 'LEFT', 'RIGHT', 'FULL', 'OUTER', 'CROSS', 'NATURAL', 'ON', 'USING', 'AS', 'AND', 'OR',
+    'NOT', 'IN', 'EXISTS', 'GROUP', 'ORDER', 'BY', 'HAVING', 'UNION', 'ALL', 'DISTINCT', 'LIMIT', 'OFFSET',
+    'FETCH', 'FOR', 'WITH', 'WHEN', 'THEN', 'ELSE', 'END', 'CASE', 'MATCHED', 'NULL', 'IS', 'LIKE', 'BETWEEN',
+    'RETURNING', 'DUAL', 'LATERAL', 'TOP', 'INTERSECT', 'EXCEPT', 'MINUS', 'CONNECT', 'START', 'WINDOW',
+}
+
+
+def _unescape_java_literal(token: str) -> str:
+    """Java文字列リテラル（"..." / テキストブロック）の中身を取り出す"""
+    body = token[3:-3] if token.startswith('"""') else token[1:-1]
+    if '\\' not in body:
+        return body
+    return re.sub(r'\\(.)', lambda m: _JAVA_ESCAPES.get(m.group(1), m.group(1)), body)
+
+
+def _skip_parenthesized(tokens: List[str], index: int) -> int:
+    """tokens[index] の '(' に対応する ')' の次の位置を返す"""
+    depth = 0
+    while index < len(tokens):
+        if tokens[index] == '(':
+            depth += 1
+        elif tokens[index] == ')':
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return index
+
+
+def _find_closing_parenthesis(tokens: list, index: int) -> int:
+    """tokens[index]（'(' のマッチ）に対応する ')' の位置（対応しなければ末尾）"""
+    depth = 0
+    while index < len(tokens):
+        token = tokens[index].group()
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+            if depth == 0:
+                return index
+        index += 1
+    return len(tokens) - 1
+
+
+def _is_non_sql_call(tokens: list, index: int) -> bool:
+    """tokens[index] がロガー呼び出し・例外の生成で、tokens[index + 1] がその引数の '(' か"""
+    if index + 1 >= len(tokens) or tokens[index + 1].group() != '(':
+        return False
+    parts = re.sub(r'\s+', '', tokens[index].group()).split('.')
+    if len(parts) >= 2 and parts[-1] in _LOG_METHODS and _LOGGER_NAME_PATTERN.match(parts[-2]):
+        return True
+    if index >= 1 and tokens[index - 1].group() == 'new':
+        return parts[-1].endswith(_EXCEPTION_SUFFIXES) or (index >= 2 and tokens[index - 2].group() == 'throw')
+    return False
+
+
+def strip_non_sql_arguments(java_code: str) -> str:
+    """ロガー呼び出し・例外の生成の引数を取り除く（ログ・例外メッセージの文言をSQLとして抽出しない）"""
+    tokens = [match for match in _JAVA_TOKEN_PATTERN.finditer(java_code)
+              if not match.group().startswith(('//', '/*'))]
+    pieces = []
+    last = 0
+    index = 0
+    while index < len(tokens):
+        if _is_non_sql_call(tokens, index):
+            close = _find_closing_parenthesis(tokens, index + 1)
+            pieces.append(java_code[last:tokens[index + 1].end()])
+            last = tokens[close].start() if tokens[close].group() == ')' else len(java_code)
+            index = close + 1
+            continue
+        index += 1
+    if not pieces:
+        return java_code
+    pieces.append(java_code[last:])
+    return ''.join(pieces)
+
+
+def evaluate_string_concatenations(java_code: str, constants: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Javaコード中の文字列リテラルの + 連結を評価して文字列を復元
+
+    - 既知の文字列定数は値に置換（Class.CONSTANT 形式も末尾名で参照）
+    - 変数・メソッド呼び出し等の動的な値はバインド変数相当の '?' に置換
+    - リテラルを1つも含まない連結は対象外
+
+    Returns:
+        復元した文字列のリスト（出現順）
+    """
+    constants = constants or {}
+    tokens = [token for token in _JAVA_TOKEN_PATTERN.findall(java_code)
+              if not token.startswith(('//', '/*'))]
+
+    results = []
+    parts: List[str] = []
+    has_literal = False
+    expect_operand = True
+    index = 0
+
+    def flush():
+        nonlocal parts, has_literal
+        if has_literal:
+            results.append(''.join(parts))
+        parts = []
+        has_literal = False
+
+    while index < len(tokens):
+        token = tokens[index]
+
+        if token == '+' and not expect_operand:
+            expect_operand = True
+            index += 1
+            continue
+
+        if token.startswith('"'):
+            if not expect_operand:
+                flush()
+            parts.append(_unescape_java_literal(token))
+            has_literal = True
+            expect_operand = False
+            index += 1
+            continue
+
+        if parts and expect_operand and (token[0].isalnum() or token[0] in '_$(' or token.startswith("'")):
+            # 連結中の動的な値（定数・変数・メソッド呼び出し・括弧式）
+            if token == '(':
+                index = _skip_parenthesized(tokens, index)
+                parts.append('?')
+            else:
+                name = re.sub(r'\s+', '', token).rsplit('.', 1)[-1]
+                index += 1
+                if index < len(tokens) and tokens[index] == '(':
+                    index = _skip_parenthesized(tokens, index)
+                    parts.append('?')
+                elif name in constants:
+                    parts.append(constants[name])
+                    has_literal = True
+                else:
+                    parts.append('?')
+            expect_operand = False
+            continue
+
+        if not parts and (token[0].isalpha() or token[0] in '_$'):
+            # 連結の先頭が定数の場合（CONSTANT + "..."）
+            name = re.sub(r'\s+', '', token).rsplit('.', 1)[-1]
+            if name in constants and index + 1 < len(tokens) and tokens[index + 1] == '+':
+                flush()
+                parts.append(constants[name])
+                has_literal = True
+                expect_operand = False
+                index += 1
+                continue
+
+        flush()
+        expect_operand = True
+        index += 1
+
+    flush()
+    return results
+
+
+def extract_string_constants(content: str) -> Dict[str, str]:
+    """ファイル内の文字列定数（final String NAME = "..." + ...;）を宣言順に評価"""
+    constants: Dict[str, str] = {}
+    for match in _STRING_CONSTANT_PATTERN.finditer(content):
+        values = evaluate_string_concatenations(match.group(2), constants)
+        if len(values) == 1:
+            constants[match.group(1)] = values[0]
+    return constants
+
+
+def tokenize_sql(sql: str) -> List[str]:
+    """SQL文字列をトークン化（コメント・文字列リテラルは除外）"""
+    return [token for token in _SQL_TOKEN_PATTERN.findall(sql)
+            if not token.startswith(("'", '--', '/*'))]
+
+
+def _is_table_name(token: str) -> bool:
+    return (token[0].isalpha() or token[0] in '_#@$"') and token.upper() not in _SQL_KEYWORDS
+
+
+def _normalize_table_name(token: str) -> str:
+    return token.strip('"').upper()
+
+
+def _read_table_list(tokens: List[str], index: int, tables: List[str]) -> int:
+    """FROM/JOIN/USING 直後のテーブル一覧（カンマ区切り・別名付き）を読み取る"""
+    while index < len(tokens):
+        if not _is_table_name(tokens[index]):
+            return index
+        tables.append(_normalize_table_name(tokens[index]))
+        index += 1
+        # 別名（AS alias / alias）
+        if index < len(tokens) and tokens[index].upper() == 'AS':
+            index += 1
+        if index < len(tokens) and _is_table_name(tokens[index]):
+            index += 1
+        if index < len(tokens) and tokens[index] == ',':
+            index += 1
+            continue
+        return index
+    return index
+
+
+def _is_update_set_clause(tokens: List[str], upper_tokens: List[str], index: int) -> bool:
+    """UPDATE のテーブル名の次（index）が [別名] SET 列 = / SET (列, ...) = の形か"""
+    if index < len(tokens) and upper_tokens[index] != 'SET' and _is_table_name(tokens[index]):
+        index += 1
+    if index + 2 >= len(tokens) or upper_tokens[index] != 'SET':
+        return False
+    if tokens[index + 1] == '(':
+        close = _skip_parenthesized(tokens, index + 1)
+        return close < len(tokens) and tokens[close] == '='
+    return _is_table_name(tokens[index + 1]) and tokens[index + 2] == '='
+
+
+def _read_with_clause(tokens: List[str], upper_tokens: List[str], index: int, cte_names: set, cte_tables: List[str]) -> int:
+    """
+    WITH の次（index）から CTE 定義（名前 [(列, ...)] AS [[NOT] MATERIALIZED] (...) のカンマ区切り）を読み飛ばし、
+    本体の文の位置を返す（構文が成立しなければ len(tokens)）
+    CTE 名を cte_names に、CTE 本体の FROM/JOIN のテーブルを cte_tables に追加する
+    """
+    if index < len(tokens) and upper_tokens[index] == 'RECURSIVE':
+        index += 1
+    while index < len(tokens) and _is_table_name(tokens[index]):
+        cte_names.add(_normalize_table_name(tokens[index]))
+        index += 1
+        if index < len(tokens) and tokens[index] == '(':
+            index = _skip_parenthesized(tokens, index)
+        if index >= len(tokens) or upper_tokens[index] != 'AS':
+            break
+        index += 1
+        if index < len(tokens) and upper_tokens[index] == 'NOT':
+            index += 1
+        if index < len(tokens) and upper_tokens[index] == 'MATERIALIZED':
+            index += 1
+        if index >= len(tokens) or tokens[index] != '(':
+            break
+        body_end = _skip_parenthesized(tokens, index)
+        for position in range(index + 1, body_end):
+            if upper_tokens[position] in ('FROM', 'JOIN'):
+                _read_table_list(tokens, position + 1, cte_tables)
+        index = body_end
+        if index < len(tokens) and tokens[index] == ',':
+            index += 1
+            continue
+        return index
+    return len(tokens)
+
+
+def _parse_statement(tokens: List[str]) -> Optional[Dict]:
+    """
+    1文分のトークンから文種別と参照テーブルを判定
+    文頭以外（"SQL: SELECT ..." 等）に現れる動詞も対象とするが、文中の動詞は大文字で書かれたもののみとする
+    （"Failed to delete user" 等の文章を除く）。構文が成立しない動詞は読み飛ばす
+    WITH 句の文は CTE 本体（の SELECT）ではなく本体の文の動詞で判定し、CTE 名はテーブルとして扱わない
+    """
+    upper_tokens = [token.upper() for token in tokens]
+
+    for start, verb in enumerate(upper_tokens):
+        if start > 0 and tokens[start] != verb:
+            continue
+
+        cte_names = set()
+        cte_tables: List[str] = []
+        verb_index = start
+        if verb == 'WITH':
+            verb_index = _read_with_clause(tokens, upper_tokens, start + 1, cte_names, cte_tables)
+            if verb_index >= len(tokens):
+                continue
+            verb = upper_tokens[verb_index]
+        if verb not in _SQL_VERB_CRUD:
+            continue
+
+        write_tables: List[str] = []
+        index = verb_index + 1
+        if verb in ('INSERT', 'MERGE', 'DELETE'):
+            # INSERT INTO t / MERGE INTO t / DELETE FROM t
+            keyword = 'FROM' if verb == 'DELETE' else 'INTO'
+            if index + 1 >= len(tokens) or upper_tokens[index] != keyword or not _is_table_name(tokens[index + 1]):
+                continue
+            write_tables.append(_normalize_table_name(tokens[index + 1]))
+            index += 2
+        elif verb == 'UPDATE':
+            # UPDATE t SET col =
+            if index >= len(tokens) or not _is_table_name(tokens[index]) or \
+                    not _is_update_set_clause(tokens, upper_tokens, index + 1):
+                continue
+            write_tables.append(_normalize_table_name(tokens[index]))
+            index += 1
+        elif 'FROM' not in upper_tokens[index:]:
+            continue
+
+        read_tables: List[str] = list(cte_tables)
+        while index < len(tokens):
+            if upper_tokens[index] in ('FROM', 'JOIN', 'USING'):
+                index = _read_table_list(tokens, index + 1, read_tables)
+            else:
+                index += 1
+        read_tables = [table for table in read_tables if table not in cte_names]
+
+        if verb == 'SELECT' and not read_tables:
+            continue
+
+        tables = []
+        for table in write_tables + read_tables:
+            if table not in tables:
+                tables.append(table)
+
+        return {
+            'verb': verb,
+            'crud_type': _SQL_VERB_CRUD[verb].value,
+            'tables': tables,
+            'write_tables': write_tables,
+            'read_tables': [table for table in dict.fromkeys(read_tables) if table not in write_tables],
+            'sql': ' '.join(tokens[start:])
+        }
+
+    return None
+
+
+def parse_sql(sql: str) -> List[Dict]:
+    """
+    SQL文字列を解析（; 区切りの複数文に対応）
+
+    Returns:
+        [{'verb', 'crud_type', 'tables', 'write_tables', 'read_tables', 'sql'}]
+    """
+    statements = []
+    current: List[str] = []
+    for token in tokenize_sql(sql) + [';']:
+        if token != ';':
+            current.append(token)
+            continue
+        if current:
+            statement = _parse_statement(current)
+            if statement:
+                statements.append(statement)
+        current = []
+    return statements
+
+
+def extract_sql_statements(method_body: str, constants: Optional[Dict[str, str]] = None) -> List[Dict]:
+    """メソッド本体の文字列リテラル（定数連結を含む、ロガー・例外の引数を除く）からSQL文を抽出"""
+    if not _SQL_HINT_PATTERN.search(method_body):
+        return []
+
+    statements = []
+    for text in evaluate_string_concatenations(strip_non_sql_arguments(method_body), constants):
+        if _SQL_HINT_PATTERN.search(text):
+            statements.extend(parse_sql(text))
+    return statements
+
+
+def strongest_statement(statements: List[Dict]) -> Optional[Dict]:
+    """
+    メソッドのCRUD種別の判定に使う文（DELETE → UPDATE/MERGE → INSERT → SELECT の順に強く、同じ強さなら先の文）
+    書き込みの前の存在確認・読み込み（SELECT）でメソッドを READ と判定しない
+    """
+    strongest = None
+    for statement in statements:
+        if strongest is None or _CRUD_STRENGTH[statement['crud_type']] > _CRUD_STRENGTH[strongest['crud_type']]:
+            strongest = statement
+    return strongest
+
+
+def contains_sql_hint(content: str) -> bool:
+    """SQLキーワードを含む可能性があるか（ファイル単位の事前判定）"""
+    return bool(_SQL_HINT_PATTERN.search(content))
+
+
+def build_table_index(all_classes: Dict) -> Dict[str, List[Dict]]:
+    """
+    クラスインデックスからテーブル → メソッド のインデックスを構築
+
+    Returns:
+        {'USERS': [{'class_key', 'class_name', 'method_name', 'arity', 'source_path',
+                    'verb', 'crud_type', 'access': 'write'|'read'}]}
+        スキーマ修飾付きのテーブル（SCHEMA.TABLE）はテーブル名のみでも登録する
+    """
+    from class_indexer import class_key, iter_unique_classes
+
+    table_index: Dict[str, List[Dict]] = {}
+    seen = set()  # (テーブル名, class_key, method_name, arity, verb, access)
+    for class_info in iter_unique_classes(all_classes):
+        for method_name, overloads in class_info.overloads.items():
+            for method_info in overloads:
+                for statement in method_info.sql_statements:
+                    for table in statement['tables']:
+                        entry = {
+                            'class_key': class_key(class_info),
+                            'class_name': class_info.class_name,
+                            'method_name': method_name,
+                            'arity': method_info.arity,
+                            'source_path': class_info.source_path,
+                            'verb': statement['verb'],
+                            'crud_type': statement['crud_type'],
+                            'access': 'write' if table in statement['write_tables'] else 'read'
+                        }
+                        for name in {table, table.rsplit('.', 1)[-1]}:
+                            entry_key = (name, entry['class_key'], method_name, method_info.arity,
+                                         entry['verb'], entry['access'])
+                            if entry_key not in seen:
+                                seen.add(entry_key)
+                                table_index.setdefault(name, []).append(entry)
+    return table_index
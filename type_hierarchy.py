@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Type hierarchy index for Smart Entity CRUD Analyzer
+継承・実装関係（supertype/subtype）インデックスと仮想ディスパッチ解決
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models import ClassInfo, MethodInfo
+from class_indexer import class_key, iter_unique_classes
+
+
+class TypeHierarchyIndex:
+    """
+    継承・実装関係インデックス
+
+    - supertypes: クラスキー → 直接の親クラス・実装interfaceのクラスキー
+    - subtypes:   クラスキー → 直接のサブクラス・実装クラスのクラスキー
+    インデックス外（JDK・ライブラリ等）の親型は unresolved_supertypes に名前のまま保持する
+    """
+
+    def __init__(self, all_classes: Dict[str, ClassInfo]):
+        self.all_classes = all_classes
+        self.supertypes: Dict[str, List[str]] = {}
+        self.subtypes: Dict[str, List[str]] = {}
+        self.unresolved_supertypes: Dict[str, List[str]] = {}
+        self._build()
+
+    def _build(self):
+        """全クラスの extends/implements から親子関係を構築"""
+        for class_info in iter_unique_classes(self.all_classes):
+            key = class_key(class_info)
+            declared = ([class_info.superclass] if class_info.superclass else []) + list(class_info.interfaces)
+
+            resolved = []
+            unresolved = []
+            for type_name in declared:
+                super_key = self._resolve_type_name(type_name, class_info)
+                if super_key:
+                    resolved.append(super_key)
+                    self.subtypes.setdefault(super_key, []).append(key)
+                else:
+                    unresolved.append(type_name)
+
+            self.supertypes[key] = resolved
+            if unresolved:
+                self.unresolved_supertypes[key] = unresolved
+
+    def _resolve_type_name(self, type_name: str, class_info: ClassInfo) -> Optional[str]:
+        """
+        extends/implements に記述された型名をクラスキーに解決
+        解決順序: 完全クラス名 → import → 同一パッケージ → 単純クラス名
+        いずれも宣言側と同じソースパスを優先する
+        """
+        if '.' in type_name:
+            candidates = [type_name, type_name.split('.')[-1]]
+        else:
+            candidates = [imp for imp in class_info.imports if imp.endswith('.' + type_name)]
+            if class_info.package_name:
+                candidates.append(f"{class_info.package_name}.{type_name}")
+            candidates.append(type_name)
+
+        for candidate in candidates:
+            for key in (f"{candidate}@{class_info.source_path}", candidate):
+                target = self.all_classes.get(key)
+                if target is not None:
+                    return class_key(target)
+        return None
+
+    def get_supertypes(self, class_info: ClassInfo) -> List[ClassInfo]:
+        """直接の親型（インデックス内のもののみ）"""
+        return [self.all_classes[key] for key in self.supertypes.get(class_key(class_info), [])]
+
+    def get_subtypes(self, class_info: ClassInfo) -> List[ClassInfo]:
+        """直接のサブ型"""
+        return [self.all_classes[key] for key in self.subtypes.get(class_key(class_info), [])]
+
+    def find_implementations(self, class_info: ClassInfo, method_name: str, arg_count: Optional[int] = None,
+                             source_order: Optional[Sequence[str]] = None,
+                             limit: int = 5) -> Tuple[List[Tuple[ClassInfo, MethodInfo]], bool]:
+        """
+        interface/abstractクラスのメソッドを実装している具象クラスを探索（推移的）
+
+        Args:
+            class_info: 呼び出し先として宣言されている型
+            method_name: メソッド名
+            arg_count: 呼び出し側の引数数（オーバーロード特定用）
+            source_order: 優先するソース識別子の順序（呼び出し元→依存ソース）。
+                          上限で打ち切る場合は先頭のソースの実装を残す（含まれないソースは対象外、Noneなら探索順）
+            limit: 展開数の上限（共通interfaceでの爆発防止）
+
+        Returns:
+            ([(実装クラス, 実装メソッド)], 上限により打ち切ったか)
+        """
+        source_ranks = {source_id: rank for rank, source_id in enumerate(source_order)} if source_order is not None else None
+        candidates = []  # (ソースの優先順位, 実装クラス, 実装メソッド)
+        best_rank_count = 0
+        start_key = class_key(class_info)
+        visited = {start_key}
+        queue = deque(self.subtypes.get(start_key, []))
+
+        while queue:
+            key = queue.popleft()
+            if key in visited:
+                continue
+            visited.add(key)
+            queue.extend(self.subtypes.get(key, []))
+
+            sub_info = self.all_classes.get(key)
+            if sub_info is None or sub_info.is_interface:
+                continue
+            rank = source_ranks.get(sub_info.source_path) if source_ranks is not None else 0
+            if rank is None:
+                continue
+
+            method_info = sub_info.find_method(method_name, arg_count)
+            if method_info is None or method_info.is_abstract:
+                continue
+
+            candidates.append((rank, sub_info, method_info))
+            if rank == 0:
+                best_rank_count += 1
+                if best_rank_count > limit:
+                    # 最優先のソースだけで上限を超えた（残りの探索は結果を変えない）
+                    break
+
+        candidates.sort(key=lambda candidate: candidate[0])
+        implementations = [(sub_info, method_info) for _, sub_info, method_info in candidates[:limit]]
+        return implementations, len(candidates) > limit
@@ -5,26 +5,105 @@ Utility functions for Smart Entity CRUD Analyzer
 """
 
 import os
+import re
 import json
 import glob
+from bisect import bisect_left
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 
 
-def read_file_with_encoding(file_path: str) -> str:
-    """複数のエンコーディングでファイルを読み込み"""
-    encodings = ['utf-8', 'shift_jis', 'cp932', 'euc-jp', 'iso-2022-jp', 'latin-1']
-    
-    for encoding in encodings:
+# 読み込み時に試すエンコーディング（先頭から順に試行）
+FILE_ENCODINGS = ['utf-8', 'shift_jis', 'cp932', 'euc-jp', 'iso-2022-jp', 'latin-1']
+
+
+def decode_with_encoding(data: bytes) -> str:
+    """
+    バイト列を複数のエンコーディングで復号（read_file_with_encoding と同じ結果）
+    テキストモードでの読み込みと同様に改行コードは \n に統一する
+    """
+    for encoding in FILE_ENCODINGS:
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read()
+            text = data.decode(encoding)
+            break
         except UnicodeDecodeError:
             continue
+    else:
+        # 最後の手段：エラーを無視して復号
+        text = data.decode('utf-8', errors='ignore')
     
-    # 最後の手段：エラーを無視して読み込み
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-        return f.read()
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def read_file_with_encoding(file_path: str) -> str:
+    """複数のエンコーディングでファイルを読み込み（ファイルは1回だけ読み込む）"""
+    with open(file_path, 'rb') as f:
+        return decode_with_encoding(f.read())
+
+
+def get_cache_dir() -> str:
+    """
+    キャッシュディレクトリ
+    環境変数 CLASS_INDEX_CACHE_DIR → $XDG_CACHE_HOME/class-index-analyzer → ~/.cache/class-index-analyzer
+    """
+    cache_dir = os.environ.get('CLASS_INDEX_CACHE_DIR')
+    if cache_dir:
+        return os.path.abspath(os.path.expanduser(cache_dir))
+    base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base_dir, 'class-index-analyzer')
+
+
+@contextmanager
+def file_lock(lock_path: str):
+    """
+    プロセス間の排他ロック（<対象>.lock ファイルへの flock）
+    fcntl のない環境ではロックせずに実行する（書き込み自体は atomic_write_json で原子的）
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    with open(lock_path, 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_json(file_path: str, data, lock: bool = True, **dump_options):
+    """
+    JSONを一時ファイルに書き出してから os.replace で置換（読み込み側が書きかけのファイルを見ることはない）
+    lock=True の場合は <file_path>.lock で書き込み同士を直列化する
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    
+    def write():
+        import tempfile
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, **dump_options)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+    
+    if lock:
+        with file_lock(file_path + '.lock'):
+            write()
+    else:
+        write()
 
 
 def load_settings_and_resolve_paths(settings_path: str) -> Tuple[List[str], List[str]]:
@@ -86,28 +165,84 @@ def load_settings_and_resolve_paths(settings_path: str) -> Tuple[List[str], List
         return [], []
 
 
+def _make_source_identifier(source_path: str) -> str:
+    """ソースパス名から識別子を生成（例: "aios_cas:src", "cfw_cas:src"）"""
+    parts = Path(source_path).parts
+    source_name = parts[-2] if len(parts) >= 2 else Path(source_path).name
+    return f"{source_name}:{Path(source_path).name}"
+
+
+class SourceRootResolver:
+    """
+    ファイルパス → ソース識別子 の解決器
+    
+    設定されたソースルートを一度だけ解決し、パス要素単位のトライに登録する。
+    検索はパス要素単位の最長一致のため、ネストしたルートは内側が優先され、
+    "/src2" が "/src" 配下と誤判定されることもない。
+    """
+    
+    _TERMINAL = object()  # トライ上でソースルート終端を表すキー
+    
+    def __init__(self, source_paths: List[str]):
+        self._trie = {}
+        for source_path in source_paths:
+            identifier = _make_source_identifier(source_path)
+            # 記述どおりの絶対パスとシンボリックリンク解決後のパスの両方を登録
+            for root in (os.path.abspath(source_path), str(Path(source_path).resolve())):
+                node = self._trie
+                for part in root.split(os.sep):
+                    if part:
+                        node = node.setdefault(part, {})
+                # 同じルートが重複して設定された場合は先に設定されたものを優先
+                node.setdefault(self._TERMINAL, identifier)
+    
+    def _longest_match(self, path: str) -> Optional[str]:
+        """パス要素単位で最長一致するソースルートの識別子"""
+        node = self._trie
+        matched = node.get(self._TERMINAL)
+        for part in path.split(os.sep):
+            if not part:
+                continue
+            node = node.get(part)
+            if node is None:
+                break
+            matched = node.get(self._TERMINAL, matched)
+        return matched
+    
+    def resolve(self, file_path: str) -> str:
+        """ファイルパスのソース識別子（どのソースルートにも属さなければ "unknown"）"""
+        identifier = self._longest_match(os.path.abspath(file_path))
+        if identifier is None:
+            # シンボリックリンク経由のパスは実体パスで再判定
+            identifier = self._longest_match(os.path.realpath(file_path))
+        return identifier or "unknown"
+
+
+# ソースパス構成ごとの解決器（ソースルートの解決は構成ごとに一度だけ）
+_source_root_resolvers: Dict[Tuple[str, ...], SourceRootResolver] = {}
+
+
 def get_source_identifier(file_path: str, source_paths: List[str]) -> str:
     """
     ファイルパスからどのソースパス由来かを識別
     重要：複数ソースパスで同名クラスが存在する場合の区別に使用
     """
-    file_path_abs = str(Path(file_path).resolve())
-    
-    for i, source_path in enumerate(source_paths):
-        source_path_abs = str(Path(source_path).resolve())
-        if file_path_abs.startswith(source_path_abs):
-            # ソースパス名から識別子を生成
-            source_name = Path(source_path).parts[-2] if len(Path(source_path).parts) >= 2 else Path(source_path).name
-            return f"{source_name}:{Path(source_path).name}"  # 例: "aios_cas:src", "cfw_cas:src"
-    
-    return "unknown"
+    key = tuple(source_paths)
+    resolver = _source_root_resolvers.get(key)
+    if resolver is None:
+        resolver = _source_root_resolvers[key] = SourceRootResolver(source_paths)
+    return resolver.resolve(file_path)
 
 
 def find_java_files(directory: str) -> List[str]:
-    """ディレクトリからJavaファイルを再帰検索"""
+    """
+    ディレクトリからJavaファイルを再帰検索
+    同名クラスの先勝ち登録・シャード分割を環境によらず再現できるよう、ディレクトリ・ファイルは名前順に走査する
+    """
     java_files = []
     for root, dirs, files in os.walk(directory):
-        for file in files:
+        dirs.sort()
+        for file in sorted(files):
             if file.endswith('.java'):
                 java_files.append(os.path.join(root, file))
     return java_files
@@ -130,40 +265,314 @@ def extract_package_and_class_name(content: str) -> Tuple[str, str]:
     return package_name, class_name
 
 
-def extract_method_signatures(content: str) -> List[Dict[str, str]]:
+def _split_type_list(type_list: str) -> List[str]:
+    """extends/implements の型リストを単純型名のリストに分割（ジェネリクス除去）"""
+    names = []
+    depth = 0
+    current = []
+    for ch in type_list:
+        if ch == '<':
+            depth += 1
+        elif ch == '>':
+            depth -= 1
+        elif depth == 0:
+            if ch == ',':
+                names.append(''.join(current).strip())
+                current = []
+            else:
+                current.append(ch)
+    names.append(''.join(current).strip())
+    return [name for name in names if name]
+
+
+def extract_class_hierarchy(content: str, class_name: str) -> Dict:
     """
-    ファイル内容からメソッドシグネチャを抽出
-    複数ソースパス対応：重複メソッドの区別のため詳細情報を保持
+    クラス宣言から継承・実装情報を抽出
+    戻り値: {'superclass': str, 'interfaces': [str], 'is_interface': bool, 'is_abstract': bool}
+    interfaceの場合、extendsで指定された親interfaceはinterfacesに格納する
     """
-    import re
+    hierarchy = {'superclass': '', 'interfaces': [], 'is_interface': False, 'is_abstract': False}
+    if not class_name:
+        return hierarchy
     
-    methods = []
+    declaration = re.search(
+        rf'((?:\w+\s+)*)(class|interface)\s+{re.escape(class_name)}\b([^{{;]*)\{{', content)
+    if not declaration:
+        return hierarchy
+    
+    modifiers = declaration.group(1).split()
+    is_interface = declaration.group(2) == 'interface'
+    header = declaration.group(3)
+    
+    # 型パラメータ <T extends Foo> を除去してから extends/implements を解析
+    header_depth = 0
+    stripped = []
+    for ch in header:
+        if ch == '<':
+            header_depth += 1
+        elif ch == '>':
+            header_depth -= 1
+        elif header_depth == 0:
+            stripped.append(ch)
+    header = ''.join(stripped)
+    
+    extends_match = re.search(r'\bextends\s+(.+?)(?=\bimplements\b|$)', header, re.S)
+    implements_match = re.search(r'\bimplements\s+(.+)$', header, re.S)
+    
+    extends_names = _split_type_list(extends_match.group(1)) if extends_match else []
+    implements_names = _split_type_list(implements_match.group(1)) if implements_match else []
+    
+    hierarchy['is_interface'] = is_interface
+    hierarchy['is_abstract'] = is_interface or 'abstract' in modifiers
+    if is_interface:
+        hierarchy['interfaces'] = extends_names
+    else:
+        hierarchy['superclass'] = extends_names[0] if extends_names else ''
+        hierarchy['interfaces'] = implements_names
     
-    # メソッドパターン（interface対応含む）
-    patterns = [
-        r'(?:public|private|protected)?\s*(?:static\s+)?(?:final\s+)?(\w+(?:<[^>]*>)?)\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[\w\s,]+)?\s*[{;]',
-        r'(?:public|private|protected)?\s*(?:abstract\s+)?(\w+(?:<[^>]*>)?)\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[\w\s,]+)?\s*;'
-    ]
+    return hierarchy
+
+
+# メソッドパターン（interface対応含む）: 戻り値型・メソッド名・パラメータ部を取得
+_METHOD_SIGNATURE_PATTERNS = [
+    re.compile(r'(?:public|private|protected)?\s*(?:static\s+)?(?:final\s+)?(\w+(?:<[^>]*>)?)\s+(\w+)\s*\(([^)]*)\)\s*(?:throws\s+[\w\s,]+)?\s*[{;]'),
+    re.compile(r'(?:public|private|protected)?\s*(?:abstract\s+)?(\w+(?:<[^>]*>)?)\s+(\w+)\s*\(([^)]*)\)\s*(?:throws\s+[\w\s,]+)?\s*;'),
+]
+
+# メソッドとして扱わないキーワード（制御構文・new式など）
+_NON_METHOD_KEYWORDS = {'if', 'for', 'while', 'switch', 'try', 'catch', 'return', 'new', 'throw', 'else'}
+
+# 中括弧対応の走査対象トークン（文字列・文字リテラル・コメント・中括弧）
+_BLOCK_TOKEN_PATTERN = re.compile(r'"""|"|\'|//|/\*|[{}]')
+
+# 引数数カウントの走査対象トークン
+_ARGUMENT_TOKEN_PATTERN = re.compile(r'"""|"|\'|//|/\*|[()\[\]{},<]')
+
+# 型引数の直前（大文字で始まる型名、または明示的な型引数の "."）
+_TYPE_ARGUMENTS_PREFIX_PATTERN = re.compile(r'(?:\b[A-Z]\w*|\.)\s*$')
+
+# 型引数の中に現れる文字
+_TYPE_ARGUMENT_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$ \t\r\n,.?&[]@')
+
+
+def _skip_literal_or_comment(content: str, token: str, pos: int) -> int:
+    """文字列・文字リテラル・コメントの終端位置を返す（posはトークン直後）"""
+    if token == '"""':
+        end = content.find('"""', pos)
+        return len(content) if end == -1 else end + 3
+    if token == '//':
+        end = content.find('\n', pos)
+        return len(content) if end == -1 else end
+    if token == '/*':
+        end = content.find('*/', pos)
+        return len(content) if end == -1 else end + 2
+    
+    # "..." または '...'（エスケープ対応、改行で打ち切り）
+    i = pos
+    while i < len(content):
+        ch = content[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == token or ch == '\n':
+            return i + 1
+        i += 1
+    return len(content)
+
+
+def find_block_end(content: str, open_brace_index: int) -> int:
+    """
+    開き中括弧に対応する閉じ中括弧の直後の位置を返す
+    文字列リテラル・コメント内の中括弧は無視する（見つからない場合は-1）
+    """
+    depth = 0
+    pos = open_brace_index
     
+    while True:
+        match = _BLOCK_TOKEN_PATTERN.search(content, pos)
+        if not match:
+            return -1
+        
+        token = match.group(0)
+        pos = match.end()
+        
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return pos
+        else:
+            pos = _skip_literal_or_comment(content, token, pos)
+
+
+def _skip_type_arguments(content: str, open_angle_index: int) -> int:
+    """
+    型引数（new HashMap<String, List<Long>>() 、Collections.<K, V>emptyMap() など）の終端位置を返す
+    比較演算子の "<" と区別できない場合は -1
+    """
+    if not _TYPE_ARGUMENTS_PREFIX_PATTERN.search(content, max(0, open_angle_index - 100), open_angle_index):
+        return -1
+    
+    depth = 0
+    for i in range(open_angle_index, len(content)):
+        ch = content[i]
+        if ch == '<':
+            depth += 1
+        elif ch == '>':
+            depth -= 1
+            if depth == 0:
+                following = content[i + 1:].lstrip()[:1]
+                if following and following in '()[]{},:' or content[open_angle_index - 1] == '.':
+                    return i + 1
+                return -1
+        elif ch not in _TYPE_ARGUMENT_CHARS:
+            return -1
+    return -1
+
+
+def count_call_arguments(content: str, open_paren_index: int) -> Optional[int]:
+    """
+    呼び出し箇所の開き括弧から実引数の個数を数える
+    型引数の中のカンマは数えない。括弧の対応が取れない場合はNone
+    """
+    depth = 0
+    commas = 0
+    pos = open_paren_index
+    
+    while True:
+        match = _ARGUMENT_TOKEN_PATTERN.search(content, pos)
+        if not match:
+            return None
+        
+        token = match.group(0)
+        pos = match.end()
+        
+        if token in ('(', '[', '{'):
+            depth += 1
+        elif token in (')', ']', '}'):
+            depth -= 1
+            if depth == 0:
+                if content[open_paren_index + 1:match.start()].strip() == '':
+                    return 0
+                return commas + 1
+        elif token == ',':
+            if depth == 1:
+                commas += 1
+        elif token == '<':
+            end = _skip_type_arguments(content, match.start())
+            if end != -1:
+                pos = end
+        else:
+            pos = _skip_literal_or_comment(content, token, pos)
+
+
+def parse_parameter_types(parameter_text: str) -> List[str]:
+    """
+    パラメータ部の文字列から型のリストを抽出
+    例: "final Map<String, Long> ids, String... names" → ["Map<String, Long>", "String..."]
+    """
+    parameters = []
+    if not parameter_text.strip():
+        return parameters
+    
+    # ジェネリクス内のカンマを考慮して分割
+    parts = []
+    depth = 0
+    current = []
+    for ch in parameter_text:
+        if ch == '<':
+            depth += 1
+        elif ch == '>':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(ch)
+    parts.append(''.join(current))
+    
+    for part in parts:
+        # アノテーション・final修飾子を除去
+        part = re.sub(r'@\w+(?:\([^)]*\))?', ' ', part)
+        part = re.sub(r'\bfinal\b', ' ', part)
+        part = ' '.join(part.split())
+        if not part:
+            continue
+        
+        # 末尾の識別子がパラメータ名、それ以前が型
+        match = re.match(r'(.+?)\s*(\.\.\.)?\s*(\w+)\s*((?:\[\s*\])*)$', part)
+        if not match:
+            parameters.append(part)
+            continue
+        
+        param_type = match.group(1).replace(' ', '') if '<' in match.group(1) else match.group(1)
+        param_type += match.group(4).replace(' ', '')  # String args[] 形式
+        if match.group(2):
+            param_type += '...'
+        parameters.append(param_type)
+    
+    return parameters
+
+
+def extract_method_signatures(content: str) -> List[Dict]:
+    """
+    ファイル内容からメソッドシグネチャを抽出
+    複数ソースパス対応：重複メソッドの区別のため詳細情報を保持
+    オーバーロード対応：同名でもパラメータ型が異なれば別メソッドとして保持し、
+    メソッド本体の範囲（オフセット・行番号）も記録する
+    """
+    methods = []
     detected_methods = set()
+    # 改行位置（行番号はその前にある改行の数から二分探索で求める）
+    newline_offsets = [match.start() for match in re.finditer('\n', content)]
     
-    for pattern in patterns:
-        for match in re.finditer(pattern, content):
+    for pattern in _METHOD_SIGNATURE_PATTERNS:
+        for match in pattern.finditer(content):
             return_type = match.group(1)
             method_name = match.group(2)
             
-            # 重複チェック & フィルタリング
-            if (method_name not in detected_methods and 
-                method_name not in ['getClass', 'hashCode', 'equals', 'toString'] and
-                return_type not in ['if', 'for', 'while', 'switch', 'try', 'catch', 'return']):
-                
-                detected_methods.add(method_name)
-                methods.append({
-                    'method_name': method_name,
-                    'return_type': return_type,
-                    'signature': match.group(0).strip()
-                })
+            # フィルタリング
+            if (method_name in ['getClass', 'hashCode', 'equals', 'toString'] or
+                return_type in _NON_METHOD_KEYWORDS):
+                continue
+            
+            parameters = parse_parameter_types(match.group(3))
+            
+            # 重複チェック（メソッド名＋パラメータ型）
+            method_key = (method_name, tuple(parameters))
+            if method_key in detected_methods:
+                continue
+            detected_methods.add(method_key)
+            
+            signature = match.group(0)
+            start_offset = match.start() + (len(signature) - len(signature.lstrip()))
+            is_abstract = signature.endswith(';')
+            
+            if is_abstract:
+                end_offset = match.end()
+            else:
+                end_offset = find_block_end(content, match.end() - 1)
+                if end_offset == -1:
+                    end_offset = len(content)
+            
+            start_line = bisect_left(newline_offsets, start_offset) + 1
+            end_line = bisect_left(newline_offsets, end_offset) + 1
+            
+            methods.append({
+                'method_name': method_name,
+                'return_type': return_type,
+                'parameters': parameters,
+                'signature': signature.strip(),
+                'is_abstract': is_abstract,
+                'start_offset': start_offset,
+                'end_offset': end_offset,
+                'start_line': start_line,
+                'end_line': end_line
+            })
     
+    # ソース上の出現順に揃える
+    methods.sort(key=lambda m: m['start_offset'])
     return methods
 
 